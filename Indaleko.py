@@ -145,7 +145,7 @@ class Indaleko:
         return utils.data_validation.validate_iso_timestamp(source)
 
     @staticmethod
-    def generate_iso_timestamp(ts: datetime | None = None) -> str:
+    def generate_iso_timestamp(ts: datetime.datetime | None = None) -> str:
         """Given a timestamp, convert it to an ISO timestamp."""
         return utils.misc.timestamp_management.generate_iso_timestamp(ts)
 
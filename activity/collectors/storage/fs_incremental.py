@@ -3,10 +3,19 @@ Incremental file system collector for Indaleko.
 
 This collector walks configured volumes and emits file metadata for files
 with modification timestamps newer than a stored "last run" timestamp.
+
+The default "pruned" strategy also keeps each directory's mtime and child
+listing in the state file.  A directory whose mtime has not changed is not
+re-read, files are stat'd from a thread pool, and files that have gone away
+since the last scan are reported as deleted.
 """
 
+import fnmatch
 import json
+import os
+import time
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
@@ -15,21 +24,42 @@ from typing import Any
 class FsIncrementalCollector:
     """Collector that scans directories incrementally based on file mtime."""
 
+    # Directory mtimes this close to the scan are not trusted: the directory
+    # could change again within the file system's timestamp granularity.
+    RACY_MTIME_NS = 2_000_000_000
+
     def __init__(
         self,
         volumes: list[str],
         state_file: str = "data/fs_indexer_state.json",
         patterns: list[str] | None = None,
+        strategy: str = "pruned",
+        threads: int | None = None,
+        prune_unchanged_dirs: bool = False,
     ) -> None:
+        """
+        strategy is "pruned" (cached listings, parallel stat, deletions) or
+        "rglob" (the original full walk).  With prune_unchanged_dirs the files
+        in a directory whose mtime has not changed are not stat'd at all; that
+        finds creations, deletions and renames, but not files rewritten in
+        place, so it is meant for use alongside a watcher.
+        """
+        if strategy not in ("pruned", "rglob"):
+            raise ValueError(f"Unknown rescan strategy {strategy}")
         self.volumes = volumes
         self.state_path = Path(state_file)
         self.patterns = patterns or ["*"]
+        self.strategy = strategy
+        self.threads = threads or min(32, 4 * (os.cpu_count() or 1))
+        self.prune_unchanged_dirs = prune_unchanged_dirs
+        self.directories: dict[str, dict[str, Any]] = {}
         # Load last run timestamp
         if self.state_path.is_file():
             try:
                 data = json.loads(self.state_path.read_text(encoding="utf-8"))
                 ts = data.get("last_run")
                 self.last_run = datetime.fromisoformat(ts) if ts else None
+                self.directories = data.get("directories", {}) if self.last_run else {}
             except Exception:
                 self.last_run = None
         else:
@@ -37,8 +67,30 @@ class FsIncrementalCollector:
         # Current run timestamp to update state
         self.current_run = datetime.now(UTC)
 
+    def save_state(self, last_run: datetime) -> None:
+        """Persist the time up to which file events have been collected."""
+        self.last_run = last_run
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        self.state_path.write_text(
+            json.dumps({"last_run": last_run.isoformat(), "directories": self.directories}),
+            encoding="utf-8",
+        )
+
     def collect_activities(self) -> list[dict[str, Any]]:
         """Scan volumes and return list of file events newer than last_run."""
+        if self.last_run is not None:
+            # a collector may be used for more than one scan (e.g., by a watcher)
+            self.current_run = datetime.now(UTC)
+        if self.strategy == "rglob" or any("/" in pattern or os.sep in pattern for pattern in self.patterns):
+            activities = self.collect_rglob()
+        else:
+            activities = self.collect_pruned()
+        # Update state file
+        self.save_state(self.current_run)
+        return activities
+
+    def collect_rglob(self) -> list[dict[str, Any]]:
+        """Walk every volume with rglob, checking every file's mtime."""
         activities: list[dict[str, Any]] = []
         for vol in self.volumes:
             base = Path(vol)
@@ -59,10 +111,110 @@ class FsIncrementalCollector:
                                 "size_bytes": p.stat().st_size,
                             },
                         )
-        # Update state file
-        self.state_path.parent.mkdir(parents=True, exist_ok=True)
-        self.state_path.write_text(
-            json.dumps({"last_run": self.current_run.isoformat()}, indent=2),
-            encoding="utf-8",
-        )
+        self.directories = {}  # listings were not maintained
+        return activities
+
+    def matches(self, name: str) -> bool:
+        """Return True if the file name matches one of the patterns."""
+        return any(fnmatch.fnmatch(name, pattern) for pattern in self.patterns)
+
+    @staticmethod
+    def list_directory(path: str) -> tuple[list[str], list[str]]:
+        """Return the names of the files and subdirectories in a directory."""
+        files, dirs = [], []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.name)
+                    elif entry.is_file():
+                        files.append(entry.name)
+                except OSError:
+                    continue
+        return files, dirs
+
+    @staticmethod
+    def stat_files(paths: list[str]) -> list[tuple[str, os.stat_result | None]]:
+        """Stat a group of files (run on the thread pool)."""
+        results = []
+        for path in paths:
+            try:
+                results.append((path, os.stat(path)))
+            except OSError:
+                results.append((path, None))
+        return results
+
+    def deleted_activity(self, path: str) -> dict[str, Any]:
+        """Build the activity record for a file that has gone away."""
+        return {
+            "file_path": path,
+            "modified_time": self.current_run.isoformat(),
+            "size_bytes": None,
+            "event": "deleted",
+        }
+
+    def collect_pruned(self) -> list[dict[str, Any]]:
+        """Walk the volumes using (and refreshing) the cached directory listings."""
+        activities: list[dict[str, Any]] = []
+        previous = self.directories
+        directories: dict[str, dict[str, Any]] = {}
+        scan_start_ns = time.time_ns()
+        last_run = self.last_run.timestamp() if self.last_run is not None else None
+        known_files = set()  # files that were in a cached listing
+        futures = []
+        with ThreadPoolExecutor(max_workers=self.threads) as pool:
+            stack = [os.path.abspath(vol) for vol in self.volumes]
+            while stack:
+                path = stack.pop()
+                try:
+                    dir_stat = os.stat(path)
+                    cached = previous.get(path)
+                    unchanged = (
+                        cached is not None
+                        and cached["mtime_ns"] == dir_stat.st_mtime_ns
+                        and cached["ino"] == dir_stat.st_ino
+                    )
+                    if unchanged:
+                        files, dirs = cached["files"], cached["dirs"]
+                    else:
+                        files, dirs = self.list_directory(path)
+                except OSError:
+                    continue  # it will be reported as deleted
+                if cached is not None:
+                    known_files.update(os.path.join(path, name) for name in cached["files"])
+                    if not unchanged:
+                        for name in set(cached["files"]).difference(files):
+                            if self.matches(name):
+                                activities.append(self.deleted_activity(os.path.join(path, name)))
+                directories[path] = {
+                    "mtime_ns": dir_stat.st_mtime_ns if dir_stat.st_mtime_ns < scan_start_ns - self.RACY_MTIME_NS else -1,
+                    "ino": dir_stat.st_ino,
+                    "files": files,
+                    "dirs": dirs,
+                }
+                stack.extend(os.path.join(path, name) for name in dirs)
+                if unchanged and self.prune_unchanged_dirs:
+                    continue
+                candidates = [os.path.join(path, name) for name in files if self.matches(name)]
+                if candidates:
+                    futures.append(pool.submit(self.stat_files, candidates))
+            for future in futures:
+                for file_path, file_stat in future.result():
+                    if file_stat is None:
+                        continue  # vanished during the scan; the next scan reports it
+                    if last_run is None or file_stat.st_mtime >= last_run:
+                        activities.append(
+                            {
+                                "file_path": file_path,
+                                "modified_time": datetime.fromtimestamp(file_stat.st_mtime, UTC).isoformat(),
+                                "size_bytes": file_stat.st_size,
+                                "event": "modified" if file_path in known_files else "created",
+                            },
+                        )
+        # directories that are gone take their files with them
+        for path in previous.keys() - directories.keys():
+            activities.extend(
+                self.deleted_activity(os.path.join(path, name)) for name in previous[path]["files"] if self.matches(name)
+            )
+        self.directories = directories
         return activities
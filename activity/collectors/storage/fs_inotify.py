@@ -0,0 +1,396 @@
+"""
+Event-driven Linux backend for the incremental file system collector.
+
+Rather than walking every volume on each run, this watches the trees with
+inotify and turns the kernel's events into the same activity records that
+FsIncrementalCollector produces (plus an "event" field, and "old_path" for
+renames).  Bursts of events for the same path are coalesced before they are
+handed to a recorder.  If the kernel's event queue overflows, events have
+been lost, so the watcher falls back to a rescan with the collector.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import fnmatch
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime
+from typing import Any
+
+from activity.collectors.storage.fs_incremental import FsIncrementalCollector
+
+
+# From <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+CREATED = "created"
+MODIFIED = "modified"
+DELETED = "deleted"
+RENAMED = "renamed"
+
+
+class FsInotifyWatcher:
+    """Watch directory trees with inotify and emit coalesced file activities."""
+
+    def __init__(
+        self,
+        volumes: list[str],
+        collector: FsIncrementalCollector | None = None,
+        patterns: list[str] | None = None,
+        coalesce_window: float = 0.5,
+        max_delay: float = 5.0,
+    ) -> None:
+        """
+        Set up the watcher.
+
+        coalesce_window is how long the tree must be quiet before pending
+        events are emitted; max_delay bounds how long an event can be held
+        back while the tree stays busy.  The collector, if given, is used to
+        catch up on changes made before the watch started and after a queue
+        overflow, and its state file is kept current as events are emitted.
+        """
+        if not self.is_supported():
+            raise OSError("inotify is not available on this platform")
+        self.volumes = [os.path.abspath(volume) for volume in volumes]
+        self.collector = collector
+        if patterns is None:
+            patterns = collector.patterns if collector is not None else ["*"]
+        self.patterns = patterns
+        self.coalesce_window = coalesce_window
+        self.max_delay = max_delay
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self._paths: dict[int, str] = {}  # watch descriptor -> directory
+        self._watches: dict[str, int] = {}  # directory -> watch descriptor
+        self._pending: dict[str, tuple[str, str | None]] = {}  # path -> (event, old path)
+        self._moves: dict[int, tuple[str, bool]] = {}  # cookie -> (old path, is directory)
+        self._first_pending = None
+        self._batch_start = None
+        self.overflow_count = 0
+        self.unwatched_count = 0
+        self._logger = logging.getLogger("FsInotifyWatcher")
+
+    @staticmethod
+    def is_supported() -> bool:
+        """Return True if inotify can be used here."""
+        if not sys.platform.startswith("linux"):
+            return False
+        library = ctypes.util.find_library("c")
+        if library is None:
+            return False
+        return hasattr(ctypes.CDLL(library), "inotify_init1")
+
+    def matches(self, path: str) -> bool:
+        """Return True if the file name matches the collector's patterns."""
+        name = os.path.basename(path)
+        return any(fnmatch.fnmatch(name, pattern) for pattern in self.patterns)
+
+    def add_watch(self, directory: str) -> None:
+        """Watch a single directory."""
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error == errno.ENOSPC:
+                self._logger.warning(
+                    "Out of inotify watches (see fs.inotify.max_user_watches), not watching %s",
+                    directory,
+                )
+            elif error not in (errno.ENOENT, errno.ENOTDIR):
+                self._logger.warning("Unable to watch %s: %s", directory, os.strerror(error))
+            self.unwatched_count += 1
+            return
+        old_path = self._paths.get(wd)
+        if old_path is not None and old_path != directory:
+            self._watches.pop(old_path, None)
+        self._paths[wd] = directory
+        self._watches[directory] = wd
+
+    def add_tree(self, root: str, created: bool = False) -> None:
+        """
+        Watch a directory tree.  When created is True the tree appeared
+        after the watch started, so any files already in it are reported
+        as created (they may have been written before the watch was added).
+        """
+        self.add_watch(root)
+        for path, dirs, files in os.walk(root):
+            for name in dirs:
+                self.add_watch(os.path.join(path, name))
+            if created:
+                for name in files:
+                    self.record(os.path.join(path, name), CREATED)
+
+    def start(self) -> None:
+        """Watch all of the volumes."""
+        for volume in self.volumes:
+            self.add_tree(volume)
+
+    def rename_tree(self, old_root: str, new_root: str) -> None:
+        """Update the watched paths for a directory that was renamed in place."""
+        prefix = old_root + os.sep
+        for wd, path in list(self._paths.items()):
+            if path == old_root or path.startswith(prefix):
+                new_path = new_root + path[len(old_root) :]
+                self._paths[wd] = new_path
+                self._watches.pop(path, None)
+                self._watches[new_path] = wd
+
+    def forget_tree(self, root: str) -> None:
+        """Stop tracking the watches for a directory tree that has gone away."""
+        prefix = root + os.sep
+        for path in [path for path in self._watches if path == root or path.startswith(prefix)]:
+            wd = self._watches.pop(path)
+            self._paths.pop(wd, None)
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def record(self, path: str, event: str, old_path: str | None = None) -> None:
+        """Add an event for a path, coalescing it with any pending event."""
+        if not self.matches(path):
+            return
+        now = time.monotonic()
+        if self._first_pending is None:
+            self._first_pending = now
+            self._batch_start = datetime.now(UTC)
+        previous = self._pending.get(path)
+        previous_event = previous[0] if previous is not None else None
+        if event == CREATED:
+            if previous_event == DELETED:
+                event = MODIFIED  # replaced
+        elif event == MODIFIED:
+            if previous_event in (CREATED, RENAMED):
+                event, old_path = previous
+        elif event == DELETED:
+            if previous_event == CREATED:
+                del self._pending[path]  # came and went
+                return
+        elif event == RENAMED:
+            source = self._pending.pop(old_path, None)
+            if source is not None and source[0] == CREATED:
+                event, old_path = CREATED, None
+            elif source is not None and source[0] == RENAMED:
+                old_path = source[1]
+        self._pending[path] = (event, old_path)
+
+    def moved_out(self, path: str, is_dir: bool) -> None:
+        """Handle the source of a move whose destination was never seen."""
+        if is_dir:
+            self.forget_tree(path)
+            if self.matches(path):
+                self._pending[path] = (DELETED, None)
+        else:
+            self.record(path, DELETED)
+
+    def moved_in(self, old_path: str | None, path: str, is_dir: bool) -> None:
+        """Handle the destination of a move (old_path is None if from outside)."""
+        if not is_dir:
+            if old_path is None:
+                self.record(path, CREATED)
+            else:
+                self.record(path, RENAMED, old_path)
+            return
+        if old_path is None:
+            self.add_tree(path, created=True)
+            return
+        self.rename_tree(old_path, path)
+        for directory, _, files in os.walk(path):
+            old_directory = old_path + directory[len(path) :]
+            for name in files:
+                self.record(os.path.join(directory, name), RENAMED, os.path.join(old_directory, name))
+
+    def handle_event(self, wd: int, mask: int, cookie: int, name: str) -> None:
+        """Translate one inotify event into pending activity."""
+        directory = self._paths.get(wd)
+        if mask & IN_IGNORED:
+            if directory is not None:
+                self._paths.pop(wd, None)
+                if self._watches.get(directory) == wd:
+                    del self._watches[directory]
+            return
+        if directory is None or not name:
+            return  # events on the watched directory itself are seen by its parent
+        path = os.path.join(directory, name)
+        is_dir = bool(mask & IN_ISDIR)
+        if mask & IN_MOVED_FROM:
+            self._moves[cookie] = (path, is_dir)
+        elif mask & IN_MOVED_TO:
+            old = self._moves.pop(cookie, None)
+            self.moved_in(old[0] if old is not None else None, path, is_dir)
+        elif is_dir:
+            if mask & IN_CREATE:
+                self.add_tree(path, created=True)
+        elif mask & IN_CREATE:
+            self.record(path, CREATED)
+        elif mask & IN_DELETE:
+            self.record(path, DELETED)
+        elif mask & (IN_MODIFY | IN_CLOSE_WRITE | IN_ATTRIB):
+            self.record(path, MODIFIED)
+
+    def read_events(self) -> bool:
+        """Read and handle the queued events.  Returns False on queue overflow."""
+        while True:
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return True
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, cookie, length = EVENT_HEADER.unpack_from(buffer, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(buffer[offset : offset + length].rstrip(b"\0"))
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    return False
+                self.handle_event(wd, mask, cookie, name)
+
+    def flush(self) -> list[dict[str, Any]]:
+        """Turn the pending events into activity records."""
+        for path, is_dir in self._moves.values():
+            self.moved_out(path, is_dir)
+        self._moves = {}
+        activities = []
+        now = datetime.now(UTC).isoformat()
+        for path, (event, old_path) in self._pending.items():
+            activity = {"file_path": path, "event": event}
+            if old_path is not None:
+                activity["old_path"] = old_path
+            if event == DELETED:
+                activity["modified_time"] = now
+                activity["size_bytes"] = None
+            else:
+                try:
+                    stat_data = os.stat(path)
+                except OSError:
+                    continue  # gone again; the delete event will follow
+                activity["modified_time"] = datetime.fromtimestamp(stat_data.st_mtime, UTC).isoformat()
+                activity["size_bytes"] = stat_data.st_size
+            activities.append(activity)
+        self._pending = {}
+        self._first_pending = None
+        return activities
+
+    def rescan(self) -> list[dict[str, Any]]:
+        """Recover from lost events: re-establish the watches and rescan."""
+        self.overflow_count += 1
+        self._logger.warning("inotify queue overflow, rescanning %s", self.volumes)
+        self._pending = {}
+        self._moves = {}
+        self._first_pending = None
+        self.start()
+        return self.collect()
+
+    def collect(self) -> list[dict[str, Any]]:
+        """Scan for changes with the collector (if there is one)."""
+        if self.collector is None:
+            return []
+        activities = self.collector.collect_activities()
+        for activity in activities:
+            activity.setdefault("event", MODIFIED)
+        return activities
+
+    def save_state(self) -> None:
+        """Record that everything before the current batch has been emitted."""
+        if self.collector is not None and self._batch_start is not None:
+            self.collector.save_state(self._batch_start)
+        self._batch_start = None
+
+    def batches(self, stop: threading.Event | None = None) -> Iterator[list[dict[str, Any]]]:
+        """
+        Yield batches of activities until stop is set.  A catch-up rescan is
+        done first (if there is a collector) so that nothing that changed
+        while the watcher was not running is missed.
+        """
+        self.start()
+        activities = self.collect()
+        if activities:
+            yield activities
+        poller = select.poll()
+        poller.register(self._fd, select.POLLIN)
+        last_event = time.monotonic()
+        while stop is None or not stop.is_set():
+            if poller.poll(int(self.coalesce_window * 1000)):
+                if not self.read_events():
+                    activities = self.rescan()
+                    if activities:
+                        yield activities
+                    continue
+                last_event = time.monotonic()
+            if self._first_pending is None and not self._moves:
+                continue
+            now = time.monotonic()
+            if now - last_event >= self.coalesce_window or (
+                self._first_pending is not None and now - self._first_pending >= self.max_delay
+            ):
+                activities = self.flush()
+                if activities:
+                    yield activities
+                self.save_state()
+
+    def run(
+        self,
+        store: Callable[[list[dict[str, Any]]], Any],
+        stop: threading.Event | None = None,
+    ) -> None:
+        """Feed batches to a recorder's store_activities until stop is set."""
+        for activities in self.batches(stop):
+            store(activities)
+
+    def close(self) -> None:
+        """Release the inotify instance."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
@@ -0,0 +1,173 @@
+"""
+This module provides the bounded entity cache used by the NTFS recorders.
+
+The hot tier recorder maps USN journal events (volume + FRN, or volume +
+path) to entity UUIDs far more often than that mapping changes.  Only the
+mapping is cached: entity documents are updated on every activity, so a
+cached copy would go stale.  An unbounded dictionary grows for
+the lifetime of a long-running collector and is lost on restart, after which
+every lookup falls through to the database (for the hot tier, to the slow
+LocalPath fallback query).  NtfsEntityCache holds at most max_entries items,
+evicting the least recently used one, counts hits, misses and evictions, and
+can be snapshotted to a JSON file so that the next run starts warm.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import uuid
+
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+
+class NtfsEntityCache:
+    """A size-bounded LRU cache with hit/miss metrics and an optional snapshot file."""
+
+    DEFAULT_MAX_ENTRIES = 100_000
+    SNAPSHOT_VERSION = 1
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        snapshot_file: str | None = None,
+        encode: Callable[[Any], Any] = str,
+        decode: Callable[[Any], Any] = uuid.UUID,
+        save_on_exit: bool = True,
+    ) -> None:
+        """
+        Create the cache, warming it from snapshot_file if that exists.
+
+        Values are entity UUIDs by default; encode and decode convert them to
+        and from JSON for the snapshot.  If save_on_exit is set, the snapshot
+        is written when the interpreter shuts down.
+        """
+        self.max_entries = max(1, max_entries)
+        self.snapshot_file = snapshot_file
+        self._encode = encode
+        self._decode = decode
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if snapshot_file:
+            self.load()
+            if save_on_exit:
+                atexit.register(self.save)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        """Membership test; this neither counts as a hit nor refreshes the entry."""
+        return key in self._entries
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value (marking it most recently used), or default."""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+    def put(self, key: str, value: Any) -> None:
+        """Add or replace an entry, evicting the least recently used ones if full."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, key: str) -> None:
+        """Remove an entry, if it is present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry.  The metrics are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return the size, the hit/miss/eviction counts and the hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def save(self, snapshot_file: str | None = None) -> bool:
+        """
+        Write the entries, least recently used first, to the snapshot file.
+
+        The file is replaced atomically, so an interrupted save leaves the
+        previous snapshot intact.  Returns True if a snapshot was written.
+        """
+        snapshot_file = snapshot_file or self.snapshot_file
+        if not snapshot_file:
+            return False
+        with self._lock:
+            entries = [[key, self._encode(value)] for key, value in self._entries.items()]
+        temp_file = f"{snapshot_file}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(snapshot_file)), exist_ok=True)
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump({"version": self.SNAPSHOT_VERSION, "entries": entries}, f)
+            os.replace(temp_file, snapshot_file)
+        except OSError as e:
+            logging.warning("Could not save entity cache snapshot %s: %s", snapshot_file, e)
+            return False
+        logging.debug("Saved %d entity cache entries to %s", len(entries), snapshot_file)
+        return True
+
+    def load(self, snapshot_file: str | None = None) -> int:
+        """
+        Warm the cache from a snapshot file, returning the number of entries
+        loaded.  A missing, unreadable or incompatible snapshot is ignored.
+        If the snapshot is larger than the cache, its most recently used
+        entries are kept.
+        """
+        snapshot_file = snapshot_file or self.snapshot_file
+        if not snapshot_file or not os.path.exists(snapshot_file):
+            return 0
+        try:
+            with open(snapshot_file, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            if snapshot.get("version") != self.SNAPSHOT_VERSION:
+                logging.warning("Ignoring entity cache snapshot %s: unknown version", snapshot_file)
+                return 0
+            entries = [(key, self._decode(value)) for key, value in snapshot["entries"][-self.max_entries :]]
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logging.warning("Ignoring entity cache snapshot %s: %s", snapshot_file, e)
+            return 0
+        for key, value in entries:
+            self.put(key, value)
+        logging.info("Loaded %d entity cache entries from %s", len(entries), snapshot_file)
+        return len(entries)
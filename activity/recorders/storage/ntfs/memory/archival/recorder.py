@@ -112,6 +112,9 @@ class NtfsArchivalMemoryRecorder(StorageActivityRecorder):
             db_config_path: Path to database configuration
             debug: Whether to enable debug logging
             no_db: Whether to run without database connection
+            batch_consolidation: Whether consolidation processes each batch of
+                entities with a few bulk queries rather than several queries per
+                entity (default: True)
         """
         # Configure logging first
         logging.basicConfig(
@@ -140,6 +143,7 @@ class NtfsArchivalMemoryRecorder(StorageActivityRecorder):
             "knowledge_graph_collection_name",
             self.KNOWLEDGE_GRAPH_COLLECTION_NAME,
         )
+        self._batch_consolidation = kwargs.get("batch_consolidation", True)
 
         # Set recorder-specific defaults
         kwargs["name"] = kwargs.get("name", "NTFS Archival Memory Recorder")
@@ -379,6 +383,16 @@ class NtfsArchivalMemoryRecorder(StorageActivityRecorder):
                 unique=False,
             )
 
+            # Array indices on W5H concepts for knowledge graph construction
+            self._collection.add_hash_index(
+                fields=["Record.Data.w5h_concepts.what[*]"],
+                unique=False,
+            )
+            self._collection.add_hash_index(
+                fields=["Record.Data.w5h_concepts.why[*]"],
+                unique=False,
+            )
+
             # Set up indices for knowledge graph collection (if it exists)
             if self._db.collection_exists(self._knowledge_graph_collection_name):
                 knowledge_graph_collection = self._db.get_collection(
@@ -503,6 +517,48 @@ class NtfsArchivalMemoryRecorder(StorageActivityRecorder):
             self._logger.exception(f"Error getting entity from long-term memory: {e}")
             return {}
 
+    def _get_entities_from_entity_collection(self, entity_ids: list[str]) -> dict[str, dict]:
+        """
+        Get entity information for a batch of entities from the entity collection.
+
+        The entities are fetched with a single query.
+
+        Args:
+            entity_ids: Entity keys to look up
+
+        Returns:
+            Entity information keyed by entity key (entities not found are omitted)
+
+        Raises:
+            Query errors are not caught, so that the caller can tell an entity
+            that does not exist from one that could not be read
+        """
+        if not hasattr(self, "_db") or self._db is None:
+            return {}
+
+        entities = {}
+        if not entity_ids:
+            return entities
+
+        query = """
+            FOR doc IN @@entity_collection
+            FILTER doc._key IN @entity_ids
+            RETURN doc
+        """
+
+        cursor = self._db._arangodb.aql.execute(
+            query,
+            bind_vars={
+                "@entity_collection": self._entity_collection_name,
+                "entity_ids": list(dict.fromkeys(str(entity_id) for entity_id in entity_ids)),
+            },
+        )
+
+        for doc in cursor:
+            entities[doc["_key"]] = doc
+
+        return entities
+
     def _enhance_ontology(self, w5h_concepts: dict[str, list[str]]) -> dict:
         """
         Enhance the W5H concepts into a more structured ontology.
@@ -752,24 +808,14 @@ class NtfsArchivalMemoryRecorder(StorageActivityRecorder):
                 if not related_id:
                     continue
 
-                # Calculate semantic similarity
-                intersection_count = related_entity.get("intersection_count", 0)
-                similarity = min(1.0, intersection_count / 10)
-
                 # Create relationship
-                relationship = {
-                    "_from": f"{self._collection_name}/{entity_id}",
-                    "_to": f"{self._collection_name}/{related_id}",
-                    "type": "semantically_related",
-                    "semantic_type": "shared_concepts",
-                    "strength": similarity,
-                    "created_at": datetime.now(UTC).isoformat(),
-                    "common_concepts": intersection_count,
-                    "description": f"Entities share {intersection_count} common concepts",
-                }
-
-                # Add to relationships
-                relationships.append(relationship)
+                relationships.append(
+                    self._semantic_relationship(
+                        entity_id,
+                        related_id,
+                        related_entity.get("intersection_count", 0),
+                    ),
+                )
 
             # Find project-related entities
             project_indicators = [c for c in w5h_concepts.get("why", []) if c.startswith("project:")]
@@ -811,18 +857,7 @@ class NtfsArchivalMemoryRecorder(StorageActivityRecorder):
                         continue
 
                     # Create relationship
-                    relationship = {
-                        "_from": f"{self._collection_name}/{entity_id}",
-                        "_to": f"{self._collection_name}/{related_id}",
-                        "type": "project_related",
-                        "semantic_type": "same_project",
-                        "strength": 0.9,
-                        "created_at": datetime.now(UTC).isoformat(),
-                        "description": "Entities belong to the same project",
-                    }
-
-                    # Add to relationships
-                    relationships.append(relationship)
+                    relationships.append(self._project_relationship(entity_id, related_id))
 
             return relationships
 
@@ -830,6 +865,146 @@ class NtfsArchivalMemoryRecorder(StorageActivityRecorder):
             self._logger.exception(f"Error building knowledge graph relationships: {e}")
             return relationships
 
+    def _semantic_relationship(
+        self,
+        entity_id: uuid.UUID | str,
+        related_id: str,
+        intersection_count: int,
+    ) -> dict:
+        """Create a relationship between two entities that share W5H "what" concepts."""
+        return {
+            "_from": f"{self._collection_name}/{entity_id}",
+            "_to": f"{self._collection_name}/{related_id}",
+            "type": "semantically_related",
+            "semantic_type": "shared_concepts",
+            "strength": min(1.0, intersection_count / 10),
+            "created_at": datetime.now(UTC).isoformat(),
+            "common_concepts": intersection_count,
+            "description": f"Entities share {intersection_count} common concepts",
+        }
+
+    def _project_relationship(self, entity_id: uuid.UUID | str, related_id: str) -> dict:
+        """Create a relationship between two entities that belong to the same project."""
+        return {
+            "_from": f"{self._collection_name}/{entity_id}",
+            "_to": f"{self._collection_name}/{related_id}",
+            "type": "project_related",
+            "semantic_type": "same_project",
+            "strength": 0.9,
+            "created_at": datetime.now(UTC).isoformat(),
+            "description": "Entities belong to the same project",
+        }
+
+    def _build_knowledge_graph_relationships_batch(
+        self,
+        entities: dict[str, dict],
+    ) -> dict[str, list[dict]]:
+        """
+        Build knowledge graph relationships for a batch of entities.
+
+        This produces the same relationships as _build_knowledge_graph_relationships
+        called for each entity in turn, right after it is stored: an entity is
+        related to the archived entities outside the batch and to those before
+        it in the batch, but not to those after it, so no pair of entities is
+        related in both directions.  All the entities are matched in one query,
+        with a bounded subquery per entity rather than two queries per entity.
+        The subqueries look up each of the entity's concepts in the array
+        indices on w5h_concepts.what and w5h_concepts.why (see _setup_indices),
+        so they only visit the archived entities that share a concept.
+
+        Args:
+            entities: Entity data from long-term memory, keyed by entity key, in
+                the order they were stored
+
+        Returns:
+            Lists of knowledge graph relationship dictionaries, keyed by entity key
+        """
+        relationships = {entity_id: [] for entity_id in entities}
+
+        if not hasattr(self, "_db") or self._db is None:
+            return relationships
+
+        batch = []
+        for entity_id, entity_data in entities.items():
+            data = entity_data.get("Record", {}).get("Data", {})
+            file_path = data.get("file_path", "")
+            if not file_path or not os.path.dirname(file_path):
+                continue
+            w5h_concepts = data.get("w5h_concepts", {})
+            batch.append(
+                {
+                    "key": entity_id,
+                    "what": list(dict.fromkeys(w5h_concepts.get("what", []))),
+                    "projects": list(dict.fromkeys(c for c in w5h_concepts.get("why", []) if c.startswith("project:"))),
+                },
+            )
+
+        if not batch:
+            return relationships
+
+        # Position of each entity in the batch; an entity only relates to those before it
+        positions = {entity_id: position for position, entity_id in enumerate(entities)}
+
+        try:
+            query = """
+                FOR entity IN @entities
+                LET position = @positions[entity.key]
+                LET related = (
+                    FOR concept IN entity.what
+                    FOR doc IN @@collection
+                    FILTER concept IN doc.Record.Data.w5h_concepts.what[*]
+                    FILTER doc._key != entity.key
+                    FILTER NOT HAS(@positions, doc._key) OR @positions[doc._key] < position
+                    COLLECT key = doc._key WITH COUNT INTO intersection
+                    SORT intersection DESC
+                    LIMIT 10
+                    RETURN {
+                        "_key": key,
+                        "intersection_count": intersection
+                    }
+                )
+                LET projects = (
+                    FOR concept IN entity.projects
+                    FOR doc IN @@collection
+                    FILTER concept IN doc.Record.Data.w5h_concepts.why[*]
+                    FILTER doc._key != entity.key
+                    FILTER NOT HAS(@positions, doc._key) OR @positions[doc._key] < position
+                    COLLECT key = doc._key WITH COUNT INTO project_matches
+                    SORT project_matches DESC
+                    LIMIT 10
+                    RETURN {
+                        "_key": key,
+                        "project_matches": project_matches
+                    }
+                )
+                RETURN {
+                    "entity_id": entity.key,
+                    "related": related,
+                    "projects": projects
+                }
+            """
+
+            cursor = self._db._arangodb.aql.execute(
+                query,
+                bind_vars={
+                    "@collection": self._collection_name,
+                    "entities": batch,
+                    "positions": positions,
+                },
+            )
+
+            for result in cursor:
+                entity_id = result["entity_id"]
+                relationships[entity_id] = [
+                    self._semantic_relationship(entity_id, match["_key"], match["intersection_count"])
+                    for match in result["related"]
+                ] + [self._project_relationship(entity_id, match["_key"]) for match in result["projects"]]
+
+        except Exception as e:
+            self._logger.exception(f"Error building knowledge graph relationships: {e}")
+
+        return relationships
+
     def _build_archival_memory_document(
         self,
         entity_id: uuid.UUID,
@@ -1089,17 +1264,32 @@ class NtfsArchivalMemoryRecorder(StorageActivityRecorder):
         min_age_days: int = 90,
         min_importance: float = 0.0,
         entity_limit: int = 100,
-    ) -> dict[str, int]:
+        since: str | None = None,
+        since_key: str | None = None,
+        batched: bool | None = None,
+    ) -> dict[str, Any]:
         """
         Consolidate entities from long-term memory into archival memory.
 
+        Entities are taken in (last_updated, _key) order, starting after the
+        watermark (since, since_key) when one is given, so that repeated calls
+        only consider entities added or changed since the previous one.
+        last_updated is the time the long-term record last changed (see
+        _watermark_position); an entity skipped because it was not yet
+        eligible or important enough is considered again once it changes.
+
         Args:
             min_age_days: Minimum age in days for entities to consolidate
             min_importance: Minimum importance score for entities to consolidate
             entity_limit: Maximum number of entities to process
+            since: Update time of the last entity already considered
+            since_key: Key of the last entity already considered
+            batched: Whether to consolidate the entities as one batch
+                (default: the recorder's batch_consolidation setting)
 
         Returns:
-            Dictionary with consolidation statistics
+            Dictionary with consolidation statistics; "watermark" holds the
+            position to resume from (absent if no entity was considered)
         """
         if not hasattr(self, "_db") or self._db is None:
             return {"error": "Not connected to database"}
@@ -1129,6 +1319,8 @@ class NtfsArchivalMemoryRecorder(StorageActivityRecorder):
                     min_importance=self._importance_threshold,
                     min_age_days=min_age_days,
                     limit=entity_limit,
+                    since=since,
+                    since_key=since_key,
                 )
                 stats["entities_found"] = len(eligible_entities)
             except Exception as e:
@@ -1140,11 +1332,17 @@ class NtfsArchivalMemoryRecorder(StorageActivityRecorder):
 
                 query = """
                     FOR doc IN @@long_term_collection
+                    LET updated = doc.Record.Data.last_updated
+                        || doc.Record.Data.consolidation_date
+                        || doc.Record.Data.timestamp
+                    FILTER @since == null
+                        OR updated > @since
+                        OR (updated == @since AND doc._key > @since_key)
                     FILTER doc.Record.Data.importance_score >= @min_importance
                     FILTER doc.Record.Data.consolidation_date <= @min_date
                     FILTER doc.Record.Data.archival_eligible == true
                     FILTER doc.Record.Data.consolidated_to_archival != true
-                    SORT doc.Record.Data.importance_score DESC
+                    SORT updated ASC, doc._key ASC
                     LIMIT @entity_limit
                     RETURN doc
                 """
@@ -1155,6 +1353,8 @@ class NtfsArchivalMemoryRecorder(StorageActivityRecorder):
                         "@long_term_collection": self._long_term_collection_name,
                         "min_importance": min_importance,
                         "min_date": min_date,
+                        "since": since,
+                        "since_key": since_key or "",
                         "entity_limit": entity_limit,
                     },
                 )
@@ -1162,90 +1362,279 @@ class NtfsArchivalMemoryRecorder(StorageActivityRecorder):
                 eligible_entities = list(cursor)
                 stats["entities_found"] = len(eligible_entities)
 
-            # Process each eligible entity
-            for long_term_entity in eligible_entities:
-                entity_id = long_term_entity.get("_key")
+            # Process the eligible entities
+            if self._batch_consolidation if batched is None else batched:
+                watermark = self._consolidate_entities_batch(eligible_entities, stats)
+            else:
+                watermark = self._consolidate_entities(eligible_entities, stats)
+
+            if watermark is not None:
+                stats["watermark"] = watermark
+
+            self._logger.info(
+                f"Consolidation complete: {stats['entities_consolidated']} entities consolidated",
+            )
+
+            return stats
+
+        except Exception as e:
+            self._logger.exception(f"Error consolidating from long-term memory: {e}")
+            return {"error": str(e)}
 
-                if not entity_id:
+    def _consolidate_entities(
+        self,
+        eligible_entities: list[dict],
+        stats: dict[str, Any],
+    ) -> dict[str, str] | None:
+        """
+        Consolidate eligible long-term memory entities one at a time.
+
+        The watermark advances past each entity considered, up to the first
+        one that fails, so that the failed entity is retried by the next call.
+
+        Args:
+            eligible_entities: Entities from long-term memory, in watermark order
+            stats: Consolidation statistics, updated in place
+
+        Returns:
+            The watermark to resume from, or None if no entity was considered
+        """
+        watermark = None
+        watermark_blocked = False
+        for long_term_entity in eligible_entities:
+            entity_id = long_term_entity.get("_key")
+
+            if not entity_id:
+                continue
+
+            stats["entities_processed"] += 1
+            errors_before = stats["errors"]
+
+            try:
+                # Skip if already in archival memory
+                if self._is_in_archival_memory(uuid.UUID(entity_id)):
+                    stats["already_in_archival"] += 1
+
+                    # Update the long-term memory record to indicate it's been consolidated
+                    self._mark_consolidated_in_long_term(uuid.UUID(entity_id))
                     continue
 
-                stats["entities_processed"] += 1
+                # Get entity information from entity collection
+                entity_data = self._get_entity_from_entity_collection(
+                    uuid.UUID(entity_id),
+                )
+                if not entity_data:
+                    continue
 
-                try:
-                    # Skip if already in archival memory
-                    if self._is_in_archival_memory(uuid.UUID(entity_id)):
-                        stats["already_in_archival"] += 1
+                # Check if entity meets importance threshold for archival memory
+                importance_score = long_term_entity.get("Record", {}).get("Data", {}).get("importance_score", 0.0)
+                if importance_score < self._importance_threshold:
+                    stats["below_threshold"] += 1
+                    continue
 
-                        # Update the long-term memory record to indicate it's been consolidated
-                        self._mark_consolidated_in_long_term(uuid.UUID(entity_id))
-                        continue
+                # Build archival memory document
+                document = self._build_archival_memory_document(
+                    uuid.UUID(entity_id),
+                    entity_data,
+                    long_term_entity,
+                )
 
-                    # Get entity information from entity collection
-                    entity_data = self._get_entity_from_entity_collection(
-                        uuid.UUID(entity_id),
+                # Insert into archival memory collection
+                self._collection.insert(document)
+
+                # Create knowledge graph relationships
+                relationships = self._build_knowledge_graph_relationships(
+                    uuid.UUID(entity_id),
+                    long_term_entity,
+                )
+
+                # Store relationships
+                if relationships:
+                    knowledge_graph_collection = self._db.get_collection(
+                        self._knowledge_graph_collection_name,
                     )
-                    if not entity_data:
-                        continue
 
-                    # Check if entity meets importance threshold for archival memory
-                    importance_score = long_term_entity.get("Record", {}).get("Data", {}).get("importance_score", 0.0)
-                    if importance_score < self._importance_threshold:
-                        stats["below_threshold"] += 1
-                        continue
+                    for relationship in relationships:
+                        try:
+                            knowledge_graph_collection.insert(relationship)
+                        except Exception as e:
+                            self._logger.exception(f"Error storing relationship: {e}")
 
-                    # Build archival memory document
-                    document = self._build_archival_memory_document(
+                    # Update relationship count in entity document
+                    self._update_knowledge_graph_metadata(
                         uuid.UUID(entity_id),
-                        entity_data,
-                        long_term_entity,
+                        len(relationships),
+                        relationships,
                     )
 
-                    # Insert into archival memory collection
-                    self._collection.insert(document)
+                # Mark as consolidated in long-term memory
+                self._mark_consolidated_in_long_term(uuid.UUID(entity_id))
+
+                stats["entities_consolidated"] += 1
+
+            except Exception as e:
+                self._logger.exception(f"Error consolidating entity {entity_id}: {e}")
+                stats["errors"] += 1
+
+            finally:
+                if stats["errors"] > errors_before:
+                    watermark_blocked = True
+                elif not watermark_blocked:
+                    watermark = self._watermark_position(long_term_entity)
+
+        return watermark
 
-                    # Create knowledge graph relationships
-                    relationships = self._build_knowledge_graph_relationships(
+    def _consolidate_entities_batch(
+        self,
+        eligible_entities: list[dict],
+        stats: dict[str, Any],
+    ) -> dict[str, str] | None:
+        """
+        Consolidate eligible long-term memory entities as one batch.
+
+        Instead of several queries per entity, the batch costs one query to
+        find the entities already in archival memory, one to fetch the entity
+        documents, one insert_many for the archival documents, one query to
+        find related entities, one insert_many for the knowledge graph edges,
+        and one update each for the knowledge graph metadata and the
+        long-term memory consolidation flags.
+
+        The watermark advances past each entity considered, up to the first
+        one that fails, so that the failed entity is retried by the next call.
+
+        Args:
+            eligible_entities: Entities from long-term memory, in watermark order
+            stats: Consolidation statistics, updated in place
+
+        Returns:
+            The watermark to resume from, or None if no entity was considered
+        """
+        long_term_entities = {}
+        for long_term_entity in eligible_entities:
+            entity_id = long_term_entity.get("_key")
+            if not entity_id:
+                continue
+            stats["entities_processed"] += 1
+            long_term_entities[entity_id] = long_term_entity
+
+        entity_ids = list(long_term_entities)
+        if not entity_ids:
+            return None
+
+        # Skip entities already in archival memory
+        archived = self._get_archival_memory_keys(entity_ids)
+        stats["already_in_archival"] += len(archived)
+
+        # Get entity information from entity collection; if that fails, the
+        # entities are failed rather than not found, so the watermark stops
+        failed = set()
+        unarchived = [entity_id for entity_id in entity_ids if entity_id not in archived]
+        try:
+            entities = self._get_entities_from_entity_collection(unarchived)
+        except Exception as e:
+            self._logger.exception(f"Error getting entities from entity collection: {e}")
+            entities = {}
+            failed.update(unarchived)
+
+        # Build archival memory documents
+        documents = []
+        for entity_id in entity_ids:
+            if entity_id in archived or entity_id not in entities:
+                continue
+
+            # Check if entity meets importance threshold for archival memory
+            long_term_entity = long_term_entities[entity_id]
+            importance_score = long_term_entity.get("Record", {}).get("Data", {}).get("importance_score", 0.0)
+            if importance_score < self._importance_threshold:
+                stats["below_threshold"] += 1
+                continue
+
+            try:
+                documents.append(
+                    self._build_archival_memory_document(
                         uuid.UUID(entity_id),
+                        entities[entity_id],
                         long_term_entity,
-                    )
+                    ),
+                )
+            except Exception as e:
+                self._logger.exception(f"Error consolidating entity {entity_id}: {e}")
+                failed.add(entity_id)
 
-                    # Store relationships
-                    if relationships:
-                        knowledge_graph_collection = self._db.get_collection(
-                            self._knowledge_graph_collection_name,
-                        )
+        # Insert into archival memory collection
+        inserted = []
+        if documents:
+            try:
+                results = self._collection.insert_many(documents)
+            except Exception as e:
+                self._logger.exception(f"Error storing archival memory documents: {e}")
+                results = [e] * len(documents)
+            for document, result in zip(documents, results, strict=False):
+                if isinstance(result, Exception):
+                    self._logger.error(f"Error consolidating entity {document['_key']}: {result}")
+                    failed.add(document["_key"])
+                else:
+                    inserted.append(document["_key"])
+
+        # Create and store knowledge graph relationships
+        relationships = self._build_knowledge_graph_relationships_batch(
+            {entity_id: long_term_entities[entity_id] for entity_id in inserted},
+        )
+        relationships = {entity_id: edges for entity_id, edges in relationships.items() if edges}
+        if relationships:
+            knowledge_graph_collection = self._db.get_collection(
+                self._knowledge_graph_collection_name,
+            )
+            try:
+                results = knowledge_graph_collection.insert_many(
+                    [edge for edges in relationships.values() for edge in edges],
+                )
+                for result in results:
+                    if isinstance(result, Exception):
+                        self._logger.error(f"Error storing relationship: {result}")
+            except Exception as e:
+                self._logger.exception(f"Error storing relationships: {e}")
 
-                        for relationship in relationships:
-                            try:
-                                knowledge_graph_collection.insert(relationship)
-                            except Exception as e:
-                                self._logger.exception(f"Error storing relationship: {e}")
-
-                        # Update relationship count in entity document
-                        self._update_knowledge_graph_metadata(
-                            uuid.UUID(entity_id),
-                            len(relationships),
-                            relationships,
-                        )
+            # Update relationship counts in entity documents
+            self._update_knowledge_graph_metadata_batch(relationships)
 
-                    # Mark as consolidated in long-term memory
-                    self._mark_consolidated_in_long_term(uuid.UUID(entity_id))
+        # Mark as consolidated in long-term memory
+        self._mark_consolidated_in_long_term_batch(
+            [entity_id for entity_id in entity_ids if entity_id in archived] + inserted,
+        )
 
-                    stats["entities_consolidated"] += 1
+        stats["entities_consolidated"] += len(inserted)
+        stats["errors"] += len(failed)
 
-                except Exception as e:
-                    self._logger.exception(f"Error consolidating entity {entity_id}: {e}")
-                    stats["errors"] += 1
+        watermark = None
+        for entity_id in entity_ids:
+            if entity_id in failed:
+                break
+            watermark = self._watermark_position(long_term_entities[entity_id])
+        return watermark
 
-            self._logger.info(
-                f"Consolidation complete: {stats['entities_consolidated']} entities consolidated",
-            )
+    @staticmethod
+    def _watermark_position(long_term_entity: dict) -> dict[str, str]:
+        """
+        Return the watermark position of a long-term memory entity.
 
-            return stats
+        The position is the time the long-term record last changed: its
+        last_updated field, which whatever changes an entity's importance
+        score or archival eligibility must advance, falling back to the
+        consolidation date (and the activity timestamp) for records that
+        have never changed since they were consolidated.
 
-        except Exception as e:
-            self._logger.exception(f"Error consolidating from long-term memory: {e}")
-            return {"error": str(e)}
+        Args:
+            long_term_entity: Entity from long-term memory
+
+        Returns:
+            Dictionary with the timestamp and key of the entity
+        """
+        data = long_term_entity.get("Record", {}).get("Data", {})
+        return {
+            "timestamp": data.get("last_updated") or data.get("consolidation_date") or data.get("timestamp", ""),
+            "key": long_term_entity.get("_key"),
+        }
 
     def _is_in_archival_memory(self, entity_id: uuid.UUID) -> bool:
         """
@@ -1268,6 +1657,40 @@ class NtfsArchivalMemoryRecorder(StorageActivityRecorder):
             self._logger.exception(f"Error checking if entity is in archival memory: {e}")
             return False
 
+    def _get_archival_memory_keys(self, entity_ids: list[str]) -> set[str]:
+        """
+        Find which of a batch of entities are already in archival memory.
+
+        Args:
+            entity_ids: Entity keys
+
+        Returns:
+            The keys of the entities that exist in archival memory
+        """
+        if not hasattr(self, "_db") or self._db is None or not entity_ids:
+            return set()
+
+        try:
+            query = """
+                FOR doc IN @@collection
+                FILTER doc._key IN @entity_ids
+                RETURN doc._key
+            """
+
+            cursor = self._db._arangodb.aql.execute(
+                query,
+                bind_vars={
+                    "@collection": self._collection_name,
+                    "entity_ids": [str(entity_id) for entity_id in entity_ids],
+                },
+            )
+
+            return set(cursor)
+
+        except Exception as e:
+            self._logger.exception(f"Error checking if entities are in archival memory: {e}")
+            return set()
+
     def _mark_consolidated_in_long_term(self, entity_id: uuid.UUID) -> bool:
         """
         Mark an entity as consolidated to archival memory in the long-term memory.
@@ -1312,6 +1735,54 @@ class NtfsArchivalMemoryRecorder(StorageActivityRecorder):
             )
             return False
 
+    def _mark_consolidated_in_long_term_batch(self, entity_ids: list[str]) -> bool:
+        """
+        Mark a batch of entities as consolidated to archival memory in the long-term memory.
+
+        Args:
+            entity_ids: Entity keys
+
+        Returns:
+            True if successful
+        """
+        if not hasattr(self, "_db") or self._db is None:
+            return False
+
+        if not entity_ids:
+            return True
+
+        try:
+            # Update the documents
+            query = """
+                FOR entity_id IN @entity_ids
+                    UPDATE entity_id WITH {
+                        Record: {
+                            Data: {
+                                consolidated_to_archival: true,
+                                consolidation_to_archival_date: @timestamp
+                            }
+                        }
+                    } IN @@collection
+                    OPTIONS { ignoreErrors: true }
+            """
+
+            self._db._arangodb.aql.execute(
+                query,
+                bind_vars={
+                    "@collection": self._long_term_collection_name,
+                    "entity_ids": [str(entity_id) for entity_id in entity_ids],
+                    "timestamp": datetime.now(UTC).isoformat(),
+                },
+            )
+
+            return True
+
+        except Exception as e:
+            self._logger.exception(
+                f"Error marking entities as consolidated in long-term memory: {e}",
+            )
+            return False
+
     def _update_knowledge_graph_metadata(
         self,
         entity_id: uuid.UUID,
@@ -1372,6 +1843,66 @@ class NtfsArchivalMemoryRecorder(StorageActivityRecorder):
             self._logger.exception(f"Error updating knowledge graph metadata: {e}")
             return False
 
+    def _update_knowledge_graph_metadata_batch(
+        self,
+        relationships: dict[str, list[dict]],
+    ) -> bool:
+        """
+        Update the knowledge graph metadata for a batch of entities with one query.
+
+        Args:
+            relationships: Lists of relationship dictionaries, keyed by entity key
+
+        Returns:
+            True if successful
+        """
+        if not hasattr(self, "_db") or self._db is None:
+            return False
+
+        if not relationships:
+            return True
+
+        try:
+            updates = [
+                {
+                    "entity_id": str(entity_id),
+                    "knowledge_graph": {
+                        "relationship_count": len(entity_relationships),
+                        # Calculate centrality (basic approximation)
+                        "centrality": min(1.0, len(entity_relationships) / 20),
+                        "relationship_types": list({rel.get("type") for rel in entity_relationships}),
+                    },
+                }
+                for entity_id, entity_relationships in relationships.items()
+            ]
+
+            # Update the documents
+            query = """
+                FOR entity IN @updates
+                    UPDATE entity.entity_id WITH {
+                        Record: {
+                            Data: {
+                                knowledge_graph: entity.knowledge_graph
+                            }
+                        }
+                    } IN @@collection
+                    OPTIONS { ignoreErrors: true }
+            """
+
+            self._db._arangodb.aql.execute(
+                query,
+                bind_vars={
+                    "@collection": self._collection_name,
+                    "updates": updates,
+                },
+            )
+
+            return True
+
+        except Exception as e:
+            self._logger.exception(f"Error updating knowledge graph metadata: {e}")
+            return False
+
     def get_archival_memory_statistics(self) -> dict[str, Any]:
         """
         Get statistics about the archival memory.
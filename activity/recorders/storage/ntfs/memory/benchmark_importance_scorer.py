@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+"""
+Importance Scoring Benchmark for the Indaleko Cognitive Memory System.
+
+This script compares the per-activity ImportanceScorer methods with their
+batch counterparts on a synthetic workload shaped like USN journal activity
+(many events against a smaller set of files), and checks that both paths
+produce the same scores.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import time
+
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import numpy as np
+
+
+# Set up environment
+if os.environ.get("INDALEKO_ROOT") is None:
+    current_path = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.exists(os.path.join(current_path, "Indaleko.py")):
+        current_path = os.path.dirname(current_path)
+    os.environ["INDALEKO_ROOT"] = current_path
+    sys.path.append(current_path)
+
+# pylint: disable=wrong-import-position
+from activity.recorders.storage.ntfs.memory.importance_scorer import ImportanceScorer
+
+
+# pylint: enable=wrong-import-position
+
+DIRECTORIES = [
+    "C:\\Users\\user\\Documents\\Reports",
+    "C:\\Users\\user\\Desktop",
+    "C:\\Users\\user\\Projects\\indaleko\\src",
+    "C:\\Users\\user\\AppData\\Local\\Cache",
+    "C:\\Users\\user\\Downloads",
+    "C:\\Windows\\Temp",
+    "C:\\Program Files\\App",
+    "D:\\Media\\Photos",
+]
+EXTENSIONS = ["docx", "pdf", "py", "json", "jpg", "exe", "zip", "log", "tmp", "dat"]
+ACTIVITY_TYPES = list(ImportanceScorer.ACTIVITY_TYPE_WEIGHTS)
+
+
+def generate_activities(count: int, file_count: int, seed: int = 42) -> list[dict[str, Any]]:
+    """
+    Generate synthetic activities against a fixed set of files.
+
+    Args:
+        count: Number of activities
+        file_count: Number of distinct files the activities touch
+        seed: Random seed
+
+    Returns:
+        List of activity dictionaries
+    """
+    rng = random.Random(seed)
+    files = [
+        f"{rng.choice(DIRECTORIES)}\\file_{i}.{rng.choice(EXTENSIONS)}" for i in range(file_count)
+    ]
+    now = datetime.now(UTC)
+    activities = []
+    for _ in range(count):
+        activity = {
+            "file_path": rng.choice(files),
+            "activity_type": rng.choice(ACTIVITY_TYPES),
+            "timestamp": (now - timedelta(seconds=rng.randrange(30 * 24 * 3600))).isoformat(),
+            "is_directory": rng.random() < 0.05,
+            "file_size": rng.choice([0, 512, 64 * 1024, 10 * 1024 * 1024]),
+        }
+        if rng.random() < 0.1:
+            activity["search_hits"] = rng.randrange(20)
+        if rng.random() < 0.2:
+            activity["attributes"] = {"usn_reason": rng.choice([["FILE_CREATE"], ["DATA_EXTEND", "DATA_OVERWRITE"]])}
+        activities.append(activity)
+    return activities
+
+
+def run_benchmark(count: int, file_count: int, repeat: int) -> dict[str, Any]:
+    """
+    Time the scalar and batch scoring paths.
+
+    Args:
+        count: Number of activities
+        file_count: Number of distinct files
+        repeat: Number of timed runs; the fastest is reported
+
+    Returns:
+        Dictionary of benchmark results
+    """
+    scorer = ImportanceScorer()
+    activities = generate_activities(count, file_count)
+    columns = scorer.activities_to_columns(activities)
+
+    def best_of(function) -> tuple[float, Any]:
+        best, result = float("inf"), None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = function()
+            best = min(best, time.perf_counter() - start)
+        return best, result
+
+    scalar_time, scalar_scores = best_of(lambda: [scorer.calculate_importance(a) for a in activities])
+    convert_time, _ = best_of(lambda: scorer.activities_to_columns(activities))
+    batch_time, batch_scores = best_of(lambda: scorer.calculate_importance_batch(columns))
+
+    # Collectors that keep timestamps as POSIX seconds skip the ISO parsing
+    posix_columns = dict(columns)
+    posix_columns["timestamp"] = np.array([datetime.fromisoformat(a["timestamp"]).timestamp() for a in activities])
+    posix_time, _ = best_of(lambda: scorer.calculate_importance_batch(posix_columns))
+
+    ages = np.linspace(0, 365, count)
+    access_counts = np.arange(count) % 12
+    decay_time, decay_scores = best_of(
+        lambda: [
+            scorer.calculate_importance_decay(i, a, c)
+            for i, a, c in zip(scalar_scores, ages.tolist(), access_counts.tolist(), strict=True)
+        ],
+    )
+    decay_batch_time, decay_batch_scores = best_of(
+        lambda: scorer.calculate_importance_decay_batch(np.array(scalar_scores), ages, access_counts),
+    )
+
+    return {
+        "activities": count,
+        "distinct_files": file_count,
+        "importance": {
+            "scalar_seconds": scalar_time,
+            "to_columns_seconds": convert_time,
+            "batch_seconds": batch_time,
+            "batch_posix_timestamps_seconds": posix_time,
+            "speedup": scalar_time / batch_time if batch_time else 0.0,
+            "speedup_including_conversion": scalar_time / (batch_time + convert_time),
+            # Recency is measured from the time each path runs, so this
+            # includes the decay over the benchmark's own running time
+            "max_difference": float(np.max(np.abs(batch_scores - np.array(scalar_scores)))),
+        },
+        "decay": {
+            "scalar_seconds": decay_time,
+            "batch_seconds": decay_batch_time,
+            "speedup": decay_time / decay_batch_time if decay_batch_time else 0.0,
+            "max_difference": float(np.max(np.abs(decay_batch_scores - np.array(decay_scores)))),
+        },
+    }
+
+
+def main() -> int:
+    """Main function for command line operation."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark scalar and batch importance scoring",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--count", type=int, default=100_000, help="Number of activities to score")
+    parser.add_argument("--files", type=int, default=5_000, help="Number of distinct files")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs per path")
+    parser.add_argument("--output", type=str, default=None, help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    results = run_benchmark(args.count, args.files, args.repeat)
+    logging.info(json.dumps(results, indent=2))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""
+This module provides the persistent state of the memory consolidation process.
+
+Each consolidation stage (sensory to short-term, short-term to long-term,
+long-term to archival) keeps a watermark: the (timestamp, key) of the last
+source activity it has considered, and the minimum importance it applied.
+A pass only asks the source tier for activities after the watermark, so its
+cost follows the data added since the previous pass rather than the whole
+history of the tier.  If a pass runs with a lower minimum importance than
+the watermark was built with, activities skipped earlier become eligible
+again and the stage starts over.
+
+The state also records the stages a consolidate_all run has completed, so
+that an interrupted run resumes with the first unfinished stage.  Stages
+advance their watermark after every batch, so an interrupted stage resumes
+with the first unprocessed batch.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+import logging
+import os
+import threading
+
+from datetime import UTC, datetime
+from typing import Any
+
+
+class ConsolidationState:
+    """Per-stage consolidation watermarks and the consolidate_all checkpoint, kept in a JSON file."""
+
+    STATE_VERSION = 1
+
+    def __init__(self, state_file: str | None = None) -> None:
+        """
+        Load the state from state_file, if it exists.
+
+        Without a state file the state is kept in memory only, so every
+        manager starts from the beginning of each tier.
+        """
+        self.state_file = state_file
+        self._lock = threading.Lock()
+        self._state = {"version": self.STATE_VERSION, "watermarks": {}, "run": None}
+        if state_file:
+            self.load()
+
+    def get_watermark(self, stage: str, min_importance: float) -> dict[str, Any] | None:
+        """
+        Return the watermark to resume a stage from, or None to start from the beginning.
+
+        Args:
+            stage: Consolidation stage name
+            min_importance: Minimum importance the stage will apply
+
+        Returns:
+            Dictionary with the timestamp and key of the last activity considered
+        """
+        with self._lock:
+            watermark = self._state["watermarks"].get(stage)
+        if not watermark:
+            return None
+        if min_importance < watermark.get("min_importance", 0.0):
+            logging.info(
+                "Minimum importance for %s lowered from %s to %s, reconsidering all activities",
+                stage,
+                watermark.get("min_importance"),
+                min_importance,
+            )
+            return None
+        return watermark
+
+    def advance_watermark(
+        self,
+        stage: str,
+        timestamp: str,
+        key: str,
+        min_importance: float,
+        processed: int = 0,
+    ) -> None:
+        """
+        Record that a stage has considered every activity up to (timestamp, key).
+
+        Args:
+            stage: Consolidation stage name
+            timestamp: Timestamp of the last activity considered
+            key: Document key of the last activity considered
+            min_importance: Minimum importance the stage applied
+            processed: Number of activities considered since the previous watermark
+        """
+        with self._lock:
+            previous = self._state["watermarks"].get(stage) or {}
+            self._state["watermarks"][stage] = {
+                "timestamp": timestamp,
+                "key": key,
+                "min_importance": min_importance,
+                "processed": previous.get("processed", 0) + processed,
+                "updated": datetime.now(UTC).isoformat(),
+            }
+        self.save()
+
+    def reset_watermark(self, stage: str | None = None) -> None:
+        """Forget the watermark of one stage, or of every stage."""
+        with self._lock:
+            if stage is None:
+                self._state["watermarks"].clear()
+            else:
+                self._state["watermarks"].pop(stage, None)
+        self.save()
+
+    def begin_run(self) -> list[str]:
+        """
+        Start a consolidate_all run, resuming an interrupted one.
+
+        Returns:
+            Stages already completed by the interrupted run (empty for a new run)
+        """
+        with self._lock:
+            run = self._state.get("run")
+            if run is None:
+                self._state["run"] = {"started": datetime.now(UTC).isoformat(), "completed_stages": []}
+                completed = []
+            else:
+                completed = list(run.get("completed_stages", []))
+        self.save()
+        return completed
+
+    def complete_stage(self, stage: str) -> None:
+        """Record that the current consolidate_all run has finished a stage."""
+        with self._lock:
+            run = self._state.get("run")
+            if run is None or stage in run["completed_stages"]:
+                return
+            run["completed_stages"].append(stage)
+        self.save()
+
+    def finish_run(self) -> None:
+        """Record that the current consolidate_all run has finished every stage."""
+        with self._lock:
+            self._state["run"] = None
+        self.save()
+
+    def get_state(self) -> dict[str, Any]:
+        """Return a copy of the watermarks and the run checkpoint."""
+        with self._lock:
+            return json.loads(json.dumps(self._state))
+
+    def save(self) -> bool:
+        """
+        Write the state to the state file, replacing it atomically.
+
+        Returns True if the state was written.
+        """
+        if not self.state_file:
+            return False
+        with self._lock:
+            state = json.dumps(self._state, indent=2)
+        temp_file = f"{self.state_file}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.state_file)), exist_ok=True)
+            with open(temp_file, "w", encoding="utf-8") as f:
+                f.write(state)
+            os.replace(temp_file, self.state_file)
+        except OSError as e:
+            logging.warning("Could not save consolidation state %s: %s", self.state_file, e)
+            return False
+        return True
+
+    def load(self) -> bool:
+        """
+        Load the state file.  A missing, unreadable or incompatible file is ignored.
+
+        Returns True if the state was loaded.
+        """
+        if not self.state_file or not os.path.exists(self.state_file):
+            return False
+        try:
+            with open(self.state_file, encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("version") != self.STATE_VERSION:
+                logging.warning("Ignoring consolidation state %s: unknown version", self.state_file)
+                return False
+            watermarks = dict(state["watermarks"])
+            run = state.get("run")
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logging.warning("Ignoring consolidation state %s: %s", self.state_file, e)
+            return False
+        with self._lock:
+            self._state = {"version": self.STATE_VERSION, "watermarks": watermarks, "run": run}
+        return True
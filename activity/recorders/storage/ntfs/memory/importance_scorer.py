@@ -34,9 +34,12 @@ import math
 import os
 import re
 
+from collections.abc import Iterable, Sequence
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
+import numpy as np
+
 
 # pylint: disable=wrong-import-position
 # Set up environment
@@ -287,8 +290,10 @@ class ImportanceScorer:
         if activity_data.get("is_directory", False):
             return 0.7  # Directories are generally important
 
-        # Get file path and extract extension
-        file_path = activity_data.get("file_path", "")
+        return self._extension_weight(activity_data.get("file_path", ""))
+
+    def _extension_weight(self, file_path: str) -> float:
+        """Return the importance of a (non-directory) file path's extension."""
         _, ext = os.path.splitext(file_path)
 
         # Clean extension and convert to lowercase
@@ -314,18 +319,25 @@ class ImportanceScorer:
 
         # Handle specific USN reason codes if available
         if "attributes" in activity_data and "usn_reason" in activity_data["attributes"]:
-            usn_reason = activity_data["attributes"]["usn_reason"]
-
-            # Check for particularly important combinations
-            if "DATA_EXTEND" in usn_reason and "DATA_OVERWRITE" in usn_reason:
-                return 0.9  # Heavy modification is very important
-
-            if "FILE_CREATE" in usn_reason:
-                return 0.85  # File creation is very important
+            usn_score = self._usn_reason_weight(activity_data["attributes"]["usn_reason"])
+            if usn_score is not None:
+                return usn_score
 
         # Use activity type weights for general cases
         return self.ACTIVITY_TYPE_WEIGHTS.get(activity_type, 0.2)
 
+    @staticmethod
+    def _usn_reason_weight(usn_reason: Any) -> float | None:
+        """Return the importance of a USN reason combination, or None if it is not special."""
+        # Check for particularly important combinations
+        if "DATA_EXTEND" in usn_reason and "DATA_OVERWRITE" in usn_reason:
+            return 0.9  # Heavy modification is very important
+
+        if "FILE_CREATE" in usn_reason:
+            return 0.85  # File creation is very important
+
+        return None
+
     def _calculate_path_importance(self, activity_data: dict[str, Any]) -> float:
         """
         Calculate importance based on file path.
@@ -345,6 +357,10 @@ class ImportanceScorer:
             if depth <= 2:
                 return 0.8  # Higher importance for shallow directories
 
+        return self._path_pattern_weight(file_path)
+
+    def _path_pattern_weight(self, file_path: str) -> float:
+        """Return the weight of the first path significance pattern matching file_path."""
         # Apply path significance patterns
         for pattern, weight in self._compiled_patterns:
             if pattern.search(file_path):
@@ -432,6 +448,209 @@ class ImportanceScorer:
         # Cap at 1.0
         return min(1.0, score)
 
+    @staticmethod
+    def _object_column(values: Iterable[Any], size: int) -> np.ndarray:
+        """Return values as a 1-D object array (list values stay whole)."""
+        if isinstance(values, np.ndarray) and values.dtype == object:
+            return values
+        return np.fromiter(values, dtype=object, count=size)
+
+    @staticmethod
+    def _factorize(values: Sequence[Any]) -> tuple[list[Any], np.ndarray]:
+        """Return the distinct values, in first-seen order, and each value's index into them."""
+        codes = {}
+        index = np.fromiter((codes.setdefault(value, len(codes)) for value in values), dtype=np.intp, count=len(values))
+        return list(codes), index
+
+    @classmethod
+    def activities_to_columns(cls, activities: Sequence[dict[str, Any]]) -> dict[str, np.ndarray]:
+        """
+        Convert activity dictionaries to columns for calculate_importance_batch.
+
+        Missing values take the defaults calculate_importance uses; the
+        attribute columns (usn_reason, rename_type, usn_reason_simplified)
+        are None where the attribute is absent.
+
+        Args:
+            activities: Activity data from collector
+
+        Returns:
+            Dictionary mapping column names to arrays
+        """
+        size = len(activities)
+        attributes = [activity.get("attributes") or {} for activity in activities]
+        return {
+            "file_path": cls._object_column((a.get("file_path", "") for a in activities), size),
+            "activity_type": cls._object_column((a.get("activity_type", "unknown") for a in activities), size),
+            "is_directory": np.fromiter((bool(a.get("is_directory", False)) for a in activities), dtype=bool, count=size),
+            "timestamp": cls._object_column((a.get("timestamp") for a in activities), size),
+            "search_hits": np.fromiter((a.get("search_hits", 0) for a in activities), dtype=np.float64, count=size),
+            "file_size": np.fromiter((a.get("file_size", 0) for a in activities), dtype=np.float64, count=size),
+            "importance_boost": np.fromiter(
+                (a.get("importance_boost", 0.0) for a in activities),
+                dtype=np.float64,
+                count=size,
+            ),
+            "usn_reason": cls._object_column((attrs.get("usn_reason") for attrs in attributes), size),
+            "rename_type": cls._object_column((attrs.get("rename_type") for attrs in attributes), size),
+            "usn_reason_simplified": cls._object_column(
+                (attrs.get("usn_reason_simplified") for attrs in attributes),
+                size,
+            ),
+            "empty": np.fromiter((not a for a in activities), dtype=bool, count=size),
+        }
+
+    def calculate_importance_batch(
+        self,
+        activities: Sequence[dict[str, Any]] | dict[str, Any],
+        now: datetime | None = None,
+    ) -> np.ndarray:
+        """
+        Calculate importance scores for many activities at once.
+
+        The scores are those calculate_importance gives (up to floating point
+        rounding in the recency factor), but each distinct file path, activity
+        type and timestamp is scored only once and the factors are combined
+        with array arithmetic, which is much faster for tier transitions and
+        memory consolidation runs.
+
+        Args:
+            activities: Activity data from collector, or columns as returned by
+                activities_to_columns.  Only file_path is required; other
+                missing columns take the defaults calculate_importance uses.
+                timestamp may also be a float array of POSIX seconds (NaN if
+                missing) or a datetime64 array.
+            now: Time the recency factor is measured from (default: now)
+
+        Returns:
+            Array of importance scores between 0.0 and 1.0, one per activity
+        """
+        columns = activities if isinstance(activities, dict) else self.activities_to_columns(activities)
+        file_paths = self._object_column(columns["file_path"], len(columns["file_path"]))
+        size = len(file_paths)
+        if size == 0:
+            return np.zeros(0)
+
+        def numeric(name: str, default: float, dtype: type = np.float64) -> np.ndarray:
+            values = columns.get(name)
+            return np.full(size, default, dtype=dtype) if values is None else np.asarray(values, dtype=dtype)
+
+        def objects(name: str, default: Any = None) -> np.ndarray:
+            values = columns.get(name)
+            return np.full(size, default, dtype=object) if values is None else self._object_column(values, size)
+
+        is_directory = numeric("is_directory", False, dtype=bool)
+
+        # File path factors, computed once per distinct path
+        paths, path_index = self._factorize(file_paths)
+        path_extension = np.array([self._extension_weight(path) for path in paths])[path_index]
+        path_pattern = np.array([self._path_pattern_weight(path) for path in paths])[path_index]
+        path_shallow = np.array([path.count("\\") + path.count("/") <= 2 for path in paths])[path_index]
+        extension_score = np.where(is_directory, 0.7, path_extension)
+        path_score = np.where(is_directory & path_shallow, 0.8, path_pattern)
+
+        # Activity type factor, overridden by special USN reason combinations
+        activity_types, type_index = self._factorize(objects("activity_type", "unknown"))
+        activity_type_score = np.array(
+            [self.ACTIVITY_TYPE_WEIGHTS.get(activity_type.lower(), 0.2) for activity_type in activity_types],
+        )[type_index]
+        usn_reasons = objects("usn_reason")
+        for i in np.flatnonzero(np.not_equal(usn_reasons, None)):
+            usn_score = self._usn_reason_weight(usn_reasons[i])
+            if usn_score is not None:
+                activity_type_score[i] = usn_score
+
+        # Recency factor
+        age_days = self._batch_age_days(columns.get("timestamp"), size, now)
+        with np.errstate(invalid="ignore"):
+            recency_score = np.clip(np.exp(-self._time_decay_rate * age_days), 0.1, 1.0)
+        recency_score = np.where(np.isnan(age_days), 0.5, recency_score)
+
+        # Metadata factor, accumulated in the same order as the scalar path
+        search_hits = numeric("search_hits", 0)
+        file_size = numeric("file_size", 0)
+        metadata_score = np.full(size, 0.5)
+        metadata_score += np.where(search_hits > 0, np.minimum(0.3, search_hits * 0.03), 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            size_factor = np.minimum(0.2, np.log10(np.maximum(1, file_size) / 1024) * 0.05)
+        metadata_score += np.where(file_size > 0, size_factor, 0.0)
+        metadata_score += np.where(objects("rename_type") == "new_name", 0.1, 0.0)
+        simplified = objects("usn_reason_simplified")
+        metadata_score += np.where(
+            (simplified == "security_change") | (simplified == "named_data_extend"),
+            0.05,
+            0.0,
+        )
+        metadata_score = np.minimum(1.0, metadata_score)
+
+        # Combine scores with their respective weights
+        combined_score = (
+            (extension_score * self._extensions_weight)
+            + (activity_type_score * self._activity_type_weight)
+            + (path_score * self._path_weight)
+            + (recency_score * self._recency_weight)
+            + (metadata_score * self._metadata_weight)
+        )
+        importance = np.maximum(0.1, np.minimum(1.0, combined_score))
+
+        # Apply any external boost from user feedback
+        importance_boost = numeric("importance_boost", 0.0)
+        importance = np.where(
+            importance_boost > 0,
+            np.minimum(1.0, importance + (importance_boost * (1.0 - importance))),
+            importance,
+        )
+
+        # Empty activities score zero, as in calculate_importance
+        empty = columns.get("empty")
+        if empty is not None:
+            importance = np.where(np.asarray(empty, dtype=bool), 0.0, importance)
+
+        return importance
+
+    def _batch_age_days(self, timestamps: Any, size: int, now: datetime | None) -> np.ndarray:
+        """
+        Return the age in days of each timestamp, NaN where it is missing or unparseable.
+
+        Args:
+            timestamps: POSIX seconds, datetime64 values, or ISO strings/datetimes
+            size: Number of activities
+            now: Reference time (default: now)
+        """
+        if now is None:
+            now = datetime.now(UTC)
+        elif now.tzinfo is None:
+            now = now.replace(tzinfo=UTC)
+        if timestamps is None:
+            return np.full(size, np.nan)
+
+        timestamps = np.asarray(timestamps) if not isinstance(timestamps, np.ndarray) else timestamps
+        if np.issubdtype(timestamps.dtype, np.datetime64):
+            seconds = timestamps.astype("datetime64[us]").astype(np.int64) / 1e6
+            seconds = np.where(np.isnat(timestamps), np.nan, seconds)
+        elif np.issubdtype(timestamps.dtype, np.number):
+            seconds = timestamps.astype(np.float64)
+        else:
+            values, index = self._factorize(self._object_column(timestamps, size))
+            seconds = np.array([self._timestamp_seconds(value) for value in values])[index]
+        return (now.timestamp() - seconds) / (24 * 60 * 60)
+
+    def _timestamp_seconds(self, timestamp: Any) -> float:
+        """Return a timestamp (ISO string or datetime) as POSIX seconds, or NaN."""
+        if not timestamp:
+            return math.nan
+        try:
+            activity_time = datetime.fromisoformat(timestamp) if isinstance(timestamp, str) else timestamp
+
+            # Ensure timezone-aware
+            if activity_time.tzinfo is None:
+                activity_time = activity_time.replace(tzinfo=UTC)
+
+            return activity_time.timestamp()
+        except Exception as e:
+            self._logger.exception(f"Error calculating recency score: {e}")
+            return math.nan
+
     def calculate_importance_decay(
         self,
         original_importance: float,
@@ -462,6 +681,38 @@ class ImportanceScorer:
         # Ensure minimum importance
         return max(0.1, min(1.0, adjusted_importance))
 
+    def calculate_importance_decay_batch(
+        self,
+        original_importance: Sequence[float] | np.ndarray,
+        age_days: Sequence[float] | np.ndarray,
+        access_count: Sequence[int] | np.ndarray | int = 0,
+    ) -> np.ndarray:
+        """
+        Calculate importance decay for many items at once.
+
+        The arguments are arrays (or scalars, which are broadcast) with the
+        meaning they have in calculate_importance_decay.
+
+        Returns:
+            Array of updated importance scores
+        """
+        original_importance = np.asarray(original_importance, dtype=np.float64)
+        age_days = np.asarray(age_days, dtype=np.float64)
+        access_count = np.asarray(access_count, dtype=np.float64)
+
+        # Base decay from age (more important items decay more slowly)
+        decay_rate = self._time_decay_rate * (1.0 - (original_importance * 0.5))
+        time_factor = np.exp(-decay_rate * age_days)
+
+        # Access count boosts importance retention
+        access_factor = 1.0 + (np.minimum(10, access_count) * 0.05)
+
+        # Combine factors (access partially counteracts time decay)
+        adjusted_importance = original_importance * time_factor * access_factor
+
+        # Ensure minimum importance
+        return np.maximum(0.1, np.minimum(1.0, adjusted_importance))
+
     def estimate_retention_days(
         self,
         importance: float,
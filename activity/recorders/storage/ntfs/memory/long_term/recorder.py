@@ -208,20 +208,30 @@ class NtfsLongTermMemoryRecorder:
         min_importance: float = 0.8,
         min_age_days: int = 90,
         limit: int = 100,
+        since: str | None = None,
+        since_key: str | None = None,
     ) -> list[dict]:
         """
         Get entities eligible for consolidation to archival memory.
 
+        Entities are returned in (last_updated, _key) order, starting after
+        the watermark (since, since_key) if one is given.  last_updated is
+        advanced whenever an entity's importance score or archival
+        eligibility changes, so such an entity is returned again.
+
         Args:
             min_importance: Minimum importance score for entities to consolidate
             min_age_days: Minimum age in days for entities to consolidate
             limit: Maximum number of entities to process
+            since: Update time of the last entity already considered
+            since_key: Key of the last entity already considered
 
         Returns:
             List of entities eligible for archival memory
         """
         # Mock implementation for testing
         results = []
+        consolidation_date = (datetime.now(UTC) - timedelta(days=min_age_days)).isoformat()
         for i in range(min(3, limit)):
             # Create mock w5h concepts for testing
             mock_w5h = {
@@ -241,6 +251,8 @@ class NtfsLongTermMemoryRecorder:
                             "file_path": f"/path/to/archive_candidate_{i}.txt",
                             "activity_type": StorageActivityType.MODIFY,
                             "timestamp": datetime.now(UTC).isoformat(),
+                            "consolidation_date": consolidation_date,
+                            "last_updated": consolidation_date,
                             "importance_score": 0.8 + (i * 0.1),
                             "memory_tier": "long_term",
                             "w5h_concepts": mock_w5h,
@@ -252,6 +264,12 @@ class NtfsLongTermMemoryRecorder:
                 },
             )
 
+        def position(entity: dict) -> tuple[str, str]:
+            return (entity["Record"]["Data"]["last_updated"], entity["_key"])
+
+        results.sort(key=position)
+        if since is not None:
+            results = [entity for entity in results if position(entity) > (since, since_key or "")]
         return results
 
     def cache_duration(self) -> timedelta:
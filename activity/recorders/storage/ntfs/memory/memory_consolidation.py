@@ -17,6 +17,11 @@ Usage:
     python memory_consolidation.py --consolidate-long     # Consolidate from long-term to archival
     python memory_consolidation.py --consolidate-all      # Run all consolidation processes
 
+Each consolidation stage keeps a watermark in a state file, so a pass only
+considers activities added since the previous one, and an interrupted
+--consolidate-all run resumes with its first unfinished stage (see
+consolidation_state.py; --full-scan ignores the watermarks).
+
 Project Indaleko
 Copyright (C) 2024-2025 Tony Mason
 
@@ -54,7 +59,9 @@ if os.environ.get("INDALEKO_ROOT") is None:
     sys.path.append(current_path)
 
 # pylint: disable=wrong-import-position
+from activity.recorders.storage.ntfs.memory.consolidation_state import ConsolidationState
 from utils.i_logging import get_logger
+from utils.misc.directory_management import indaleko_default_data_dir
 
 
 # pylint: enable=wrong-import-position
@@ -72,6 +79,9 @@ class MemoryConsolidationManager:
     Sensory Memory → Short-Term Memory → Long-Term Memory → Archival Memory
     """
 
+    DEFAULT_STATE_FILE = os.path.join(indaleko_default_data_dir, "ntfs_memory_consolidation_state.json")
+    STAGES = ("sensory_to_short_term", "short_term_to_long_term", "long_term_to_archival")
+
     def __init__(
         self,
         db_config_path: str | None = None,
@@ -84,6 +94,9 @@ class MemoryConsolidationManager:
         long_term_min_importance: float = 0.7,
         archival_min_importance: float = 0.8,
         entity_batch_size: int = 100,
+        incremental: bool = True,
+        state_file: str | None = None,
+        max_batches: int = 1000,
         debug: bool = False,
     ) -> None:
         """
@@ -100,6 +113,10 @@ class MemoryConsolidationManager:
             long_term_min_importance: Minimum importance for long-term memory
             archival_min_importance: Minimum importance for archival memory
             entity_batch_size: Number of entities to process in each batch
+            incremental: Whether each stage resumes from its watermark (default: True)
+            state_file: File keeping the watermarks and the consolidate_all checkpoint
+                (default: DEFAULT_STATE_FILE)
+            max_batches: Maximum number of batches an incremental stage runs per pass
             debug: Whether to enable debug logging
         """
         # Configure logging
@@ -116,6 +133,9 @@ class MemoryConsolidationManager:
         self._long_term_min_importance = long_term_min_importance
         self._archival_min_importance = archival_min_importance
         self._entity_batch_size = entity_batch_size
+        self._incremental = incremental
+        self._max_batches = max(1, max_batches)
+        self._state = ConsolidationState(state_file or self.DEFAULT_STATE_FILE)
 
         # Initialize recorders
         self._sensory_memory_recorder = sensory_memory_recorder
@@ -214,10 +234,11 @@ class MemoryConsolidationManager:
             # Perform consolidation
             start_time = time.time()
 
-            stats = self._short_term_memory_recorder.consolidate_from_sensory_memory(
+            stats = self._run_stage(
+                "sensory_to_short_term",
+                self._short_term_memory_recorder.consolidate_from_sensory_memory,
+                self._short_term_min_importance,
                 days=self._sensory_days,
-                min_importance=self._short_term_min_importance,
-                entity_limit=self._entity_batch_size,
             )
 
             end_time = time.time()
@@ -267,10 +288,11 @@ class MemoryConsolidationManager:
             start_time = time.time()
 
             # Perform consolidation through the long-term memory recorder
-            stats = self._long_term_memory_recorder.consolidate_from_short_term_memory(
+            stats = self._run_stage(
+                "short_term_to_long_term",
+                self._long_term_memory_recorder.consolidate_from_short_term_memory,
+                self._long_term_min_importance,
                 min_age_days=7,  # Use a default of 7 days minimum age
-                min_importance=self._long_term_min_importance,
-                entity_limit=self._entity_batch_size,
             )
 
             end_time = time.time()
@@ -321,10 +343,11 @@ class MemoryConsolidationManager:
             # Perform consolidation through the archival memory recorder
             start_time = time.time()
 
-            stats = self._archival_memory_recorder.consolidate_from_long_term_memory(
+            stats = self._run_stage(
+                "long_term_to_archival",
+                self._archival_memory_recorder.consolidate_from_long_term_memory,
+                self._archival_min_importance,
                 min_age_days=90,  # Use a default of 90 days minimum age
-                min_importance=self._archival_min_importance,
-                entity_limit=self._entity_batch_size,
             )
 
             end_time = time.time()
@@ -353,6 +376,79 @@ class MemoryConsolidationManager:
 
         return stats
 
+    def _run_stage(
+        self,
+        stage: str,
+        consolidate: Any,
+        min_importance: float,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """
+        Run a consolidation stage, in batches from its watermark if incremental.
+
+        The recorder's consolidate method is passed since and since_key (the
+        timestamp and key of the last activity already considered, or None)
+        and returns the position it reached as stats["watermark"].  The
+        watermark is saved after every batch, and batches continue until one
+        comes back short.  A recorder that returns no watermark gets a single
+        batch, as without incremental consolidation.
+
+        Args:
+            stage: Consolidation stage name
+            consolidate: The recorder's consolidate method
+            min_importance: Minimum importance for the target tier
+            **kwargs: Additional arguments for the consolidate method
+
+        Returns:
+            Dictionary with the consolidation statistics, summed over the batches
+        """
+        if not self._incremental:
+            return consolidate(min_importance=min_importance, entity_limit=self._entity_batch_size, **kwargs)
+
+        totals = {"batches": 0}
+        for _ in range(self._max_batches):
+            watermark = self._state.get_watermark(stage, min_importance) or {}
+            stats = consolidate(
+                min_importance=min_importance,
+                entity_limit=self._entity_batch_size,
+                since=watermark.get("timestamp"),
+                since_key=watermark.get("key"),
+                **kwargs,
+            )
+            totals["batches"] += 1
+            for key, value in stats.items():
+                if isinstance(value, int) and not isinstance(value, bool):
+                    totals[key] = totals.get(key, 0) + value
+                elif key != "watermark":
+                    totals[key] = value
+            if "error" in stats:
+                break
+
+            next_watermark = stats.get("watermark")
+            if not next_watermark:
+                break
+            self._state.advance_watermark(
+                stage,
+                next_watermark["timestamp"],
+                next_watermark["key"],
+                min_importance,
+                processed=stats.get("entities_processed", 0),
+            )
+            if stats.get("entities_found", 0) < self._entity_batch_size:
+                break
+
+        totals["watermark"] = self._state.get_watermark(stage, min_importance)
+        return totals
+
+    def reset_watermarks(self, stage: str | None = None) -> None:
+        """
+        Make the next pass of a stage (or of every stage) consider all activities again.
+
+        Args:
+            stage: Consolidation stage name, or None for every stage
+        """
+        self._state.reset_watermark(stage)
+
     def consolidate_all(self) -> dict[str, Any]:
         """
         Run all consolidation processes in sequence.
@@ -369,18 +465,32 @@ class MemoryConsolidationManager:
 
         # Run all consolidation processes
         results = {}
+        stage_methods = {
+            "sensory_to_short_term": self.consolidate_sensory_to_short_term,  # Sensory → Short-Term
+            "short_term_to_long_term": self.consolidate_short_term_to_long_term,  # Short-Term → Long-Term
+            "long_term_to_archival": self.consolidate_long_term_to_archival,  # Long-Term → Archival
+        }
 
-        # Sensory → Short-Term
-        sensory_results = self.consolidate_sensory_to_short_term()
-        results["sensory_to_short_term"] = sensory_results
-
-        # Short-Term → Long-Term
-        short_term_results = self.consolidate_short_term_to_long_term()
-        results["short_term_to_long_term"] = short_term_results
+        # Resume an interrupted run with its first unfinished stage
+        completed_stages = self._state.begin_run()
+        if completed_stages:
+            self._logger.info(f"Resuming interrupted consolidation after {', '.join(completed_stages)}")
+
+        for stage in self.STAGES:
+            if stage in completed_stages:
+                results[stage] = {"status": "completed_in_interrupted_run", "consolidation_type": stage}
+                continue
+            results[stage] = stage_methods[stage]()
+            # A failed stage is not checkpointed, so resuming this run retries it
+            if "error" in results[stage]:
+                self._logger.warning(f"Consolidation stage {stage} failed: {results[stage]['error']}")
+            else:
+                self._state.complete_stage(stage)
 
-        # Long-Term → Archival
-        long_term_results = self.consolidate_long_term_to_archival()
-        results["long_term_to_archival"] = long_term_results
+        self._state.finish_run()
+        sensory_results = results["sensory_to_short_term"]
+        short_term_results = results["short_term_to_long_term"]
+        long_term_results = results["long_term_to_archival"]
 
         end_time = time.time()
 
@@ -434,6 +544,7 @@ class MemoryConsolidationManager:
         stats = {
             "timestamp": datetime.now(UTC).isoformat(),
             "memory_tiers": {},
+            "consolidation_state": self._state.get_state(),
         }
 
         # Get sensory memory statistics
@@ -536,6 +647,22 @@ def main() -> int:
         default=100,
         help="Number of entities to process in each batch",
     )
+    parser.add_argument(
+        "--state-file",
+        type=str,
+        default=MemoryConsolidationManager.DEFAULT_STATE_FILE,
+        help="File keeping the consolidation watermarks and checkpoint",
+    )
+    parser.add_argument(
+        "--full-scan",
+        action="store_true",
+        help="Ignore the watermarks and consider every activity in the source tiers",
+    )
+    parser.add_argument(
+        "--reset-watermarks",
+        action="store_true",
+        help="Forget the watermarks before consolidating",
+    )
 
     # Consolidation modes
     mode_group = parser.add_mutually_exclusive_group(required=True)
@@ -592,8 +719,12 @@ def main() -> int:
         long_term_min_importance=args.long_term_min_importance,
         archival_min_importance=args.archival_min_importance,
         entity_batch_size=args.batch_size,
+        incremental=not args.full_scan,
+        state_file=args.state_file,
         debug=args.debug,
     )
+    if args.reset_watermarks and not args.dry_run:
+        manager.reset_watermarks()
 
     # Execute requested operation
     results = None
@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+"""
+Unit tests for batched consolidation into archival memory.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+import unittest
+import uuid
+
+from unittest.mock import MagicMock
+
+
+# Set up environment
+if os.environ.get("INDALEKO_ROOT") is None:
+    current_path = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.exists(os.path.join(current_path, "Indaleko.py")):
+        current_path = os.path.dirname(current_path)
+    os.environ["INDALEKO_ROOT"] = current_path
+    sys.path.append(current_path)
+
+# pylint: disable=wrong-import-position
+from activity.recorders.storage.ntfs.memory.archival.recorder import (
+    NtfsArchivalMemoryRecorder,
+)
+
+
+# pylint: enable=wrong-import-position
+
+
+class TestBatchedArchivalConsolidation(unittest.TestCase):
+    """Tests for the batched path of consolidate_from_long_term_memory."""
+
+    def setUp(self):
+        """Create a recorder with a mock database and some long-term memory entities."""
+        self.recorder = NtfsArchivalMemoryRecorder(no_db=True, register_service=False)
+        self.recorder._db = MagicMock()
+        self.recorder._collection = MagicMock()
+        self.recorder._collection.insert_many.side_effect = lambda docs: [{"_key": doc["_key"]} for doc in docs]
+        self.recorder._db._arangodb.aql.execute.side_effect = self._execute
+        self.knowledge_graph = self.recorder._db.get_collection.return_value
+        self.knowledge_graph.insert_many.side_effect = lambda edges: [{} for _ in edges]
+
+        self.keys = [str(uuid.UUID(int=i + 1)) for i in range(6)]
+        self.archived = {self.keys[0]}
+        self.long_term_entities = [
+            {
+                "_key": key,
+                "Record": {
+                    "Data": {
+                        "file_path": f"C:/Users/test/Documents/file{i}.docx",
+                        "importance_score": 0.5 if i == 1 else 0.9,
+                        "consolidation_date": f"2025-01-01T00:00:0{i}+00:00",
+                        "w5h_concepts": {"what": ["document"], "why": ["project:indaleko"]},
+                    },
+                },
+            }
+            for i, key in enumerate(self.keys)
+        ]
+        self.queries = []
+        self.entity_path = "file"
+
+    def _execute(self, query, bind_vars):
+        """Answer the recorder's AQL queries from the test data."""
+        self.queries.append(query)
+        if "RETURN doc._key" in query:
+            return iter([key for key in bind_vars["entity_ids"] if key in self.archived])
+        if "@entity_collection" in bind_vars:
+            return iter([{"_key": key, "file_path": self.entity_path} for key in bind_vars["entity_ids"]])
+        if "@positions" in query:
+            return iter(self._related(bind_vars))
+        return iter([])
+
+    def _related(self, bind_vars):
+        """Match each entity against the archival collection, as the relationship query does."""
+        archival = [
+            entity
+            for entity in self.long_term_entities
+            if entity["_key"] in self.archived or entity["_key"] in self._stored()
+        ]
+        positions = bind_vars["positions"]
+        results = []
+        for entity in bind_vars["entities"]:
+            candidates = [
+                doc
+                for doc in archival
+                if doc["_key"] != entity["key"]
+                and (doc["_key"] not in positions or positions[doc["_key"]] < positions[entity["key"]])
+            ]
+            related, projects = [], []
+            for doc in candidates:
+                concepts = doc["Record"]["Data"]["w5h_concepts"]
+                if set(concepts["what"]) & set(entity["what"]):
+                    related.append({"_key": doc["_key"], "intersection_count": 1})
+                if set(concepts["why"]) & set(entity["projects"]):
+                    projects.append({"_key": doc["_key"], "project_matches": 1})
+            results.append({"entity_id": entity["key"], "related": related[:10], "projects": projects[:10]})
+        return results
+
+    def _stored(self):
+        return {
+            doc["_key"] for call in self.recorder._collection.insert_many.call_args_list for doc in call.args[0]
+        }
+
+    def _consolidate(self):
+        stats = {
+            "entities_processed": 0,
+            "entities_consolidated": 0,
+            "already_in_archival": 0,
+            "below_threshold": 0,
+            "errors": 0,
+        }
+        watermark = self.recorder._consolidate_entities_batch(self.long_term_entities, stats)
+        return stats, watermark
+
+    def test_batch_uses_bulk_operations(self):
+        """A batch costs a fixed number of queries, whatever its size."""
+        stats, watermark = self._consolidate()
+
+        assert stats["entities_processed"] == 6
+        assert stats["already_in_archival"] == 1
+        assert stats["below_threshold"] == 1
+        assert stats["entities_consolidated"] == 4
+        assert stats["errors"] == 0
+        assert watermark == {"timestamp": "2025-01-01T00:00:05+00:00", "key": self.keys[5]}
+
+        # archival keys, entities, relationships, metadata, long-term flags
+        assert len(self.queries) == 5
+        self.recorder._collection.insert_many.assert_called_once()
+        self.knowledge_graph.insert_many.assert_called_once()
+        edges = self.knowledge_graph.insert_many.call_args.args[0]
+        assert {edge["type"] for edge in edges} == {"semantically_related", "project_related"}
+
+        # Each stored entity relates to the archived entity and to those stored before it, never both ways
+        pairs = [(edge["_from"], edge["_to"]) for edge in edges if edge["type"] == "semantically_related"]
+        assert len(pairs) == 1 + 2 + 3 + 4
+        assert len({frozenset(pair) for pair in pairs}) == len(pairs)
+
+        marked = self.recorder._db._arangodb.aql.execute.call_args.kwargs["bind_vars"]["entity_ids"]
+        assert sorted(marked) == sorted([self.keys[0], *self.keys[2:]])
+
+    def test_failed_insert_holds_back_watermark(self):
+        """The watermark stops before the first entity that could not be stored."""
+        failed = self.keys[3]
+        self.recorder._collection.insert_many.side_effect = lambda docs: [
+            ValueError("conflict") if doc["_key"] == failed else {"_key": doc["_key"]} for doc in docs
+        ]
+
+        stats, watermark = self._consolidate()
+
+        assert stats["errors"] == 1
+        assert stats["entities_consolidated"] == 3
+        assert watermark["key"] == self.keys[2]
+        marked = self.recorder._db._arangodb.aql.execute.call_args.kwargs["bind_vars"]["entity_ids"]
+        assert failed not in marked
+
+    def test_failed_entity_lookup_holds_back_watermark(self):
+        """Entities whose documents could not be read are failed, not skipped."""
+        execute = self._execute
+
+        def failing_execute(query, bind_vars):
+            if "@entity_collection" in bind_vars:
+                raise ConnectionError("database unavailable")
+            return execute(query, bind_vars)
+
+        self.recorder._db._arangodb.aql.execute.side_effect = failing_execute
+
+        stats, watermark = self._consolidate()
+
+        assert stats["errors"] == 5
+        assert stats["entities_consolidated"] == 0
+        assert watermark == {"timestamp": "2025-01-01T00:00:00+00:00", "key": self.keys[0]}
+        self.recorder._collection.insert_many.assert_not_called()
+
+    def test_watermark_follows_last_update(self):
+        """The watermark is the time an entity last changed, so a later change is seen again."""
+        self.long_term_entities[5]["Record"]["Data"]["last_updated"] = "2025-03-01T00:00:00+00:00"
+
+        _, watermark = self._consolidate()
+
+        assert watermark == {"timestamp": "2025-03-01T00:00:00+00:00", "key": self.keys[5]}
+
+    def test_entity_documents_are_read_fresh(self):
+        """Entity documents change as activities arrive, so each lookup reads the current one."""
+        key = self.keys[2]
+        assert self.recorder._get_entities_from_entity_collection([key])[key]["file_path"] == "file"
+        self.entity_path = "renamed"
+        assert self.recorder._get_entities_from_entity_collection([key, key])[key]["file_path"] == "renamed"
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+"""
+Unit tests for incremental memory consolidation.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+from unittest.mock import MagicMock
+
+
+# Set up environment
+if os.environ.get("INDALEKO_ROOT") is None:
+    current_path = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.exists(os.path.join(current_path, "Indaleko.py")):
+        current_path = os.path.dirname(current_path)
+    os.environ["INDALEKO_ROOT"] = current_path
+    sys.path.append(current_path)
+
+# pylint: disable=wrong-import-position
+from activity.recorders.storage.ntfs.memory.consolidation_state import ConsolidationState
+from activity.recorders.storage.ntfs.memory.memory_consolidation import MemoryConsolidationManager
+
+
+# pylint: enable=wrong-import-position
+
+
+class MockSourceTier:
+    """A source tier whose consolidate method pages through entities by watermark."""
+
+    def __init__(self, count):
+        """Create count entities with increasing consolidation dates."""
+        self.entities = [(f"2025-01-01T00:00:{i // 2:02d}+00:00", f"key{i:03d}") for i in range(count)]
+        self.calls = []
+
+    def add(self, count):
+        """Add entities after the existing ones."""
+        start = len(self.entities)
+        self.entities += [(f"2025-02-01T00:00:{i:02d}+00:00", f"key{i:03d}") for i in range(start, start + count)]
+
+    def consolidate(self, min_importance, entity_limit, since=None, since_key=None, **kwargs):
+        """Consolidate the next batch after the watermark."""
+        self.calls.append(since)
+        pending = [e for e in self.entities if since is None or e > (since, since_key)][:entity_limit]
+        stats = {"entities_found": len(pending), "entities_processed": len(pending), "entities_consolidated": 0}
+        if pending:
+            stats["watermark"] = {"timestamp": pending[-1][0], "key": pending[-1][1]}
+        return stats
+
+
+class TestIncrementalConsolidation(unittest.TestCase):
+    """Tests for the consolidation watermarks and checkpoint."""
+
+    def setUp(self):
+        """Create a scratch state file."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.state_file = os.path.join(self.temp_dir.name, "consolidation_state.json")
+
+    def tearDown(self):
+        """Remove the scratch directory."""
+        self.temp_dir.cleanup()
+
+    def _manager(self, **kwargs):
+        return MemoryConsolidationManager(state_file=self.state_file, entity_batch_size=4, **kwargs)
+
+    def test_watermark_round_trip(self):
+        """Watermarks persist, and lowering the importance threshold resets them."""
+        state = ConsolidationState(self.state_file)
+        state.advance_watermark("long_term_to_archival", "2025-01-01T00:00:00+00:00", "abc", 0.8, processed=5)
+
+        reloaded = ConsolidationState(self.state_file)
+        watermark = reloaded.get_watermark("long_term_to_archival", 0.8)
+        assert watermark["key"] == "abc"
+        assert watermark["processed"] == 5
+        assert reloaded.get_watermark("long_term_to_archival", 0.9) is not None
+        assert reloaded.get_watermark("long_term_to_archival", 0.5) is None
+
+    def test_stage_only_considers_new_entities(self):
+        """A second pass starts after the entities the first pass considered."""
+        tier = MockSourceTier(10)
+        stats = self._manager()._run_stage("long_term_to_archival", tier.consolidate, 0.8)
+        assert stats["entities_processed"] == 10
+        assert stats["batches"] == 3
+
+        tier.add(3)
+        tier.calls.clear()
+        stats = self._manager()._run_stage("long_term_to_archival", tier.consolidate, 0.8)
+        assert stats["entities_processed"] == 3
+        assert tier.calls[0] == tier.entities[9][0]
+
+        stats = self._manager(incremental=False)._run_stage("long_term_to_archival", tier.consolidate, 0.8)
+        assert stats["entities_processed"] == 4  # one full-scan batch
+
+    def test_interrupted_run_resumes(self):
+        """consolidate_all skips the stages an interrupted run completed."""
+        state = ConsolidationState(self.state_file)
+        state.begin_run()
+        state.complete_stage("sensory_to_short_term")
+
+        manager = self._manager()
+        manager.consolidate_sensory_to_short_term = MagicMock(return_value={})
+        manager.consolidate_short_term_to_long_term = MagicMock(return_value={"entities_consolidated": 2})
+        manager.consolidate_long_term_to_archival = MagicMock(return_value={"entities_consolidated": 1})
+        manager._initialize_recorders = MagicMock()
+        results = manager.consolidate_all()
+
+        manager.consolidate_sensory_to_short_term.assert_not_called()
+        assert results["sensory_to_short_term"]["status"] == "completed_in_interrupted_run"
+        assert results["total_entities_consolidated"] == 3
+        assert ConsolidationState(self.state_file).get_state()["run"] is None
+
+    def test_failed_stage_is_not_completed(self):
+        """A stage that returned an error is retried when an interrupted run resumes."""
+        manager = self._manager()
+        manager.consolidate_sensory_to_short_term = MagicMock(return_value={"entities_consolidated": 2})
+        manager.consolidate_short_term_to_long_term = MagicMock(return_value={"error": "database unavailable"})
+        manager.consolidate_long_term_to_archival = MagicMock(side_effect=KeyboardInterrupt)
+        manager._initialize_recorders = MagicMock()
+        with self.assertRaises(KeyboardInterrupt):
+            manager.consolidate_all()
+
+        run = ConsolidationState(self.state_file).get_state()["run"]
+        assert run["completed_stages"] == ["sensory_to_short_term"]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+"""
+Unit tests for the batch scoring paths of the ImportanceScorer.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+import unittest
+
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+
+
+# Set up environment
+if os.environ.get("INDALEKO_ROOT") is None:
+    current_path = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.exists(os.path.join(current_path, "Indaleko.py")):
+        current_path = os.path.dirname(current_path)
+    os.environ["INDALEKO_ROOT"] = current_path
+    sys.path.append(current_path)
+
+# pylint: disable=wrong-import-position
+from activity.recorders.storage.ntfs.memory.importance_scorer import ImportanceScorer
+
+
+# pylint: enable=wrong-import-position
+
+
+class TestImportanceScorerBatch(unittest.TestCase):
+    """Tests that the batch paths agree with the scalar ones."""
+
+    def setUp(self):
+        """Create a scorer and activities covering each scoring branch."""
+        self.scorer = ImportanceScorer()
+        now = datetime.now(UTC)
+        self.activities = [
+            {
+                "file_path": "C:\\Users\\Documents\\Project\\report.docx",
+                "activity_type": "modify",
+                "timestamp": now.isoformat(),
+                "attributes": {"usn_reason": ["DATA_OVERWRITE", "DATA_EXTEND"], "rename_type": "new_name"},
+            },
+            {
+                "file_path": "C:\\Users\\Downloads\\setup.exe",
+                "activity_type": "CREATE",
+                "timestamp": (now - timedelta(days=1)).isoformat(),
+                "file_size": 5 * 1024 * 1024,
+                "importance_boost": 0.5,
+            },
+            {
+                "file_path": "C:\\Windows\\Temp\\temp12345.dat",
+                "activity_type": "delete",
+                "timestamp": (now - timedelta(days=30)).replace(tzinfo=None),
+                "file_size": 100,
+                "attributes": {"usn_reason": ["FILE_CREATE"], "usn_reason_simplified": "security_change"},
+            },
+            {
+                "file_path": "C:\\Users",
+                "activity_type": "rename",
+                "is_directory": True,
+                "search_hits": 5,
+            },
+            {
+                "file_path": "C:\\Users\\Projects\\Source\\main.py",
+                "activity_type": "unexpected",
+                "timestamp": "not a timestamp",
+                "search_hits": 50,
+            },
+            {},
+        ]
+
+    def test_batch_matches_scalar(self):
+        """calculate_importance_batch gives the calculate_importance scores."""
+        expected = [self.scorer.calculate_importance(activity) for activity in self.activities]
+        scores = self.scorer.calculate_importance_batch(self.activities)
+
+        np.testing.assert_allclose(scores, expected, rtol=0, atol=1e-9)
+        assert scores[-1] == 0.0
+
+    def test_batch_from_columns(self):
+        """Columns, including POSIX-second timestamps, score like the activities."""
+        now = datetime.now(UTC)
+        columns = {
+            "file_path": ["C:\\Users\\Documents\\a.pdf", "C:\\Temp\\b.tmp"],
+            "activity_type": ["create", "close"],
+            "timestamp": np.array([now.timestamp(), np.nan]),
+        }
+        activities = [
+            {"file_path": "C:\\Users\\Documents\\a.pdf", "activity_type": "create", "timestamp": now.isoformat()},
+            {"file_path": "C:\\Temp\\b.tmp", "activity_type": "close"},
+        ]
+        expected = [self.scorer.calculate_importance(activity) for activity in activities]
+
+        np.testing.assert_allclose(self.scorer.calculate_importance_batch(columns, now=now), expected, atol=1e-9)
+        assert len(self.scorer.calculate_importance_batch([])) == 0
+
+    def test_decay_batch_matches_scalar(self):
+        """calculate_importance_decay_batch gives the calculate_importance_decay scores."""
+        importance = np.array([0.1, 0.35, 0.6, 0.9, 1.0])
+        age_days = np.array([0.0, 1.5, 30.0, 365.0, 3650.0])
+        access_count = np.array([0, 3, 10, 25, 1])
+        expected = [
+            self.scorer.calculate_importance_decay(i, a, int(c))
+            for i, a, c in zip(importance, age_days, access_count, strict=True)
+        ]
+
+        np.testing.assert_allclose(
+            self.scorer.calculate_importance_decay_batch(importance, age_days, access_count),
+            expected,
+            rtol=1e-12,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
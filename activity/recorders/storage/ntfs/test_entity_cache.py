@@ -0,0 +1,107 @@
+"""
+Tests for the bounded entity cache shared by the NTFS recorders.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+import uuid
+
+
+if os.environ.get("INDALEKO_ROOT") is None:
+    current_path = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.exists(os.path.join(current_path, "Indaleko.py")):
+        current_path = os.path.dirname(current_path)
+    os.environ["INDALEKO_ROOT"] = current_path
+    sys.path.append(current_path)
+
+# pylint: disable=wrong-import-position
+from activity.recorders.storage.ntfs.entity_cache import NtfsEntityCache
+
+
+# pylint: enable=wrong-import-position
+
+
+class TestNtfsEntityCache(unittest.TestCase):
+    """Tests for the NtfsEntityCache class."""
+
+    def setUp(self):
+        """Create a scratch directory for snapshots."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.snapshot_file = os.path.join(self.temp_dir.name, "entity_cache.json")
+
+    def tearDown(self):
+        """Remove the scratch directory."""
+        self.temp_dir.cleanup()
+
+    def test_evicts_least_recently_used(self):
+        """The least recently used entry is evicted once the cache is full."""
+        cache = NtfsEntityCache(max_entries=2)
+        first, second, third = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        cache.put("C:1", first)
+        cache.put("C:2", second)
+        assert cache.get("C:1") == first  # C:2 is now the least recently used
+        cache.put("C:3", third)
+
+        assert len(cache) == 2
+        assert "C:2" not in cache
+        assert cache.get("C:1") == first
+        assert cache.get("C:3") == third
+        assert cache.evictions == 1
+
+    def test_stats(self):
+        """Hits, misses and the hit rate are counted."""
+        cache = NtfsEntityCache(max_entries=10)
+        cache.put("C:1", uuid.uuid4())
+        cache.get("C:1")
+        cache.get("C:1")
+        cache.get("C:2")
+
+        stats = cache.get_stats()
+        assert stats["entries"] == 1
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 2 / 3
+
+    def test_snapshot_round_trip(self):
+        """A saved cache warms a new one, keeping the most recently used entries."""
+        cache = NtfsEntityCache(max_entries=10, snapshot_file=self.snapshot_file, save_on_exit=False)
+        entries = {f"C:{frn}": uuid.uuid4() for frn in range(5)}
+        for key, value in entries.items():
+            cache.put(key, value)
+        assert cache.save()
+
+        warmed = NtfsEntityCache(max_entries=3, snapshot_file=self.snapshot_file, save_on_exit=False)
+        assert len(warmed) == 3
+        assert "C:0" not in warmed
+        for key in ("C:2", "C:3", "C:4"):
+            assert warmed.get(key) == entries[key]
+
+    def test_bad_snapshot_is_ignored(self):
+        """A corrupt snapshot leaves the cache empty rather than failing."""
+        with open(self.snapshot_file, "w", encoding="utf-8") as f:
+            f.write("{not json")
+
+        cache = NtfsEntityCache(snapshot_file=self.snapshot_file, save_on_exit=False)
+        assert len(cache) == 0
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,296 @@
+#!/usr/bin/env python
+"""
+Streaming JSONL loader for the NTFS Hot Tier Recorder.
+
+process_jsonl_file reads a whole capture into memory before storing it,
+which does not scale to backfilling days of USN journal activity.  This
+loader instead:
+
+- Splits the file into byte ranges that end on line boundaries
+- Parses and validates each range in a worker process (with orjson when it
+  is installed), so JSON decoding and pydantic validation use every core
+- Keeps only a bounded number of ranges in flight, so a slow database
+  applies back-pressure to the readers instead of filling memory
+- Stores each range through the recorder's batch path, in file order
+- Records the byte offset after each fully stored range in a checkpoint file,
+  so an interrupted load resumes where it stopped (and a load of a file
+  that has since grown picks up only the new activities)
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+
+from collections import Counter, deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from datetime import UTC, datetime
+from typing import Any
+
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Set up environment
+if os.environ.get("INDALEKO_ROOT") is None:
+    current_path = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.exists(os.path.join(current_path, "Indaleko.py")):
+        current_path = os.path.dirname(current_path)
+    os.environ["INDALEKO_ROOT"] = current_path
+    sys.path.append(current_path)
+
+# pylint: disable=wrong-import-position
+from activity.collectors.storage.data_models.storage_activity_data_model import (
+    NtfsStorageActivityData,
+)
+
+
+# pylint: enable=wrong-import-position
+
+
+def parse_jsonl_chunk(file_path: str, start: int, end: int) -> dict[str, Any]:
+    """
+    Parse and validate the activities in bytes [start, end) of a JSONL file.
+
+    This runs in the worker processes.  start and end must lie on line
+    boundaries.
+
+    Returns:
+        Dictionary with the validated activities, the number of lines that
+        could not be parsed or validated, and the count of each activity type
+    """
+    loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+    activities = []
+    errors = 0
+    activity_counts = Counter()
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    for line in data.splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = loads(line)
+            activity = NtfsStorageActivityData(**record)
+        except Exception:  # noqa: BLE001 - a bad line must not fail the chunk
+            errors += 1
+            continue
+        activities.append(activity)
+        activity_counts[str(record.get("activity_type", "unknown"))] += 1
+    return {
+        "activities": activities,
+        "errors": errors,
+        "activity_counts": dict(activity_counts),
+    }
+
+
+class NtfsHotTierJsonlLoader:
+    """Load a JSONL capture into the hot tier with parallel parsing and checkpoints."""
+
+    DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024  # bytes of JSONL per worker task
+    DEFAULT_MAX_PENDING_PER_WORKER = 2  # chunks in flight per worker
+    PROGRESS_INTERVAL = 10.0  # seconds between progress log messages
+
+    def __init__(
+        self,
+        recorder: Any,
+        workers: int | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_pending: int | None = None,
+        checkpoint: bool = True,
+    ) -> None:
+        """
+        Set up the loader.
+
+        Args:
+            recorder: The hot tier recorder the activities are stored through
+            workers: Number of parser processes (default: the CPU count)
+            chunk_size: Approximate bytes of JSONL handed to each worker task
+            max_pending: Maximum chunks parsed ahead of the database (default: 2 per worker)
+            checkpoint: Whether to resume from, and update, the checkpoint file
+        """
+        self._logger = logging.getLogger("NtfsHotTierJsonlLoader")
+        self.recorder = recorder
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.chunk_size = max(1, chunk_size)
+        self.max_pending = max(1, max_pending or self.workers * self.DEFAULT_MAX_PENDING_PER_WORKER)
+        self.checkpoint = checkpoint
+
+    @staticmethod
+    def checkpoint_file(file_path: str) -> str:
+        """Return the checkpoint file used for a JSONL file."""
+        return f"{file_path}.checkpoint"
+
+    def read_checkpoint(self, file_path: str) -> int:
+        """Return the byte offset to resume the file from (0 if there is no usable checkpoint)."""
+        checkpoint_file = self.checkpoint_file(file_path)
+        if not self.checkpoint or not os.path.exists(checkpoint_file):
+            return 0
+        try:
+            with open(checkpoint_file, encoding="utf-8") as f:
+                offset = int(json.load(f)["offset"])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self._logger.warning(f"Ignoring checkpoint {checkpoint_file}: {e}")
+            return 0
+        if offset > os.path.getsize(file_path):
+            # The file has been replaced by a shorter one
+            self._logger.warning(f"Ignoring checkpoint {checkpoint_file}: offset is past the end of the file")
+            return 0
+        return offset
+
+    def write_checkpoint(self, file_path: str, offset: int, loaded_activities: int) -> None:
+        """Atomically record that everything before offset has been stored."""
+        if not self.checkpoint:
+            return
+        checkpoint_file = self.checkpoint_file(file_path)
+        temp_file = f"{checkpoint_file}.tmp"
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "file": os.path.abspath(file_path),
+                    "offset": offset,
+                    "loaded_activities": loaded_activities,
+                    "updated": datetime.now(UTC).isoformat(),
+                },
+                f,
+            )
+        os.replace(temp_file, checkpoint_file)
+
+    def split_file(self, file_path: str, start: int = 0) -> list[tuple[int, int]]:
+        """
+        Split the file, from start, into byte ranges ending on line boundaries.
+
+        A trailing partial line (one still being written) is left for the
+        next load.
+        """
+        ranges = []
+        with open(file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            while start < size:
+                target = start + self.chunk_size
+                complete = False
+                if target < size:
+                    # Extend the range to the end of the line containing target
+                    f.seek(target - 1)
+                    complete = f.readline().endswith(b"\n")
+                    end = f.tell()
+                if not complete:
+                    # Only complete lines are loaded
+                    f.seek(start)
+                    end = start + f.read(size - start).rfind(b"\n") + 1
+                    if end <= start:
+                        break
+                ranges.append((start, end))
+                start = end
+        return ranges
+
+    def load(self, file_path: str, executor: Executor | None = None) -> dict[str, Any]:
+        """
+        Load a JSONL file into the hot tier.
+
+        Args:
+            file_path: Path to the JSONL file
+            executor: Executor to parse with (default: a process pool of the configured size)
+
+        Returns:
+            Dictionary with the load statistics, including records_per_second
+
+        Raises:
+            RuntimeError: If the recorder stores fewer activities than it was
+                given.  The checkpoint is left at the end of the last fully
+                stored range, so the next load retries the failed range.
+        """
+        start_offset = self.read_checkpoint(file_path)
+        if start_offset:
+            self._logger.info(f"Resuming {file_path} from byte offset {start_offset}")
+        ranges = self.split_file(file_path, start_offset)
+
+        stats = {
+            "file_path": file_path,
+            "start_offset": start_offset,
+            "offset": start_offset,
+            "total_activities": 0,
+            "loaded_activities": 0,
+            "parse_errors": 0,
+            "activity_counts": Counter(),
+        }
+        start_time = time.time()
+        last_progress = start_time
+
+        owns_executor = executor is None
+        if owns_executor:
+            executor = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            pending: deque[tuple[int, Future]] = deque()
+            next_range = 0
+            while next_range < len(ranges) or pending:
+                # Keep the workers busy, but never more than max_pending chunks ahead
+                while next_range < len(ranges) and len(pending) < self.max_pending:
+                    start, end = ranges[next_range]
+                    pending.append((end, executor.submit(parse_jsonl_chunk, file_path, start, end)))
+                    next_range += 1
+
+                # Store chunks in file order so the checkpoint only ever moves past stored data
+                end, future = pending.popleft()
+                chunk = future.result()
+                activities = chunk["activities"]
+                stats["total_activities"] += len(activities) + chunk["errors"]
+                stats["parse_errors"] += chunk["errors"]
+                stats["activity_counts"].update(chunk["activity_counts"])
+                if activities:
+                    stored = self.recorder.store_activities(activities) or []
+                    stats["loaded_activities"] += len(stored)
+                    if len(stored) != len(activities):
+                        # Moving the checkpoint now would skip the activities that were not stored
+                        msg = (
+                            f"{file_path}: stored {len(stored)} of {len(activities)} activities "
+                            f"ending at byte offset {end}; checkpoint left at byte offset {stats['offset']}"
+                        )
+                        self._logger.error(msg)
+                        raise RuntimeError(msg)
+                stats["offset"] = end
+                self.write_checkpoint(file_path, end, stats["loaded_activities"])
+
+                now = time.time()
+                if now - last_progress >= self.PROGRESS_INTERVAL:
+                    last_progress = now
+                    self._logger.info(
+                        f"{file_path}: {stats['loaded_activities']} activities loaded "
+                        f"({stats['loaded_activities'] / (now - start_time):.1f}/s), "
+                        f"{end - start_offset} bytes read",
+                    )
+        finally:
+            if owns_executor:
+                executor.shutdown(cancel_futures=True)
+
+        processing_time = time.time() - start_time
+        stats["activity_counts"] = dict(stats["activity_counts"])
+        stats["processing_time"] = processing_time
+        stats["records_per_second"] = stats["loaded_activities"] / processing_time if processing_time > 0 else 0.0
+        self._logger.info(
+            f"Loaded {stats['loaded_activities']} of {stats['total_activities']} activities from {file_path} "
+            f"in {processing_time:.1f}s ({stats['records_per_second']:.1f} records/s, "
+            f"{stats['parse_errors']} parse errors)",
+        )
+        return stats
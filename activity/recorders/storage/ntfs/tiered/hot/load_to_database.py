@@ -53,6 +53,7 @@ if os.environ.get("INDALEKO_ROOT") is None:
     sys.path.append(current_path)
 
 # Import the recorder and database components
+from activity.recorders.storage.ntfs.tiered.hot.jsonl_loader import NtfsHotTierJsonlLoader
 from activity.recorders.storage.ntfs.tiered.hot.recorder import NtfsHotTierRecorder
 from db.db_config import IndalekoDBConfig
 
@@ -304,6 +305,7 @@ def create_hot_tier_recorder(
     collection_name: str | None = None,
     simulate: bool = False,
     dry_run: bool = False,
+    batch_size: int = NtfsHotTierRecorder.DEFAULT_BATCH_SIZE,
 ) -> NtfsHotTierRecorder:
     """
     Create a hot tier recorder instance connected to the database.
@@ -315,6 +317,7 @@ def create_hot_tier_recorder(
         collection_name: Optional custom collection name
         simulate: If True, create recorder in simulation mode
         dry_run: If True, configure for dry run (analyze only)
+        batch_size: Number of activities written per database batch
 
     Returns:
         NtfsHotTierRecorder instance
@@ -322,6 +325,7 @@ def create_hot_tier_recorder(
     # Create recorder with database connection
     kwargs = {
         "ttl_days": ttl_days,
+        "batch_size": batch_size,
         "debug": debug,
         "no_db": simulate or dry_run or (db_config is None),  # No DB if simulating or dry run
         "register_service": not (simulate or dry_run),  # Don't register in simulation modes
@@ -352,6 +356,9 @@ def load_activities_to_database(
     recorder: NtfsHotTierRecorder,
     file_path: str,
     dry_run: bool = False,
+    workers: int | None = None,
+    chunk_size: int = NtfsHotTierJsonlLoader.DEFAULT_CHUNK_SIZE,
+    resume: bool = True,
 ) -> dict[str, Any]:
     """
     Load NTFS activities from a JSONL file into the database.
@@ -360,12 +367,38 @@ def load_activities_to_database(
         recorder: Hot tier recorder instance
         file_path: Path to JSONL file with activities
         dry_run: If True, just analyze file but don't load to database
+        workers: Number of parser processes (default: the CPU count)
+        chunk_size: Bytes of JSONL parsed per worker task
+        resume: If True, resume from (and update) the file's checkpoint
 
     Returns:
         Dictionary with processing statistics
     """
     os.path.basename(file_path)
 
+    # Process the file with real database connection
+    if not dry_run and not getattr(recorder, "_no_db", False) and getattr(recorder, "_db", None) is not None:
+        try:
+            loader = NtfsHotTierJsonlLoader(
+                recorder,
+                workers=workers,
+                chunk_size=chunk_size,
+                checkpoint=resume,
+            )
+            return loader.load(file_path)
+        except Exception as e:
+            import traceback
+
+            traceback.print_exc()
+
+            return {
+                "file_path": file_path,
+                "error": str(e),
+                "total_activities": 0,
+                "loaded_activities": 0,
+                "activity_counts": {},
+            }
+
     # Get activity counts from file
     activity_counts = count_activities_in_jsonl(file_path)
 
@@ -385,64 +418,30 @@ def load_activities_to_database(
             "activity_counts": activity_counts["activity_counts"],
         }
 
-    # Handle simulation mode (no database connection) or if the recorder is set up for no_db
-    if getattr(recorder, "_no_db", False) or not hasattr(recorder, "_db") or recorder._db is None:
-        success = activity_counts["total_lines"]
-        # Generate some fake IDs
-        activity_ids = []
-        for _ in range(min(10, success)):
-            activity_ids.append(uuid.uuid4())
+    # Otherwise this is simulation mode (no database connection) or the recorder is set up for no_db
+    success = activity_counts["total_lines"]
+    # Generate some fake IDs
+    activity_ids = []
+    for _ in range(min(10, success)):
+        activity_ids.append(uuid.uuid4())
 
-        # Simulate processing time
-        time.sleep(0.05)  # Add a small delay to simulate processing
-        end_time = time.time()
-        processing_time = end_time - start_time
-
-        if processing_time > 0:
-            pass
-
-        return {
-            "file_path": file_path,
-            "total_activities": activity_counts["total_lines"],
-            "loaded_activities": success,
-            "processing_time": processing_time,
-            "activity_ids": activity_ids,
-            "activity_counts": activity_counts["activity_counts"],
-            "simulated": True,
-        }
-
-    # Process the file with real database connection
-    try:
-        # Process the file
-        activity_ids = recorder.process_jsonl_file(file_path)
-        success = len(activity_ids) if activity_ids else 0
-
-        end_time = time.time()
-        processing_time = end_time - start_time
-
-        if processing_time > 0:
-            pass
-
-        return {
-            "file_path": file_path,
-            "total_activities": activity_counts["total_lines"],
-            "loaded_activities": success,
-            "processing_time": processing_time,
-            "activity_ids": activity_ids,
-            "activity_counts": activity_counts["activity_counts"],
-        }
-    except Exception as e:
-        import traceback
+    # Simulate processing time
+    time.sleep(0.05)  # Add a small delay to simulate processing
+    end_time = time.time()
+    processing_time = end_time - start_time
 
-        traceback.print_exc()
+    if processing_time > 0:
+        pass
 
-        return {
-            "file_path": file_path,
-            "error": str(e),
-            "total_activities": activity_counts["total_lines"],
-            "loaded_activities": 0,
-            "activity_counts": activity_counts["activity_counts"],
-        }
+    return {
+        "file_path": file_path,
+        "total_activities": activity_counts["total_lines"],
+        "loaded_activities": success,
+        "processing_time": processing_time,
+        "activity_ids": activity_ids,
+        "activity_counts": activity_counts["activity_counts"],
+        "simulated": True,
+    }
 
 
 def run_test_queries(
@@ -780,6 +779,10 @@ def parse_arguments():
 
           # Find available JSONL files without processing
           python load_to_database.py --list-files
+
+          # Backfill a large capture with 8 parser processes; rerunning
+          # resumes from the file's .checkpoint
+          python load_to_database.py --file /path/to/ntfs_data.jsonl --workers 8
         """,
         ),
     )
@@ -851,6 +854,32 @@ def parse_arguments():
         help="Skip running test queries",
     )
 
+    # Loader options
+    loader_group = parser.add_argument_group("Loader Options")
+    loader_group.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of parser processes (default: the CPU count)",
+    )
+    loader_group.add_argument(
+        "--chunk-size-mb",
+        type=int,
+        default=NtfsHotTierJsonlLoader.DEFAULT_CHUNK_SIZE // (1024 * 1024),
+        help="MB of JSONL parsed per worker task",
+    )
+    loader_group.add_argument(
+        "--batch-size",
+        type=int,
+        default=NtfsHotTierRecorder.DEFAULT_BATCH_SIZE,
+        help="Number of activities written per database batch",
+    )
+    loader_group.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Ignore checkpoints and load each file from the start",
+    )
+
     # Output options
     output_group = parser.add_argument_group("Output Options")
     output_group.add_argument(
@@ -975,6 +1004,7 @@ def main() -> None:
             collection_name=args.collection,
             simulate=args.simulate,
             dry_run=args.dry_run,
+            batch_size=args.batch_size,
         )
 
         # Process files
@@ -984,6 +1014,9 @@ def main() -> None:
                 recorder,
                 file_path,
                 dry_run=args.dry_run,
+                workers=args.workers,
+                chunk_size=args.chunk_size_mb * 1024 * 1024,
+                resume=not args.no_resume,
             )
             results.append(result)
 
@@ -78,7 +78,9 @@ from activity.recorders.storage.base import StorageActivityRecorder
 from activity.recorders.storage.ntfs.activity_context_integration import (
     NtfsActivityContextIntegration,
 )
+from activity.recorders.storage.ntfs.entity_cache import NtfsEntityCache
 from data_models.semantic_attribute import IndalekoSemanticAttributeDataModel
+from utils.misc.directory_management import indaleko_default_data_dir
 
 
 # Import ServiceManager upfront to avoid late binding issues
@@ -97,6 +99,7 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
 
     # Default settings
     DEFAULT_TTL_DAYS = 4
+    DEFAULT_BATCH_SIZE = 1000
     DEFAULT_RECORDER_ID = uuid.UUID("f4dea3b8-5d3e-48ad-9b2c-0e72c9a1b867")
 
     def __init__(self, **kwargs) -> None:
@@ -111,6 +114,10 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
             debug: Whether to enable debug logging
             no_db: Whether to run without database connection
             transition_enabled: Whether to enable transition to warm tier (not implemented yet)
+            batch_size: Number of activities written per database batch (default: 1000)
+            entity_cache_size: Maximum entries in each entity cache (default: 100000)
+            entity_cache_dir: Directory for the entity cache snapshots, or None to
+                disable them (default: the Indaleko data directory; None with no_db)
         """
         # Configure logging first
         logging.basicConfig(
@@ -119,11 +126,13 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
         self._logger = logging.getLogger("NtfsHotTierRecorder")
 
         # Initialize instance variables
-        self._frn_entity_cache = {}  # Cache of FRN to entity UUID mappings
-        self._path_entity_cache = {}  # Cache of path to entity UUID mappings
+        self._frn_entity_cache = self._create_entity_cache("frn", **kwargs)  # FRN to entity UUID
+        self._path_entity_cache = self._create_entity_cache("path", **kwargs)  # Path to entity UUID
         self._importance_scores = {}  # Cached importance scores
+        self._frn_lookup_stats = {"success": 0, "failed": 0}  # FRN to entity lookup outcomes
         self._ttl_days = kwargs.get("ttl_days", self.DEFAULT_TTL_DAYS)
         self._transition_enabled = kwargs.get("transition_enabled", False)
+        self._batch_size = max(1, kwargs.get("batch_size", self.DEFAULT_BATCH_SIZE))
 
         # Initialize collection names with temporary values
         # They will be properly set after registration with the activity data registration service
@@ -211,6 +220,27 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
             self._setup_collections()
             self._setup_indices()
 
+    def _create_entity_cache(self, name: str, **kwargs) -> NtfsEntityCache:
+        """Create one of the entity caches, warmed from its snapshot if there is one."""
+        default_dir = None if kwargs.get("no_db", False) else indaleko_default_data_dir
+        cache_dir = kwargs.get("entity_cache_dir", default_dir)
+        recorder_id = kwargs.get("recorder_id", self.DEFAULT_RECORDER_ID)
+        snapshot_file = None
+        if cache_dir:
+            snapshot_file = os.path.join(
+                cache_dir,
+                f"ntfs_hot_tier_{str(recorder_id)[:8]}_{name}_entity_cache.json",
+            )
+        return NtfsEntityCache(
+            max_entries=kwargs.get("entity_cache_size", NtfsEntityCache.DEFAULT_MAX_ENTRIES),
+            snapshot_file=snapshot_file,
+        )
+
+    def save_entity_caches(self) -> None:
+        """Snapshot the entity caches (this also happens at interpreter exit)."""
+        self._frn_entity_cache.save()
+        self._path_entity_cache.save()
+
     def _register_with_service_manager(self) -> None:
         """Register with the activity service manager."""
         try:
@@ -408,6 +438,7 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
                 self._logger.warning(
                     f"Could not set up entity collection indices: {e} - continuing anyway",
                 )
+            self._setup_entity_lookup_indices()
             self._logger.info("Finished setting up indices")
 
         except Exception as e:
@@ -415,6 +446,145 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
             if not getattr(self, "_no_db", False):
                 raise
 
+    def _setup_entity_lookup_indices(self) -> None:
+        """
+        Set up the persistent indices used to find an entity by FRN.
+
+        Both lookup keys (see _entity_lookup_keys) get a sparse persistent
+        index, so either lookup is an index seek.  The first time the FrnKey
+        index is created the existing entities are backfilled, since without
+        the keys they could no longer be found.
+        """
+        try:
+            entity_collection = self._db.get_collection(self._entity_collection_name)
+            created = False
+            for field in ("FrnKey", "PathFrnKey"):
+                self._logger.info(f"Ensuring {field} index on entity collection")
+                index = entity_collection.add_persistent_index(
+                    fields=[field],
+                    unique=False,
+                    sparse=True,
+                    name=f"{field}_lookup",
+                )
+                created = created or bool(index.get("new", index.get("isNewlyCreated", False)))
+            if created:
+                self.migrate_entity_lookup_keys()
+        except Exception as e:
+            self._logger.warning(
+                f"Could not set up entity lookup indices: {e} - continuing anyway",
+            )
+
+    @staticmethod
+    def _normalize_volume(volume: str) -> str:
+        """
+        Normalize a volume name for the entity lookup keys.
+
+        Drive letters ("C:", "c:\\") and volume GUIDs (bare, or as a
+        "\\\\?\\Volume{...}" path) each reduce to a single lower case form.
+        """
+        volume = volume.strip().rstrip("\\/").lower()
+        for prefix in ("\\\\?\\volume{", "\\\\.\\volume{"):
+            if volume.startswith(prefix) and volume.endswith("}"):
+                return volume[len(prefix) : -1]
+        return volume
+
+    @classmethod
+    def _path_volume(cls, file_path: str | None) -> str:
+        """Return the normalized volume a path starts with, or "" if it has none."""
+        if not file_path:
+            return ""
+        if len(file_path) >= 2 and file_path[1] == ":":
+            return cls._normalize_volume(file_path[:2])
+        if file_path.startswith(("\\\\?\\", "\\\\.\\")):
+            end = file_path.find("\\", 4)
+            return cls._normalize_volume(file_path if end < 0 else file_path[:end])
+        return ""
+
+    @classmethod
+    def _frn_lookup_key(cls, frn: str, volume: str) -> str:
+        """Return the value both lookup keys are matched against for an FRN."""
+        return f"{cls._normalize_volume(volume)}|{frn}"
+
+    @classmethod
+    def _entity_lookup_keys(cls, frn: str, volume: str | None, file_path: str | None) -> dict[str, str]:
+        """
+        Return the lookup keys stored on an entity document.
+
+        FrnKey is derived from the entity's Volume and PathFrnKey from the
+        volume its LocalPath starts with, so the LocalPath fallback lookup is
+        an equality match rather than a LIKE prefix scan.
+        """
+        keys = {}
+        if frn and volume:
+            keys["FrnKey"] = cls._frn_lookup_key(frn, volume)
+        path_volume = cls._path_volume(file_path)
+        if frn and path_volume:
+            keys["PathFrnKey"] = f"{path_volume}|{frn}"
+        return keys
+
+    def migrate_entity_lookup_keys(self, batch_size: int = 1000) -> int:
+        """
+        Backfill the lookup keys on existing entities.
+
+        This runs automatically when the lookup indices are first created,
+        and can be re-run safely (e.g., with --migrate-entity-keys).
+
+        Args:
+            batch_size: Number of entities updated per query
+
+        Returns:
+            Number of entities updated
+        """
+        # Skip if not connected to database
+        if not hasattr(self, "_db") or self._db is None:
+            return 0
+
+        select_query = """
+            FOR doc IN @@collection
+                FILTER doc.LocalIdentifier != null AND (doc.Volume != null OR doc.LocalPath != null)
+                FILTER doc.FrnKey == null AND doc.PathFrnKey == null
+                RETURN { _key: doc._key, frn: doc.LocalIdentifier, volume: doc.Volume, path: doc.LocalPath }
+        """
+        update_query = """
+            FOR entity IN @entities
+                UPDATE entity IN @@collection
+                OPTIONS { ignoreErrors: true }
+        """
+
+        def flush(entities: list[dict]) -> None:
+            self._db._arangodb.aql.execute(
+                update_query,
+                bind_vars={"@collection": self._entity_collection_name, "entities": entities},
+            )
+
+        self._logger.info(f"Backfilling entity lookup keys in {self._entity_collection_name}")
+        start_time = time.time()
+        migrated = 0
+        pending = []
+        cursor = self._db._arangodb.aql.execute(
+            select_query,
+            bind_vars={"@collection": self._entity_collection_name},
+            batch_size=batch_size,
+            stream=True,
+        )
+        for doc in cursor:
+            keys = self._entity_lookup_keys(str(doc["frn"]), doc.get("volume"), doc.get("path"))
+            if not keys:
+                continue
+            pending.append({"_key": doc["_key"], **keys})
+            if len(pending) >= batch_size:
+                flush(pending)
+                migrated += len(pending)
+                pending = []
+        if pending:
+            flush(pending)
+            migrated += len(pending)
+
+        self._logger.info(
+            f"Backfilled lookup keys on {migrated} entities in {time.time() - start_time:.1f} seconds",
+        )
+        return migrated
+
     def _setup_ttl_index(self) -> None:
         """Set up TTL index for automatic expiration of hot tier data."""
         try:
@@ -615,8 +785,9 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
 
         # First check cache
         cache_key = f"{volume}:{frn}"
-        if cache_key in self._frn_entity_cache:
-            return self._frn_entity_cache[cache_key]
+        entity_id = self._frn_entity_cache.get(cache_key)
+        if entity_id is not None:
+            return entity_id
 
         self._logger.debug(f"Looking up entity for FRN {frn} on volume {volume}")
 
@@ -625,10 +796,11 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
             entity_collection = self._db.get_collection(self._entity_collection_name)
 
             # First try to find entity using standard format from ENTITY_MAPPING.md
-            # which uses LocalIdentifier and Volume fields
+            # (LocalIdentifier + Volume), through its normalized FrnKey
+            lookup_key = self._frn_lookup_key(frn, volume)
             query = """
                 FOR doc IN @@collection
-                FILTER doc.LocalIdentifier == @frn AND doc.Volume == @volume
+                FILTER doc.FrnKey == @lookup_key
                 LIMIT 1
                 RETURN doc
             """
@@ -637,8 +809,7 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
                 query,
                 bind_vars={
                     "@collection": self._entity_collection_name,
-                    "frn": frn,
-                    "volume": volume,
+                    "lookup_key": lookup_key,
                 },
             )
 
@@ -651,31 +822,29 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
             if entity:
                 # Store in cache and return
                 entity_id = uuid.UUID(entity["_key"])
-                self._frn_entity_cache[cache_key] = entity_id
+                self._frn_entity_cache.put(cache_key, entity_id)
                 self._logger.debug(
                     f"Found existing entity with ID {entity_id} for FRN {frn} using LocalIdentifier field",
                 )
                 return entity_id
 
             # If not found with standard format, try with LocalPath as a fallback
-            # This provides a second lookup path if needed
+            # This provides a second lookup path if needed: PathFrnKey holds the
+            # volume that LocalPath starts with (e.g., the drive letter "C:")
             query = """
                 FOR doc IN @@collection
-                FILTER doc.LocalIdentifier == @frn AND doc.LocalPath LIKE CONCAT(@volume, '%')
+                FILTER doc.PathFrnKey == @lookup_key
                 LIMIT 1
                 RETURN doc
             """
 
             # Time the query execution
-            import time
-
             start_time = time.time()
             cursor = self._db._arangodb.aql.execute(
                 query,
                 bind_vars={
                     "@collection": self._entity_collection_name,
-                    "frn": frn,
-                    "volume": volume,  # This will be the drive letter like "C:" for the fallback query
+                    "lookup_key": lookup_key,
                 },
             )
             query_time = time.time() - start_time
@@ -695,7 +864,7 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
             if entity:
                 # Store in cache and return
                 entity_id = uuid.UUID(entity["_key"])
-                self._frn_entity_cache[cache_key] = entity_id
+                self._frn_entity_cache.put(cache_key, entity_id)
                 self._logger.debug(
                     f"Found existing entity with ID {entity_id} for FRN {frn} using LocalPath fallback",
                 )
@@ -703,11 +872,11 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
 
             # Check if we have a matching path
             path_key = f"{volume}:{file_path}"
-            if path_key in self._path_entity_cache:
-                entity_id = self._path_entity_cache[path_key]
+            entity_id = self._path_entity_cache.get(path_key)
+            if entity_id is not None:
                 # Update with FRN mapping
                 self._update_entity_frn(entity_id, frn, volume)
-                self._frn_entity_cache[cache_key] = entity_id
+                self._frn_entity_cache.put(cache_key, entity_id)
                 self._logger.debug(f"Found entity by path with ID {entity_id}")
                 return entity_id
 
@@ -715,27 +884,13 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
             entity_id = uuid.uuid4()
             self._logger.debug(f"Creating new entity with ID {entity_id} for FRN {frn}")
 
-            # Create entity document with both standard top-level fields AND Properties
-            # This ensures compatibility with both lookup patterns
-            entity_doc = {
-                "_key": str(entity_id),
-                "Label": (os.path.basename(file_path) if file_path else f"Object-{str(entity_id)[:8]}"),
-                # Add standard ENTITY_MAPPING.md fields at top level
-                "LocalIdentifier": frn,
-                "Volume": volume,
-                "LocalPath": file_path,
-                "CreatedTimestamp": datetime.now(UTC).isoformat(),
-                "ModifiedTimestamp": datetime.now(UTC).isoformat(),
-                # Keep Properties for backward compatibility
-                "Properties": {
-                    "file_reference_number": frn,
-                    "volume": volume,
-                    "file_path": file_path,
-                    "is_directory": is_directory,
-                    "last_accessed": datetime.now(UTC).isoformat(),
-                    "deleted": False,
-                },
-            }
+            entity_doc = self._new_entity_document(
+                entity_id,
+                frn,
+                volume,
+                file_path,
+                is_directory,
+            )
 
             self._logger.debug(
                 f"Inserting entity into collection {self._entity_collection_name}",
@@ -745,8 +900,8 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
                 self._logger.debug("Entity created successfully")
 
                 # Cache the mapping
-                self._frn_entity_cache[cache_key] = entity_id
-                self._path_entity_cache[path_key] = entity_id
+                self._frn_entity_cache.put(cache_key, entity_id)
+                self._path_entity_cache.put(path_key, entity_id)
 
                 return entity_id
             except Exception as insert_error:
@@ -761,6 +916,55 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
             self._logger.debug(f"Using fallback UUID: {fallback_id}")
             return fallback_id
 
+    @classmethod
+    def _new_entity_document(
+        cls,
+        entity_id: uuid.UUID,
+        frn: str,
+        volume: str,
+        file_path: str,
+        is_directory: bool,
+    ) -> dict:
+        """
+        Build the document for a newly created entity.
+
+        The document carries both the standard top-level fields from
+        ENTITY_MAPPING.md and the legacy Properties, so that both lookup
+        patterns find it.
+
+        Args:
+            entity_id: Entity UUID
+            frn: File reference number
+            volume: Volume name
+            file_path: File path
+            is_directory: Whether the entity is a directory
+
+        Returns:
+            Entity document
+        """
+        now = datetime.now(UTC).isoformat()
+        return {
+            "_key": str(entity_id),
+            "Label": (os.path.basename(file_path) if file_path else f"Object-{str(entity_id)[:8]}"),
+            # Add standard ENTITY_MAPPING.md fields at top level
+            "LocalIdentifier": frn,
+            "Volume": volume,
+            "LocalPath": file_path,
+            # Normalized keys for the indexed FRN lookups
+            **cls._entity_lookup_keys(frn, volume, file_path),
+            "CreatedTimestamp": now,
+            "ModifiedTimestamp": now,
+            # Keep Properties for backward compatibility
+            "Properties": {
+                "file_reference_number": frn,
+                "volume": volume,
+                "file_path": file_path,
+                "is_directory": is_directory,
+                "last_accessed": now,
+                "deleted": False,
+            },
+        }
+
     def _update_entity_frn(self, entity_id: uuid.UUID, frn: str, volume: str) -> None:
         """
         Update entity with a new FRN.
@@ -783,6 +987,7 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
                 UPDATE @entity_id WITH {
                     LocalIdentifier: @frn,
                     Volume: @volume,
+                    FrnKey: @lookup_key,
                     Properties: {
                         file_reference_number: @frn,
                         volume: @volume
@@ -799,6 +1004,7 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
                     "entity_id": str(entity_id),
                     "frn": frn,
                     "volume": volume,
+                    "lookup_key": self._frn_lookup_key(frn, volume),
                     "timestamp": datetime.now(UTC).isoformat(),
                 },
             )
@@ -875,8 +1081,7 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
                 try:
                     query = """
                         FOR doc IN @@collection
-                        FILTER doc.LocalIdentifier == @frn
-                           AND doc.Volume == @volume
+                        FILTER doc.FrnKey == @lookup_key
                         LIMIT 1
                         RETURN doc
                     """
@@ -889,8 +1094,7 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
                         query,
                         bind_vars={
                             "@collection": self._entity_collection_name,
-                            "frn": frn,
-                            "volume": volume,
+                            "lookup_key": self._frn_lookup_key(frn, volume),
                         },
                     )
                     query_time = time.time() - start_time
@@ -924,13 +1128,13 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
 
                             # Update our cache with the correct mapping
                             cache_key = f"{volume}:{frn}"
-                            self._frn_entity_cache[cache_key] = entity_id
+                            self._frn_entity_cache.put(cache_key, entity_id)
 
                             # Also update path cache if path available
                             file_path = activity_data.get("file_path", "")
                             if file_path:
                                 path_key = f"{volume}:{file_path}"
-                                self._path_entity_cache[path_key] = entity_id
+                                self._path_entity_cache.put(path_key, entity_id)
 
                 except Exception as lookup_error:
                     self._logger.exception(
@@ -1048,7 +1252,7 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
                 # Update path cache if volume information available
                 volume = activity_data.get("volume_name", "")
                 if volume:
-                    self._path_entity_cache[f"{volume}:{new_path}"] = entity_id
+                    self._path_entity_cache.put(f"{volume}:{new_path}", entity_id)
 
             elif activity_type == "create":
                 # For create, ensure the entity is marked as not deleted
@@ -1113,15 +1317,15 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
             self._logger.debug(f"Error details: {traceback.format_exc()}")
             # Continue execution - don't let metadata updates block activity recording
 
-    def _enhance_activity_data(self, activity_data: NtfsStorageActivityData) -> dict:
+    def _hot_tier_activity_data(self, activity_data: NtfsStorageActivityData) -> dict:
         """
-        Enhance activity data with additional metadata for hot tier storage.
+        Dump activity data with the hot tier scoring fields added.
 
         Args:
             activity_data: The activity data
 
         Returns:
-            Enhanced activity data
+            Activity data with importance score and search hit counter
         """
         data_dict = activity_data.model_dump(mode="json")
 
@@ -1132,6 +1336,20 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
         # Initialize search hits counter
         data_dict["search_hits"] = 0
 
+        return data_dict
+
+    def _enhance_activity_data(self, activity_data: NtfsStorageActivityData) -> dict:
+        """
+        Enhance activity data with additional metadata for hot tier storage.
+
+        Args:
+            activity_data: The activity data
+
+        Returns:
+            Enhanced activity data
+        """
+        data_dict = self._hot_tier_activity_data(activity_data)
+
         # Map FRN to entity UUID
         frn = data_dict.get("file_reference_number", "")
         volume = data_dict.get("volume_name", "")
@@ -1164,6 +1382,27 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
         """
         # Enhance activity data with additional metadata
         enhanced_data = self._enhance_activity_data(activity_data)
+        return self._assemble_hot_tier_document(activity_data.activity_id, enhanced_data)
+
+    def _assemble_hot_tier_document(
+        self,
+        activity_id: uuid.UUID,
+        enhanced_data: dict,
+        record_timestamp: datetime | None = None,
+    ) -> dict:
+        """
+        Wrap enhanced activity data in a hot tier document.
+
+        Args:
+            activity_id: The activity ID, used as the document key
+            enhanced_data: Activity data from _enhance_activity_data
+            record_timestamp: Record timestamp; the TTL counts from it (default: now)
+
+        Returns:
+            Document for the database
+        """
+        if record_timestamp is None:
+            record_timestamp = datetime.now(UTC)
 
         # Get semantic attributes
         semantic_attributes = get_semantic_attributes_for_activity(enhanced_data)
@@ -1208,32 +1447,442 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
         record = {
             "SourceIdentifier": source_id,
             "Data": enhanced_data,  # Use the enhanced data directly
-            "Timestamp": datetime.now(
-                UTC,
-            ).isoformat(),  # Convert datetime to string
+            "Timestamp": record_timestamp.isoformat(),  # Convert datetime to string
         }
 
         # Convert any UUIDs to strings for JSON compatibility
         record_document = {}
-        record_document["_key"] = str(
-            activity_data.activity_id,
-        )  # Use activity ID as document key
+        record_document["_key"] = str(activity_id)  # Use activity ID as document key
         record_document["Record"] = record
         record_document["SemanticAttributes"] = [attr.model_dump() for attr in semantic_attributes]
         # Top-level TTL timestamp (separate from Data blob)
-        ttl_ts = datetime.now(UTC) + timedelta(days=self._ttl_days)
+        ttl_ts = record_timestamp + timedelta(days=self._ttl_days)
         record_document["ttl_timestamp"] = ttl_ts.isoformat()
 
         self._logger.debug(f"Created document with _key: {record_document['_key']}")
         return record_document
 
+    @staticmethod
+    def _uuid_safe_serializer(obj: Any) -> str:
+        """Handle UUID serialization by converting them to strings."""
+        if isinstance(obj, uuid.UUID):
+            return str(obj)
+        raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+
+    def _entity_metadata_patch(self, entity_id: uuid.UUID, activity_data: dict) -> dict | None:
+        """
+        Compute the entity update implied by an activity.
+
+        This is the batch counterpart of _update_entity_metadata: it returns
+        the fields to merge into the entity instead of reading and rewriting
+        the entity document.
+
+        Args:
+            entity_id: Entity UUID
+            activity_data: Activity data
+
+        Returns:
+            Fields to merge into the entity, or None if there is nothing to update
+        """
+        activity_type = activity_data.get("activity_type", "")
+        if not isinstance(activity_type, str):
+            self._logger.error(
+                f"Invalid activity_type: {activity_type} ({type(activity_type).__name__})",
+            )
+            return None
+
+        timestamp = activity_data.get("timestamp")
+        if isinstance(timestamp, datetime):
+            timestamp = timestamp.isoformat()
+        elif not isinstance(timestamp, str):
+            timestamp = datetime.now(UTC).isoformat()
+
+        # De-duplicate updates using the same cache as _update_entity_metadata
+        cache_key = f"{entity_id}:{activity_type}:{timestamp}"
+        if not hasattr(self, "_processed_updates"):
+            self._processed_updates = set()
+        if cache_key in self._processed_updates:
+            self._logger.debug(f"Skipping duplicate update for entity {entity_id}")
+            return None
+        self._processed_updates.add(cache_key)
+        # Limit set size to avoid memory issues
+        if len(self._processed_updates) > 10000:
+            self._processed_updates = set(list(self._processed_updates)[-5000:])
+
+        frn = activity_data.get("file_reference_number", "")
+        volume = activity_data.get("volume_name", "")
+        file_path = activity_data.get("file_path", "")
+        properties = {}
+        modified = True
+
+        if activity_type == "delete":
+            properties["deleted"] = True
+            properties["last_modified"] = timestamp
+
+        elif activity_type == "rename":
+            if not file_path:
+                self._logger.debug("Rename operation missing file_path, skipping update")
+                return None
+            properties["file_path"] = file_path
+            properties["last_modified"] = timestamp
+            if volume:
+                self._path_entity_cache.put(f"{volume}:{file_path}", entity_id)
+
+        elif activity_type == "create":
+            properties["deleted"] = False
+            properties["last_accessed"] = timestamp
+            properties["last_modified"] = timestamp
+            if file_path:
+                properties["file_path"] = file_path
+            # Store FRN and volume for future lookups - this is critical!
+            if frn:
+                properties["file_reference_number"] = frn
+            if volume:
+                properties["volume"] = volume
+            properties["is_directory"] = activity_data.get("is_directory", False)
+
+        else:
+            properties["last_accessed"] = timestamp
+            if activity_type in ["modify", "attribute_change"]:
+                properties["last_modified"] = timestamp
+            else:
+                modified = False
+
+        patch = {"Properties": properties}
+        if modified:
+            patch["ModifiedTimestamp"] = datetime.now(UTC).isoformat()
+        return patch
+
+    @staticmethod
+    def _merge_entity_patch(target: dict, patch: dict) -> None:
+        """Merge an entity patch into the pending update for that entity."""
+        for field, value in patch.items():
+            if field == "Properties":
+                target.setdefault("Properties", {}).update(value)
+            else:
+                target[field] = value
+
+    def _resolve_entity_uuids(
+        self,
+        activities: list[dict],
+        entity_updates: dict[str, dict],
+    ) -> dict[str, uuid.UUID]:
+        """
+        Resolve the entity UUIDs for a batch of activities.
+
+        This follows the lookup order of _get_or_create_entity_uuid, but for
+        the whole batch at once:
+        1. Cached FRN mappings are used as they are
+        2. The remaining FRN + Volume pairs are looked up with a single AQL
+           query, which falls back to LocalPath for pairs without a Volume match
+        3. Pairs still unknown use the path cache (the FRN is then recorded in
+           entity_updates) or become new entities, inserted with one insert_many
+
+        Args:
+            activities: Activity data dictionaries
+            entity_updates: Pending entity updates, keyed by entity key
+
+        Returns:
+            Mapping of "volume:frn" keys to entity UUIDs.  Pairs that could not
+            be resolved are missing from the mapping.
+        """
+        resolved = {}
+        pending = {}
+        for activity in activities:
+            frn = activity.get("file_reference_number", "")
+            volume = activity.get("volume_name", "")
+            if not (frn and volume):
+                continue
+            cache_key = f"{volume}:{frn}"
+            if cache_key in resolved or cache_key in pending:
+                continue
+            entity_id = self._frn_entity_cache.get(cache_key)
+            if entity_id is not None:
+                resolved[cache_key] = entity_id
+                continue
+            pending[cache_key] = activity
+
+        if not pending:
+            return resolved
+
+        # Skip if not connected to database
+        if not hasattr(self, "_db") or self._db is None:
+            resolved.update({cache_key: uuid.uuid4() for cache_key in pending})
+            return resolved
+
+        self._logger.debug(f"Looking up entities for {len(pending)} FRNs")
+
+        query = """
+            FOR pair IN @pairs
+                LET by_volume = FIRST(
+                    FOR doc IN @@collection
+                    FILTER doc.FrnKey == pair.lookup_key
+                    LIMIT 1
+                    RETURN doc._key
+                )
+                LET entity = by_volume != null ? by_volume : FIRST(
+                    FOR doc IN @@collection
+                    FILTER doc.PathFrnKey == pair.lookup_key
+                    LIMIT 1
+                    RETURN doc._key
+                )
+                RETURN { cache_key: pair.cache_key, entity: entity }
+        """
+
+        try:
+            start_time = time.time()
+            cursor = self._db._arangodb.aql.execute(
+                query,
+                bind_vars={
+                    "@collection": self._entity_collection_name,
+                    "pairs": [
+                        {
+                            "cache_key": cache_key,
+                            "lookup_key": self._frn_lookup_key(
+                                activity["file_reference_number"],
+                                activity["volume_name"],
+                            ),
+                        }
+                        for cache_key, activity in pending.items()
+                    ],
+                },
+            )
+            found = {row["cache_key"]: row["entity"] for row in cursor}
+            query_time = time.time() - start_time
+
+            # Log a warning if the query takes more than 5 seconds
+            if query_time > 5.0:
+                self._logger.warning(
+                    f"Slow batch entity lookup (took {query_time:.2f} seconds) for {len(pending)} FRNs",
+                )
+        except Exception as e:
+            self._logger.exception(f"Error looking up entity batch: {e}")
+            self._logger.debug(f"Lookup error details: {traceback.format_exc()}")
+            return resolved
+
+        new_entities = []
+        for cache_key, activity in pending.items():
+            frn = activity["file_reference_number"]
+            volume = activity["volume_name"]
+            file_path = activity.get("file_path", "")
+            path_key = f"{volume}:{file_path}"
+
+            if found.get(cache_key):
+                entity_id = uuid.UUID(found[cache_key])
+            elif (entity_id := self._path_entity_cache.get(path_key)) is not None:
+                self._merge_entity_patch(
+                    entity_updates.setdefault(str(entity_id), {}),
+                    {
+                        "LocalIdentifier": frn,
+                        "Volume": volume,
+                        "FrnKey": self._frn_lookup_key(frn, volume),
+                        "Properties": {"file_reference_number": frn, "volume": volume},
+                        "ModifiedTimestamp": datetime.now(UTC).isoformat(),
+                    },
+                )
+            else:
+                entity_id = uuid.uuid4()
+                new_entities.append(
+                    self._new_entity_document(
+                        entity_id,
+                        frn,
+                        volume,
+                        file_path,
+                        activity.get("is_directory", False),
+                    ),
+                )
+                self._path_entity_cache.put(path_key, entity_id)
+
+            self._frn_entity_cache.put(cache_key, entity_id)
+            resolved[cache_key] = entity_id
+
+        if new_entities:
+            self._logger.debug(
+                f"Inserting {len(new_entities)} entities into collection {self._entity_collection_name}",
+            )
+            try:
+                entity_collection = self._db.get_collection(self._entity_collection_name)
+                results = entity_collection.insert_many(new_entities)
+                for result in results:
+                    if isinstance(result, Exception):
+                        self._logger.error(f"Failed to insert entity: {result}")
+            except Exception as insert_error:
+                # Still use the generated IDs so we can proceed
+                self._logger.exception(f"Failed to insert entities: {insert_error}")
+
+        return resolved
+
+    def _apply_entity_updates(self, entity_updates: dict[str, dict]) -> None:
+        """
+        Apply the pending entity updates of a batch with a single AQL query.
+
+        Args:
+            entity_updates: Fields to merge into each entity, keyed by entity key
+        """
+        # Skip if not connected to database
+        if not entity_updates or not hasattr(self, "_db") or self._db is None:
+            return
+
+        query = """
+            FOR entity IN @entities
+                UPDATE entity.key WITH entity.fields IN @@collection
+                OPTIONS { ignoreErrors: true, mergeObjects: true }
+        """
+
+        try:
+            self._db._arangodb.aql.execute(
+                query,
+                bind_vars={
+                    "@collection": self._entity_collection_name,
+                    "entities": [{"key": key, "fields": fields} for key, fields in entity_updates.items()],
+                },
+            )
+            self._logger.debug(f"Updated {len(entity_updates)} entities")
+        except Exception as e:
+            # Don't let metadata updates block activity recording
+            self._logger.exception(f"Error updating entity batch: {e}")
+            self._logger.debug(f"Error details: {traceback.format_exc()}")
+
+    def _associate_with_activity_context(
+        self,
+        activity_data: NtfsStorageActivityData,
+    ) -> tuple[NtfsStorageActivityData, str | None]:
+        """
+        Associate an activity with the current activity context, if available.
+
+        The activity data model has no field for the activity context handle,
+        so the handle is returned separately for the caller to add to the
+        hot tier document.
+
+        Args:
+            activity_data: Activity data to associate
+
+        Returns:
+            Tuple of (activity data, activity context handle or None)
+        """
+        if not (
+            hasattr(self, "_activity_context_integration") and self._activity_context_integration.is_context_available()
+        ):
+            return activity_data, None
+
+        context_handle = None
+        try:
+            self._logger.debug(
+                f"Associating activity {activity_data.activity_id} with activity context",
+            )
+            enhanced_data = self._activity_context_integration.associate_with_activity_context(
+                activity_data,
+            )
+            self._logger.debug("Activity context association successful")
+
+            # If we get a dictionary back, convert it to NtfsStorageActivityData
+            if isinstance(enhanced_data, dict):
+                context_handle = enhanced_data.get("activity_context_handle")
+                # Preserve original activity_id and create new object with context
+                original_id = activity_data.activity_id
+                activity_data = NtfsStorageActivityData(**enhanced_data)
+                activity_data.activity_id = original_id
+                self._logger.debug(
+                    f"Converted enhanced data with ID {activity_data.activity_id}",
+                )
+        except Exception as e:
+            self._logger.exception(f"Error integrating with activity context: {e}")
+            self._logger.debug(
+                f"Context integration error details: {traceback.format_exc()}",
+            )
+            # Continue with original activity data
+
+        return activity_data, context_handle
+
+    def _store_activity_batch(
+        self,
+        activities: list[NtfsStorageActivityData | dict],
+    ) -> list[uuid.UUID]:
+        """
+        Store one batch of activities in the hot tier.
+
+        Entity UUIDs are resolved for the whole batch, entity updates are
+        applied with one query, and the hot tier documents are written with
+        one insert_many.
+
+        Args:
+            activities: Activity data to store
+
+        Returns:
+            UUIDs of the activities that were stored
+        """
+        if not hasattr(self, "_collection") or self._collection is None:
+            self._logger.error("Collection is not initialized - cannot store documents")
+            raise ValueError("Collection is not initialized")
+
+        batch = []
+        for activity in activities:
+            if isinstance(activity, dict):
+                try:
+                    activity = NtfsStorageActivityData(**activity)
+                except Exception as e:
+                    self._logger.exception(
+                        f"Error converting dict to NtfsStorageActivityData: {e}",
+                    )
+                    continue
+            activity, context_handle = self._associate_with_activity_context(activity)
+            data_dict = self._hot_tier_activity_data(activity)
+            if context_handle:
+                data_dict["activity_context_handle"] = context_handle
+            batch.append((activity, data_dict))
+
+        entity_updates = {}
+        entity_ids = self._resolve_entity_uuids([data for _, data in batch], entity_updates)
+
+        for _, data_dict in batch:
+            frn = data_dict.get("file_reference_number", "")
+            volume = data_dict.get("volume_name", "")
+            if not (frn and volume):
+                continue
+            entity_id = entity_ids.get(f"{volume}:{frn}")
+            if entity_id is None:
+                self._frn_lookup_stats["failed"] += 1
+                continue
+            self._frn_lookup_stats["success"] += 1
+            data_dict["entity_id"] = str(entity_id)
+            patch = self._entity_metadata_patch(entity_id, data_dict)
+            if patch:
+                self._merge_entity_patch(entity_updates.setdefault(str(entity_id), {}), patch)
+
+        self._apply_entity_updates(entity_updates)
+
+        record_timestamp = datetime.now(UTC)
+        documents = json.loads(
+            json.dumps(
+                [
+                    self._assemble_hot_tier_document(activity.activity_id, data_dict, record_timestamp)
+                    for activity, data_dict in batch
+                ],
+                default=self._uuid_safe_serializer,
+            ),
+        )
+
+        results = self._collection.insert_many(documents)
+
+        activity_ids = []
+        for (activity, _), result in zip(batch, results, strict=False):
+            if isinstance(result, Exception):
+                self._logger.error(f"ERROR storing activity {activity.activity_id}: {result}")
+                continue
+            activity_ids.append(activity.activity_id)
+        return activity_ids
+
     def store_activities(
         self,
-        activities: list[NtfsStorageActivityData],
+        activities: list[NtfsStorageActivityData | dict],
     ) -> list[uuid.UUID]:
         """
         Store multiple activities in the hot tier.
 
+        Activities are written in batches of batch_size (see _store_activity_batch),
+        so a burst from the USN journal costs a handful of database round trips
+        per batch rather than several per activity.
+
         Args:
             activities: List of NTFS activity data to store
 
@@ -1264,43 +1913,23 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
             except Exception as e:
                 self._logger.exception(f"Error batch updating activity context: {e}")
 
-        self._logger.debug("Will store activities in groups of 5 for stability")
-
-        # Store each activity in the database
-        stored_count = 0
-        error_count = 0
-
-        # Process in smaller groups to manage memory use and provide progress reporting
-        for i, activity in enumerate(activities):
+        for start in range(0, len(activities), self._batch_size):
+            batch = activities[start : start + self._batch_size]
             self._logger.debug(
-                f"Processing activity {i+1}/{len(activities)} with ID {activity.activity_id}",
+                f"Processing activities {start+1}-{start+len(batch)}/{len(activities)}",
             )
 
             try:
-                # Skip the entity update (where the schema error is occurring)
-                # This is just for demonstration to get more records in
-                if hasattr(self, "_get_or_create_entity_uuid"):
-                    # Temporarily bypass the entity creation just to test database insertion
-                    orig_method = self._get_or_create_entity_uuid
-                    self._get_or_create_entity_uuid = lambda frn, volume, file_path, is_directory: uuid.uuid4()
-
-                # Process the activity
-                activity_id = self.store_activity(activity)
-                activity_ids.append(activity_id)
-                stored_count += 1
-
-                # Restore the original method if we patched it
-                if hasattr(self, "_get_or_create_entity_uuid") and "orig_method" in locals():
-                    self._get_or_create_entity_uuid = orig_method
-
-                self._logger.debug(f"Successfully stored activity {i+1}: {activity_id}")
-
+                activity_ids.extend(self._store_activity_batch(batch))
             except Exception as e:
-                error_count += 1
-                self._logger.exception(f"ERROR storing activity {i+1}: {e}")
-                # Don't let one failure stop the entire batch
+                self._logger.exception(
+                    f"ERROR storing activities {start+1}-{start+len(batch)}: {e}",
+                )
+                # Don't let one failed batch stop the remaining ones
                 continue
 
+        stored_count = len(activity_ids)
+        error_count = len(activities) - stored_count
         self._logger.info(
             f"SUMMARY: Stored {stored_count} out of {len(activities)} activities. Errors: {error_count}",
         )
@@ -1340,10 +1969,6 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
             f"Begin storing activity {getattr(activity_data, 'activity_id', 'unknown')}",
         )
 
-        # Initialize FRN lookup tracking state if not exists
-        if not hasattr(self, "_frn_lookup_stats"):
-            self._frn_lookup_stats = {"success": 0, "failed": 0}
-
         # Track if this activity has FRN data for lookup
         has_frn_data = False
 
@@ -1365,35 +1990,7 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
                 raise
 
         # Integrate with activity context if available
-        if hasattr(self, "_activity_context_integration") and self._activity_context_integration.is_context_available():
-            # Associate with current activity context
-            try:
-                self._logger.debug(
-                    f"Associating activity {activity_data.activity_id} with activity context",
-                )
-                enhanced_data = self._activity_context_integration.associate_with_activity_context(
-                    activity_data,
-                )
-                self._logger.debug("Activity context association successful")
-
-                # If we get a dictionary back, convert it to NtfsStorageActivityData
-                if isinstance(enhanced_data, dict):
-                    self._logger.debug(
-                        "Converting enhanced activity context data to NtfsStorageActivityData",
-                    )
-                    # Preserve original activity_id and create new object with context
-                    original_id = activity_data.activity_id
-                    activity_data = NtfsStorageActivityData(**enhanced_data)
-                    activity_data.activity_id = original_id
-                    self._logger.debug(
-                        f"Converted enhanced data with ID {activity_data.activity_id}",
-                    )
-            except Exception as e:
-                self._logger.exception(f"Error integrating with activity context: {e}")
-                self._logger.debug(
-                    f"Context integration error details: {traceback.format_exc()}",
-                )
-                # Continue with original activity data
+        activity_data, context_handle = self._associate_with_activity_context(activity_data)
 
         # Check if activity has FRN data for tracking
         if hasattr(activity_data, "file_reference_number") and hasattr(
@@ -1413,6 +2010,8 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
         try:
             document = self._build_hot_tier_document(activity_data)
             self._logger.debug("Hot tier document built successfully")
+            if context_handle and "Record" in document:
+                document["Record"]["Data"]["activity_context_handle"] = context_handle
 
             # Consider this a successful FRN lookup if we have entity_id in the document
             if has_frn_data and "entity_id" in document and document["entity_id"]:
@@ -1441,11 +2040,7 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
         )
 
         # Convert UUID objects to strings - fix JSON serialization issue
-        def uuid_safe_serializer(obj):
-            """Handle UUID serialization by converting them to strings."""
-            if isinstance(obj, uuid.UUID):
-                return str(obj)
-            raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+        uuid_safe_serializer = self._uuid_safe_serializer
 
         # Manually serialize the document to ensure all UUIDs are properly converted
         try:
@@ -1810,6 +2405,10 @@ class NtfsHotTierRecorder(StorageActivityRecorder):
             stats["collection_name"] = self._collection_name
             stats["recorder_id"] = str(self._recorder_id)
             stats["transition_enabled"] = self._transition_enabled
+            stats["entity_cache"] = {
+                "frn": self._frn_entity_cache.get_stats(),
+                "path": self._path_entity_cache.get_stats(),
+            }
 
             return stats
 
@@ -2253,6 +2852,17 @@ if __name__ == "__main__":
         default=4,
         help="Number of days to keep data in hot tier",
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=NtfsHotTierRecorder.DEFAULT_BATCH_SIZE,
+        help="Number of activities written per database batch",
+    )
+    parser.add_argument(
+        "--migrate-entity-keys",
+        action="store_true",
+        help="Backfill the entity lookup keys before processing the input",
+    )
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
 
     # Add mode-related arguments
@@ -2301,11 +2911,15 @@ if __name__ == "__main__":
         # Create recorder
         recorder = NtfsHotTierRecorder(
             ttl_days=args.ttl_days,
+            batch_size=args.batch_size,
             debug=args.debug,
             no_db=args.no_db,
             db_config_path=args.db_config,
         )
 
+        if args.migrate_entity_keys:
+            recorder.migrate_entity_lookup_keys()
+
         # Process input file
         start_time = time.time()
         activity_ids = recorder.process_jsonl_file(args.input)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+"""
+Unit tests for the streaming JSONL loader of the NTFS Hot Tier Recorder.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+import uuid
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from unittest.mock import MagicMock
+
+
+# Set up environment
+if os.environ.get("INDALEKO_ROOT") is None:
+    current_path = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.exists(os.path.join(current_path, "Indaleko.py")):
+        current_path = os.path.dirname(current_path)
+    os.environ["INDALEKO_ROOT"] = current_path
+    sys.path.append(current_path)
+
+# pylint: disable=wrong-import-position
+from activity.collectors.storage.data_models.storage_activity_data_model import (
+    NtfsStorageActivityData,
+    StorageActivityType,
+    StorageItemType,
+    StorageProviderType,
+)
+from activity.recorders.storage.ntfs.tiered.hot.jsonl_loader import (
+    NtfsHotTierJsonlLoader,
+)
+
+
+# pylint: enable=wrong-import-position
+
+
+class TestNtfsHotTierJsonlLoader(unittest.TestCase):
+    """Tests for the NtfsHotTierJsonlLoader class."""
+
+    def setUp(self):
+        """Write a small JSONL capture with one bad line."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, "ntfs_activities.jsonl")
+        lines = [self._create_activity(frn).model_dump_json() for frn in range(10)]
+        lines.insert(5, "{not json")
+        with open(self.file_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+        self.recorder = MagicMock()
+        self.recorder.store_activities.side_effect = lambda activities: [uuid.uuid4() for _ in activities]
+
+    def tearDown(self):
+        """Remove the scratch directory."""
+        self.temp_dir.cleanup()
+
+    def _create_activity(self, frn):
+        """Create a test activity."""
+        return NtfsStorageActivityData(
+            activity_id=uuid.uuid4(),
+            activity_type=StorageActivityType.CREATE,
+            timestamp=datetime.now(UTC),
+            file_name=f"test_file_{frn}.txt",
+            file_path=f"C:\\Indaleko_Test\\test_file_{frn}.txt",
+            volume_name="C:",
+            file_reference_number=str(frn),
+            is_directory=False,
+            provider_type=StorageProviderType.LOCAL_NTFS,
+            provider_id=uuid.UUID("00000000-0000-0000-0000-000000000001"),
+            item_type=StorageItemType.FILE,
+            reason_flags=0x01,  # FILE_ACTION_ADDED
+        )
+
+    def _load(self, loader):
+        """Load the capture, parsing in threads rather than processes."""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            return loader.load(self.file_path, executor=executor)
+
+    def test_split_file(self):
+        """Ranges cover the file, end on line boundaries, and skip a partial last line."""
+        with open(self.file_path, "a", encoding="utf-8") as f:
+            f.write('{"partial": ')
+        loader = NtfsHotTierJsonlLoader(self.recorder, chunk_size=100)
+        ranges = loader.split_file(self.file_path)
+
+        with open(self.file_path, "rb") as f:
+            data = f.read()
+        assert ranges[0][0] == 0
+        assert ranges[-1][1] == data.rfind(b"\n") + 1
+        for (_, end), (start, _) in zip(ranges, ranges[1:], strict=False):
+            assert end == start
+        for _, end in ranges:
+            assert data[end - 1 : end] == b"\n"
+
+    def test_load(self):
+        """Every valid line is stored in batches and the checkpoint records the end."""
+        loader = NtfsHotTierJsonlLoader(self.recorder, chunk_size=1024, max_pending=2)
+        stats = self._load(loader)
+
+        assert stats["total_activities"] == 11
+        assert stats["loaded_activities"] == 10
+        assert stats["parse_errors"] == 1
+        assert sum(stats["activity_counts"].values()) == 10
+        assert stats["offset"] == os.path.getsize(self.file_path)
+        assert loader.read_checkpoint(self.file_path) == stats["offset"]
+
+        stored = [a.file_reference_number for call in self.recorder.store_activities.call_args_list for a in call[0][0]]
+        assert stored == [str(frn) for frn in range(10)]
+
+    def test_resume(self):
+        """A second load only stores activities appended after the checkpoint."""
+        loader = NtfsHotTierJsonlLoader(self.recorder, chunk_size=1024)
+        self._load(loader)
+        self.recorder.store_activities.reset_mock()
+
+        with open(self.file_path, "a", encoding="utf-8") as f:
+            f.write(self._create_activity(10).model_dump_json() + "\n")
+        stats = self._load(loader)
+
+        assert stats["start_offset"] > 0
+        assert stats["loaded_activities"] == 1
+        self.recorder.store_activities.assert_called_once()
+
+    def test_partial_store_keeps_checkpoint(self):
+        """A range the recorder only partly stores is not checkpointed, and is retried."""
+        loader = NtfsHotTierJsonlLoader(self.recorder, chunk_size=512, max_pending=1)
+        ranges = loader.split_file(self.file_path)
+        assert len(ranges) > 2
+
+        calls = []
+
+        def store_all_but_one_in_second_range(activities):
+            calls.append(activities)
+            stored = [uuid.uuid4() for _ in activities]
+            return stored[:-1] if len(calls) == 2 else stored
+
+        self.recorder.store_activities.side_effect = store_all_but_one_in_second_range
+        with self.assertRaises(RuntimeError):
+            self._load(loader)
+        assert len(calls) == 2
+        assert loader.read_checkpoint(self.file_path) == ranges[0][1]
+
+        # Once the recorder recovers, the load resumes at the failed range
+        self.recorder.store_activities.side_effect = lambda activities: [uuid.uuid4() for _ in activities]
+        stats = self._load(loader)
+        assert stats["start_offset"] == ranges[0][1]
+        assert stats["loaded_activities"] == 10 - len(calls[0])
+        assert loader.read_checkpoint(self.file_path) == os.path.getsize(self.file_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -268,5 +268,75 @@ class TestNtfsHotTierRecorder(unittest.TestCase):
             self.recorder._collection.insert.assert_called_once()
 
 
+    def test_store_activities_batch(self):
+        """Test that store_activities writes each batch with one insert_many."""
+        self.recorder._batch_size = 2
+        self.recorder._collection = MagicMock()
+        self.recorder._collection.insert_many.side_effect = lambda docs: [{"_key": doc["_key"]} for doc in docs]
+
+        activities = [self._create_test_data() for _ in range(3)]
+        activities[1] = activities[1].model_dump(mode="json")
+
+        result = self.recorder.store_activities(activities)
+
+        assert len(result) == 3
+        assert self.recorder._collection.insert_many.call_count == 2
+        first_batch = self.recorder._collection.insert_many.call_args_list[0].args[0]
+        assert [doc["_key"] for doc in first_batch] == [str(activity_id) for activity_id in result[:2]]
+        # All three activities share an FRN, so they resolve to a single entity
+        entity_ids = {doc["Record"]["Data"]["entity_id"] for doc in first_batch}
+        assert len(entity_ids) == 1
+        assert all("ttl_timestamp" in doc for doc in first_batch)
+
+    def test_store_activities_insert_errors(self):
+        """Test that activities rejected by insert_many are not reported as stored."""
+        self.recorder._collection = MagicMock()
+        self.recorder._collection.insert_many.side_effect = lambda docs: [
+            {"_key": docs[0]["_key"]},
+            ValueError("unique constraint violated"),
+        ]
+
+        activities = [self._create_test_data(), self._create_test_data()]
+        result = self.recorder.store_activities(activities)
+
+        assert result == [activities[0].activity_id]
+
+    def test_store_activity_batch_activity_context(self):
+        """Test that batched documents keep the activity context handle."""
+        handle = str(uuid.uuid4())
+        self.recorder._activity_context_integration = MagicMock()
+        self.recorder._activity_context_integration.is_context_available.return_value = True
+        self.recorder._activity_context_integration.associate_with_activity_context.side_effect = lambda activity: {
+            **activity.model_dump(mode="json"),
+            "activity_context_handle": handle,
+        }
+        self.recorder._collection = MagicMock()
+        self.recorder._collection.insert_many.side_effect = lambda docs: [{"_key": doc["_key"]} for doc in docs]
+
+        activities = [self._create_test_data(), self._create_test_data()]
+        result = self.recorder._store_activity_batch(activities)
+
+        assert result == [activity.activity_id for activity in activities]
+        assert self.recorder._activity_context_integration.associate_with_activity_context.call_count == 2
+        documents = self.recorder._collection.insert_many.call_args.args[0]
+        assert [doc["Record"]["Data"]["activity_context_handle"] for doc in documents] == [handle, handle]
+        assert self.recorder._frn_lookup_stats["success"] == 2
+
+    def test_entity_lookup_keys(self):
+        """Test that volume spellings normalize to the same lookup keys."""
+        keys = NtfsHotTierRecorder._entity_lookup_keys(
+            "1234567890",
+            "\\\\?\\Volume{B8C4CE1B-3581-4DCE-88A6-6C05DAD92F61}\\",
+            "c:\\Indaleko_Test\\test_file.txt",
+        )
+        assert keys == {
+            "FrnKey": "b8c4ce1b-3581-4dce-88a6-6c05dad92f61|1234567890",
+            "PathFrnKey": "c:|1234567890",
+        }
+        # A drive letter volume matches the PathFrnKey, as the LIKE fallback did
+        assert NtfsHotTierRecorder._frn_lookup_key("1234567890", "C:") == keys["PathFrnKey"]
+        assert NtfsHotTierRecorder._entity_lookup_keys("1234567890", "", "/tmp/test_file.txt") == {}
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -73,6 +73,7 @@ class TierTransitionManager:
             high_importance_age_multiplier: Age multiplier for high importance (default: 2.0)
             low_importance_age_multiplier: Age multiplier for low importance (default: 0.5)
             batch_size: Number of activities to process in each batch (default: 1000)
+            server_side: Whether to aggregate and move activities inside ArangoDB (default: False)
             debug: Whether to enable debug logging (default: False)
         """
         # Configure logging
@@ -89,6 +90,7 @@ class TierTransitionManager:
         self._high_importance_age = kwargs.get("high_importance_age_multiplier", 2.0)
         self._low_importance_age = kwargs.get("low_importance_age_multiplier", 0.5)
         self._batch_size = kwargs.get("batch_size", 1000)
+        self._server_side = kwargs.get("server_side", False)
 
         # Initialize importance scorer for evaluating activities
         self._scorer = ImportanceScorer(debug=self._debug)
@@ -158,6 +160,7 @@ class TierTransitionManager:
                 "high_importance_age_multiplier": self._high_importance_age,
                 "low_importance_age_multiplier": self._low_importance_age,
                 "batch_size": self._batch_size,
+                "server_side": self._server_side,
             },
         }
 
@@ -280,6 +283,9 @@ class TierTransitionManager:
         age_threshold = age_threshold_hours if age_threshold_hours is not None else self._age_threshold_hours
         size = batch_size if batch_size is not None else self._batch_size
 
+        if self._server_side:
+            return self._transition_batch_server_side(age_threshold, size)
+
         try:
             # Find activities to transition
             hot_activities = self._hot_tier.find_hot_tier_activities_to_transition(
@@ -312,6 +318,27 @@ class TierTransitionManager:
             self._logger.exception(f"Error in transition batch: {e}")
             return (0, 0)
 
+    def _transition_batch_server_side(self, age_threshold_hours: int, batch_size: int) -> tuple[int, int]:
+        """
+        Transition a batch without fetching the activities into the client.
+
+        Returns:
+            Tuple of (activities_found, activities_transitioned); every activity
+            found is transitioned, since the batch commits as one transaction
+        """
+        self._warm_tier._hot_tier_collection_name = self._hot_tier._collection_name
+        hot_count, warm_count = self._warm_tier.transition_from_hot_tier_server_side(
+            age_threshold_hours=age_threshold_hours,
+            batch_size=batch_size,
+        )
+        if hot_count:
+            self._logger.info(
+                f"Transitioned {hot_count} activities to warm tier as {warm_count} documents",
+            )
+        else:
+            self._logger.info("No activities found ready for transition")
+        return (hot_count, hot_count)
+
     def run_transition(
         self,
         max_batches: int = 10,
@@ -488,6 +515,11 @@ def main() -> int | None:
         default=10,
         help="Maximum number of batches to process",
     )
+    parser.add_argument(
+        "--server-side",
+        action="store_true",
+        help="Select, aggregate and move activities inside ArangoDB in one transaction",
+    )
 
     # Add mode-related arguments
     mode_group = parser.add_mutually_exclusive_group()
@@ -534,6 +566,7 @@ def main() -> int | None:
             warm_tier_recorder=warm_tier,
             age_threshold_hours=args.age_hours,
             batch_size=args.batch_size,
+            server_side=args.server_side,
             debug=args.debug,
         )
 
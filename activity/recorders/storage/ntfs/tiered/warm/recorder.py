@@ -119,6 +119,8 @@ class NtfsWarmTierRecorder(StorageActivityRecorder):
             transition_enabled: Whether to enable automated transition
             importance_thresholds: Custom importance thresholds
             aggregation_window: Time window for activity aggregation (hours)
+            server_side_transition: Whether transition_from_hot_tier aggregates inside
+                ArangoDB (see transition_from_hot_tier_server_side)
         """
         # Configure logging first
         logging.basicConfig(level=logging.DEBUG if kwargs.get("debug", False) else logging.INFO)
@@ -130,6 +132,7 @@ class NtfsWarmTierRecorder(StorageActivityRecorder):
         self._entity_collection_name = kwargs.get("entity_collection_name", "file_entities")
         self._transition_enabled = kwargs.get("transition_enabled", False)
         self._aggregation_window = kwargs.get("aggregation_window", 6)  # 6 hours
+        self._server_side_transition = kwargs.get("server_side_transition", False)
 
         # Configure importance thresholds
         self._importance_thresholds = kwargs.get(
@@ -888,6 +891,10 @@ class NtfsWarmTierRecorder(StorageActivityRecorder):
             self._logger.warning("Transition is not enabled, skipping")
             return 0
 
+        if self._server_side_transition:
+            _, warm_count = self.transition_from_hot_tier_server_side()
+            return warm_count
+
         try:
             # Find hot tier activities to transition
             activities = self.find_hot_tier_activities_to_transition()
@@ -930,6 +937,172 @@ class NtfsWarmTierRecorder(StorageActivityRecorder):
             self._logger.exception(f"Error transitioning from hot tier: {e}")
             return 0
 
+    def transition_from_hot_tier_server_side(
+        self,
+        age_threshold_hours: int = 12,
+        batch_size: int = 1000,
+    ) -> tuple[int, int]:
+        """
+        Transition a batch of activities from hot tier to warm tier inside ArangoDB.
+
+        Selection, aggregation and insertion run as one AQL query in a stream
+        transaction, which also marks the hot tier activities as transitioned,
+        so no activity document is sent to the client.  This follows
+        process_hot_tier_activities, except that the importance score recorded
+        by the hot tier is used rather than recomputed: activities at or above
+        the high importance threshold are copied individually, and the rest are
+        aggregated by entity, activity type and aggregation window.  Warm tier
+        documents have the same Record wrapper as the hot tier's, which the
+        warm tier indexes (including the TTL index) are defined on.
+
+        Args:
+            age_threshold_hours: Age in hours at which activities should transition
+            batch_size: Maximum number of hot tier activities to transition
+
+        Returns:
+            Tuple of (hot tier activities transitioned, warm tier documents written)
+        """
+        # Skip if not connected to database
+        if not hasattr(self, "_db") or self._db is None:
+            self._logger.warning("Cannot transition: not connected to database")
+            return (0, 0)
+
+        # Hot tier collection needed
+        if not self._hot_tier_collection_name:
+            hot_tier_collections = self._find_hot_tier_collections()
+            if not hot_tier_collections:
+                self._logger.warning("Cannot transition: no hot tier collection found")
+                return (0, 0)
+            self._hot_tier_collection_name = hot_tier_collections[0]
+
+        now = datetime.now(UTC)
+        query = """
+            LET selected = (
+                FOR doc IN @@hot_collection
+                FILTER doc.Record.Data.timestamp <= @threshold
+                FILTER doc.Record.Data.transitioned != true
+                SORT doc.Record.Data.timestamp ASC
+                LIMIT @batch_size
+                RETURN doc
+            )
+            LET individual = (
+                FOR doc IN selected
+                FILTER doc.Record.Data.importance_score >= @high_importance
+                RETURN {
+                    Record: {
+                        SourceIdentifier: @source_identifier,
+                        Timestamp: @now,
+                        Data: MERGE(doc.Record.Data, {
+                            is_aggregated: false,
+                            ttl_timestamp: @ttl_timestamp,
+                            attributes: MERGE(doc.Record.Data.attributes || {}, {is_warm_tier: true})
+                        })
+                    }
+                }
+            )
+            LET aggregated = (
+                FOR doc IN selected
+                FILTER NOT (doc.Record.Data.importance_score >= @high_importance)
+                LET data = doc.Record.Data
+                LET window_number = data.timestamp
+                    ? CONCAT(
+                        DATE_FORMAT(data.timestamp, "%yyyy-%mm-%dd"),
+                        "_",
+                        FLOOR(DATE_HOUR(data.timestamp) / @window_hours)
+                    )
+                    : "unknown"
+                COLLECT
+                    entity_id = data.entity_id || "unknown",
+                    activity_type = data.activity_type || "unknown",
+                    window_key = window_number
+                    INTO group = doc
+                LET first_data = FIRST(group).Record.Data
+                LET group_size = LENGTH(group)
+                RETURN {
+                    Record: {
+                        SourceIdentifier: @source_identifier,
+                        Timestamp: @now,
+                        Data: {
+                            activity_id: UUID(),
+                            entity_id: entity_id,
+                            activity_type: activity_type,
+                            file_path: first_data.file_path || "unknown",
+                            file_name: first_data.file_name || "unknown",
+                            volume_name: first_data.volume_name || "unknown",
+                            is_directory: first_data.is_directory || false,
+                            timestamp: MIN(group[*].Record.Data.timestamp),
+                            end_timestamp: MAX(group[*].Record.Data.timestamp),
+                            "count": group_size,
+                            is_aggregated: true,
+                            aggregation_group: CONCAT(entity_id, "_", activity_type, "_", window_key),
+                            importance_score: MAX(group[*].Record.Data.importance_score) || 0.0,
+                            ttl_timestamp: @ttl_timestamp,
+                            original_ids: group[*]._key,
+                            attributes: MERGE(
+                                first_data.attributes || {},
+                                {is_warm_tier: true, aggregated_count: group_size}
+                            )
+                        }
+                    }
+                }
+            )
+            LET inserted = (
+                FOR warm_doc IN APPEND(individual, aggregated)
+                INSERT warm_doc INTO @@warm_collection
+                RETURN 1
+            )
+            LET marked = (
+                FOR doc IN selected
+                UPDATE doc WITH {
+                    Record: {
+                        Data: {
+                            transitioned: true,
+                            transition_time: @now
+                        }
+                    }
+                } IN @@hot_collection
+                RETURN 1
+            )
+            RETURN {hot: LENGTH(marked), warm: LENGTH(inserted)}
+        """
+        bind_vars = {
+            "@hot_collection": self._hot_tier_collection_name,
+            "@warm_collection": self._collection_name,
+            "threshold": (now - timedelta(hours=age_threshold_hours)).isoformat(),
+            "batch_size": batch_size,
+            "high_importance": self._importance_thresholds["high"],
+            "window_hours": self._aggregation_window,
+            "now": now.isoformat(),
+            "ttl_timestamp": (now + timedelta(days=self._ttl_days)).isoformat(),
+            "source_identifier": {
+                "Identifier": str(self._recorder_id),
+                "Version": self._version,
+                "Description": self._description,
+            },
+        }
+
+        # A stream transaction makes the warm tier inserts and the hot tier
+        # flags commit (or roll back) together
+        transaction = None
+        try:
+            transaction = self._db._arangodb.begin_transaction(
+                read=[self._hot_tier_collection_name],
+                write=[self._hot_tier_collection_name, self._collection_name],
+            )
+            result = next(iter(transaction.aql.execute(query, bind_vars=bind_vars)))
+            transaction.commit_transaction()
+        except Exception as e:
+            self._logger.exception(f"Error in server-side transition from hot tier: {e}")
+            if transaction is not None:
+                with contextlib.suppress(Exception):
+                    transaction.abort_transaction()
+            return (0, 0)
+
+        self._logger.info(
+            f"Transitioned {result['hot']} hot tier activities into {result['warm']} warm tier documents",
+        )
+        return (result["hot"], result["warm"])
+
     def _build_warm_tier_document(
         self,
         activity_data: NtfsStorageActivityData | dict[str, Any],
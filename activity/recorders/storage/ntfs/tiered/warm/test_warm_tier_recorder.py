@@ -531,6 +531,181 @@ class TestNtfsWarmTierRecorder(unittest.TestCase):
         assert result["total_activities_transitioned"] == 5
 
 
+class MockTransaction:
+    """
+    Mock stream transaction that carries out the server-side transition query.
+
+    The query is evaluated in Python, following the AQL, against the mock
+    hot and warm tier collections, so the tests can check the documents
+    written rather than the query text.
+    """
+
+    def __init__(self, mock_db):
+        """Initialize the mock transaction."""
+        self.mock_db = mock_db
+        self.aql = MagicMock()
+        self.aql.execute.side_effect = self._execute
+        self.commit_transaction = MagicMock()
+        self.abort_transaction = MagicMock()
+
+    def _execute(self, _query, bind_vars):
+        hot = self.mock_db.get_collection(bind_vars["@hot_collection"])
+        warm = self.mock_db.get_collection(bind_vars["@warm_collection"])
+        selected = sorted(
+            (
+                doc
+                for doc in hot.documents.values()
+                if doc["Record"]["Data"]["timestamp"] <= bind_vars["threshold"]
+                and doc["Record"]["Data"].get("transitioned") is not True
+            ),
+            key=lambda doc: doc["Record"]["Data"]["timestamp"],
+        )[: bind_vars["batch_size"]]
+
+        def record(data):
+            source_identifier = bind_vars["source_identifier"]
+            return {"Record": {"SourceIdentifier": source_identifier, "Timestamp": bind_vars["now"], "Data": data}}
+
+        warm_docs = []
+        groups = {}
+        for doc in selected:
+            data = doc["Record"]["Data"]
+            if data.get("importance_score", 0.0) >= bind_vars["high_importance"]:
+                attributes = {**data.get("attributes", {}), "is_warm_tier": True}
+                warm_data = {**data, "is_aggregated": False, "ttl_timestamp": bind_vars["ttl_timestamp"]}
+                warm_docs.append(record({**warm_data, "attributes": attributes}))
+                continue
+            timestamp = datetime.fromisoformat(data["timestamp"])
+            window_key = f"{timestamp:%Y-%m-%d}_{timestamp.hour // bind_vars['window_hours']}"
+            groups.setdefault((data.get("entity_id", "unknown"), data["activity_type"], window_key), []).append(doc)
+        for (entity_id, activity_type, window_key), group in sorted(groups.items()):
+            first_data = group[0]["Record"]["Data"]
+            warm_docs.append(
+                record(
+                    {
+                        "entity_id": entity_id,
+                        "activity_type": activity_type,
+                        "file_path": first_data["file_path"],
+                        "timestamp": min(doc["Record"]["Data"]["timestamp"] for doc in group),
+                        "end_timestamp": max(doc["Record"]["Data"]["timestamp"] for doc in group),
+                        "count": len(group),
+                        "is_aggregated": True,
+                        "aggregation_group": f"{entity_id}_{activity_type}_{window_key}",
+                        "importance_score": max(doc["Record"]["Data"]["importance_score"] for doc in group),
+                        "ttl_timestamp": bind_vars["ttl_timestamp"],
+                        "original_ids": [doc["_key"] for doc in group],
+                        "attributes": {"is_warm_tier": True, "aggregated_count": len(group)},
+                    },
+                ),
+            )
+
+        for warm_doc in warm_docs:
+            warm.add_document(warm_doc)
+        for doc in selected:
+            doc["Record"]["Data"].update({"transitioned": True, "transition_time": bind_vars["now"]})
+        return iter([{"hot": len(selected), "warm": len(warm_docs)}])
+
+
+class TestServerSideTransition(unittest.TestCase):
+    """Test the server-side transition from the hot tier to the warm tier."""
+
+    def setUp(self):
+        """Set up a recorder over mock hot and warm tier collections."""
+        self.mock_db = MockDatabase()
+        self.recorder = NtfsWarmTierRecorder(no_db=True, register_enabled=False)
+        self.recorder._db = self.mock_db
+        self.recorder._collection_name = "ntfs_activities_warm"
+        self.recorder._collection = self.mock_db.get_collection("ntfs_activities_warm")
+        self.recorder._hot_tier_collection_name = "ntfs_activities_hot"
+        self.recorder._setup_indices()
+        self.hot_collection = self.mock_db.get_collection("ntfs_activities_hot")
+        self.warm_collection = self.recorder._collection
+
+        self.transaction = MockTransaction(self.mock_db)
+        self.mock_db._arangodb.begin_transaction.return_value = self.transaction
+
+        # Two old modifications of one file, one old important creation and one recent activity
+        old = datetime(2025, 3, 1, 9, 0, tzinfo=UTC)
+        self._add_hot("a", "1", "modify", old, 0.3)
+        self._add_hot("b", "1", "modify", old + timedelta(minutes=10), 0.5)
+        self._add_hot("c", "2", "create", old + timedelta(minutes=20), 0.9)
+        self._add_hot("d", "3", "create", datetime.now(UTC), 0.9)
+
+    def _add_hot(self, key, entity_id, activity_type, timestamp, importance_score):
+        self.hot_collection.add_document(
+            {
+                "_key": key,
+                "Record": {
+                    "SourceIdentifier": {"Identifier": "hot", "Version": "1.0"},
+                    "Timestamp": timestamp.isoformat(),
+                    "Data": {
+                        "activity_id": key,
+                        "entity_id": entity_id,
+                        "activity_type": activity_type,
+                        "file_path": f"C:/Users/Documents/file_{entity_id}.txt",
+                        "timestamp": timestamp.isoformat(),
+                        "importance_score": importance_score,
+                    },
+                },
+            },
+        )
+
+    @staticmethod
+    def _field(document, path):
+        for name in path.split("."):
+            document = document[name]
+        return document
+
+    def test_transition_from_hot_tier_server_side(self):
+        """Old activities are copied or aggregated into Record-wrapped warm documents and marked in the hot tier."""
+        result = self.recorder.transition_from_hot_tier_server_side(age_threshold_hours=12, batch_size=100)
+
+        assert result == (3, 2)
+        self.mock_db._arangodb.begin_transaction.assert_called_once_with(
+            read=["ntfs_activities_hot"],
+            write=["ntfs_activities_hot", "ntfs_activities_warm"],
+        )
+        self.transaction.commit_transaction.assert_called_once()
+        self.transaction.abort_transaction.assert_not_called()
+
+        # Every warm document has the fields the warm tier indexes (and its TTL index) are defined on
+        warm_docs = list(self.warm_collection.documents.values())
+        assert len(warm_docs) == 2
+        indexed_fields = [field for index in self.warm_collection.indices for field in index["fields"]]
+        assert "Record.Data.ttl_timestamp" in indexed_fields
+        for warm_doc in warm_docs:
+            assert set(warm_doc) == {"_key", "Record"}
+            assert warm_doc["Record"]["SourceIdentifier"]["Identifier"] == str(self.recorder._recorder_id)
+            for field in indexed_fields:
+                self._field(warm_doc, field)
+
+        by_type = {warm_doc["Record"]["Data"]["activity_type"]: warm_doc["Record"]["Data"] for warm_doc in warm_docs}
+        assert by_type["create"]["activity_id"] == "c"
+        assert by_type["create"]["is_aggregated"] is False
+        assert by_type["create"]["attributes"]["is_warm_tier"] is True
+        assert by_type["modify"]["is_aggregated"] is True
+        assert by_type["modify"]["count"] == 2
+        assert sorted(by_type["modify"]["original_ids"]) == ["a", "b"]
+        assert by_type["modify"]["importance_score"] == 0.5
+
+        # The transitioned hot tier activities are marked, the recent one is left alone
+        transitioned = {
+            key for key, doc in self.hot_collection.documents.items() if doc["Record"]["Data"].get("transitioned")
+        }
+        assert transitioned == {"a", "b", "c"}
+        assert self.hot_collection.documents["a"]["Record"]["Data"]["transition_time"]
+
+        # Nothing is left to transition
+        assert self.recorder.transition_from_hot_tier_server_side(age_threshold_hours=12, batch_size=100) == (0, 0)
+        assert len(self.warm_collection.documents) == 2
+
+    def test_transition_from_hot_tier_server_side_failure(self):
+        """A failed query rolls the batch back."""
+        self.transaction.aql.execute.side_effect = Exception("query failed")
+        assert self.recorder.transition_from_hot_tier_server_side() == (0, 0)
+        self.transaction.abort_transaction.assert_called_once()
+        self.transaction.commit_transaction.assert_not_called()
+
+
 class TestImportanceScorer(unittest.TestCase):
     """Test the importance scoring functionality."""
 
@@ -78,7 +78,8 @@ class IndalekoTimestampDataModel(IndalekoBaseModel):
         }
 
     @field_validator("Value", mode="before")
-    def ensure_timezone(self, value: datetime):
+    @classmethod
+    def ensure_timezone(cls, value: datetime):
         if isinstance(value, str):
             value = datetime.fromisoformat(value)
         if value.tzinfo is None:
@@ -16,8 +16,10 @@ if os.environ.get("INDALEKO_ROOT") is None:
     sys.path.append(current_path)
 
 # pylint: disable=wrong-import-position
+from db.bulk_loader import IndalekoBulkLoader  # noqa: E402
 from db.collection import IndalekoCollection  # noqa: E402
 from db.collection_index import IndalekoCollectionIndex  # noqa: E402
+from db.connection_pool import IndalekoDBConnectionPool  # noqa: E402
 from db.db_collections import IndalekoDBCollections  # noqa: E402
 from db.db_config import IndalekoDBConfig  # noqa: E402
 from db.i_collections import IndalekoCollections  # noqa: E402
@@ -30,11 +32,13 @@ from db.utils.query_performance import timed_aql_execute  # noqa: E402
 __version__ = "0.1.0"
 
 __all__ = [
+    "IndalekoBulkLoader",
     "IndalekoCollection",
     "IndalekoCollectionIndex",
     "IndalekoCollections",
     "IndalekoDBCollections",
     "IndalekoDBConfig",
+    "IndalekoDBConnectionPool",
     "IndalekoServiceManager",
     "timed_aql_execute",
 ]
@@ -0,0 +1,241 @@
+"""
+This module implements an in-process streaming bulk loader for ArangoDB.
+
+The loader consumes an arbitrary iterable of documents, groups them into
+fixed size chunks, and hands the chunks to a small pool of worker threads.
+Each worker uses its own database connection (see IndalekoDBConnectionPool)
+and loads the chunk with the ArangoDB bulk import API.  Only a bounded number
+of chunks are ever in flight, so memory use is bounded by
+chunk_size * max_pending documents regardless of the size of the input.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import concurrent.futures
+import itertools
+import logging
+import os
+import sys
+import time
+
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+import arango
+
+
+if os.environ.get("INDALEKO_ROOT") is None:
+    current_path = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.exists(os.path.join(current_path, "Indaleko.py")):
+        current_path = os.path.dirname(current_path)
+    os.environ["INDALEKO_ROOT"] = current_path
+    sys.path.append(current_path)
+
+# pylint: disable=wrong-import-position
+from db.connection_pool import IndalekoDBConnectionPool
+from db.db_config import IndalekoDBConfig
+
+
+# pylint: enable=wrong-import-position
+
+
+class IndalekoBulkLoader:
+    """Stream documents into a collection in parallel, bounded-size chunks."""
+
+    default_chunk_size = int(os.environ.get("INDALEKO_BULK_CHUNK_SIZE", "5000"))
+    default_workers = int(os.environ.get("INDALEKO_BULK_WORKERS", "4"))
+    max_error_details = 10  # per chunk, to keep error reports bounded
+
+    def __init__(
+        self,
+        collection_name: str,
+        db_config: IndalekoDBConfig | None = None,
+        chunk_size: int = default_chunk_size,
+        workers: int = default_workers,
+        max_pending: int | None = None,
+        on_duplicate: str = "error",
+        pool: IndalekoDBConnectionPool | None = None,
+    ) -> None:
+        """
+        Create a bulk loader.
+
+        Inputs:
+            * collection_name: the collection into which documents are loaded
+            * db_config: the database configuration (default config if not specified)
+            * chunk_size: the number of documents per import request
+            * workers: the number of chunks loaded concurrently
+            * max_pending: the number of chunks buffered (default 2 * workers)
+            * on_duplicate: ArangoDB import duplicate policy
+              (error, update, replace, ignore)
+            * pool: an existing connection pool to use (a private pool is
+              created and closed by the loader if not specified)
+        """
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be at least 1, not {chunk_size}")
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, not {workers}")
+        if on_duplicate not in ("error", "update", "replace", "ignore"):
+            raise ValueError(f"Unknown on_duplicate policy {on_duplicate}")
+        self.collection_name = collection_name
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.max_pending = max_pending if max_pending is not None else 2 * workers
+        self.max_pending = max(self.max_pending, workers)
+        self.on_duplicate = on_duplicate
+        self.owns_pool = pool is None
+        self.pool = pool if pool is not None else IndalekoDBConnectionPool(db_config=db_config, size=workers)
+
+    @staticmethod
+    def to_document(entry: Any) -> dict[str, Any]:
+        """Convert an entry (dict or Indaleko object) into a database document."""
+        if isinstance(entry, dict):
+            return entry
+        if hasattr(entry, "serialize"):
+            return entry.serialize()
+        raise TypeError(f"Cannot convert {type(entry)} to a database document")
+
+    @staticmethod
+    def chunk_documents(documents: Iterable[Any], chunk_size: int) -> Iterator[list[dict[str, Any]]]:
+        """Yield lists of at most chunk_size documents from the input."""
+        iterator = iter(documents)
+        while True:
+            chunk = [IndalekoBulkLoader.to_document(entry) for entry in itertools.islice(iterator, chunk_size)]
+            if not chunk:
+                return
+            yield chunk
+
+    def load_chunk(self, chunk_number: int, chunk: list[dict[str, Any]]) -> dict[str, Any]:
+        """Load a single chunk and return a report about it."""
+        report = {
+            "chunk": chunk_number,
+            "documents": len(chunk),
+            "created": 0,
+            "updated": 0,
+            "ignored": 0,
+            "errors": 0,
+            "details": [],
+        }
+        start = time.perf_counter()
+        try:
+            with self.pool.connection() as db:
+                result = db.collection(self.collection_name).import_bulk(
+                    chunk,
+                    halt_on_error=False,
+                    details=True,
+                    on_duplicate=self.on_duplicate,
+                )
+            report["created"] = result.get("created", 0)
+            report["updated"] = result.get("updated", 0)
+            report["ignored"] = result.get("ignored", 0)
+            report["errors"] = result.get("errors", 0)
+            report["details"] = result.get("details", [])[: self.max_error_details]
+        except arango.exceptions.ArangoError as error:  # pylint: disable=no-member
+            report["errors"] = len(chunk)
+            report["details"] = [str(error)]
+        report["elapsed"] = time.perf_counter() - start
+        return report
+
+    def start(self) -> "IndalekoBulkLoader":
+        """
+        Start an incremental load.  Documents are then added with submit()
+        and the load is completed with finish().  This allows a producer to
+        feed several loaders at once without materializing its output.
+        """
+        self.summary = {
+            "collection": self.collection_name,
+            "chunks": 0,
+            "documents": 0,
+            "created": 0,
+            "updated": 0,
+            "ignored": 0,
+            "errors": 0,
+            "failed_chunks": [],
+        }
+        self._chunk_number = 0
+        self._pending = set()
+        self._start_time = time.perf_counter()
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers)
+        return self
+
+    def _record(self, future: concurrent.futures.Future) -> None:
+        """Fold a completed chunk report into the summary."""
+        report = future.result()
+        self.summary["chunks"] += 1
+        for key in ("documents", "created", "updated", "ignored", "errors"):
+            self.summary[key] += report[key]
+        if report["errors"]:
+            logging.warning(
+                "Bulk load of chunk %d into %s: %d of %d documents failed: %s",
+                report["chunk"],
+                self.collection_name,
+                report["errors"],
+                report["documents"],
+                report["details"],
+            )
+            self.summary["failed_chunks"].append(report)
+
+    def submit(self, documents: Iterable[Any]) -> None:
+        """
+        Queue documents for loading.  This blocks while max_pending chunks are
+        in flight, which bounds the memory used by the loader.
+        """
+        for chunk in self.chunk_documents(documents, self.chunk_size):
+            if len(self._pending) >= self.max_pending:
+                done, self._pending = concurrent.futures.wait(
+                    self._pending,
+                    return_when=concurrent.futures.FIRST_COMPLETED,
+                )
+                for future in done:
+                    self._record(future)
+            self._pending.add(self._executor.submit(self.load_chunk, self._chunk_number, chunk))
+            self._chunk_number += 1
+
+    def finish(self) -> dict[str, Any]:
+        """
+        Wait for all queued chunks to load and return the summary: the total
+        counts, the elapsed time, and the reports for chunks with errors.
+        """
+        try:
+            for future in concurrent.futures.as_completed(self._pending):
+                self._record(future)
+        finally:
+            self._pending = set()
+            self._executor.shutdown(wait=True)
+            if self.owns_pool:
+                self.pool.close()
+        summary = self.summary
+        summary["elapsed"] = time.perf_counter() - self._start_time
+        if summary["elapsed"] > 0:
+            summary["documents_per_second"] = summary["documents"] / summary["elapsed"]
+        logging.info(
+            "Bulk loaded %d documents into %s in %d chunks (%d errors, %.2f seconds)",
+            summary["documents"],
+            self.collection_name,
+            summary["chunks"],
+            summary["errors"],
+            summary["elapsed"],
+        )
+        return summary
+
+    def load(self, documents: Iterable[Any]) -> dict[str, Any]:
+        """Load the documents into the collection and return the summary."""
+        self.start()
+        try:
+            self.submit(documents)
+        finally:
+            summary = self.finish()
+        return summary
@@ -0,0 +1,254 @@
+"""
+This module provides a small pool of ArangoDB connections.
+
+The IndalekoDBConfig object wraps a single client and database handle, which
+is fine for interactive use but serializes bulk work.  The pool here hands out
+independent database handles (each with its own HTTP session) so that several
+threads can talk to the database at the same time.  It also provides an
+asyncio facade: queries and inserts run on pooled connections in worker
+threads, so a coroutine can overlap database work with other processing.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import collections
+import concurrent.futures
+import itertools
+import logging
+import os
+import queue
+import sys
+import threading
+
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from arango import ArangoClient
+from arango.database import StandardDatabase
+from arango.http import DefaultHTTPClient
+
+
+if os.environ.get("INDALEKO_ROOT") is None:
+    current_path = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.exists(os.path.join(current_path, "Indaleko.py")):
+        current_path = os.path.dirname(current_path)
+    os.environ["INDALEKO_ROOT"] = current_path
+    sys.path.append(current_path)
+
+# pylint: disable=wrong-import-position
+from db.db_config import IndalekoDBConfig
+
+
+# pylint: enable=wrong-import-position
+
+
+class IndalekoDBConnectionPool:
+    """
+    A fixed size pool of ArangoDB database handles.
+
+    Connections are created lazily, up to the pool size, and are returned to
+    the pool when the caller is done with them.  Callers should use the
+    `connection` context manager rather than calling acquire/release directly.
+    """
+
+    default_pool_size = int(os.environ.get("INDALEKO_DB_POOL_SIZE", "4"))
+
+    def __init__(
+        self,
+        db_config: IndalekoDBConfig | None = None,
+        size: int = default_pool_size,
+        timeout: float | None = None,
+    ) -> None:
+        """
+        Create the connection pool.
+
+        Inputs:
+            * db_config: the database configuration (default config if not specified)
+            * size: the maximum number of concurrent connections
+            * timeout: how long to wait for a free connection (None = forever)
+        """
+        if size < 1:
+            raise ValueError(f"Connection pool size must be at least 1, not {size}")
+        if db_config is None:
+            db_config = IndalekoDBConfig()
+        self.db_config = db_config
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._lock = threading.Lock()
+        self._created = 0
+        self._clients = []
+
+    def get_url(self) -> str:
+        """Return the URL of the database server."""
+        scheme = "https" if str(self.db_config.get_ssl_state()).lower() == "true" else "http"
+        return f"{scheme}://{self.db_config.get_hostname()}:{self.db_config.get_port()}"
+
+    def _connect(self) -> StandardDatabase:
+        """Create a new database handle with its own HTTP session."""
+        request_timeout = int(
+            self.db_config.config["database"].get(
+                "timeout",
+                IndalekoDBConfig.default_db_aql_timeout,
+            ),
+        )
+        client = ArangoClient(
+            hosts=self.get_url(),
+            http_client=DefaultHTTPClient(
+                request_timeout=request_timeout,
+                pool_connections=1,
+                pool_maxsize=1,
+            ),
+            request_timeout=request_timeout,
+        )
+        self._clients.append(client)
+        return client.db(
+            self.db_config.get_database_name(),
+            username=self.db_config.get_user_name(),
+            password=self.db_config.get_user_password(),
+            auth_method="basic",
+        )
+
+    def acquire(self) -> StandardDatabase:
+        """Take a database handle from the pool, creating one if allowed."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                create = True
+            else:
+                create = False
+        if create:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty as error:
+            raise TimeoutError(
+                f"No database connection available after {self.timeout} seconds",
+            ) from error
+
+    def release(self, db: StandardDatabase) -> None:
+        """Return a database handle to the pool."""
+        self._idle.put_nowait(db)
+
+    @contextmanager
+    def connection(self) -> Iterator[StandardDatabase]:
+        """Context manager that lends a database handle to the caller."""
+        db = self.acquire()
+        try:
+            yield db
+        finally:
+            self.release(db)
+
+    def execute(
+        self,
+        query: str,
+        bind_vars: dict[str, Any] | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> list[Any]:
+        """
+        Run an AQL query on a pooled connection and return all of the results.
+        The cursor is drained before the connection goes back to the pool.
+        """
+        with self.connection() as db:
+            return list(db.aql.execute(query, bind_vars=bind_vars, **kwargs))
+
+    async def execute_async(
+        self,
+        query: str,
+        bind_vars: dict[str, Any] | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> list[Any]:
+        """Run an AQL query without blocking the event loop."""
+        return await asyncio.to_thread(self.execute, query, bind_vars, **kwargs)
+
+    def insert_many(
+        self,
+        collection_name: str,
+        documents: Iterable[dict[str, Any]],
+        chunk_size: int = 1000,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> list[Any]:
+        """
+        Insert documents into a collection, with up to the pool size chunks
+        in flight at once.  Returns the per-document results (metadata or
+        the exception for that document) in the order of the input.
+        """
+
+        def insert_chunk(chunk: list[dict[str, Any]]) -> list[Any]:
+            with self.connection() as db:
+                return db.collection(collection_name).insert_many(chunk, **kwargs)
+
+        def collect(future: concurrent.futures.Future) -> None:
+            chunk_results = future.result()
+            if isinstance(chunk_results, list):
+                results.extend(chunk_results)
+            else:  # silent inserts return True
+                results.append(chunk_results)
+
+        iterator = iter(documents)
+        results = []
+        pending = collections.deque()  # bounded, so the input is never fully materialized
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.size) as executor:
+            for chunk in iter(lambda: list(itertools.islice(iterator, chunk_size)), []):
+                if len(pending) >= 2 * self.size:
+                    collect(pending.popleft())
+                pending.append(executor.submit(insert_chunk, chunk))
+            while pending:
+                collect(pending.popleft())
+        return results
+
+    async def insert_many_async(
+        self,
+        collection_name: str,
+        documents: Iterable[dict[str, Any]],
+        chunk_size: int = 1000,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> list[Any]:
+        """Insert documents without blocking the event loop."""
+        return await asyncio.to_thread(self.insert_many, collection_name, documents, chunk_size, **kwargs)
+
+    def close(self) -> None:
+        """Close all of the clients created by the pool."""
+        with self._lock:
+            clients, self._clients = self._clients, []
+            self._created = 0
+        while not self._idle.empty():
+            self._idle.get_nowait()
+        for client in clients:
+            try:
+                client.close()
+            except Exception as error:  # pylint: disable=broad-except
+                logging.warning("Error closing database client: %s", error)
+
+    def __enter__(self) -> "IndalekoDBConnectionPool":
+        """Support use as a context manager."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Close the pool on exit."""
+        self.close()
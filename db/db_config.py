@@ -26,14 +26,18 @@ import os
 import secrets
 import string
 import sys
+import threading
 import time
 
+from collections.abc import Iterable
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import requests
 
 from arango import ArangoClient
 from arango.collection import StandardCollection
+from arango.http import DefaultHTTPClient
 from icecream import ic
 
 
@@ -60,6 +64,10 @@ from utils.misc.directory_management import (
 from utils.misc.file_name_management import generate_file_name
 
 
+if TYPE_CHECKING:
+    from db.connection_pool import IndalekoDBConnectionPool
+
+
 # pylint: enable=wrong-import-position
 
 
@@ -70,6 +78,7 @@ class IndalekoDBConfig(IndalekoSingleton):
     default_db_config_file = Path(indaleko_default_config_dir) / default_db_config_file_name
     default_db_timeout = int(os.environ.get("INDALEKO_DB_TIMEOUT", "10"))
     default_db_aql_timeout = int(os.environ.get("INDALEKO_DB_AQL_TIMEOUT", "300"))
+    default_db_http_connections = int(os.environ.get("INDALEKO_DB_HTTP_CONNECTIONS", "10"))
 
     def __init__(
         self,
@@ -105,6 +114,8 @@ class IndalekoDBConfig(IndalekoSingleton):
         self._arangodb = None
         self.db = None  # this is legacy and should be removed (but it'll break things)
         self.collections = {}
+        self._pool = None
+        self._pool_lock = threading.Lock()
         if start:
             self.started = self.start()
 
@@ -176,11 +187,27 @@ class IndalekoDBConfig(IndalekoSingleton):
         connect_arg += ":"
         connect_arg += f"{self.config['database']['port']}"
         logging.debug("Connecting to %s", connect_arg)
-        aql_timeout = self.config["database"].get(
-            "timeout",
-            IndalekoDBConfig.default_db_aql_timeout,
+        aql_timeout = int(
+            self.config["database"].get(
+                "timeout",
+                IndalekoDBConfig.default_db_aql_timeout,
+            ),
+        )
+        http_connections = int(
+            self.config["database"].get(
+                "http_connections",
+                IndalekoDBConfig.default_db_http_connections,
+            ),
+        )
+        self.client = ArangoClient(
+            connect_arg,
+            http_client=DefaultHTTPClient(
+                request_timeout=aql_timeout,
+                pool_connections=http_connections,
+                pool_maxsize=http_connections,
+            ),
+            request_timeout=aql_timeout,
         )
-        self.client = ArangoClient(connect_arg, request_timeout=aql_timeout)
         if "admin_user" not in self.config["database"]:
             self.config["database"]["admin_user"] = "root"
         if "admin_passwd" not in self.config["database"]:
@@ -215,6 +242,52 @@ class IndalekoDBConfig(IndalekoSingleton):
         logging.info("Connected to database %s", self.config["database"]["database"])
         return connected
 
+    def get_connection_pool(self, size: int | None = None) -> "IndalekoDBConnectionPool":
+        """
+        Return the shared connection pool for concurrent database access.
+        The size is only used when the pool is first created (the default is
+        the pool_size configuration value, or IndalekoDBConnectionPool's).
+        """
+        from db.connection_pool import IndalekoDBConnectionPool  # avoid circular import
+
+        with self._pool_lock:
+            if self._pool is None:
+                if size is None:
+                    size = int(
+                        self.config["database"].get(
+                            "pool_size",
+                            IndalekoDBConnectionPool.default_pool_size,
+                        ),
+                    )
+                self._pool = IndalekoDBConnectionPool(db_config=self, size=size)
+            return self._pool
+
+    def close_connection_pool(self) -> None:
+        """Close the shared connection pool (it is re-created on demand)."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+
+    async def aql_execute_async(
+        self,
+        query: str,
+        bind_vars: dict[str, Any] | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> list[Any]:
+        """Run an AQL query on the shared pool without blocking the event loop."""
+        return await self.get_connection_pool().execute_async(query, bind_vars, **kwargs)
+
+    def insert_many(
+        self,
+        collection_name: str,
+        documents: Iterable[dict[str, Any]],
+        chunk_size: int = 1000,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> list[Any]:
+        """Insert documents concurrently over the shared pool."""
+        return self.get_connection_pool().insert_many(collection_name, documents, chunk_size, **kwargs)
+
     @staticmethod
     def generate_random_password(length=15):
         """
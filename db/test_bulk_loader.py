@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+"""
+Unit tests for the streaming bulk loader.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+import threading
+import unittest
+
+from contextlib import contextmanager
+from unittest.mock import MagicMock
+
+from arango.exceptions import DocumentInsertError
+
+
+# Set up environment
+if os.environ.get("INDALEKO_ROOT") is None:
+    current_path = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.exists(os.path.join(current_path, "Indaleko.py")):
+        current_path = os.path.dirname(current_path)
+    os.environ["INDALEKO_ROOT"] = current_path
+    sys.path.append(current_path)
+
+# pylint: disable=wrong-import-position
+from db.bulk_loader import IndalekoBulkLoader
+
+
+# pylint: enable=wrong-import-position
+
+
+class TestIndalekoBulkLoader(unittest.TestCase):
+    """Tests for the IndalekoBulkLoader class."""
+
+    def setUp(self):
+        """Build a connection pool whose connections share a mocked collection."""
+        self.chunks = []
+        self.lock = threading.Lock()
+        self.collection = MagicMock()
+        self.collection.import_bulk.side_effect = self._import_bulk
+        self.db = MagicMock()
+        self.db.collection.return_value = self.collection
+
+        @contextmanager
+        def connection():
+            yield self.db
+
+        self.pool = MagicMock()
+        self.pool.connection.side_effect = connection
+
+    def _import_bulk(self, chunk, **_kwargs):
+        """Record the chunk and report every document as created."""
+        with self.lock:
+            self.chunks.append(list(chunk))
+        return {"created": len(chunk), "errors": 0, "details": []}
+
+    def _loader(self, **kwargs):
+        """Create a loader on the mocked pool."""
+        kwargs.setdefault("chunk_size", 2)
+        kwargs.setdefault("workers", 2)
+        return IndalekoBulkLoader("Objects", pool=self.pool, **kwargs)
+
+    @staticmethod
+    def _documents(count):
+        """Create count distinct documents."""
+        return [{"_key": str(index)} for index in range(count)]
+
+    def test_invalid_arguments(self):
+        """Test that invalid sizes and duplicate policies are rejected."""
+        with self.assertRaises(ValueError):
+            self._loader(chunk_size=0)
+        with self.assertRaises(ValueError):
+            self._loader(workers=0)
+        with self.assertRaises(ValueError):
+            self._loader(on_duplicate="merge")
+
+    def test_to_document(self):
+        """Test that dicts are passed through and objects are serialized."""
+        document = {"_key": "1"}
+        entry = MagicMock()
+        entry.serialize.return_value = {"_key": "2"}
+        self.assertIs(IndalekoBulkLoader.to_document(document), document)
+        self.assertEqual(IndalekoBulkLoader.to_document(entry), {"_key": "2"})
+        with self.assertRaises(TypeError):
+            IndalekoBulkLoader.to_document(42)
+
+    def test_load_in_chunks(self):
+        """Test that the documents are loaded in chunks of chunk_size."""
+        summary = self._loader(on_duplicate="update").load(iter(self._documents(5)))
+
+        self.assertEqual(sorted(len(chunk) for chunk in self.chunks), [1, 2, 2])
+        loaded = sorted(document["_key"] for chunk in self.chunks for document in chunk)
+        self.assertEqual(loaded, [str(index) for index in range(5)])
+        for call in self.collection.import_bulk.call_args_list:
+            self.assertEqual(call.kwargs["on_duplicate"], "update")
+            self.assertFalse(call.kwargs["halt_on_error"])
+        self.db.collection.assert_called_with("Objects")
+
+        self.assertEqual(summary["collection"], "Objects")
+        self.assertEqual(summary["chunks"], 3)
+        self.assertEqual(summary["documents"], 5)
+        self.assertEqual(summary["created"], 5)
+        self.assertEqual(summary["errors"], 0)
+        self.assertEqual(summary["failed_chunks"], [])
+        self.pool.close.assert_not_called()
+
+    def test_load_serializes_objects(self):
+        """Test that Indaleko objects are serialized before loading."""
+        entries = []
+        for index in range(3):
+            entry = MagicMock()
+            entry.serialize.return_value = {"_key": str(index)}
+            entries.append(entry)
+
+        summary = self._loader().load(entries)
+
+        loaded = sorted(document["_key"] for chunk in self.chunks for document in chunk)
+        self.assertEqual(loaded, ["0", "1", "2"])
+        self.assertEqual(summary["created"], 3)
+
+    def test_import_errors_are_reported(self):
+        """Test that documents rejected by import_bulk are reported per chunk."""
+        details = [f"document {index} rejected" for index in range(15)]
+
+        def import_bulk(chunk, **_kwargs):
+            if any(document["_key"] == "4" for document in chunk):
+                return {"created": len(chunk) - 1, "errors": 1, "details": details}
+            return {"created": len(chunk), "ignored": 0, "errors": 0, "details": []}
+
+        self.collection.import_bulk.side_effect = import_bulk
+        with self.assertLogs(level="WARNING"):
+            summary = self._loader(chunk_size=3).load(self._documents(6))
+
+        self.assertEqual(summary["chunks"], 2)
+        self.assertEqual(summary["documents"], 6)
+        self.assertEqual(summary["created"], 5)
+        self.assertEqual(summary["errors"], 1)
+        self.assertEqual(len(summary["failed_chunks"]), 1)
+        report = summary["failed_chunks"][0]
+        self.assertEqual(report["chunk"], 1)
+        self.assertEqual(report["documents"], 3)
+        self.assertEqual(report["errors"], 1)
+        self.assertEqual(report["details"], details[: IndalekoBulkLoader.max_error_details])
+
+    def test_failed_chunk_falls_back_to_error_report(self):
+        """Test that a chunk whose import raises is counted as failed without stopping the load."""
+
+        def import_bulk(chunk, **_kwargs):
+            if any(document["_key"] == "0" for document in chunk):
+                raise DocumentInsertError(MagicMock(), MagicMock())
+            return self._import_bulk(chunk)
+
+        self.collection.import_bulk.side_effect = import_bulk
+        with self.assertLogs(level="WARNING"):
+            summary = self._loader().load(self._documents(5))
+
+        self.assertEqual(summary["chunks"], 3)
+        self.assertEqual(summary["documents"], 5)
+        self.assertEqual(summary["created"], 3)
+        self.assertEqual(summary["errors"], 2)
+        self.assertEqual(len(summary["failed_chunks"]), 1)
+        report = summary["failed_chunks"][0]
+        self.assertEqual(report["chunk"], 0)
+        self.assertEqual(report["errors"], 2)
+        self.assertEqual(len(report["details"]), 1)
+
+    def test_incremental_load(self):
+        """Test that several submit() calls are combined into one summary."""
+        loader = self._loader(chunk_size=10, workers=1, max_pending=1).start()
+        for start in range(0, 30, 3):
+            loader.submit({"_key": str(index)} for index in range(start, start + 3))
+        summary = loader.finish()
+
+        self.assertEqual(summary["documents"], 30)
+        self.assertEqual(summary["chunks"], 10)
+        self.assertEqual(summary["created"], 30)
+
+    def test_private_pool_is_closed(self):
+        """Test that the loader closes a pool it created itself."""
+        loader = self._loader()
+        loader.owns_pool = True
+        loader.load(self._documents(1))
+        self.pool.close.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
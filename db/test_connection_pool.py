@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+"""
+Unit tests for the database connection pool.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import unittest
+
+from unittest.mock import MagicMock
+
+from arango.exceptions import DocumentInsertError
+
+
+# Set up environment
+if os.environ.get("INDALEKO_ROOT") is None:
+    current_path = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.exists(os.path.join(current_path, "Indaleko.py")):
+        current_path = os.path.dirname(current_path)
+    os.environ["INDALEKO_ROOT"] = current_path
+    sys.path.append(current_path)
+
+# pylint: disable=wrong-import-position
+from db.connection_pool import IndalekoDBConnectionPool
+
+
+# pylint: enable=wrong-import-position
+
+
+class TestIndalekoDBConnectionPool(unittest.TestCase):
+    """Tests for the IndalekoDBConnectionPool class."""
+
+    def setUp(self):
+        """Build a pool whose connections share a mocked collection."""
+        self.chunks = []
+        self.lock = threading.Lock()
+        self.collection = MagicMock()
+        self.collection.insert_many.side_effect = self._insert_many
+        self.pool = IndalekoDBConnectionPool(db_config=MagicMock(), size=3)
+        self.pool._connect = MagicMock(side_effect=self._connect)
+
+    def _connect(self):
+        """Create a mocked database handle."""
+        db = MagicMock()
+        db.collection.return_value = self.collection
+        return db
+
+    def _insert_many(self, chunk, **_kwargs):
+        """Record the chunk and return one metadata entry per document."""
+        with self.lock:
+            self.chunks.append(list(chunk))
+            position = len(self.chunks)
+        if position % 3 == 1:  # delay some chunks so they complete out of order
+            time.sleep(0.01)
+        return [{"_key": document["_key"]} for document in chunk]
+
+    @staticmethod
+    def _documents(count):
+        """Create count distinct documents."""
+        return ({"_key": str(index)} for index in range(count))
+
+    def test_invalid_size(self):
+        """Test that an empty pool is rejected."""
+        with self.assertRaises(ValueError):
+            IndalekoDBConnectionPool(db_config=MagicMock(), size=0)
+
+    def test_connection_is_reused(self):
+        """Test that released connections are handed out again."""
+        with self.pool.connection() as first:
+            pass
+        with self.pool.connection() as second:
+            pass
+        self.assertIs(first, second)
+        self.assertEqual(self.pool._connect.call_count, 1)
+
+    def test_acquire_timeout(self):
+        """Test that acquire gives up when every connection is in use."""
+        self.pool.timeout = 0.01
+        connections = [self.pool.acquire() for _ in range(self.pool.size)]
+        with self.assertRaises(TimeoutError):
+            self.pool.acquire()
+        self.pool.release(connections[0])
+        self.assertIs(self.pool.acquire(), connections[0])
+
+    def test_insert_many_in_chunks(self):
+        """Test that documents are inserted in chunks and results keep the input order."""
+        results = self.pool.insert_many("Objects", self._documents(25), chunk_size=4, overwrite=True)
+
+        self.assertEqual(sorted(len(chunk) for chunk in self.chunks), [1, 4, 4, 4, 4, 4, 4])
+        self.assertEqual(results, [{"_key": str(index)} for index in range(25)])
+        for call in self.collection.insert_many.call_args_list:
+            self.assertEqual(call.kwargs, {"overwrite": True})
+        self.assertLessEqual(self.pool._connect.call_count, self.pool.size)
+
+    def test_insert_many_empty(self):
+        """Test that an empty input does not touch the database."""
+        self.assertEqual(self.pool.insert_many("Objects", []), [])
+        self.collection.insert_many.assert_not_called()
+
+    def test_insert_many_silent(self):
+        """Test that silent inserts return one result per chunk."""
+        self.collection.insert_many.side_effect = lambda _chunk, **_kwargs: True
+        results = self.pool.insert_many("Objects", self._documents(5), chunk_size=2, silent=True)
+        self.assertEqual(results, [True, True, True])
+
+    def test_insert_many_document_errors(self):
+        """Test that per-document errors are returned in place of their metadata."""
+        error = DocumentInsertError(MagicMock(), MagicMock())
+
+        def insert_many(chunk, **_kwargs):
+            return [error if document["_key"] == "3" else {"_key": document["_key"]} for document in chunk]
+
+        self.collection.insert_many.side_effect = insert_many
+        results = self.pool.insert_many("Objects", self._documents(6), chunk_size=4)
+
+        self.assertEqual(len(results), 6)
+        self.assertIs(results[3], error)
+        self.assertEqual(results[4], {"_key": "4"})
+
+    def test_insert_many_chunk_failure(self):
+        """Test that a failed chunk request is raised to the caller."""
+
+        def insert_many(chunk, **_kwargs):
+            if chunk[0]["_key"] == "4":
+                raise DocumentInsertError(MagicMock(), MagicMock())
+            return [{"_key": document["_key"]} for document in chunk]
+
+        self.collection.insert_many.side_effect = insert_many
+        with self.assertRaises(DocumentInsertError):
+            self.pool.insert_many("Objects", self._documents(12), chunk_size=4)
+        # the failed chunk's connection went back to the pool
+        self.assertEqual(self.pool._idle.qsize(), self.pool._connect.call_count)
+
+    def test_insert_many_async(self):
+        """Test that the async variant returns the same results."""
+        results = asyncio.run(self.pool.insert_many_async("Objects", self._documents(5), chunk_size=2))
+        self.assertEqual(results, [{"_key": str(index)} for index in range(5)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,7 +3,8 @@
 Incremental File System Indexer CLI.
 
 Walks configured directories, emits new or modified files since last run,
-and records them to a JSONL file.
+and records them to a JSONL file.  With --watch it keeps running on Linux,
+recording changes as inotify reports them.
 """
 import argparse
 import logging
@@ -60,6 +61,33 @@ def main() -> None:
         action="store_true",
         help="Upsert incremental records into the database instead of JSONL file",
     )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running, recording changes as they happen (Linux, uses inotify)",
+    )
+    parser.add_argument(
+        "--coalesce",
+        type=float,
+        default=0.5,
+        help="Seconds of quiet before watched changes are recorded (default: 0.5)",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=None,
+        help="Threads used to stat files during a rescan",
+    )
+    parser.add_argument(
+        "--prune-unchanged-dirs",
+        action="store_true",
+        help="Skip files in directories whose mtime is unchanged (misses in-place rewrites)",
+    )
+    parser.add_argument(
+        "--rglob",
+        action="store_true",
+        help="Use the original full rglob walk instead of the cached directory listings",
+    )
     args = parser.parse_args()
 
     # Configure logging
@@ -77,12 +105,44 @@ def main() -> None:
         Path(args.state_file).unlink(missing_ok=True)
         logger.info("Removed state file for full scan: %s", args.state_file)
 
-    # Collect
     collector = FsIncrementalCollector(
         volumes=args.volumes,
         state_file=args.state_file,
         patterns=args.patterns,
+        strategy="rglob" if args.rglob else "pruned",
+        threads=args.threads,
+        prune_unchanged_dirs=args.prune_unchanged_dirs,
     )
+    if args.db_records:
+        from activity.recorders.storage.fs_incremental_db import FsIncrementalDbRecorder
+
+        recorder = FsIncrementalDbRecorder()
+    else:
+        recorder = FsIncrementalRecorder(output_file=args.output_file)
+
+    if args.watch:
+        from activity.collectors.storage.fs_inotify import FsInotifyWatcher
+
+        if not FsInotifyWatcher.is_supported():
+            logger.error("--watch requires inotify (Linux)")
+            sys.exit(1)
+        watcher = FsInotifyWatcher(
+            volumes=args.volumes,
+            collector=collector,
+            coalesce_window=args.coalesce,
+        )
+        logger.info("Watching %s for changes", args.volumes)
+        try:
+            for activities in watcher.batches():
+                recorder.store_activities(activities)
+                logger.info("Recorded %d file events", len(activities))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            watcher.close()
+        return
+
+    # Collect
     activities = collector.collect_activities()
     logger.info(
         "Collected %d new/modified files since last run",
@@ -91,16 +151,12 @@ def main() -> None:
 
     # Record
     if args.db_records:
-        from activity.recorders.storage.fs_incremental_db import FsIncrementalDbRecorder
-
-        recorder = FsIncrementalDbRecorder()
         count = recorder.store_activities(activities)
         logger.info(
             "Upserted %d file records to database",
             count,
         )
     else:
-        recorder = FsIncrementalRecorder(output_file=args.output_file)
         count = recorder.store_activities(activities)
         logger.info(
             "Recorded %d file events to %s",
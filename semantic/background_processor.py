@@ -6,6 +6,14 @@ This module provides a centralized way to run multiple semantic extractors
 in the background at low priority. It uses the enhanced IndalekoFilePicker
 to find files in the database that are locally accessible and need processing.
 
+The extractors share a single pool of worker processes, since MIME and EXIF
+parsing are CPU bound and would otherwise be serialized by the GIL.  A
+ResourceGovernor decides how many files may be in flight from the load on
+the machine: the processors take every core the rest of the system leaves
+idle, and back off as soon as other work, disk pressure or a user at the
+keyboard needs the machine.  Batch sizes follow each extractor's measured
+throughput.
+
 Project Indaleko
 Copyright (C) 2024-2025 Tony Mason
 
@@ -27,11 +35,14 @@ import argparse
 import json
 import logging
 import os
+import random
 import signal
 import sys
 import threading
 import time
 
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from datetime import UTC, datetime
 from typing import Any
 
@@ -46,12 +57,25 @@ if os.environ.get("INDALEKO_ROOT") is None:
 
 # pylint: disable=wrong-import-position
 from semantic.collectors.checksum.background_processor import (
-    schedule_checksum_processing,
+    get_checksum_attribute_ids,
+)
+from semantic.collectors.checksum.background_processor import (
+    process_file_and_store as process_checksum_file,
+)
+from semantic.collectors.exif.background_processor import (
+    SUPPORTED_IMAGE_EXTENSIONS,
+    get_exif_attribute_ids,
+)
+from semantic.collectors.exif.background_processor import (
+    process_file_and_store as process_exif_file,
 )
-from semantic.collectors.exif.background_processor import schedule_exif_processing
 
 # Import specialized processors
-from semantic.collectors.mime.background_processor import schedule_mime_processing
+from semantic.collectors.mime.background_processor import (
+    process_file_and_store as process_mime_file,
+)
+from semantic.resource_governor import ResourceGovernor, init_worker_process
+from storage.known_attributes import StorageSemanticAttributes
 from utils.db.db_file_picker import IndalekoFilePicker
 
 
@@ -113,8 +137,20 @@ class BackgroundProcessorManager:
     Manages multiple background semantic processors running concurrently.
     Coordinates resources and ensures fair allocation across different
     semantic extraction tasks.
+
+    One scheduler thread picks files for every processor type and hands
+    them, round robin, to a process pool shared by all of them.  The
+    ResourceGovernor bounds the files in flight, and each processor type's
+    batch size follows its measured throughput.
     """
 
+    # Per-file work for each processor type; each runs in a worker process
+    PROCESS_FUNCTIONS = {  # noqa: RUF012
+        ProcessorType.MIME: process_mime_file,
+        ProcessorType.CHECKSUM: process_checksum_file,
+        ProcessorType.EXIF: process_exif_file,
+    }
+
     def __init__(self, config: dict[str, Any]) -> None:
         """
         Initialize the background processor manager.
@@ -123,10 +159,27 @@ class BackgroundProcessorManager:
             config: Configuration dictionary with processor settings
         """
         self.config = config
+        self.scheduler_config = config.get("scheduler", {})
         self.file_picker = IndalekoFilePicker()
         self.should_stop = threading.Event()
         self.processors: dict[str, threading.Thread] = {}
         self.stats: dict[str, dict[str, int]] = {}
+        self.executor: ProcessPoolExecutor | None = None
+        self.governor = ResourceGovernor(
+            max_workers=self.scheduler_config.get("max_workers") or os.cpu_count() or 1,
+            max_cpu_percent=self.scheduler_config.get("max_cpu_percent", 50),
+            max_io_percent=self.scheduler_config.get("max_io_percent", 60),
+            user_idle_seconds=self.scheduler_config.get("user_idle_seconds", 300),
+            suspend_on_activity=self.scheduler_config.get("suspend_on_activity", True),
+            interval=self.scheduler_config.get("poll_interval", 1.0),
+        )
+
+        # Scheduling state of each processor type
+        self._pending: dict[str, deque] = {}
+        self._in_flight: dict[Future, dict[str, Any]] = {}
+        self._batch_sizes: dict[str, int] = {}
+        self._next_pick: dict[str, float] = {}
+        self._batch_started: dict[str, tuple[float, int]] = {}
 
         # Configure each processor type
         for processor_type in ProcessorType.get_enabled():
@@ -135,6 +188,11 @@ class BackgroundProcessorManager:
                 "processed": 0,
                 "errors": 0,
                 "last_run": 0,
+                "skipped": 0,
+                "completed": 0,
+                "busy_seconds": 0.0,
+                "files_per_second": 0.0,
+                "batch_size": self.config.get(processor_type, {}).get("batch_size", 10),
             }
 
         # Set up signal handlers
@@ -150,7 +208,7 @@ class BackgroundProcessorManager:
         """Start all enabled background processors."""
         logger.info("Starting background processor manager")
 
-        # Start processor threads
+        processor_types = []
         for processor_type in self.config.get(
             "processors",
             ProcessorType.get_enabled(),
@@ -160,32 +218,48 @@ class BackgroundProcessorManager:
                     f"Processor type {processor_type} is not enabled or available",
                 )
                 continue
-
-            # Create and start the processor thread
-            thread = threading.Thread(
-                target=self._run_processor,
-                args=(processor_type,),
-                daemon=True,
-                name=f"Indaleko-{processor_type.capitalize()}Processor",
-            )
-            self.processors[processor_type] = thread
-            thread.start()
-            logger.info(f"Started {processor_type} processor thread")
+            if processor_type not in self.PROCESS_FUNCTIONS:
+                # Unstructured processing is not yet implemented as a background processor
+                logger.warning(f"{processor_type} background processing not yet implemented")
+                continue
+            processor_types.append(processor_type)
+            self._pending[processor_type] = deque()
+            self._batch_sizes[processor_type] = self.config.get(processor_type, {}).get("batch_size", 10)
+            self._next_pick[processor_type] = 0.0
+
+        if not processor_types:
+            logger.warning("No processors to run")
+            return
+
+        # One pool of worker processes is shared by all the processor types
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.governor.max_workers,
+            initializer=init_worker_process,
+        )
+        thread = threading.Thread(
+            target=self._run_scheduler,
+            args=(processor_types,),
+            daemon=True,
+            name="Indaleko-ProcessorScheduler",
+        )
+        self.processors["scheduler"] = thread
+        thread.start()
+        logger.info(
+            f"Started scheduler for {', '.join(processor_types)} with up to {self.governor.max_workers} workers",
+        )
 
     def stop(self) -> None:
         """Stop all background processors."""
         logger.info("Stopping background processors...")
         self.should_stop.set()
 
-        # Wait for all processor threads to terminate
-        for processor_type, thread in self.processors.items():
-            if thread.is_alive():
-                logger.info(f"Waiting for {processor_type} processor to terminate...")
+        # Wait for the scheduler thread to terminate
+        for name, thread in self.processors.items():
+            if thread.is_alive() and thread is not threading.current_thread():
+                logger.info(f"Waiting for {name} to terminate...")
                 thread.join(timeout=10.0)
                 if thread.is_alive():
-                    logger.warning(
-                        f"{processor_type} processor did not terminate gracefully",
-                    )
+                    logger.warning(f"{name} did not terminate gracefully")
 
         # Stop the file picker's background processing
         self.file_picker.stop_background_processing(wait=True)
@@ -193,124 +267,230 @@ class BackgroundProcessorManager:
         # Log final statistics
         self._log_statistics()
 
-    def _run_processor(self, processor_type: str) -> None:
+    def _run_scheduler(self, processor_types: list[str]) -> None:
         """
-        Run a specific type of processor in a loop.
+        Keep the shared pool busy with files for the given processor types.
 
         Args:
-            processor_type: The type of processor to run
+            processor_types: The types of processor to run
         """
-        logger.info(f"Starting {processor_type} processor loop")
+        logger.info(f"Starting scheduler loop for {', '.join(processor_types)}")
+        poll_interval = self.scheduler_config.get("poll_interval", 1.0)
+        report_interval = self.scheduler_config.get("report_interval", 300)
+        last_report = time.time()
+        turn = 0
 
-        # Get processor-specific config
-        processor_config = self.config.get(processor_type, {})
+        try:
+            while not self.should_stop.is_set():
+                try:
+                    allowed = self.governor.update()
+
+                    if allowed > 0:
+                        for processor_type in processor_types:
+                            self._refill(processor_type)
+
+                    # Submit files round robin, so no processor type starves the others
+                    while len(self._in_flight) < allowed:
+                        ready = [p for p in processor_types if self._pending[p]]
+                        if not ready:
+                            break
+                        processor_type = ready[turn % len(ready)]
+                        turn += 1
+                        self._submit(processor_type, self._pending[processor_type].popleft())
+
+                    if self._in_flight:
+                        done, _ = wait(list(self._in_flight), timeout=poll_interval, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            self._complete(future)
+                    else:
+                        self.should_stop.wait(poll_interval)
+
+                    if time.time() - last_report >= report_interval:
+                        self._log_statistics()
+                        last_report = time.time()
+
+                except Exception as e:
+                    logger.error(f"Error in processor scheduler: {e}", exc_info=True)
+                    self.should_stop.wait(60)  # Wait before retry after error
+        finally:
+            self.governor.release()
+            if self.executor is not None:
+                self.executor.shutdown(wait=True, cancel_futures=True)
+            for future in list(self._in_flight):
+                if future.done() and not future.cancelled():
+                    self._complete(future)
+
+    def _refill(self, processor_type: str) -> None:
+        """
+        Pick the next batch of files for a processor type once its last batch is under way.
 
-        # Main processing loop
-        while not self.should_stop.is_set():
-            try:
-                # Check if it's time to run this processor
-                current_time = time.time()
-                min_interval = processor_config.get(
-                    "interval",
-                    300,
-                )  # Default: 5 minutes
-
-                if current_time - self.stats[processor_type]["last_run"] < min_interval:
-                    # Not time yet, sleep and continue
-                    time.sleep(1)
-                    continue
+        Args:
+            processor_type: The type of processor to pick files for
+        """
+        now = time.time()
+        if self._pending[processor_type] or now < self._next_pick[processor_type]:
+            return
+
+        # Size this batch from how quickly the last one was processed
+        if processor_type in self._batch_started:
+            started, completed_before = self._batch_started[processor_type]
+            completed = self.stats[processor_type]["completed"] - completed_before
+            self._adapt_batch_size(processor_type, completed, now - started)
+
+        batch_size = self._batch_sizes[processor_type]
+        files = self._pick_files(processor_type, batch_size)
+        self.stats[processor_type]["last_run"] = now
+        self.stats[processor_type]["scheduled"] += len(files)
+        self._pending[processor_type].extend(files)
+
+        if files:
+            self._batch_started[processor_type] = (now, self.stats[processor_type]["completed"])
+            logger.info(f"{processor_type} processor: scheduled={len(files)}, batch_size={batch_size}")
+        else:
+            # If nothing to process, wait longer
+            min_interval = self.config.get(processor_type, {}).get("interval", 300)
+            self._next_pick[processor_type] = now + min(3600, min_interval * 2)  # Max: 1 hour
+            self._batch_started.pop(processor_type, None)
 
-                # Execute the appropriate processor
-                scheduled, processed = self._execute_processor(processor_type)
+    def _adapt_batch_size(self, processor_type: str, files_completed: int, elapsed_seconds: float) -> None:
+        """
+        Grow or shrink a processor type's batch towards target_batch_seconds of work.
 
-                # Update statistics
-                self.stats[processor_type]["scheduled"] += scheduled
-                self.stats[processor_type]["processed"] += processed
-                self.stats[processor_type]["last_run"] = current_time
+        Args:
+            processor_type: The type of processor
+            files_completed: Files completed since the last batch was picked
+            elapsed_seconds: Seconds since the last batch was picked
+        """
+        if files_completed <= 0 or elapsed_seconds <= 0:
+            return
+        rate = files_completed / elapsed_seconds
+        target = int(rate * self.scheduler_config.get("target_batch_seconds", 60))
+        batch_size = self._batch_sizes[processor_type]
+        batch_size = min(target, batch_size * 2)  # grow at most twofold per batch
+        batch_size = max(
+            self.scheduler_config.get("min_batch_size", 5),
+            min(self.scheduler_config.get("max_batch_size", 500), batch_size),
+        )
+        self._batch_sizes[processor_type] = batch_size
+        self.stats[processor_type]["batch_size"] = batch_size
+
+    def _pick_files(self, processor_type: str, count: int) -> list[dict[str, Any]]:
+        """
+        Pick files that a processor type has not (recently) processed.
 
-                # Log progress
-                logger.info(
-                    f"{processor_type} processor: scheduled={scheduled}, total_scheduled={self.stats[processor_type]['scheduled']}",
-                )
+        Args:
+            processor_type: The type of processor to pick files for
+            count: Maximum number of files to pick
+
+        Returns:
+            List[Dict[str, Any]]: The files, their local paths and the attribute they will update
+        """
+        processor_config = self.config.get(processor_type, {})
+        file_extensions = processor_config.get("file_extensions", None)
+        if processor_type == ProcessorType.MIME:
+            attr_id = StorageSemanticAttributes.STORAGE_ATTRIBUTES_MIMETYPE_FROM_CONTENT
+        elif processor_type == ProcessorType.CHECKSUM:
+            # Distribute the work across the different checksum types
+            attr_id = random.choice(get_checksum_attribute_ids())
+        else:
+            attr_id = random.choice(get_exif_attribute_ids())
+            file_extensions = file_extensions or SUPPORTED_IMAGE_EXTENSIONS
+
+        files = self.file_picker.pick_files_for_semantic_processing(
+            semantic_attribute_id=attr_id,
+            count=count,
+            max_age_days=processor_config.get("max_age_days", None),
+            min_last_processed_days=processor_config.get("min_last_processed_days", 30),
+        )
+
+        in_flight = {item["file"].get_object_id() for item in self._in_flight.values()}
+        picked = []
+        for file in files:
+            if file.get_object_id() in in_flight:
+                continue
+            doc = file.serialize()
+            if file_extensions:
+                label = doc.get("Label", "") or ""
+                if not any(label.lower().endswith(ext.lower()) for ext in file_extensions):
+                    continue
+            local_path = self._get_local_path(doc)
+            if local_path:
+                picked.append({"file": file, "local_path": local_path, "attr_id": attr_id})
+        return picked
 
-                # Sleep before next execution
-                if scheduled == 0:
-                    # If nothing to process, wait longer
-                    sleep_time = min(3600, min_interval * 2)  # Max: 1 hour
-                else:
-                    sleep_time = min_interval
-
-                # Sleep with periodic checks for stop signal
-                for _ in range(0, sleep_time, 5):
-                    if self.should_stop.is_set():
-                        break
-                    time.sleep(min(5, sleep_time))
-
-            except Exception as e:
-                logger.error(f"Error in {processor_type} processor: {e}", exc_info=True)
-                self.stats[processor_type]["errors"] += 1
-                time.sleep(60)  # Wait before retry after error
-
-    def _execute_processor(self, processor_type: str) -> tuple[int, int]:
+    def _get_local_path(self, doc: dict[str, Any]) -> str | None:
         """
-        Execute a specific processor type.
+        Get the local path of a file from its serialized object.
 
         Args:
-            processor_type: The type of processor to execute
+            doc: The serialized IndalekoObject
 
         Returns:
-            Tuple[int, int]: Number of files scheduled and processed
+            Optional[str]: The local path, or None if the file is not accessible here
         """
-        # Get processor-specific config
-        processor_config = self.config.get(processor_type, {})
+        uri = doc.get("URI", "")
+        volume_parts = uri.split("Volume") if uri else []
+        if len(volume_parts) < 2:
+            return None
+        volume_guid = "Volume" + volume_parts[1].split("\\")[0]
+        local_path = self.file_picker._uri_to_local_path(uri, volume_guid)
+        if not local_path or not os.path.exists(local_path):
+            return None
+        return local_path
+
+    def _submit(self, processor_type: str, item: dict[str, Any]) -> None:
+        """
+        Hand a file to the shared pool.
 
-        # Common parameters
-        count = processor_config.get("batch_size", 10)
-        max_age_days = processor_config.get("max_age_days", None)
-        min_last_processed_days = processor_config.get("min_last_processed_days", 30)
+        Args:
+            processor_type: The type of processor to run on the file
+            item: The file, as returned by _pick_files
+        """
+        future = self.executor.submit(
+            self.PROCESS_FUNCTIONS[processor_type],
+            item["file"],
+            item["local_path"],
+        )
+        self._in_flight[future] = {**item, "processor_type": processor_type, "submitted": time.time()}
+
+    def _complete(self, future: Future) -> None:
+        """
+        Record the result of a file processed by the pool.
 
-        # Execute the appropriate processor
-        if processor_type == ProcessorType.MIME:
-            return schedule_mime_processing(
-                count=count,
-                background=True,
-                max_age_days=max_age_days,
-                min_last_processed_days=min_last_processed_days,
-                run_duration=None,
-            )
-        if processor_type == ProcessorType.CHECKSUM:
-            file_extensions = processor_config.get("file_extensions", None)
-            return schedule_checksum_processing(
-                count=count,
-                background=True,
-                max_age_days=max_age_days,
-                min_last_processed_days=min_last_processed_days,
-                run_duration=None,
-                file_extensions=file_extensions,
-            )
-        if processor_type == ProcessorType.EXIF:
-            return schedule_exif_processing(
-                count=count,
-                background=True,
-                max_age_days=max_age_days,
-                min_last_processed_days=min_last_processed_days,
-                run_duration=None,
-            )
-        if processor_type == ProcessorType.UNSTRUCTURED and UNSTRUCTURED_AVAILABLE:
-            # Unstructured processing is not yet implemented as a background processor
-            # This is a placeholder for future implementation
-            logger.warning("Unstructured background processing not yet implemented")
-            return 0, 0
-        logger.warning(f"Unknown processor type: {processor_type}")
-        return 0, 0
+        Args:
+            future: The finished future returned by _submit
+        """
+        item = self._in_flight.pop(future)
+        processor_type = item["processor_type"]
+        stats = self.stats[processor_type]
+        stats["completed"] += 1
+        stats["busy_seconds"] += time.time() - item["submitted"]
+        # Files per second of worker time; times the workers in use gives the pool's throughput
+        stats["files_per_second"] = stats["completed"] / stats["busy_seconds"] if stats["busy_seconds"] else 0.0
+
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.error(f"Error processing {item['local_path']} with {processor_type}: {e}")
+            stats["errors"] += 1
+            return
+
+        if result:
+            stats["processed"] += 1
+            self.file_picker._update_semantic_attribute(item["file"], item["attr_id"], result)
+        else:
+            stats["skipped"] += 1
 
     def _log_statistics(self) -> None:
         """Log processor statistics."""
         logger.info("Background processor statistics:")
         for processor_type, stats in self.stats.items():
             logger.info(
-                f"  {processor_type}: scheduled={stats['scheduled']}, processed={stats['processed']}, errors={stats['errors']}",
+                f"  {processor_type}: scheduled={stats['scheduled']}, processed={stats['processed']}, "
+                f"skipped={stats['skipped']}, errors={stats['errors']}, files/s per worker={stats['files_per_second']:.2f}, batch_size={stats['batch_size']}",
             )
+        if self.governor.snapshot:
+            logger.info(f"  resources: {self.governor.snapshot}")
 
     def save_statistics(self, file_path: str) -> None:
         """
@@ -324,6 +504,7 @@ class BackgroundProcessorManager:
             output_stats = {
                 "timestamp": datetime.now(UTC).isoformat(),
                 "processors": self.stats,
+                "resources": self.governor.snapshot,
             }
 
             # Write to file
@@ -349,6 +530,18 @@ def load_config(config_file: str | None = None) -> dict[str, Any]:
     # Default configuration
     default_config = {
         "processors": ProcessorType.get_enabled(),
+        "scheduler": {
+            "max_workers": None,  # default: the CPU count
+            "max_cpu_percent": 50,  # CPU use by other processes above which no work is started
+            "max_io_percent": 60,  # disk busy time above which the work in flight is halved
+            "user_idle_seconds": 300,  # back off while a user was active this recently
+            "suspend_on_activity": True,
+            "poll_interval": 1.0,
+            "target_batch_seconds": 60,
+            "min_batch_size": 5,
+            "max_batch_size": 500,
+            "report_interval": 300,
+        },
         "mime": {
             "batch_size": 20,
             "interval": 300,  # 5 minutes
@@ -429,6 +622,12 @@ def main() -> None:
         default="semantic_processor_stats.json",
         help="Path to statistics output file",
     )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=None,
+        help="Maximum number of worker processes (default: the CPU count)",
+    )
     parser.add_argument("--debug", action="store_true", help="Enable debug output")
 
     args = parser.parse_args()
@@ -443,6 +642,8 @@ def main() -> None:
     # Override processors if specified
     if args.processors:
         config["processors"] = args.processors
+    if args.max_workers:
+        config["scheduler"]["max_workers"] = args.max_workers
 
     # Create and start the processor manager
     manager = BackgroundProcessorManager(config)
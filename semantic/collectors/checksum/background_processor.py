@@ -39,7 +39,8 @@ if os.environ.get("INDALEKO_ROOT") is None:
 
 # pylint: disable=wrong-import-position
 
-from semantic.collectors.checksum.checksum import IndalekoSemanticChecksums
+from semantic.collectors.checksum.checksum import compute_checksums
+from semantic.extractor_cache import get_extractor_cache
 from semantic.recorders.checksum.recorder import ChecksumRecorder
 from storage.i_object import IndalekoObject
 from storage.known_attributes import StorageSemanticAttributes
@@ -55,6 +56,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger("ChecksumBackgroundProcessor")
 
+# Name and version of the checksum results in the extractor cache
+CACHE_EXTRACTOR_NAME = "checksum"
+CACHE_EXTRACTOR_VERSION = "1.1"
+
 
 def process_file_checksums(
     file_obj: IndalekoObject,
@@ -71,9 +76,6 @@ def process_file_checksums(
         Optional[Dict[str, str]]: Checksum information if successful, None otherwise
     """
     try:
-        # Create a collector instance
-        collector = IndalekoSemanticChecksums()
-
         # Process the file
         object_id = file_obj.get_object_id()
         logger.info(f"Processing checksums for {local_path} (ID: {object_id})")
@@ -83,14 +85,20 @@ def process_file_checksums(
             logger.warning(f"File {local_path} does not exist or is not readable")
             return None
 
+        # Skip files that have not changed since their checksums were stored
+        _, cached = get_extractor_cache().lookup(CACHE_EXTRACTOR_NAME, CACHE_EXTRACTOR_VERSION, local_path)
+        if cached is not None:
+            logger.info(f"Using cached checksums for unchanged file {local_path}")
+            return cached
+
         # Calculate checksums
-        checksums = collector.compute_checksums(local_path)
-        if not checksums:
+        checksums = compute_checksums(local_path)
+        if not checksums or not all(checksums.values()):
             logger.warning(f"Failed to compute checksums for {local_path}")
             return None
 
         logger.info(
-            f"Calculated checksums for {local_path}: MD5={checksums['md5'][:8]}...",
+            f"Calculated checksums for {local_path}: MD5={checksums['MD5'][:8]}...",
         )
 
         # Return the checksum information
@@ -128,22 +136,26 @@ def process_file_and_store(
             logger.warning(f"File {local_path} does not exist or is not readable")
             return None
 
-        # Calculate checksums and store them
-        result = recorder.process_file(local_path, object_id)
+        # Skip files that have not changed since their checksums were stored
+        cache = get_extractor_cache()
+        cache_key, cached = cache.lookup(CACHE_EXTRACTOR_NAME, CACHE_EXTRACTOR_VERSION, local_path)
+        if cached is not None:
+            logger.info(f"Using cached checksums for unchanged file {local_path}")
+            return cached
+
+        # Calculate checksums and store them; the checksums themselves are
+        # cached, so a hit returns what process_file_checksums returns
+        checksums = compute_checksums(local_path)
+        if not checksums or not all(checksums.values()):
+            logger.warning(f"Failed to compute checksums for {local_path}")
+            return None
+        result = recorder.process_file(local_path, object_id, checksums)
         if not result:
             logger.warning(f"Failed to process checksums for {local_path}")
             return None
 
-        # Extract checksums from the process result
-        checksums = {
-            "md5": result.get("md5", ""),
-            "sha1": result.get("sha1", ""),
-            "sha256": result.get("sha256", ""),
-            "sha512": result.get("sha512", ""),
-            "dropbox": result.get("dropbox", ""),
-        }
-
         logger.info(f"Processed and stored checksums for {local_path}")
+        cache.store(CACHE_EXTRACTOR_NAME, CACHE_EXTRACTOR_VERSION, cache_key, checksums)
 
         # Return the checksum information
         return checksums
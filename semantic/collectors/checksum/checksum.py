@@ -21,7 +21,6 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # standard imports
 import hashlib
 import logging
-import mmap
 import os
 import sys
 import unittest
@@ -54,6 +53,13 @@ from data_models.semantic_attribute import IndalekoSemanticAttributeDataModel
 from data_models.source_identifier import IndalekoSourceIdentifierDataModel
 from semantic.characteristics import SemanticDataCharacteristics
 from semantic.collectors.checksum.data_model import SemanticChecksumDataModel
+from semantic.collectors.checksum.engine import (  # noqa: F401 - CHUNK_SIZE and DropboxChecksum used to live here
+    ALGORITHMS,
+    CHUNK_SIZE,
+    ChecksumEngine,
+    DropboxChecksum,
+    compute_file_checksums,
+)
 from semantic.collectors.semantic_collector import SemanticCollector
 
 
@@ -100,27 +106,33 @@ class IndalekoSemanticChecksums(SemanticCollector):
         )
         return None
 
-    def compute_checksums_for_file(self, file_path: str) -> dict[str, str]:
+    def compute_checksums_for_file(
+        self,
+        file_path: str,
+        algorithms: list[str] | None = None,
+    ) -> dict[str, str]:
         """
         Compute checksums for a file.
 
         Args:
             file_path (str): Path to the file
+            algorithms (List[str]): Algorithms to compute (default: all)
 
         Returns:
             Dict[str, str]: Dictionary of checksums with algorithm as key
         """
-        # Check if we already have the checksums cached
-        if file_path in self._checksums_cache:
-            return self._checksums_cache[file_path]
+        algorithms = list(algorithms if algorithms is not None else ALGORITHMS)
 
-        # Compute checksums
-        checksums = compute_checksums(file_path)
+        # Only compute the checksums we do not already have cached
+        checksums = self._checksums_cache.get(file_path, {})
+        missing = [algorithm for algorithm in algorithms if algorithm not in checksums]
+        if missing:
+            checksums = {**checksums, **compute_checksums(file_path, missing)}
 
-        # Cache the result
-        self._checksums_cache[file_path] = checksums
+            # Cache the result
+            self._checksums_cache[file_path] = checksums
 
-        return checksums
+        return {algorithm: checksums[algorithm] for algorithm in algorithms}
 
     def create_checksum_record(
         self,
@@ -285,99 +297,23 @@ class IndalekoSemanticChecksums(SemanticCollector):
         }
 
 
-# Define Dropbox checksum
-class DropboxChecksum:
-    """
-    Implementation of Dropbox's content-hash algorithm.
-
-    This is a special hash algorithm used by Dropbox for content addressing.
-    The algorithm works as follows:
-    1. Split the file into 4MB blocks
-    2. Compute SHA256 hash for each block
-    3. Concatenate all block hashes
-    4. Compute a final SHA256 hash of the concatenated hashes
-    """
-
-    def __init__(self) -> None:
-        self.block_hashes = []
-
-    def update(self, data) -> None:
-        # Compute SHA256 hash of each 4MB block
-        sha256 = hashlib.sha256()
-        sha256.update(data)
-        self.block_hashes.append(sha256.digest())
-
-    def digest(self):
-        # Concatenate all block hashes and compute final SHA256 hash
-        final_sha256 = hashlib.sha256()
-        final_sha256.update(b"".join(self.block_hashes))
-        return final_sha256.hexdigest()
-
-
-# Define chunk size and threshold for mmap usage
-CHUNK_SIZE = 4 * 1024 * 1024  # 4MB per chunk
-MMAP_THRESHOLD = 16 * 1024 * 1024  # 16MB file size threshold
-
-
-def compute_checksums(file_path):
+def compute_checksums(file_path, algorithms=None):
     """
     Compute multiple checksums for a file in a single pass.
 
     This function computes MD5, SHA1, SHA256, SHA512, and Dropbox content hash
-    for a file in a single pass through the data. It uses memory mapping
-    for large files to improve performance.
+    (or only the requested algorithms) for a file in a single pass through the
+    data.  Large files are memory mapped and each algorithm runs on its own
+    thread; use ChecksumEngine to hash many files concurrently.
 
     Args:
         file_path (str): Path to the file
+        algorithms (Iterable[str]): Algorithms to compute (default: all)
 
     Returns:
         Dict[str, str]: Dictionary of checksums with algorithm as key
     """
-    # Initialize checksum calculators
-    md5 = hashlib.md5()
-    sha1 = hashlib.sha1()
-    sha256 = hashlib.sha256()
-    sha512 = hashlib.sha512()
-    dropbox = DropboxChecksum()
-
-    file_size = os.path.getsize(file_path)
-
-    if file_size < MMAP_THRESHOLD:
-        # For small files, read the entire file at once
-        with open(file_path, "rb") as f:
-            data = f.read()
-            md5.update(data)
-            sha1.update(data)
-            sha256.update(data)
-            sha512.update(data)
-            dropbox.update(data)
-    else:
-        # For large files, use memory mapping and process chunks
-        with open(file_path, "rb") as f:
-            # Use mmap for memory-efficient processing of large files
-            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mmapped_file:
-                for offset in range(0, file_size, CHUNK_SIZE):
-                    chunk = mmapped_file[offset : offset + min(CHUNK_SIZE, file_size - offset)]
-                    md5.update(chunk)
-                    sha1.update(chunk)
-                    sha256.update(chunk)
-                    sha512.update(chunk)
-                    dropbox.update(chunk)
-
-    # Get digests for each checksum
-    md5_hash = md5.hexdigest()
-    sha1_hash = sha1.hexdigest()
-    sha256_hash = sha256.hexdigest()
-    sha512_hash = sha512.hexdigest()
-    dropbox_hash = dropbox.digest()
-
-    return {
-        "MD5": md5_hash,
-        "SHA1": sha1_hash,
-        "SHA256": sha256_hash,
-        "SHA512": sha512_hash,
-        "Dropbox": dropbox_hash,
-    }
+    return compute_file_checksums(file_path, algorithms)
 
 
 # Unit tests
@@ -416,6 +352,27 @@ class TestChecksum(unittest.TestCase):
         assert len(checksums["Dropbox"]) == 64  # SHA-256 hash length in hex is 64 characters
         assert len(checksums["SHA512"]) == 128  # SHA-512 hash length in hex is 128 characters
 
+    def test_algorithm_selection(self) -> None:
+        """Test computing only some of the checksums."""
+        checksums = compute_checksums("test_file_1.txt", ["SHA256"])
+        assert checksums == {"SHA256": hashlib.sha256(b"Hello World!").hexdigest()}
+        with self.assertRaises(ValueError):
+            compute_checksums("test_file_1.txt", ["CRC32"])
+
+    def test_lanes_match_single_thread(self) -> None:
+        """Test that hashing each algorithm on its own lane gives the same checksums."""
+        expected = compute_checksums("test_file_2.txt")
+        assert compute_file_checksums("test_file_2.txt", chunk_size=1000003, lane_threshold=1) == expected
+        assert expected["SHA1"] == hashlib.sha1(b"A" * 4 * 1024 * 1024).hexdigest()
+
+    def test_engine_many_files(self) -> None:
+        """Test hashing several files concurrently."""
+        engine = ChecksumEngine(workers=2)
+        results = dict(engine.compute_checksums_for_files(["test_file_1.txt", "test_file_2.txt", "missing.txt"]))
+        assert results["test_file_1.txt"] == compute_checksums("test_file_1.txt")
+        assert results["test_file_2.txt"] == compute_checksums("test_file_2.txt")
+        assert results["missing.txt"] is None
+
     def test_collector_initialization(self) -> None:
         """Test collector initialization."""
         collector = IndalekoSemanticChecksums()
@@ -0,0 +1,296 @@
+"""
+This implements a multi-core engine for computing file checksums.
+
+compute_checksums used to feed every algorithm, one after another, on a
+single thread, one file at a time.  hashlib releases the GIL while it hashes
+a large buffer, so this engine spreads the work over threads:
+
+- Many files are hashed concurrently in a pool (threads by default; a
+  process pool may be supplied instead)
+- Within a large file, each algorithm runs on its own lane (thread) over
+  the same zero-copy memoryview chunks of a memory mapped file, so hashing
+  a file takes about as long as its slowest algorithm rather than the sum
+  of them all
+- Lanes are kept within a few chunks of each other, so a chunk is still in
+  the page cache when the slowest lane gets to it
+- Small files are read through a reused buffer rather than whole into memory
+- Callers can ask for only the algorithms they need
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# standard imports
+import hashlib
+import mmap
+import os
+import queue
+import sys
+import threading
+
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor
+from typing import Any
+
+
+if os.environ.get("INDALEKO_ROOT") is None:
+    current_path = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.exists(os.path.join(current_path, "Indaleko.py")):
+        current_path = os.path.dirname(current_path)
+    os.environ["INDALEKO_ROOT"] = current_path
+    sys.path.append(current_path)
+
+# pylint: disable=wrong-import-position
+from utils.misc.concurrent_files import map_files
+
+
+# pylint: enable=wrong-import-position
+
+
+# Define chunk size and the file size from which each algorithm gets its own lane
+CHUNK_SIZE = 4 * 1024 * 1024  # 4MB per chunk
+LANE_THRESHOLD = 16 * 1024 * 1024  # 16MB file size threshold
+LANE_DEPTH = 4  # chunks a lane may fall behind the fastest lane
+
+
+class DropboxChecksum:
+    """
+    Implementation of Dropbox's content-hash algorithm.
+
+    This is a special hash algorithm used by Dropbox for content addressing.
+    The algorithm works as follows:
+    1. Split the file into 4MB blocks
+    2. Compute SHA256 hash for each block
+    3. Concatenate all block hashes
+    4. Compute a final SHA256 hash of the concatenated hashes
+
+    The blocks are cut at 4MB boundaries whatever the size of the buffers
+    passed to update.
+    """
+
+    BLOCK_SIZE = 4 * 1024 * 1024
+
+    def __init__(self) -> None:
+        self.block_hashes = []
+        self._block = hashlib.sha256()
+        self._block_length = 0
+
+    def update(self, data) -> None:
+        # Compute SHA256 hash of each 4MB block
+        view = memoryview(data).cast("B")
+        while view:
+            take = min(self.BLOCK_SIZE - self._block_length, len(view))
+            self._block.update(view[:take])
+            self._block_length += take
+            view = view[take:]
+            if self._block_length == self.BLOCK_SIZE:
+                self.block_hashes.append(self._block.digest())
+                self._block = hashlib.sha256()
+                self._block_length = 0
+
+    def digest(self):
+        # Concatenate all block hashes and compute final SHA256 hash
+        block_hashes = list(self.block_hashes)
+        if self._block_length:
+            block_hashes.append(self._block.digest())
+        final_sha256 = hashlib.sha256()
+        final_sha256.update(b"".join(block_hashes))
+        return final_sha256.hexdigest()
+
+    def hexdigest(self):
+        return self.digest()
+
+
+# Checksum algorithms, by the name used as the key of the results
+ALGORITHMS = {
+    "MD5": hashlib.md5,
+    "SHA1": hashlib.sha1,
+    "SHA256": hashlib.sha256,
+    "SHA512": hashlib.sha512,
+    "Dropbox": DropboxChecksum,
+}
+
+
+def _create_hashers(algorithms: Iterable[str] | None) -> dict[str, Any]:
+    """Create a hasher for each requested algorithm (all of them by default)."""
+    if algorithms is None:
+        algorithms = ALGORITHMS
+    hashers = {}
+    for algorithm in algorithms:
+        if algorithm not in ALGORITHMS:
+            raise ValueError(
+                f"Unknown checksum algorithm {algorithm}, expected one of {', '.join(ALGORITHMS)}",
+            )
+        hashers[algorithm] = ALGORITHMS[algorithm]()
+    return hashers
+
+
+def _hash_sequentially(f, hashers: dict[str, Any], chunk_size: int) -> None:
+    """Feed a file to every hasher on this thread, a chunk at a time."""
+    buffer = bytearray(chunk_size)
+    with memoryview(buffer) as view:
+        while length := f.readinto(buffer):
+            chunk = view[:length]
+            for hasher in hashers.values():
+                hasher.update(chunk)
+            chunk.release()
+
+
+def _run_lane(hasher: Any, chunks: queue.Queue, errors: list[BaseException]) -> None:
+    """Feed the chunks of a file to one hasher until the end-of-file marker."""
+    while (chunk := chunks.get()) is not None:
+        if not errors:
+            try:
+                hasher.update(chunk)
+            except BaseException as e:  # noqa: BLE001 - reported by the reader
+                errors.append(e)
+        # Keep draining after an error, so the reader never blocks on this lane
+        chunk = None
+
+
+def _hash_in_lanes(f, size: int, hashers: dict[str, Any], chunk_size: int, depth: int) -> None:
+    """Feed a file to every hasher at once, each on its own lane over shared chunks."""
+    errors = []
+    lanes = []
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+        try:
+            with memoryview(mapped_file) as view:
+                for hasher in hashers.values():
+                    chunks = queue.Queue(maxsize=depth)
+                    thread = threading.Thread(target=_run_lane, args=(hasher, chunks, errors), daemon=True)
+                    thread.start()
+                    lanes.append((thread, chunks))
+                try:
+                    for offset in range(0, size, chunk_size):
+                        if errors:
+                            break
+                        chunk = view[offset : offset + chunk_size]
+                        for _, chunks in lanes:
+                            chunks.put(chunk)
+                        chunk = None
+                finally:
+                    chunk = None
+                    for _, chunks in lanes:
+                        chunks.put(None)
+                    for thread, _ in lanes:
+                        thread.join()
+        finally:
+            # Every chunk must be gone before the mapping can be closed
+            lanes.clear()
+    if errors:
+        raise errors[0]
+
+
+def compute_file_checksums(
+    file_path: str,
+    algorithms: Iterable[str] | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    lane_threshold: int = LANE_THRESHOLD,
+    lane_depth: int = LANE_DEPTH,
+) -> dict[str, str]:
+    """
+    Compute checksums for a file in a single pass.
+
+    Files of at least lane_threshold bytes are memory mapped and each
+    algorithm runs on its own lane; smaller files are read through a
+    buffer of chunk_size bytes.  This is a module level function so that
+    it can run in a process pool.
+
+    Args:
+        file_path (str): Path to the file
+        algorithms: Names of the algorithms to compute (default: all of ALGORITHMS)
+        chunk_size (int): Bytes hashed per chunk
+        lane_threshold (int): File size from which each algorithm gets its own lane
+        lane_depth (int): Chunks a lane may fall behind the fastest lane
+
+    Returns:
+        Dict[str, str]: Dictionary of checksums with algorithm as key
+    """
+    hashers = _create_hashers(algorithms)
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= lane_threshold and len(hashers) > 1:
+            _hash_in_lanes(f, size, hashers, chunk_size, lane_depth)
+        else:
+            _hash_sequentially(f, hashers, chunk_size)
+    return {algorithm: hasher.hexdigest() for algorithm, hasher in hashers.items()}
+
+
+class ChecksumEngine:
+    """Compute checksums for many files concurrently."""
+
+    def __init__(
+        self,
+        algorithms: Iterable[str] | None = None,
+        workers: int | None = None,
+        chunk_size: int = CHUNK_SIZE,
+        lane_threshold: int = LANE_THRESHOLD,
+        lane_depth: int = LANE_DEPTH,
+    ) -> None:
+        """
+        Set up the engine.
+
+        Args:
+            algorithms: Names of the algorithms to compute (default: all of ALGORITHMS)
+            workers: Number of files hashed at once (default: the CPU count)
+            chunk_size: Bytes hashed per chunk
+            lane_threshold: File size from which each algorithm gets its own lane
+            lane_depth: Chunks a lane may fall behind the fastest lane
+        """
+        self.algorithms = list(algorithms if algorithms is not None else ALGORITHMS)
+        _create_hashers(self.algorithms)  # reject unknown algorithms now
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.chunk_size = max(1, chunk_size)
+        self.lane_threshold = lane_threshold
+        self.lane_depth = max(1, lane_depth)
+
+    def compute_checksums(self, file_path: str) -> dict[str, str]:
+        """Compute the checksums for one file on the calling thread (plus its lanes)."""
+        return compute_file_checksums(
+            file_path,
+            self.algorithms,
+            self.chunk_size,
+            self.lane_threshold,
+            self.lane_depth,
+        )
+
+    def compute_checksums_for_files(
+        self,
+        file_paths: Iterable[str],
+        executor: Executor | None = None,
+    ) -> Iterator[tuple[str, dict[str, str] | None]]:
+        """
+        Compute checksums for many files concurrently (see map_files).
+
+        Args:
+            file_paths: Paths of the files to hash
+            executor: Executor to hash with (default: a thread pool of the configured size)
+
+        Yields:
+            (file_path, checksums) in the order the files finish; checksums is
+            None if the file could not be hashed
+        """
+        return map_files(
+            compute_file_checksums,
+            file_paths,
+            self.algorithms,
+            self.chunk_size,
+            self.lane_threshold,
+            self.lane_depth,
+            workers=self.workers,
+            executor=executor,
+            action="computing checksums for",
+        )
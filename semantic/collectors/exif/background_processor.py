@@ -44,6 +44,7 @@ if os.environ.get("INDALEKO_ROOT") is None:
 import semantic.recorders.exif.characteristics as ExifCharacteristics
 
 from semantic.collectors.exif.exif_collector import ExifCollector
+from semantic.extractor_cache import get_extractor_cache
 from semantic.recorders.exif.recorder import ExifRecorder
 from storage.i_object import IndalekoObject
 from utils.db.db_file_picker import IndalekoFilePicker
@@ -58,6 +59,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger("ExifBackgroundProcessor")
 
+# Name and version of the EXIF results in the extractor cache
+CACHE_EXTRACTOR_NAME = "exif"
+CACHE_EXTRACTOR_VERSION = "1.0"
+
 # Define supported image extensions
 SUPPORTED_IMAGE_EXTENSIONS = [
     ".jpg",
@@ -106,6 +111,12 @@ def process_file_exif(
             logger.warning(f"File {local_path} does not exist or is not readable")
             return None
 
+        # Skip files that have not changed since their EXIF data was stored
+        _, cached = get_extractor_cache().lookup(CACHE_EXTRACTOR_NAME, CACHE_EXTRACTOR_VERSION, local_path)
+        if cached is not None:
+            logger.info(f"Using cached EXIF data for unchanged file {local_path}")
+            return cached
+
         # Extract EXIF data
         exif_data = collector.extract_exif_from_file(local_path, object_id)
         if not exif_data:
@@ -155,6 +166,13 @@ def process_file_and_store(
             logger.warning(f"File {local_path} does not exist or is not readable")
             return None
 
+        # Skip files that have not changed since their EXIF data was stored
+        cache = get_extractor_cache()
+        cache_key, cached = cache.lookup(CACHE_EXTRACTOR_NAME, CACHE_EXTRACTOR_VERSION, local_path)
+        if cached is not None:
+            logger.info(f"Using cached EXIF data for unchanged file {local_path}")
+            return cached
+
         # Extract and store EXIF data
         exif_data = recorder.process_file(local_path, object_id)
         if not exif_data:
@@ -162,6 +180,7 @@ def process_file_and_store(
             return None
 
         logger.info(f"Processed and stored EXIF data for {local_path}")
+        cache.store(CACHE_EXTRACTOR_NAME, CACHE_EXTRACTOR_VERSION, cache_key, exif_data)
 
         # Return the EXIF data
         return exif_data
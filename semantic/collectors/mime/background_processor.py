@@ -42,6 +42,7 @@ if os.environ.get("INDALEKO_ROOT") is None:
 # pylint: disable=wrong-import-position
 
 from semantic.collectors.mime.mime_collector import IndalekoSemanticMimeType
+from semantic.extractor_cache import get_extractor_cache
 from semantic.recorders.mime.recorder import MimeTypeRecorder
 from storage.i_object import IndalekoObject
 from storage.known_attributes import StorageSemanticAttributes
@@ -57,6 +58,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger("MimeBackgroundProcessor")
 
+# Name and version of the MIME type results in the extractor cache
+CACHE_EXTRACTOR_NAME = "mime"
+CACHE_EXTRACTOR_VERSION = "1.1"
+
 
 def process_file_mime(
     file_obj: IndalekoObject,
@@ -85,6 +90,12 @@ def process_file_mime(
             logger.warning(f"File {local_path} does not exist or is not readable")
             return None
 
+        # Skip files that have not changed since their MIME type was stored
+        _, cached = get_extractor_cache().lookup(CACHE_EXTRACTOR_NAME, CACHE_EXTRACTOR_VERSION, local_path)
+        if cached is not None:
+            logger.info(f"Using cached MIME type {cached['mime_type']} for unchanged file {local_path}")
+            return cached
+
         # Detect MIME type
         mime_info = collector.detect_mime_type(local_path)
         logger.info(f"Detected MIME type: {mime_info['mime_type']} for {local_path}")
@@ -125,6 +136,20 @@ def process_file_and_store(
             logger.warning(f"File {local_path} does not exist or is not readable")
             return None
 
+        # Skip files that have not changed since their MIME type was stored
+        cache = get_extractor_cache()
+        cache_key, cached = cache.lookup(CACHE_EXTRACTOR_NAME, CACHE_EXTRACTOR_VERSION, local_path)
+        if cached is not None:
+            logger.info(f"Using cached MIME type {cached['mime_type']} for unchanged file {local_path}")
+            return cached
+
+        # Detect the MIME type; create_mime_record reuses this detection, and
+        # the full result is cached so a hit returns what process_file_mime returns
+        mime_info = collector.detect_mime_type(local_path)
+        if not mime_info or not mime_info.get("mime_type"):
+            logger.warning(f"Failed to detect MIME type for {local_path}")
+            return None
+
         # Create a MIME record
         mime_record = collector.create_mime_record(local_path, object_id)
         if not mime_record:
@@ -134,11 +159,9 @@ def process_file_and_store(
         # Store the record
         recorder.store_mime_data([mime_record])
 
-        # Return the MIME type information
-        return {
-            "mime_type": mime_record["mime_type"],
-            "confidence": mime_record.get("confidence", 100),
-        }
+        # Cache and return the MIME type information
+        cache.store(CACHE_EXTRACTOR_NAME, CACHE_EXTRACTOR_VERSION, cache_key, mime_info)
+        return mime_info
 
     except Exception as e:
         logger.exception(f"Error processing and storing MIME type for {local_path}: {e}")
@@ -0,0 +1,275 @@
+"""
+This implements batched, single-read MIME type detection.
+
+detect_mime_type used to open every file three times: libmagic read it in
+from_file, then it was reopened to read 4KB for encoding detection, and
+again to read a 1KB header for format metadata.  Here each file is opened
+once and a single prefix buffer is read from it:
+
+- libmagic classifies the prefix with from_buffer
+- The encoding and header heuristics reuse the same bytes; plain ASCII
+  text (the bulk of most source trees) is recognized without chardet
+- Many files are classified concurrently in a pool; each worker thread (or
+  process) has its own magic.Magic handle, since a libmagic handle cannot
+  be shared, and ctypes releases the GIL while libmagic runs
+
+The prefix is large enough for libmagic to recognize common formats.
+A file that is longer than the prefix and is classified as generic binary
+falls back to from_file, so that the result matches what the whole file
+would give.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# standard imports
+import logging
+import mimetypes
+import os
+import sys
+import threading
+
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor
+from typing import Any
+
+# third-party imports
+import magic
+
+
+if os.environ.get("INDALEKO_ROOT") is None:
+    current_path = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.exists(os.path.join(current_path, "Indaleko.py")):
+        current_path = os.path.dirname(current_path)
+    os.environ["INDALEKO_ROOT"] = current_path
+    sys.path.append(current_path)
+
+# pylint: disable=wrong-import-position
+from utils.misc.concurrent_files import map_files
+
+
+# pylint: enable=wrong-import-position
+
+try:
+    import chardet
+
+    CHARDET_AVAILABLE = True
+except ImportError:
+    CHARDET_AVAILABLE = False
+
+
+# Bytes read from each file, and the parts of them used by each heuristic
+PREFIX_SIZE = 64 * 1024  # 64KB prefix for libmagic
+ENCODING_SAMPLE_SIZE = 4096  # bytes used to detect the encoding of text
+HEADER_SAMPLE_SIZE = 1024  # bytes searched for format metadata
+
+# What libmagic calls an empty file when it can stat it
+EMPTY_MIME_TYPE = "inode/x-empty"
+GENERIC_MIME_TYPE = "application/octet-stream"
+
+_magic_handles = threading.local()
+
+
+def get_magic_handle() -> magic.Magic:
+    """Get the libmagic handle of the calling thread, creating it on first use."""
+    handle = getattr(_magic_handles, "mime_magic", None)
+    if handle is None:
+        handle = magic.Magic(mime=True)
+        _magic_handles.mime_magic = handle
+    return handle
+
+
+def is_plain_ascii(sample: bytes) -> bool:
+    """
+    Check whether a sample is ASCII text with no escape sequences.
+
+    Escape sequences (ESC, or the HZ "~{") may introduce a multi-byte encoding
+    such as ISO-2022, which only chardet can tell apart.
+    """
+    return sample.isascii() and b"\x1b" not in sample and b"~{" not in sample
+
+
+def classify_prefix(
+    file_path: str,
+    prefix: bytes | None,
+    file_size: int,
+    mime_magic: magic.Magic,
+) -> dict[str, Any]:
+    """
+    Build the MIME type information for a file from the first bytes of its content.
+
+    Args:
+        file_path (str): Path to the file (for the extension and the from_file fallback)
+        prefix (Optional[bytes]): The first bytes of the file, or None if it could not be read
+        file_size (int): Size of the whole file
+        mime_magic (magic.Magic): libmagic handle to classify the prefix with
+
+    Returns:
+        Dict[str, Any]: Dictionary with MIME type information
+    """
+    # Get file extension and guess MIME type from it
+    ext_mime_type = mimetypes.guess_type(file_path)[0] or GENERIC_MIME_TYPE
+
+    # Use libmagic to detect MIME type from content
+    try:
+        if prefix is None:
+            # Not a readable regular file; libmagic may still know what it is
+            content_mime_type = mime_magic.from_file(file_path)
+        elif file_size == 0:
+            content_mime_type = EMPTY_MIME_TYPE
+        else:
+            content_mime_type = mime_magic.from_buffer(prefix)
+            if content_mime_type == GENERIC_MIME_TYPE and file_size > len(prefix):
+                # Some formats are only recognized further into the file
+                content_mime_type = mime_magic.from_file(file_path)
+        confidence = 0.9  # Default high confidence for libmagic
+    except Exception as e:
+        logging.warning(f"Error detecting MIME type for {file_path}: {e}")
+        content_mime_type = GENERIC_MIME_TYPE
+        confidence = 0.5
+
+    # Check for text files and detect encoding
+    encoding = None
+    additional_metadata = {}
+
+    # For text files, try to detect encoding
+    if content_mime_type.startswith("text/") and prefix:
+        sample = prefix[:ENCODING_SAMPLE_SIZE]
+        if is_plain_ascii(sample):
+            # What chardet reports for such text, without running its detectors
+            encoding = "ascii"
+            additional_metadata["charset_confidence"] = 1.0
+        elif CHARDET_AVAILABLE:
+            try:
+                result = chardet.detect(sample)
+                encoding = result["encoding"]
+                additional_metadata["charset_confidence"] = result["confidence"]
+            except Exception as e:
+                logging.warning(f"Error detecting encoding for {file_path}: {e}")
+        else:
+            logging.info("chardet module not available, skipping encoding detection")
+
+    # For specific file types, add additional metadata
+    if content_mime_type == "application/pdf" and prefix:
+        # Try to extract PDF version
+        header = prefix[:HEADER_SAMPLE_SIZE].decode("latin-1", errors="ignore")
+        if "%PDF-" in header:
+            version = header.split("%PDF-")[1].split("\n")[0].strip()
+            additional_metadata["version"] = version
+
+    # Store category information
+    if content_mime_type.startswith("text/"):
+        additional_metadata["category"] = "text"
+    elif content_mime_type.startswith("image/"):
+        additional_metadata["category"] = "image"
+    elif content_mime_type.startswith("audio/"):
+        additional_metadata["category"] = "audio"
+    elif content_mime_type.startswith("video/"):
+        additional_metadata["category"] = "video"
+    elif content_mime_type.startswith("application/"):
+        additional_metadata["category"] = "application"
+
+    # Check if extension and content MIME types match
+    if ext_mime_type == content_mime_type:
+        # Increase confidence if extension matches content type
+        confidence = min(confidence + 0.05, 1.0)
+    else:
+        # Slightly decrease confidence if they don't match
+        confidence = max(confidence - 0.1, 0.5)
+
+    return {
+        "mime_type": content_mime_type,
+        "mime_type_from_extension": ext_mime_type,
+        "confidence": confidence,
+        "encoding": encoding,
+        "additional_metadata": additional_metadata,
+    }
+
+
+def detect_file_mime_type(
+    file_path: str,
+    prefix_size: int = PREFIX_SIZE,
+    mime_magic: magic.Magic | None = None,
+) -> dict[str, Any]:
+    """
+    Detect the MIME type of a file from a single read of its first bytes.
+
+    This is a module level function so that it can run in a process pool.
+
+    Args:
+        file_path (str): Path to the file
+        prefix_size (int): Bytes read from the start of the file
+        mime_magic: libmagic handle (default: the calling thread's handle)
+
+    Returns:
+        Dict[str, Any]: Dictionary with MIME type information
+    """
+    if mime_magic is None:
+        mime_magic = get_magic_handle()
+    try:
+        with open(file_path, "rb") as f:
+            file_size = os.fstat(f.fileno()).st_size
+            prefix = f.read(prefix_size)
+    except OSError:
+        prefix, file_size = None, 0
+    return classify_prefix(file_path, prefix, file_size, mime_magic)
+
+
+class BatchMimeDetector:
+    """Detect the MIME types of many files concurrently."""
+
+    PENDING_PER_WORKER = 4  # files in flight per worker; classifying a file is quick
+
+    def __init__(self, workers: int | None = None, prefix_size: int = PREFIX_SIZE) -> None:
+        """
+        Set up the detector.
+
+        Args:
+            workers: Number of files classified at once (default: as for a ThreadPoolExecutor)
+            prefix_size: Bytes read from the start of each file
+        """
+        self.workers = max(1, workers or min(32, (os.cpu_count() or 1) + 4))
+        self.prefix_size = max(1, prefix_size)
+
+    def detect_mime_type(self, file_path: str) -> dict[str, Any]:
+        """Detect the MIME type of one file on the calling thread."""
+        return detect_file_mime_type(file_path, self.prefix_size)
+
+    def detect_mime_types(
+        self,
+        file_paths: Iterable[str],
+        executor: Executor | None = None,
+    ) -> Iterator[tuple[str, dict[str, Any] | None]]:
+        """
+        Detect the MIME types of many files concurrently (see map_files).
+
+        Args:
+            file_paths: Paths of the files to classify
+            executor: Executor to classify with (default: a thread pool of the configured size)
+
+        Yields:
+            (file_path, mime_info) in the order the files finish; mime_info is
+            None if the file could not be classified
+        """
+        return map_files(
+            detect_file_mime_type,
+            file_paths,
+            self.prefix_size,
+            workers=self.workers,
+            pending_per_worker=self.PENDING_PER_WORKER,
+            executor=executor,
+            action="detecting MIME type for",
+        )
@@ -54,6 +54,7 @@ from data_models.semantic_attribute import IndalekoSemanticAttributeDataModel
 from data_models.source_identifier import IndalekoSourceIdentifierDataModel
 from semantic.characteristics import SemanticDataCharacteristics
 from semantic.collectors.mime.data_model import SemanticMimeDataModel
+from semantic.collectors.mime.detector import BatchMimeDetector, detect_file_mime_type
 from semantic.collectors.semantic_collector import SemanticCollector
 
 
@@ -118,84 +119,42 @@ class IndalekoSemanticMimeType(SemanticCollector):
         if file_path in self._mime_cache:
             return self._mime_cache[file_path]
 
-        # Get file extension and guess MIME type from it
-        ext_mime_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
-
-        # Use libmagic to detect MIME type from content
-        try:
-            content_mime_type = self._mime_magic.from_file(file_path)
-            confidence = 0.9  # Default high confidence for libmagic
-        except Exception as e:
-            logging.warning(f"Error detecting MIME type for {file_path}: {e}")
-            content_mime_type = "application/octet-stream"
-            confidence = 0.5
-
-        # Check for text files and detect encoding
-        encoding = None
-        additional_metadata = {}
-
-        # For text files, try to detect encoding
-        if content_mime_type.startswith("text/"):
-            try:
-                import chardet
-
-                with open(file_path, "rb") as f:
-                    raw_data = f.read(4096)  # Read a chunk to detect encoding
-                    result = chardet.detect(raw_data)
-                    encoding = result["encoding"]
-                    additional_metadata["charset_confidence"] = result["confidence"]
-            except ImportError:
-                logging.info(
-                    "chardet module not available, skipping encoding detection",
-                )
-            except Exception as e:
-                logging.warning(f"Error detecting encoding for {file_path}: {e}")
-
-        # For specific file types, add additional metadata
-        if content_mime_type == "application/pdf":
-            try:
-                # Try to extract PDF version
-                with open(file_path, "rb") as f:
-                    header = f.read(1024).decode("latin-1", errors="ignore")
-                    if "%PDF-" in header:
-                        version = header.split("%PDF-")[1].split("\n")[0].strip()
-                        additional_metadata["version"] = version
-            except Exception as e:
-                logging.warning(f"Error extracting PDF metadata for {file_path}: {e}")
-
-        # Store category information
-        if content_mime_type.startswith("text/"):
-            additional_metadata["category"] = "text"
-        elif content_mime_type.startswith("image/"):
-            additional_metadata["category"] = "image"
-        elif content_mime_type.startswith("audio/"):
-            additional_metadata["category"] = "audio"
-        elif content_mime_type.startswith("video/"):
-            additional_metadata["category"] = "video"
-        elif content_mime_type.startswith("application/"):
-            additional_metadata["category"] = "application"
-
-        # Check if extension and content MIME types match
-        if ext_mime_type == content_mime_type:
-            # Increase confidence if extension matches content type
-            confidence = min(confidence + 0.05, 1.0)
-        else:
-            # Slightly decrease confidence if they don't match
-            confidence = max(confidence - 0.1, 0.5)
-
-        result = {
-            "mime_type": content_mime_type,
-            "mime_type_from_extension": ext_mime_type,
-            "confidence": confidence,
-            "encoding": encoding,
-            "additional_metadata": additional_metadata,
-        }
+        # Detect the MIME type from a single read of the start of the file
+        result = detect_file_mime_type(file_path, mime_magic=self._mime_magic)
 
         # Cache the result
         self._mime_cache[file_path] = result
 
         return result
 
+    def detect_mime_types(
+        self,
+        file_paths: list[str],
+        workers: int | None = None,
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Detect the MIME types of many files concurrently.
+
+        The results are cached, so that create_mime_record and
+        get_mime_type_for_file do not classify these files again.
+
+        Args:
+            file_paths (List[str]): Paths to the files
+            workers (Optional[int]): Number of files classified at once
+
+        Returns:
+            Dict[str, Dict[str, Any]]: MIME type information by file path
+        """
+        results = {path: self._mime_cache[path] for path in file_paths if path in self._mime_cache}
+        detector = BatchMimeDetector(workers=workers)
+        for file_path, result in detector.detect_mime_types(
+            path for path in file_paths if path not in results
+        ):
+            if result is not None:
+                self._mime_cache[file_path] = result
+                results[file_path] = result
+        return results
+
     def create_mime_record(
         self,
         file_path: str,
@@ -170,6 +170,23 @@ class TestMimeTypeCollector(unittest.TestCase):
         if html_result["mime_type"] == "text/html" and html_result["mime_type_from_extension"] == "text/html":
             assert html_result["confidence"] > 0.9  # High confidence when they match
 
+    def test_batch_detection(self):
+        """Test that batch detection matches single file detection"""
+        files = [self.text_file, self.html_file, self.json_file, self.bin_file, self.py_file, self.pdf_file]
+        missing_file = os.path.join(self.test_dir, "missing.txt")
+
+        single = {file_path: IndalekoSemanticMimeType().detect_mime_type(file_path) for file_path in files}
+        batch = self.mime_collector.detect_mime_types([*files, missing_file], workers=3)
+
+        assert batch.pop(missing_file)["mime_type"] == "application/octet-stream"
+        assert batch == single
+        assert self.mime_collector.detect_mime_type(self.pdf_file) is batch[self.pdf_file]
+
+        # The header and encoding heuristics use the bytes read for libmagic
+        if batch[self.pdf_file]["mime_type"] == "application/pdf":
+            assert batch[self.pdf_file]["additional_metadata"]["version"] == "1.7"
+        assert batch[self.py_file]["encoding"] == "ascii"
+
 
 def main():
     """Run the test suite"""
@@ -0,0 +1,246 @@
+"""
+This module provides a persistent cache of semantic extractor results.
+
+The background processors used to recompute checksums, MIME types and EXIF
+data for every file the file picker handed them, even when the file had not
+changed since it was last processed.  This cache remembers each result by
+the identity and state of the file it came from:
+
+    (st_dev, st_ino, st_size, st_mtime_ns) plus the extractor version
+
+A lookup only needs a stat of the file, so a hit skips opening the file
+altogether.  Changing the file (its size or modification time) or the
+extractor version misses, and the new result replaces the old one.  The
+cache is a SQLite database under the Indaleko data directory, so it is
+shared by every processor on the machine and survives restarts.
+
+Hits and misses are reported to SemanticExtractorPerformance.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+
+from datetime import UTC, datetime
+from typing import Any
+
+
+# Import path setup
+if os.environ.get("INDALEKO_ROOT") is None:
+    current_path = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.exists(os.path.join(current_path, "Indaleko.py")):
+        current_path = os.path.dirname(current_path)
+    os.environ["INDALEKO_ROOT"] = current_path
+    sys.path.append(current_path)
+
+# pylint: disable=wrong-import-position
+from constants import IndalekoConstants
+
+
+# pylint: enable=wrong-import-position
+
+
+FileKey = tuple[str, str, int, int]  # (st_dev, st_ino, st_size, st_mtime_ns)
+
+
+class SemanticExtractorCache:
+    """Persistent cache of semantic extractor results, keyed by file identity and state."""
+
+    DEFAULT_CACHE_FILE = os.path.join(
+        IndalekoConstants.default_data_dir,
+        "semantic",
+        "extractor_cache.sqlite",
+    )
+
+    def __init__(self, cache_file: str | None = None, report_performance: bool = True) -> None:
+        """
+        Open (or create) the cache.
+
+        Args:
+            cache_file: Path to the SQLite database (default: DEFAULT_CACHE_FILE)
+            report_performance: Whether to report hits and misses to SemanticExtractorPerformance
+        """
+        self.cache_file = cache_file or self.DEFAULT_CACHE_FILE
+        self._report_performance = report_performance
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "bytes_skipped": 0}
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_file)), exist_ok=True)
+        self._connection = sqlite3.connect(self.cache_file, timeout=30.0, check_same_thread=False)
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS extractor_results (
+                    extractor TEXT NOT NULL,
+                    st_dev TEXT NOT NULL,
+                    st_ino TEXT NOT NULL,
+                    st_size INTEGER NOT NULL,
+                    st_mtime_ns INTEGER NOT NULL,
+                    version TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    updated TEXT NOT NULL,
+                    PRIMARY KEY (extractor, st_dev, st_ino)
+                )
+                """,
+            )
+            self._connection.commit()
+
+    @staticmethod
+    def file_key(file_path: str) -> FileKey | None:
+        """
+        Return the key that identifies the current content of a file, without opening it.
+
+        Returns None if the file cannot be identified (it cannot be stat'ed,
+        or the file system does not provide inode numbers).
+        """
+        try:
+            stat_result = os.stat(file_path)
+        except OSError:
+            return None
+        if not stat_result.st_ino:
+            return None
+        # Device and inode numbers may not fit in a SQLite integer
+        return (str(stat_result.st_dev), str(stat_result.st_ino), stat_result.st_size, stat_result.st_mtime_ns)
+
+    def lookup(self, extractor: str, version: str, file_path: str) -> tuple[FileKey | None, Any]:
+        """
+        Look up the result an extractor produced for the current content of a file.
+
+        Pass the returned key to store once the file has been processed, so
+        that a file modified during extraction is not recorded as unchanged.
+
+        Args:
+            extractor: Name of the extractor
+            version: Version of the extractor
+            file_path: Path to the file
+
+        Returns:
+            (key, result); result is None on a miss
+        """
+        key = self.file_key(file_path)
+        result = None
+        if key is not None:
+            try:
+                with self._lock:
+                    row = self._connection.execute(
+                        """
+                        SELECT result FROM extractor_results
+                        WHERE extractor = ? AND st_dev = ? AND st_ino = ?
+                            AND st_size = ? AND st_mtime_ns = ? AND version = ?
+                        """,
+                        (extractor, *key, version),
+                    ).fetchone()
+                if row is not None:
+                    result = json.loads(row[0])
+            except (sqlite3.Error, ValueError) as e:
+                logging.warning(f"Error reading extractor cache {self.cache_file}: {e}")
+
+        hit = result is not None
+        with self._lock:
+            if hit:
+                self._stats["hits"] += 1
+                self._stats["bytes_skipped"] += key[2]
+            else:
+                self._stats["misses"] += 1
+        self._report(extractor, hit, key[2] if key else None)
+        return key, result
+
+    def store(self, extractor: str, version: str, key: FileKey | None, result: Any) -> bool:
+        """
+        Record the result an extractor produced for a file.
+
+        Args:
+            extractor: Name of the extractor
+            version: Version of the extractor
+            key: Key returned by lookup before the file was processed
+            result: JSON serializable extraction result (None is not cached)
+
+        Returns:
+            True if the result was recorded
+        """
+        if key is None or result is None:
+            return False
+        try:
+            data = json.dumps(result, default=str)
+            with self._lock:
+                self._connection.execute(
+                    """
+                    INSERT OR REPLACE INTO extractor_results
+                        (extractor, st_dev, st_ino, st_size, st_mtime_ns, version, result, updated)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (extractor, *key, version, data, datetime.now(UTC).isoformat()),
+                )
+                self._connection.commit()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logging.warning(f"Error writing extractor cache {self.cache_file}: {e}")
+            return False
+        return True
+
+    def invalidate(self, extractor: str | None = None) -> None:
+        """Forget the results of one extractor, or of every extractor."""
+        with self._lock:
+            if extractor is None:
+                self._connection.execute("DELETE FROM extractor_results")
+            else:
+                self._connection.execute("DELETE FROM extractor_results WHERE extractor = ?", (extractor,))
+            self._connection.commit()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return the hits, misses and bytes not read since the cache was opened."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = self._connection.execute("SELECT COUNT(*) FROM extractor_results").fetchone()[0]
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def close(self) -> None:
+        """Close the cache database."""
+        with self._lock:
+            self._connection.close()
+
+    def _report(self, extractor: str, hit: bool, file_size: int | None) -> None:
+        """Report a lookup to the performance monitor, if one is available."""
+        if not self._report_performance:
+            return
+        try:
+            from semantic.performance_monitor import SemanticExtractorPerformance
+
+            SemanticExtractorPerformance().record_cache_lookup(extractor, hit, file_size)
+        except Exception as e:  # noqa: BLE001 - monitoring must never fail extraction
+            logging.debug(f"Could not report extractor cache lookup: {e}")
+            self._report_performance = False
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_extractor_cache() -> SemanticExtractorCache:
+    """Return the extractor cache shared by the background processors of this process."""
+    global _default_cache  # noqa: PLW0603
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = SemanticExtractorCache()
+        return _default_cache
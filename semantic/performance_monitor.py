@@ -227,6 +227,9 @@ class SemanticExtractorPerformance(metaclass=Singleton):
             "total_bytes": 0,
             "total_processing_time": 0.0,
             "extractor_stats": {},
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "cache_bytes_skipped": 0,
             "machine_id": (str(self._machine_config_id) if self._machine_config_id else None),
             "platform": platform.system(),
             "hostname": socket.gethostname(),
@@ -258,6 +261,9 @@ class SemanticExtractorPerformance(metaclass=Singleton):
             "total_bytes": 0,
             "total_processing_time": 0.0,
             "extractor_stats": {},
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "cache_bytes_skipped": 0,
         }
         self._file_type_stats = {}
 
@@ -276,6 +282,10 @@ class SemanticExtractorPerformance(metaclass=Singleton):
                 stats["total_files"] / stats["total_processing_time"] if stats["total_processing_time"] > 0 else 0
             )
 
+        # Calculate the extractor result cache hit rate
+        cache_lookups = stats.get("cache_hits", 0) + stats.get("cache_misses", 0)
+        stats["cache_hit_rate"] = stats.get("cache_hits", 0) / cache_lookups if cache_lookups > 0 else 0
+
         # Add file type statistics
         stats["file_type_stats"] = self._file_type_stats
 
@@ -312,14 +322,7 @@ class SemanticExtractorPerformance(metaclass=Singleton):
                 file_size = 0
 
         # Initialize extractor stats if needed
-        if extractor_name not in self._stats["extractor_stats"]:
-            self._stats["extractor_stats"][extractor_name] = {
-                "files_processed": 0,
-                "bytes_processed": 0,
-                "total_time": 0.0,
-                "success_count": 0,
-                "error_count": 0,
-            }
+        self._get_extractor_stats(extractor_name)
 
         # Track MIME type statistics if provided
         if mime_type and mime_type not in self._file_type_stats:
@@ -344,6 +347,49 @@ class SemanticExtractorPerformance(metaclass=Singleton):
         }
 
 
+    def _get_extractor_stats(self, extractor_name: str) -> dict[str, Any]:
+        """Get the statistics of an extractor, initializing them if needed."""
+        if extractor_name not in self._stats["extractor_stats"]:
+            self._stats["extractor_stats"][extractor_name] = {
+                "files_processed": 0,
+                "bytes_processed": 0,
+                "total_time": 0.0,
+                "success_count": 0,
+                "error_count": 0,
+                "cache_hits": 0,
+                "cache_misses": 0,
+            }
+        return self._stats["extractor_stats"][extractor_name]
+
+    def record_cache_lookup(
+        self,
+        extractor_name: str,
+        hit: bool,
+        file_size: int | None = None,
+    ) -> None:
+        """
+        Record a lookup in the extractor result cache.
+
+        A hit means the extraction was skipped because the file has not
+        changed since it was last processed.
+
+        Args:
+            extractor_name: Name of the extractor
+            hit: Whether the cache held a result for the file
+            file_size: Size of the file in bytes (optional)
+        """
+        if not self._enabled:
+            return
+
+        extractor_stats = self._get_extractor_stats(extractor_name)
+        if hit:
+            self._stats["cache_hits"] = self._stats.get("cache_hits", 0) + 1
+            self._stats["cache_bytes_skipped"] = self._stats.get("cache_bytes_skipped", 0) + (file_size or 0)
+            extractor_stats["cache_hits"] = extractor_stats.get("cache_hits", 0) + 1
+        else:
+            self._stats["cache_misses"] = self._stats.get("cache_misses", 0) + 1
+            extractor_stats["cache_misses"] = extractor_stats.get("cache_misses", 0) + 1
+
     def stop_monitoring(
         self,
         context: dict[str, Any],
@@ -61,6 +61,7 @@ from semantic.collectors.checksum.checksum import (
     IndalekoSemanticChecksums,
     compute_checksums,
 )
+from semantic.collectors.checksum.engine import ChecksumEngine
 from semantic.data_models.base_data_model import BaseSemanticDataModel
 
 
@@ -76,14 +77,16 @@ class ChecksumRecorder:
     # Unique identifier for this recorder
     recorder_uuid = "de7ff1c7-2550-4cb3-9538-775f9464746e"
 
-    def __init__(self, output_path: str | None = None) -> None:
+    def __init__(self, output_path: str | None = None, workers: int | None = None) -> None:
         """
         Initialize the checksum recorder.
 
         Args:
             output_path: Optional path for output. If not provided, uses default location.
+            workers: Number of files checksummed at once in batches (default: the CPU count)
         """
         self.collector = IndalekoSemanticChecksums()
+        self.engine = ChecksumEngine(workers=workers)
         self.output_file = output_path or os.path.join(
             Indaleko.default_data_dir,
             "semantic",
@@ -160,6 +163,7 @@ class ChecksumRecorder:
         self,
         file_path: str,
         object_id: str | uuid.UUID,
+        checksums: dict[str, str] | None = None,
     ) -> dict[str, Any]:
         """
         Process a file to compute and format checksum data.
@@ -167,6 +171,7 @@ class ChecksumRecorder:
         Args:
             file_path: Path to the file
             object_id: UUID of the file in Indaleko
+            checksums: Checksums already computed for the file, if any
 
         Returns:
             Dict[str, Any]: Semantic data model for checksums
@@ -186,11 +191,12 @@ class ChecksumRecorder:
             object_id = uuid.UUID(object_id)
 
         # Compute checksums
-        try:
-            checksums = compute_checksums(file_path)
-        except Exception as e:
-            logging.exception(f"Error computing checksums for {file_path}: {e}")
-            return None
+        if checksums is None:
+            try:
+                checksums = compute_checksums(file_path)
+            except Exception as e:
+                logging.exception(f"Error computing checksums for {file_path}: {e}")
+                return None
 
         # Create semantic attributes
         semantic_attributes = self.create_semantic_attributes(checksums)
@@ -213,6 +219,9 @@ class ChecksumRecorder:
         """
         Process multiple files and save the results.
 
+        The checksums are computed by the checksum engine, several files at a
+        time, and the results are written in the order the files finish.
+
         Args:
             file_list: List of dictionaries with 'path' and 'object_id' keys
         """
@@ -222,24 +231,34 @@ class ChecksumRecorder:
         error_count = 0
         last_percent = 0
 
-        with open(self.output_file, "w", encoding="utf-8") as jsonl_output:
-            for i, file_info in enumerate(file_list):
-                # Progress reporting
-                current_percent = int((i / total_files) * 100)
-                if current_percent > last_percent and current_percent % 5 == 0:
-                    last_percent = current_percent
+        object_ids = {}
+        for file_info in file_list:
+            if "path" not in file_info or "object_id" not in file_info:
+                logging.warning(
+                    f"Missing path or object_id in file info: {file_info}",
+                )
+                error_count += 1
+                continue
+
+            file_path = file_info["path"]
+            if file_path in self.processed_files or file_path in object_ids:
+                logging.info(f"Skipping already processed file: {file_path}")
+                continue
+            if not os.path.exists(file_path):
+                logging.warning(f"File not found: {file_path}")
+                error_count += 1
+                continue
+            object_ids[file_path] = file_info["object_id"]
 
-                if "path" not in file_info or "object_id" not in file_info:
-                    logging.warning(
-                        f"Missing path or object_id in file info: {file_info}",
+        with open(self.output_file, "w", encoding="utf-8") as jsonl_output:
+            for file_path, checksums in self.engine.compute_checksums_for_files(object_ids):
+                checksum_data = None
+                if checksums is not None:
+                    checksum_data = self.process_file(
+                        file_path,
+                        object_ids[file_path],
+                        checksums,
                     )
-                    error_count += 1
-                    continue
-
-                checksum_data = self.process_file(
-                    file_info["path"],
-                    file_info["object_id"],
-                )
                 if checksum_data:
                     jsonl_output.write(
                         json.dumps(checksum_data, cls=IndalekoJSONEncoder) + "\n",
@@ -248,6 +267,14 @@ class ChecksumRecorder:
                 else:
                     error_count += 1
 
+                # Progress reporting
+                current_percent = int(((processed_count + error_count) / total_files) * 100)
+                if current_percent >= last_percent + 5:
+                    last_percent = current_percent
+                    logging.info(
+                        f"Processed {processed_count + error_count} of {total_files} files ({current_percent}%)",
+                    )
+
         logging.info(
             f"Batch processing complete. Processed: {processed_count}, Errors: {error_count}",
         )
@@ -300,6 +327,12 @@ class ChecksumRecorder:
 def main() -> None:
     """Main entry point for the checksum recorder."""
     parser = argparse.ArgumentParser(description="Indaleko Multi-Checksum Recorder")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of files checksummed at once (default: the CPU count)",
+    )
 
     subparsers = parser.add_subparsers(dest="command", help="Command to execute")
 
@@ -341,7 +374,7 @@ def main() -> None:
     args = parser.parse_args()
 
     # Create recorder
-    recorder = ChecksumRecorder()
+    recorder = ChecksumRecorder(workers=args.workers)
 
     # Execute command
     if args.command == "file":
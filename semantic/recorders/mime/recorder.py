@@ -66,14 +66,16 @@ class IndalekoJSONEncoder(json.JSONEncoder):
 class MimeTypeRecorder:
     """Class for recording MIME type information to Indaleko database."""
 
-    def __init__(self, db_config: dict | None = None) -> None:
+    def __init__(self, db_config: dict | None = None, workers: int | None = None) -> None:
         """
         Initialize the MIME type recorder.
 
         Args:
             db_config (Optional[Dict]): Database configuration
+            workers (Optional[int]): Number of files classified at once in batches
         """
         self._collector = IndalekoSemanticMimeType()
+        self._workers = workers
         self._service_id = uuid.UUID("b3c7a9d5-4e6f-8d2a-1c9e-7f4b6d3a5e8c")
         self._logger = logging.getLogger("MimeTypeRecorder")
         self._db_config = db_config
@@ -122,12 +124,18 @@ class MimeTypeRecorder:
         # This is just for testing purposes
         return uuid.uuid5(uuid.NAMESPACE_URL, f"file://{os.path.abspath(file_path)}")
 
-    def process_file(self, file_path: str) -> dict[str, Any] | None:
+    def process_file(
+        self,
+        file_path: str,
+        object_id: str | uuid.UUID | None = None,
+    ) -> dict[str, Any] | None:
         """
         Process a single file to detect and record MIME type.
 
         Args:
             file_path (str): Path to the file to process
+            object_id (Optional[Union[str, uuid.UUID]]): Object identifier of the
+                file, if known; otherwise it is looked up from the path
 
         Returns:
             Optional[Dict[str, Any]]: The recorded data if successful, None otherwise
@@ -139,7 +147,8 @@ class MimeTypeRecorder:
                 return None
 
             # Get object ID for file
-            object_id = self.lookup_object_by_path(file_path)
+            if object_id is None:
+                object_id = self.lookup_object_by_path(file_path)
             if not object_id:
                 self._logger.warning(f"Failed to lookup object ID for: {file_path}")
                 return None
@@ -170,6 +179,12 @@ class MimeTypeRecorder:
         """
         results = []
 
+        # Classify the whole batch concurrently; process_file then uses the cached results
+        self._collector.detect_mime_types(
+            [file_path for file_path in file_list if os.path.isfile(file_path)],
+            workers=self._workers,
+        )
+
         with tqdm(total=len(file_list), desc="Processing files", unit="file") as pbar:
             for file_path in file_list:
                 result = self.process_file(file_path)
@@ -320,6 +335,12 @@ def main() -> None:
         action="store_true",
         help="Print summary of results",
     )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        help="Number of files classified at once",
+    )
     parser.add_argument(
         "--verbose",
         "-v",
@@ -330,7 +351,7 @@ def main() -> None:
     args = parser.parse_args()
 
     # Create recorder
-    recorder = MimeTypeRecorder()
+    recorder = MimeTypeRecorder(workers=args.workers)
 
     # Set logging level
     if args.verbose:
@@ -0,0 +1,273 @@
+"""
+This module decides how hard the semantic background processors may work.
+
+The processors are meant to saturate the cores a machine leaves idle (at
+night, say) and to get out of the way the moment anyone else needs it.  The
+ResourceGovernor measures, with psutil:
+
+- the CPU used by everything except the processors and their workers
+- the busy time of the busiest disk, where the platform reports it
+- how long ago a user last touched the keyboard or mouse
+
+and turns them into the number of files that may be processed at once.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import logging
+import os
+import signal
+import sys
+import time
+
+from typing import Any
+
+import psutil
+
+
+logger = logging.getLogger("IndalekoBgProcessor")
+
+
+def get_user_idle_seconds() -> float | None:
+    """
+    Get the number of seconds since a user last interacted with the machine.
+
+    On Windows this is the time since the last keyboard or mouse input.
+    Elsewhere it is the time since the most recent input on a login
+    terminal (the idle time reported by who); graphical sessions without a
+    terminal device are not seen.
+
+    Returns:
+        Optional[float]: Seconds since the last input, or None if unknown
+    """
+    try:
+        if sys.platform == "win32":
+            import ctypes
+
+            class LastInputInfo(ctypes.Structure):
+                _fields_ = [("cbSize", ctypes.c_uint), ("dwTime", ctypes.c_uint)]  # noqa: RUF012
+
+            info = LastInputInfo()
+            info.cbSize = ctypes.sizeof(info)
+            if not ctypes.windll.user32.GetLastInputInfo(ctypes.byref(info)):
+                return None
+            return ((ctypes.windll.kernel32.GetTickCount() - info.dwTime) & 0xFFFFFFFF) / 1000.0
+
+        idle_times = []
+        for user in psutil.users():
+            terminal = os.path.join("/dev", user.terminal) if user.terminal else None
+            if terminal and os.path.exists(terminal):
+                idle_times.append(time.time() - os.stat(terminal).st_atime)
+        return max(0.0, min(idle_times)) if idle_times else None
+    except Exception as e:
+        logger.debug(f"Could not determine user idle time: {e}")
+        return None
+
+
+def init_worker_process() -> None:
+    """Run a worker process of the shared pool at the lowest priority."""
+    # The manager handles shutdown; workers finish or are cancelled by it
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    try:
+        process = psutil.Process()
+        if sys.platform == "win32":
+            process.nice(psutil.IDLE_PRIORITY_CLASS)
+        else:
+            process.nice(19)
+    except Exception as e:
+        logger.warning(f"Could not set worker process priority: {e}")
+
+
+class ResourceGovernor:
+    """
+    Decides how many files may be processed at once from the load on the machine.
+
+    The CPU used by this process and its workers is discounted, so the
+    processors can take every core the rest of the machine leaves idle.  No
+    new work is started while other processes use more than max_cpu_percent
+    of the CPU, and the work in flight is halved while a disk is busier than
+    max_io_percent.  When a user has been active within user_idle_seconds
+    the workers are suspended at once, and resumed when the user goes idle.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_cpu_percent: float = 50.0,
+        max_io_percent: float = 60.0,
+        user_idle_seconds: float = 300.0,
+        suspend_on_activity: bool = True,
+        interval: float = 1.0,
+    ) -> None:
+        """
+        Initialize the governor.
+
+        Args:
+            max_workers: Upper bound on the files processed at once
+            max_cpu_percent: CPU use by other processes above which no work is started
+            max_io_percent: Disk busy time above which the work in flight is halved
+            user_idle_seconds: Input within this many seconds means a user is active
+            suspend_on_activity: Suspend the workers while a user is active
+            interval: Minimum seconds between measurements
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_cpu_percent = max_cpu_percent
+        self.max_io_percent = max_io_percent
+        self.user_idle_seconds = user_idle_seconds
+        self.suspend_on_activity = suspend_on_activity
+        self.interval = interval
+        self.allowed = 1
+        self.suspended = False
+        self.snapshot: dict[str, Any] = {}
+
+        self._cpu_count = psutil.cpu_count() or 1
+        self._process = psutil.Process()
+        self._children: dict[int, psutil.Process] = {}
+        self._last_disk_busy = self._disk_busy_times()
+        self._last_disk_time = time.monotonic()
+        self._last_update = 0.0
+        psutil.cpu_percent(interval=None)  # start measuring from now
+        self._process.cpu_percent(interval=None)
+
+    def update(self) -> int:
+        """
+        Measure the load on the machine and decide how many files may be in flight.
+
+        Measurements closer together than interval are too noisy to act on,
+        so the previous decision stands until interval has passed.
+
+        Returns:
+            int: The number of files that may be processed at once (0 to pause)
+        """
+        if time.monotonic() - self._last_update < self.interval:
+            return self.allowed
+        self._last_update = time.monotonic()
+
+        system_cpu = psutil.cpu_percent(interval=None)
+        own_cpu = self._own_cpu_percent()
+        other_cpu = max(0.0, system_cpu - own_cpu)
+        io_busy = self._io_busy_percent()
+        user_idle = get_user_idle_seconds()
+
+        self.allowed = self.decide(other_cpu, io_busy, user_idle)
+        user_active = user_idle is not None and user_idle < self.user_idle_seconds
+        self._set_suspended(user_active and self.suspend_on_activity)
+        self.snapshot = {
+            "system_cpu_percent": system_cpu,
+            "own_cpu_percent": own_cpu,
+            "io_busy_percent": io_busy,
+            "user_idle_seconds": user_idle,
+            "allowed_workers": self.allowed,
+            "suspended": self.suspended,
+        }
+        return self.allowed
+
+    def decide(
+        self,
+        other_cpu_percent: float,
+        io_busy_percent: float | None,
+        user_idle_seconds: float | None,
+    ) -> int:
+        """
+        Decide how many files may be in flight from the measured load.
+
+        Args:
+            other_cpu_percent: System CPU use, less that of the processors
+            io_busy_percent: Busy time of the busiest disk, if known
+            user_idle_seconds: Seconds since the last user input, if known
+
+        Returns:
+            int: The number of files that may be processed at once
+        """
+        if user_idle_seconds is not None and user_idle_seconds < self.user_idle_seconds:
+            return 0
+        if other_cpu_percent > self.max_cpu_percent:
+            return 0
+        if io_busy_percent is not None and io_busy_percent > self.max_io_percent:
+            # Our own reads add to the pressure, so keep one file moving
+            return max(1, self.allowed // 2)
+        idle_cores = int(self._cpu_count * (100.0 - other_cpu_percent) / 100.0)
+        return max(1, min(self.max_workers, idle_cores))
+
+    def release(self) -> None:
+        """Resume any suspended workers."""
+        self._set_suspended(False)
+
+    def _workers(self) -> list[psutil.Process]:
+        """Get the worker processes (and anything they started)."""
+        try:
+            children = self._process.children(recursive=True)
+        except psutil.Error:
+            return list(self._children.values())
+        current = {}
+        for child in children:
+            # Keep the same Process objects, which carry the CPU measurements
+            current[child.pid] = self._children.get(child.pid, child)
+        self._children = current
+        return list(current.values())
+
+    def _own_cpu_percent(self) -> float:
+        """Get the CPU used by this process and its workers, as a share of the machine."""
+        total = 0.0
+        for process in [self._process, *self._workers()]:
+            try:
+                total += process.cpu_percent(interval=None)
+            except psutil.Error:
+                continue
+        return total / self._cpu_count
+
+    @staticmethod
+    def _disk_busy_times() -> dict[str, int] | None:
+        """Get the busy time of each disk in milliseconds, where the platform reports it."""
+        try:
+            counters = psutil.disk_io_counters(perdisk=True)
+        except Exception:  # noqa: BLE001 - not every platform can report this
+            return None
+        if not counters:
+            return None
+        busy = {disk: getattr(counter, "busy_time", None) for disk, counter in counters.items()}
+        return {disk: value for disk, value in busy.items() if value is not None} or None
+
+    def _io_busy_percent(self) -> float | None:
+        """Get the share of time the busiest disk was busy since the last measurement."""
+        now = time.monotonic()
+        busy = self._disk_busy_times()
+        last_busy, last_time = self._last_disk_busy, self._last_disk_time
+        self._last_disk_busy, self._last_disk_time = busy, now
+        if busy is None or last_busy is None or now <= last_time:
+            return None
+        elapsed_ms = (now - last_time) * 1000.0
+        deltas = [busy[disk] - last_busy[disk] for disk in busy if disk in last_busy]
+        if not deltas:
+            return None
+        return min(100.0, max(deltas) * 100.0 / elapsed_ms)
+
+    def _set_suspended(self, suspended: bool) -> None:
+        """Suspend or resume the workers."""
+        if suspended == self.suspended:
+            return
+        for worker in self._workers():
+            try:
+                if suspended:
+                    worker.suspend()
+                else:
+                    worker.resume()
+            except psutil.Error as e:
+                logger.debug(f"Could not {'suspend' if suspended else 'resume'} worker {worker.pid}: {e}")
+        self.suspended = suspended
+        logger.info("User active, workers suspended" if suspended else "Workers resumed")
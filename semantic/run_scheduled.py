@@ -41,13 +41,19 @@ from typing import Any
 
 import psutil
 
+import semantic.recorders.checksum.characteristics as ChecksumDataCharacteristics
+import semantic.recorders.mime.characteristics as MimeDataCharacteristics
+
 # Import Indaleko database connection
+from db.db_collections import IndalekoDBCollections
+from db.db_config import IndalekoDBConfig
 from semantic.collectors.checksum.checksum import IndalekoSemanticChecksums
 
 # Import our extractors
 from semantic.collectors.mime.mime_collector import IndalekoSemanticMimeType
 from semantic.recorders.checksum.recorder import ChecksumRecorder
 from semantic.recorders.mime.recorder import MimeTypeRecorder
+from storage.i_object import IndalekoObject
 
 
 # Set up logging
@@ -79,10 +85,90 @@ DEFAULT_CONFIG = {
         "max_run_time_seconds": 14400,  # 4 hours
         "log_level": "INFO",
         "state_file": "data/semantic/processing_state.json",
+        "min_batch_size": 10,
+        "max_batch_size": 5000,
+        "target_batch_seconds": 60,  # adapt batch sizes to take about this long
+        "scan_factor": 10,  # objects examined per query, as a multiple of the batch size
     },
     "database": {"connection_retries": 3, "batch_commit_size": 50},
 }
 
+# Semantic attribute that marks a file as processed, by extractor type
+EXTRACTOR_ATTRIBUTES = {
+    "mime": MimeDataCharacteristics.SEMANTIC_MIME_TYPE,
+    "checksum": ChecksumDataCharacteristics.SEMANTIC_CHECKSUM_SHA256,
+}
+
+# Index used to find the processed objects within a page of the Objects collection
+BATCH_INDEX_NAME = "semantic_attribute_key"
+BATCH_INDEX_FIELDS = ["SemanticAttributes[*].Identifier.Identifier", "_key"]
+
+# Keyset paginated selection of the files an extractor still has to process.
+#
+# A page of object keys following the cursor is read from the primary index;
+# the objects in the same key range that already have a current attribute are
+# found through the batch index, and the rest of the page (in key order) is
+# the batch.  An attribute is current unless its LastUpdated predates the
+# modification time of the file.
+BATCH_QUERY = """
+LET page = (
+    FOR obj IN @@objects
+        FILTER obj._key > @cursor
+        SORT obj._key
+        LIMIT @scan_size
+        RETURN obj._key
+)
+LET page_end = LAST(page)
+LET current = (
+    FOR obj IN @@objects
+        FILTER @attr_id IN obj.SemanticAttributes[*].Identifier.Identifier
+        FILTER obj._key > @cursor AND obj._key <= page_end
+        LET attr = FIRST(
+            FOR a IN obj.SemanticAttributes
+                FILTER a.Identifier.Identifier == @attr_id
+                RETURN a
+        )
+        LET modified = FIRST(
+            FOR t IN obj.Timestamps || []
+                FILTER t.Label == @modified_label
+                RETURN t.Value
+        )
+        FILTER attr.LastUpdated == null OR modified == null OR attr.LastUpdated >= modified
+        RETURN obj._key
+)
+LET files = (
+    FOR key IN MINUS(page, current)
+        SORT key
+        LET obj = DOCUMENT(@@objects, key)
+        FILTER LENGTH(@extensions) == 0
+            OR LOWER(CONCAT(".", LAST(SPLIT(obj.Label, ".")))) IN @extensions
+        LIMIT @batch_size
+        RETURN {
+            object_id: obj._key,
+            local_path: obj.LocalPath,
+            name: obj.Label,
+            uri: obj.URI
+        }
+)
+RETURN { files: files, scanned: LENGTH(page), page_end: page_end }
+"""
+
+# Record an extractor's attributes on an object, replacing any earlier values
+# of the same attributes, so that BATCH_QUERY no longer selects the object.
+RECORD_ATTRIBUTES_QUERY = """
+LET obj = DOCUMENT(@@objects, @key)
+FILTER obj != null
+LET kept = (
+    FOR a IN obj.SemanticAttributes || []
+        FILTER a.Identifier.Identifier NOT IN @attr_ids
+        RETURN a
+)
+UPDATE obj WITH { SemanticAttributes: APPEND(kept, @attributes) } IN @@objects
+RETURN NEW._key
+"""
+
+_db_config = None
+
 
 def ensure_directory_exists(file_path: str) -> None:
     """Ensure the directory for the given file path exists."""
@@ -150,6 +236,7 @@ def load_state(state_file: str) -> dict[str, Any]:
                 "skipped_files": 0,
                 "error_files": 0,
                 "last_file_id": None,
+                "cursor": None,
             },
             "checksum": {
                 "last_run": datetime.datetime.now(datetime.UTC).isoformat(),
@@ -157,6 +244,7 @@ def load_state(state_file: str) -> dict[str, Any]:
                 "skipped_files": 0,
                 "error_files": 0,
                 "last_file_id": None,
+                "cursor": None,
             },
         },
         "database": {
@@ -227,6 +315,47 @@ def check_resource_usage(max_cpu: int, max_memory: int) -> bool:
     return True
 
 
+def get_database(config: dict[str, Any]) -> IndalekoDBConfig | None:
+    """
+    Connect to the database, and make sure the batch selection index exists.
+
+    Returns None if no connection could be made.
+    """
+    global _db_config  # noqa: PLW0603
+    if _db_config is not None:
+        return _db_config
+
+    retries = max(1, config["database"].get("connection_retries", 3))
+    for attempt in range(1, retries + 1):
+        try:
+            db_config = IndalekoDBConfig()
+            if not db_config.started and not db_config.start():
+                raise ConnectionError("database did not start")
+            ensure_batch_index(db_config)
+            _db_config = db_config
+            logger.info("Connected to database")
+            return _db_config
+        except Exception as e:
+            logger.warning(f"Database connection attempt {attempt}/{retries} failed: {e}")
+            if attempt < retries:
+                time.sleep(2**attempt)
+    return None
+
+
+def ensure_batch_index(db_config: IndalekoDBConfig) -> None:
+    """Create the index behind the batch selection query, if it does not exist."""
+    objects = db_config.get_collection(IndalekoDBCollections.Indaleko_Object_Collection)
+    try:
+        objects.add_persistent_index(
+            fields=BATCH_INDEX_FIELDS,
+            unique=False,
+            sparse=False,
+            name=BATCH_INDEX_NAME,
+        )
+    except Exception as e:
+        logger.warning(f"Could not create batch selection index: {e} - continuing anyway")
+
+
 def get_file_batch_from_database(
     extractor_type: str,
     batch_size: int,
@@ -235,17 +364,170 @@ def get_file_batch_from_database(
 ) -> list[dict[str, Any]]:
     """
     Get a batch of files from the database that need semantic processing.
+
+    Files are those lacking the extractor's semantic attribute, or whose
+    attribute is older than their modification time.  The Objects
+    collection is walked in key order from the cursor kept in the state;
+    the cursor is moved past the returned batch, and reset to None once
+    the end of the collection is reached.  A query examines at most
+    scan_factor * batch_size objects, so the batch may be empty while the
+    pass is still under way.
+
     Returns a list of files with their paths and object IDs.
     """
-    # TODO: Implement actual database query
-    # This is a placeholder implementation
+    attr_id = EXTRACTOR_ATTRIBUTES.get(extractor_type)
+    if attr_id is None:
+        logger.warning(f"No semantic attribute known for extractor {extractor_type}")
+        return []
+
+    db_config = get_database(config)
+    if db_config is None:
+        logger.error("Cannot get files: not connected to database")
+        return []
+
+    extractor_state = state["extractors"].setdefault(extractor_type, {})
+    cursor = extractor_state.get("cursor") or ""  # every key sorts after ""
+    scan_size = batch_size * max(1, config["processing"].get("scan_factor", 10))
+    file_extensions = config["extractors"][extractor_type].get("file_extensions", ["*"])
+    extensions = []
+    if "*" not in file_extensions:
+        extensions = [(ext if ext.startswith(".") else f".{ext}").lower() for ext in file_extensions]
+
+    bind_vars = {
+        "@objects": IndalekoDBCollections.Indaleko_Object_Collection,
+        "cursor": cursor,
+        "scan_size": scan_size,
+        "batch_size": batch_size,
+        "attr_id": attr_id,
+        "modified_label": IndalekoObject.MODIFICATION_TIMESTAMP,
+        "extensions": extensions,
+    }
+    try:
+        result = next(iter(db_config._arangodb.aql.execute(BATCH_QUERY, bind_vars=bind_vars)))
+    except Exception as e:
+        logger.exception(f"Error selecting files for {extractor_type} processing: {e}")
+        return []
+
+    files = result["files"]
+    if len(files) == batch_size:
+        # The rest of the page has not been looked at yet
+        extractor_state["cursor"] = files[-1]["object_id"]
+    elif result["scanned"] == scan_size:
+        extractor_state["cursor"] = result["page_end"]
+    else:
+        extractor_state["cursor"] = None
+        logger.info(f"Reached the end of the Objects collection for {extractor_type}")
+
+    batch = []
+    for file in files:
+        path = None
+        if file.get("local_path") and file.get("name"):
+            path = os.path.join(file["local_path"], file["name"])
+        batch.append({"path": path, "object_id": file["object_id"], "uri": file.get("uri")})
 
-    # For now, return an empty list - we'll implement the actual query later
-    # when we have direct database access
     logger.info(
-        f"Would query database for {batch_size} files for {extractor_type} processing",
+        f"Selected {len(batch)} files for {extractor_type} processing from {result['scanned']} objects",
     )
-    return []
+    return batch
+
+
+def adapt_batch_size(
+    batch_size: int,
+    files_processed: int,
+    elapsed_seconds: float,
+    within_limits: bool,
+    config: dict[str, Any],
+) -> int:
+    """
+    Choose the size of the next batch from the throughput of the last one.
+
+    The batch grows (at most doubling) towards the number of files that can
+    be processed in target_batch_seconds, and is halved while the process
+    is over its CPU or memory limit.
+    """
+    processing = config["processing"]
+    min_batch_size = processing.get("min_batch_size", 10)
+    max_batch_size = processing.get("max_batch_size", 5000)
+
+    if not within_limits:
+        new_size = batch_size // 2
+    elif files_processed and elapsed_seconds > 0:
+        rate = files_processed / elapsed_seconds
+        target = int(rate * processing.get("target_batch_seconds", 60))
+        new_size = min(target, batch_size * 2)
+    else:
+        new_size = batch_size
+
+    new_size = max(min_batch_size, min(max_batch_size, new_size))
+    if new_size != batch_size:
+        logger.debug(f"Batch size changed from {batch_size} to {new_size}")
+    return new_size
+
+
+def semantic_attributes_from_result(
+    extractor_type: str,
+    result: dict[str, Any],
+) -> list[dict[str, Any]]:
+    """
+    Build the semantic attributes to record on an object from an extractor's result.
+
+    The attributes use the nested Identifier.Identifier shape that the batch
+    selection index and query expect, and carry a LastUpdated timestamp
+    that is compared against the object's modification time.
+    """
+    if extractor_type == "mime":
+        attributes = [
+            {
+                "Identifier": {"Identifier": MimeDataCharacteristics.SEMANTIC_MIME_TYPE, "Label": "MIME Type"},
+                "Value": result["mime_type"],
+            },
+        ]
+    else:
+        attributes = [
+            {
+                "Identifier": {
+                    "Identifier": str(attribute["Identifier"]["Identifier"]),
+                    "Label": attribute["Identifier"].get("Label"),
+                },
+                "Value": attribute["Value"],
+            }
+            for attribute in result.get("SemanticAttributes", [])
+        ]
+    # Same form as the object timestamps, so that the two compare as strings
+    last_updated = datetime.datetime.now(datetime.UTC).isoformat().replace("+00:00", "Z")
+    for attribute in attributes:
+        attribute["LastUpdated"] = last_updated
+    return attributes
+
+
+def record_semantic_attributes(
+    extractor_type: str,
+    object_id: str,
+    result: dict[str, Any],
+    config: dict[str, Any],
+) -> bool:
+    """
+    Write an extractor's result back to the object it was computed for.
+
+    Returns True if the object was updated.
+    """
+    db_config = get_database(config)
+    if db_config is None:
+        logger.error(f"Cannot record {extractor_type} attributes for {object_id}: not connected to database")
+        return False
+
+    attributes = semantic_attributes_from_result(extractor_type, result)
+    bind_vars = {
+        "@objects": IndalekoDBCollections.Indaleko_Object_Collection,
+        "key": str(object_id),
+        "attr_ids": [attribute["Identifier"]["Identifier"] for attribute in attributes],
+        "attributes": attributes,
+    }
+    updated = list(db_config._arangodb.aql.execute(RECORD_ATTRIBUTES_QUERY, bind_vars=bind_vars))
+    if not updated:
+        logger.warning(f"Object {object_id} no longer exists, {extractor_type} attributes not recorded")
+        return False
+    return True
 
 
 def process_mime_batch(
@@ -278,7 +560,7 @@ def process_mime_batch(
             # Process the file
             result = recorder.process_file(file_path, object_id=object_id)
 
-            if result:
+            if result and record_semantic_attributes("mime", object_id, result, config):
                 results["processed"] += 1
                 state["extractors"]["mime"]["last_file_id"] = object_id
             else:
@@ -329,7 +611,7 @@ def process_checksum_batch(
             # Process the file
             result = recorder.process_file(file_path, object_id=object_id)
 
-            if result:
+            if result and record_semantic_attributes("checksum", object_id, result, config):
                 results["processed"] += 1
                 state["extractors"]["checksum"]["last_file_id"] = object_id
             else:
@@ -394,6 +676,7 @@ def run_scheduled_extraction(args: argparse.Namespace) -> None:
                     "skipped_files": 0,
                     "error_files": 0,
                     "last_file_id": None,
+                    "cursor": None,
                 },
                 "checksum": {
                     "last_run": datetime.datetime.now(
@@ -403,6 +686,7 @@ def run_scheduled_extraction(args: argparse.Namespace) -> None:
                     "skipped_files": 0,
                     "error_files": 0,
                     "last_file_id": None,
+                    "cursor": None,
                 },
             },
             "database": {
@@ -447,20 +731,24 @@ def run_scheduled_extraction(args: argparse.Namespace) -> None:
     start_time = time.time()
     max_run_time = config["processing"]["max_run_time_seconds"]
 
+    # Batch sizes start from the configuration and adapt to the throughput
+    batch_sizes = {extractor: config["extractors"][extractor]["batch_size"] for extractor in extractors_to_run}
+
+    # Each run makes (at most) one pass over the Objects collection per extractor
+    active_extractors = list(extractors_to_run)
+
     try:
         # Main processing loop
-        while time.time() - start_time < max_run_time:
-            for extractor in extractors_to_run:
+        while active_extractors and time.time() - start_time < max_run_time:
+            for extractor in list(active_extractors):
                 if time.time() - start_time >= max_run_time:
                     logger.info(f"Reached maximum run time of {max_run_time} seconds")
                     break
 
                 logger.info(f"Processing batch for {extractor}")
 
-                # Get batch size from config
-                batch_size = config["extractors"][extractor]["batch_size"]
-
                 # Get batch of files to process
+                batch_size = batch_sizes[extractor]
                 files = get_file_batch_from_database(
                     extractor,
                     batch_size,
@@ -468,11 +756,17 @@ def run_scheduled_extraction(args: argparse.Namespace) -> None:
                     state,
                 )
 
+                if state["extractors"][extractor].get("cursor") is None:
+                    logger.info(f"Completed a pass over all files for {extractor}")
+                    active_extractors.remove(extractor)
+
                 if not files:
-                    logger.info(f"No files to process for {extractor}")
+                    logger.info(f"No files to process for {extractor} in this range")
+                    save_state(state, state_file)
                     continue
 
                 # Process batch based on extractor type
+                batch_start = time.time()
                 if extractor == "mime":
                     results = process_mime_batch(files, config, state)
                 elif extractor == "checksum":
@@ -480,12 +774,25 @@ def run_scheduled_extraction(args: argparse.Namespace) -> None:
                 else:
                     logger.warning(f"Unknown extractor: {extractor}")
                     continue
+                batch_seconds = time.time() - batch_start
 
                 # Log results
                 logger.info(
                     f"{extractor} batch processed: {results['processed']} processed, {results['skipped']} skipped, {results['errors']} errors",
                 )
 
+                # Size the next batch from this one's throughput and the resource limits
+                batch_sizes[extractor] = adapt_batch_size(
+                    batch_size,
+                    len(files),
+                    batch_seconds,
+                    check_resource_usage(
+                        config["resources"]["max_cpu_percent"],
+                        config["resources"]["max_memory_mb"],
+                    ),
+                    config,
+                )
+
                 # Save state after each batch
                 save_state(state, state_file)
 
@@ -493,17 +800,8 @@ def run_scheduled_extraction(args: argparse.Namespace) -> None:
                 interval = config["extractors"][extractor]["interval_seconds"]
                 time.sleep(interval)
 
-            # Add a short sleep to prevent tight loop if no files are found
-            if not any(
-                files for files in [get_file_batch_from_database(e, 1, config, state) for e in extractors_to_run]
-            ):
-                logger.info("No more files to process, waiting 60 seconds")
-                time.sleep(60)
-
-                # If we've gone through all extractors and found no files, we can exit
-                if all(not get_file_batch_from_database(e, 1, config, state) for e in extractors_to_run):
-                    logger.info("No more files to process for any extractor, finishing")
-                    break
+        if not active_extractors:
+            logger.info("No more files to process for any extractor, finishing")
     except KeyboardInterrupt:
         logger.info("Processing interrupted by user")
     except Exception as e:
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Indaleko Project - Tests for the semantic extractor result cache
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+
+if os.environ.get("INDALEKO_ROOT") is None:
+    current_path = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.exists(os.path.join(current_path, "Indaleko.py")):
+        current_path = os.path.dirname(current_path)
+    os.environ["INDALEKO_ROOT"] = current_path
+    sys.path.append(current_path)
+
+from semantic.extractor_cache import SemanticExtractorCache
+
+
+class TestSemanticExtractorCache(unittest.TestCase):
+    """Test cases for the SemanticExtractorCache class."""
+
+    def setUp(self):
+        """Create a cache and a file in a temporary directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = SemanticExtractorCache(
+            cache_file=os.path.join(self.temp_dir, "cache.sqlite"),
+            report_performance=False,
+        )
+        self.file_path = os.path.join(self.temp_dir, "sample.txt")
+        with open(self.file_path, "w", encoding="utf-8") as f:
+            f.write("unchanged content")
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.cache.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_unchanged_file_hits(self):
+        """A stored result is returned while the file is unchanged, and survives a restart."""
+        key, result = self.cache.lookup("mime", "1.0", self.file_path)
+        assert result is None
+        assert self.cache.store("mime", "1.0", key, {"mime_type": "text/plain", "confidence": 100})
+
+        self.cache.close()
+        self.cache = SemanticExtractorCache(cache_file=self.cache.cache_file, report_performance=False)
+        _, result = self.cache.lookup("mime", "1.0", self.file_path)
+        assert result == {"mime_type": "text/plain", "confidence": 100}
+
+        # Results are kept per extractor
+        _, result = self.cache.lookup("checksum", "1.0", self.file_path)
+        assert result is None
+
+        stats = self.cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["bytes_skipped"] == len("unchanged content")
+
+    def test_changes_miss(self):
+        """Modifying the file or changing the extractor version invalidates the result."""
+        key, _ = self.cache.lookup("checksum", "1.0", self.file_path)
+        self.cache.store("checksum", "1.0", key, {"SHA256": "abc"})
+
+        _, result = self.cache.lookup("checksum", "2.0", self.file_path)
+        assert result is None
+
+        with open(self.file_path, "a", encoding="utf-8") as f:
+            f.write(" and more")
+        _, result = self.cache.lookup("checksum", "1.0", self.file_path)
+        assert result is None
+
+        _, result = self.cache.lookup("checksum", "1.0", os.path.join(self.temp_dir, "missing.txt"))
+        assert result is None
+
+
+if __name__ == "__main__":
+    unittest.main()
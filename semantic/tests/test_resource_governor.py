@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Indaleko Project - Tests for the resource governor of the semantic background processors
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+import unittest
+
+from unittest.mock import MagicMock, patch
+
+
+if os.environ.get("INDALEKO_ROOT") is None:
+    current_path = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.exists(os.path.join(current_path, "Indaleko.py")):
+        current_path = os.path.dirname(current_path)
+    os.environ["INDALEKO_ROOT"] = current_path
+    sys.path.append(current_path)
+
+from semantic import resource_governor
+from semantic.resource_governor import ResourceGovernor
+
+
+class TestResourceGovernor(unittest.TestCase):
+    """Test cases for the ResourceGovernor class."""
+
+    def setUp(self):
+        """Create a governor for an 8 core machine without real measurements."""
+        self.worker = MagicMock()
+        self.psutil = MagicMock()
+        self.psutil.Error = Exception
+        self.psutil.cpu_count.return_value = 8
+        self.psutil.disk_io_counters.return_value = {}
+        self.psutil.Process.return_value.children.return_value = [self.worker]
+        self.psutil.Process.return_value.cpu_percent.return_value = 0.0
+        self.worker.cpu_percent.return_value = 400.0  # four busy workers
+        patcher = patch.object(resource_governor, "psutil", self.psutil)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.governor = ResourceGovernor(max_workers=6, max_cpu_percent=50, max_io_percent=60, interval=0)
+
+    def test_decide(self):
+        """Idle cores are used up to max_workers, and the governor backs off under load."""
+        assert self.governor.decide(0.0, None, None) == 6
+        assert self.governor.decide(25.0, 10.0, 3600.0) == 6
+        assert self.governor.decide(50.0, None, None) == 4
+        assert self.governor.decide(80.0, None, None) == 0
+        assert self.governor.decide(0.0, None, 10.0) == 0
+
+        self.governor.allowed = 6
+        assert self.governor.decide(0.0, 90.0, None) == 3
+        self.governor.allowed = 1
+        assert self.governor.decide(0.0, 90.0, None) == 1
+
+    def test_update_discounts_own_cpu_and_suspends_for_users(self):
+        """The workers' own CPU use does not count as load; user activity suspends them."""
+        self.psutil.cpu_percent.return_value = 60.0  # half of it is the workers
+
+        with patch.object(resource_governor, "get_user_idle_seconds", return_value=3600.0):
+            assert self.governor.update() == 6
+        assert self.governor.snapshot["own_cpu_percent"] == 50.0
+        assert not self.governor.suspended
+
+        with patch.object(resource_governor, "get_user_idle_seconds", return_value=1.0):
+            assert self.governor.update() == 0
+        assert self.governor.suspended
+        self.worker.suspend.assert_called_once()
+
+        with patch.object(resource_governor, "get_user_idle_seconds", return_value=3600.0):
+            self.governor.update()
+        assert not self.governor.suspended
+        self.worker.resume.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
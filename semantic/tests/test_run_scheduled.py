@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Indaleko Project - Tests for the batch selection of the scheduled semantic runner
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import copy
+import os
+import sys
+import tempfile
+import unittest
+import uuid
+
+from unittest.mock import MagicMock, patch
+
+
+if os.environ.get("INDALEKO_ROOT") is None:
+    current_path = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.exists(os.path.join(current_path, "Indaleko.py")):
+        current_path = os.path.dirname(current_path)
+    os.environ["INDALEKO_ROOT"] = current_path
+    sys.path.append(current_path)
+
+from semantic import run_scheduled
+
+
+class TestBatchSelection(unittest.TestCase):
+    """Test cases for get_file_batch_from_database and adapt_batch_size."""
+
+    def setUp(self):
+        """Create a configuration, a state and a mock database."""
+        self.config = copy.deepcopy(run_scheduled.DEFAULT_CONFIG)
+        self.config["processing"]["scan_factor"] = 2
+        self.state = {"extractors": {"mime": {"cursor": None}}}
+        self.db_config = MagicMock()
+        self.results = []
+        self.db_config._arangodb.aql.execute.side_effect = lambda query, bind_vars: iter([self.results.pop(0)])
+        patcher = patch.object(run_scheduled, "get_database", return_value=self.db_config)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def _file(key):
+        return {"object_id": key, "local_path": "/data", "name": f"{key}.txt", "uri": None}
+
+    def _bind_vars(self):
+        return self.db_config._arangodb.aql.execute.call_args.kwargs["bind_vars"]
+
+    def test_cursor_resumes_and_resets(self):
+        """The cursor follows the batch, skips examined pages and is reset at the end."""
+        self.results = [
+            {"files": [self._file("a"), self._file("b")], "scanned": 4, "page_end": "d"},
+            {"files": [], "scanned": 4, "page_end": "h"},
+            {"files": [self._file("j")], "scanned": 3, "page_end": "k"},
+        ]
+
+        files = run_scheduled.get_file_batch_from_database("mime", 2, self.config, self.state)
+        assert [f["path"] for f in files] == [os.path.join("/data", "a.txt"), os.path.join("/data", "b.txt")]
+        assert self._bind_vars()["cursor"] == ""
+        assert self._bind_vars()["scan_size"] == 4
+        assert self._bind_vars()["extensions"] == []
+        assert self.state["extractors"]["mime"]["cursor"] == "b"
+
+        assert run_scheduled.get_file_batch_from_database("mime", 2, self.config, self.state) == []
+        assert self._bind_vars()["cursor"] == "b"
+        assert self.state["extractors"]["mime"]["cursor"] == "h"
+
+        files = run_scheduled.get_file_batch_from_database("mime", 2, self.config, self.state)
+        assert [f["object_id"] for f in files] == ["j"]
+        assert self.state["extractors"]["mime"]["cursor"] is None
+
+    def test_adapt_batch_size(self):
+        """Batches grow with throughput, within bounds, and shrink over the resource limits."""
+        self.config["processing"].update({"min_batch_size": 10, "max_batch_size": 1000, "target_batch_seconds": 60})
+
+        # 5 files per second for 60 seconds, but at most double
+        assert run_scheduled.adapt_batch_size(100, 100, 20.0, True, self.config) == 200
+        assert run_scheduled.adapt_batch_size(100, 100, 50.0, True, self.config) == 120
+        assert run_scheduled.adapt_batch_size(800, 800, 1.0, True, self.config) == 1000
+        assert run_scheduled.adapt_batch_size(100, 100, 20.0, False, self.config) == 50
+        assert run_scheduled.adapt_batch_size(12, 12, 20.0, False, self.config) == 10
+        assert run_scheduled.adapt_batch_size(100, 0, 0.0, True, self.config) == 100
+
+
+class FakeObjects:
+    """
+    An in-memory Objects collection answering the runner's two queries.
+
+    The queries are evaluated in Python, following the AQL, so that the
+    shape of the recorded attributes is checked against the selection.
+    """
+
+    def __init__(self):
+        self.objects = {}
+
+    def add(self, key, local_path, name, modified):
+        self.objects[key] = {
+            "_key": key,
+            "LocalPath": local_path,
+            "Label": name,
+            "URI": None,
+            "Timestamps": [{"Label": run_scheduled.IndalekoObject.MODIFICATION_TIMESTAMP, "Value": modified}],
+            "SemanticAttributes": [],
+        }
+
+    def execute(self, query, bind_vars):
+        if query == run_scheduled.BATCH_QUERY:
+            return iter([self._select(bind_vars)])
+        if query == run_scheduled.RECORD_ATTRIBUTES_QUERY:
+            return iter(self._record(bind_vars))
+        raise AssertionError("unexpected query")
+
+    def _is_current(self, obj, attr_id):
+        attrs = [a for a in obj["SemanticAttributes"] if a["Identifier"]["Identifier"] == attr_id]
+        if not attrs:
+            return False
+        modified_label = run_scheduled.IndalekoObject.MODIFICATION_TIMESTAMP
+        modified = next((t["Value"] for t in obj["Timestamps"] if t["Label"] == modified_label), None)
+        return attrs[0].get("LastUpdated") is None or modified is None or attrs[0]["LastUpdated"] >= modified
+
+    def _select(self, bind_vars):
+        page = sorted(key for key in self.objects if key > bind_vars["cursor"])[: bind_vars["scan_size"]]
+        files = []
+        for key in page:
+            obj = self.objects[key]
+            extension = "." + obj["Label"].split(".")[-1].lower()
+            if self._is_current(obj, bind_vars["attr_id"]):
+                continue
+            if bind_vars["extensions"] and extension not in bind_vars["extensions"]:
+                continue
+            files.append({"object_id": key, "local_path": obj["LocalPath"], "name": obj["Label"], "uri": obj["URI"]})
+        files = files[: bind_vars["batch_size"]]
+        return {"files": files, "scanned": len(page), "page_end": page[-1] if page else None}
+
+    def _record(self, bind_vars):
+        obj = self.objects.get(bind_vars["key"])
+        if obj is None:
+            return []
+        kept = [a for a in obj["SemanticAttributes"] if a["Identifier"]["Identifier"] not in bind_vars["attr_ids"]]
+        obj["SemanticAttributes"] = kept + copy.deepcopy(bind_vars["attributes"])
+        return [obj["_key"]]
+
+
+class TestBatchProcessing(unittest.TestCase):
+    """Test cases for process_mime_batch and process_checksum_batch."""
+
+    def setUp(self):
+        """Create a configuration, a state, a file to process and its object."""
+        self.config = copy.deepcopy(run_scheduled.DEFAULT_CONFIG)
+        self.config["extractors"]["checksum"]["file_extensions"].append(".txt")
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.state = run_scheduled.load_state(os.path.join(temp_dir.name, "processing_state.json"))
+        self.file_path = os.path.join(temp_dir.name, "notes.txt")
+        with open(self.file_path, "w", encoding="utf-8") as f:
+            f.write("Some notes\n")
+
+        self.object_id = str(uuid.uuid4())
+        self.objects = FakeObjects()
+        self.objects.add(self.object_id, temp_dir.name, "notes.txt", "2025-01-01T00:00:00Z")
+        db_config = MagicMock()
+        db_config._arangodb.aql.execute.side_effect = self.objects.execute
+        for name, value in (("get_database", db_config), ("check_resource_usage", True)):
+            patcher = patch.object(run_scheduled, name, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        # Keep the checksum recorder's output directory in the scratch directory
+        checksum_recorder = run_scheduled.ChecksumRecorder
+        checksum_output = os.path.join(temp_dir.name, "checksum_data.jsonl")
+        patcher = patch.object(
+            run_scheduled,
+            "ChecksumRecorder",
+            lambda: checksum_recorder(output_path=checksum_output),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _select(self, extractor):
+        self.state["extractors"][extractor]["cursor"] = None
+        return run_scheduled.get_file_batch_from_database(extractor, 10, self.config, self.state)
+
+    def test_mime_batch_uses_object_id(self):
+        """Files are recorded against the object identifier selected from the database."""
+        object_id = self.object_id
+        recorded = []
+        process_file = run_scheduled.MimeTypeRecorder.process_file
+
+        def record(recorder, *args, **kwargs):
+            recorded.append(process_file(recorder, *args, **kwargs))
+            return recorded[-1]
+
+        with patch.object(run_scheduled.MimeTypeRecorder, "process_file", record):
+            results = run_scheduled.process_mime_batch(
+                [{"path": self.file_path, "object_id": object_id}],
+                self.config,
+                self.state,
+            )
+
+        assert results == {"processed": 1, "skipped": 0, "errors": 0}
+        assert str(recorded[0]["ObjectIdentifier"]) == object_id
+        assert recorded[0]["mime_type"] == "text/plain"
+        assert self.state["extractors"]["mime"]["last_file_id"] == object_id
+
+    def test_processed_objects_are_not_selected_again(self):
+        """Each extractor's attribute is written back, so the next pass skips the object until it changes."""
+        for extractor, process_batch in (
+            ("mime", run_scheduled.process_mime_batch),
+            ("checksum", run_scheduled.process_checksum_batch),
+        ):
+            files = self._select(extractor)
+            assert [f["object_id"] for f in files] == [self.object_id]
+            assert process_batch(files, self.config, self.state)["processed"] == 1
+            assert self._select(extractor) == []
+
+        attributes = {
+            a["Identifier"]["Identifier"]: a for a in self.objects.objects[self.object_id]["SemanticAttributes"]
+        }
+        assert attributes[run_scheduled.EXTRACTOR_ATTRIBUTES["mime"]]["Value"] == "text/plain"
+        assert len(attributes[run_scheduled.EXTRACTOR_ATTRIBUTES["checksum"]]["Value"]) == 64
+
+        # A later modification makes the attributes stale again
+        self.objects.objects[self.object_id]["Timestamps"][0]["Value"] = "2999-01-01T00:00:00Z"
+        assert [f["object_id"] for f in self._select("mime")] == [self.object_id]
+
+
+if __name__ == "__main__":
+    unittest.main()
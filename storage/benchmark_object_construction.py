@@ -0,0 +1,159 @@
+"""
+Benchmark for IndalekoObject construction and serialization.
+
+This compares the fully validated construction path with the trusted path
+used by the storage recorders, reporting objects per second for each.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import sys
+import time
+import uuid
+
+from typing import Any
+
+
+if os.environ.get("INDALEKO_ROOT") is None:
+    current_path = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.exists(os.path.join(current_path, "Indaleko.py")):
+        current_path = os.path.dirname(current_path)
+    os.environ["INDALEKO_ROOT"] = current_path
+    sys.path.append(current_path)
+
+# pylint: disable=wrong-import-position
+from data_models import (
+    IndalekoRecordDataModel,
+    IndalekoSemanticAttributeDataModel,
+    IndalekoSourceIdentifierDataModel,
+)
+from storage.i_object import IndalekoObject
+
+
+# pylint: enable=wrong-import-position
+
+
+def build_object_arguments(index: int, source: IndalekoSourceIdentifierDataModel) -> dict[str, Any]:
+    """Build the arguments a local recorder would pass for one file."""
+    now = datetime.datetime.now(datetime.UTC)
+    return {
+        "URI": f"/home/user/projects/someProject/source_file_{index}.py",
+        "ObjectIdentifier": str(uuid.uuid4()),
+        "Timestamps": [
+            {
+                "Label": label,
+                "Value": now.isoformat(),
+                "Description": description,
+            }
+            for label, description in (
+                (IndalekoObject.MODIFICATION_TIMESTAMP, "Modified"),
+                (IndalekoObject.ACCESS_TIMESTAMP, "Accessed"),
+                (IndalekoObject.CHANGE_TIMESTAMP, "Changed"),
+            )
+        ],
+        "Size": index * 17,
+        "Machine": str(uuid.uuid4()),
+        "SemanticAttributes": [
+            IndalekoSemanticAttributeDataModel(Identifier=str(uuid.uuid4()), Value=index),
+            IndalekoSemanticAttributeDataModel(Identifier=str(uuid.uuid4()), Value=0o644),
+        ],
+        "PosixFileAttributes": "S_IFREG",
+        "LocalIdentifier": str(1000000 + index),
+        "Label": f"source_file_{index}.py",
+        "LocalPath": "/home/user/projects/someProject",
+        "Record": IndalekoRecordDataModel(
+            SourceIdentifier=source,
+            Timestamp=now,
+            Data="eyJzdF9zaXplIjogMTIzfQ==",
+        ),
+    }
+
+
+def serialize_round_trip(obj: IndalekoObject) -> dict[str, Any]:
+    """Serialize the way IndalekoObject used to: JSON string, then parse it again."""
+    doc = json.loads(obj.indaleko_object.model_dump_json(exclude_none=True, exclude_unset=True))
+    doc["_key"] = obj.args["ObjectIdentifier"]
+    return doc
+
+
+def run_benchmark(
+    label: str,
+    count: int,
+    construct: Any,  # noqa: ANN401
+    serialize: Any = None,  # noqa: ANN401
+    repeat: int = 3,
+) -> float:
+    """Construct and serialize count objects, returning the best objects per second."""
+    if serialize is None:
+        serialize = IndalekoObject.serialize
+    source = IndalekoSourceIdentifierDataModel(Identifier=uuid.uuid4(), Version="1.0")
+    best = None
+    for _ in range(repeat):
+        arguments = [build_object_arguments(index, source) for index in range(count)]
+        gc.collect()
+        start = time.perf_counter()
+        for kwargs in arguments:
+            serialize(construct(**kwargs))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    rate = count / best
+    print(f"{label:<36} {count:>8} objects {best:8.3f} s {rate:12.1f} objects/s")
+    return rate
+
+
+def main() -> None:
+    """Run the object construction benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark IndalekoObject construction")
+    parser.add_argument("--count", type=int, default=20000, help="Number of objects to build")
+    parser.add_argument(
+        "--sample-rate",
+        type=float,
+        default=0.01,
+        help="Validation sample rate for the sampled trusted run",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per configuration (best is reported)")
+    args = parser.parse_args()
+    before = run_benchmark(
+        "validated, JSON round trip (before)",
+        args.count,
+        IndalekoObject,
+        serialize_round_trip,
+        args.repeat,
+    )
+    run_benchmark("validated (IndalekoObject)", args.count, IndalekoObject, repeat=args.repeat)
+    trusted = run_benchmark(
+        "trusted (from_trusted)",
+        args.count,
+        lambda **kwargs: IndalekoObject.from_trusted(validation_sample_rate=0.0, **kwargs),
+        repeat=args.repeat,
+    )
+    run_benchmark(
+        f"trusted, {args.sample_rate:.0%} validated",
+        args.count,
+        lambda **kwargs: IndalekoObject.from_trusted(validation_sample_rate=args.sample_rate, **kwargs),
+        repeat=args.repeat,
+    )
+    print(f"speedup (trusted vs before): {trusted / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
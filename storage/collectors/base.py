@@ -29,6 +29,7 @@ import sys
 import tempfile
 import uuid
 
+from collections.abc import Iterator
 from pathlib import Path
 
 import jsonlines
@@ -47,6 +48,11 @@ if os.environ.get("INDALEKO_ROOT") is None:
 # from data_models import IndalekoServiceDataModel
 from db import IndalekoServiceManager
 from storage.collectors.data_model import IndalekoStorageCollectorDataModel
+from storage.collectors.parallel_walker import (
+    IndalekoParallelWalker,
+    IndalekoWalkEntry,
+    IndalekoWalkResult,
+)
 from utils.misc.directory_management import (
     indaleko_default_config_dir,
     indaleko_default_data_dir,
@@ -169,6 +175,7 @@ class BaseStorageCollector:
             self.path = kwargs["path"]
         else:
             self.path = os.path.expanduser("~")
+        self.walker_threads = kwargs.get("walker_threads", IndalekoParallelWalker.default_workers)
         self.collector_service = None
         if not self.offline:
             self.collector_service = IndalekoServiceManager().lookup_service_by_identifier(
@@ -361,7 +368,21 @@ class BaseStorageCollector:
             else:
                 self.error_count += 1
             return None
-        if stat_data.st_ino != lstat_data.st_ino:
+        return self.build_stat_dict_from_stat(name, root, lstat_data, stat_data)
+
+    def build_stat_dict_from_stat(
+        self,
+        name: str,
+        root: str,
+        lstat_data: os.stat_result,
+        stat_data: os.stat_result,
+    ) -> dict | None:
+        """
+        This function builds a stat dict for a given file from stat information
+        that has already been collected (e.g., by the parallel walker).
+        """
+        file_path = os.path.join(root, name)
+        if stat_data.st_ino != lstat_data.st_ino or stat.S_ISLNK(lstat_data.st_mode):
             logging.info("File %s is a symlink, collecting symlink data", file_path)
             self.good_symlink_count += 1
             stat_data = lstat_data
@@ -378,11 +399,31 @@ class BaseStorageCollector:
         stat_dict = {key: getattr(stat_data, key) for key in dir(stat_data) if key.startswith("st_")}
         stat_dict["Name"] = name
         stat_dict["Path"] = root
-        stat_dict["URI"] = os.path.join(root, name)
+        stat_dict["URI"] = file_path
         stat_dict["Collector"] = str(self.get_collector_service_identifier())
         stat_dict["ObjectIdentifier"] = str(uuid.uuid4())
         return stat_dict
 
+    def build_stat_dict_from_walk_entry(self, entry: IndalekoWalkEntry, root: str) -> dict | None:
+        """
+        This function builds a stat dict from an entry returned by the parallel
+        walker, keeping the same counters as build_stat_dict.
+        """
+        if entry.lstat is None:
+            logging.warning("Unable to stat %s : %s", os.path.join(root, entry.name), entry.error)
+            if isinstance(entry.error, FileNotFoundError):
+                self.not_found_count += 1
+            elif isinstance(entry.error, PermissionError):
+                self.access_error_count += 1
+            else:
+                self.error_count += 1
+            return None
+        if entry.stat is None:
+            logging.warning("File %s is a broken symlink", os.path.join(root, entry.name))
+            self.bad_symlink_count += 1
+            return None
+        return self.build_stat_dict_from_stat(entry.name, root, entry.lstat, entry.stat)
+
     @staticmethod
     def convert_to_serializable(data):
         if isinstance(data, (int, float, str, bool, type(None))):
@@ -395,6 +436,10 @@ class BaseStorageCollector:
             return BaseStorageCollector.convert_to_serializable(data.__dict__)
         return None
 
+    def walk(self) -> Iterator[IndalekoWalkResult]:
+        """Walk the collection path with the parallel walker."""
+        return IndalekoParallelWalker(self.path, workers=self.walker_threads).walk()
+
     def collect(self, **kwargs) -> None:
         """
         This is the main function for the collector.  Can be overridden
@@ -402,7 +447,10 @@ class BaseStorageCollector:
         """
         data = []
         count = 0
-        for root, dirs, files in os.walk(self.path):
+        for root, entries, error in self.walk():
+            if error is not None:
+                logging.warning("Unable to scan directory %s : %s", root, error)
+                self.access_error_count += 1
             try:
                 root.encode("utf-8")
             except UnicodeEncodeError as e:
@@ -414,20 +462,20 @@ class BaseStorageCollector:
                 ic(f"Unable to encode directory {root} : {e} * skipping")
                 self.encoding_count += 1
                 continue
-            for name in dirs + files:
+            for walk_entry in entries:
                 try:
-                    name.encode("utf-8")
+                    walk_entry.name.encode("utf-8")
                 except UnicodeEncodeError as e:
                     logging.warning(
                         "Unable to encode name %s (path %s) : %s * skipping",
-                        name,
+                        walk_entry.name,
                         root,
                         e,
                     )
-                    ic(f"Unable to encode name {name} (path {root}) : {e} * skipping")
+                    ic(f"Unable to encode name {walk_entry.name} (path {root}) : {e} * skipping")
                     self.encoding_count += 1
                     continue
-                entry = self.build_stat_dict(name, root)
+                entry = self.build_stat_dict_from_walk_entry(walk_entry, root)
                 if entry is not None:
                     data.append(entry)
                     count += 1
@@ -45,6 +45,7 @@ from perf.perf_collector import IndalekoPerformanceDataCollector
 from perf.perf_recorder import IndalekoPerformanceDataRecorder
 from platforms.machine_config import IndalekoMachineConfig
 from storage.collectors import BaseStorageCollector
+from storage.collectors.parallel_walker import IndalekoParallelWalker
 from utils.cli.base import IndalekoBaseCLI
 from utils.cli.data_models.cli_data import IndalekoBaseCliDataModel
 from utils.cli.runner import IndalekoCLIRunner
@@ -110,6 +111,13 @@ class BaseLocalStorageCollector(BaseStorageCollector):
                 type=str,
                 default=default_path,
             )
+            parser.add_argument(
+                "--walker_threads",
+                help="Number of threads used to walk the directory tree "
+                f"(default={IndalekoParallelWalker.default_workers})",
+                type=int,
+                default=IndalekoParallelWalker.default_workers,
+            )
             return parser
 
         @staticmethod
@@ -150,6 +158,7 @@ class BaseLocalStorageCollector(BaseStorageCollector):
             "timestamp": config_data["Timestamp"],
             "path": args.path,
             "offline": args.offline,
+            "walker_threads": getattr(args, "walker_threads", IndalekoParallelWalker.default_workers),
         }
         if config_data.get("StorageId"):
             kwargs["storage"] = config_data["StorageId"]
@@ -117,7 +117,21 @@ class IndalekoMacLocalStorageCollector(BaseLocalStorageCollector):
             logging.warning("Unable to stat %s : %s", file_path, e)
             self.error_count += 1
             return None
-
+        return self.build_stat_dict_from_stat(name, root, stat_data, stat_data)
+
+    def build_stat_dict_from_stat(
+        self,
+        name: str,
+        root: str,
+        lstat_data: os.stat_result,
+        stat_data: os.stat_result,
+    ) -> dict | None:
+        """
+        Given stat information that has already been collected for a file, this
+        will return the stat dict.  As with build_stat_dict, the Mac collector
+        records the metadata of the symlink target rather than the link.
+        """
+        del lstat_data  # unused: we always record the target metadata
         stat_dict = {key: getattr(stat_data, key) for key in dir(stat_data) if key.startswith("st_")}
         stat_dict["Name"] = name
         stat_dict["Path"] = root
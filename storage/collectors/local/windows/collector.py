@@ -21,6 +21,7 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 import argparse
 import logging
 import os
+import stat
 import sys
 import uuid
 
@@ -199,8 +200,25 @@ class IndalekoWindowsLocalStorageCollector(BaseLocalStorageCollector):
                 self.bad_symlink_count += 1
             return None
 
+        return self.build_windows_stat_dict(name, root, lstat_data, stat_data, last_uri, last_drive)
+
+    def build_windows_stat_dict(
+        self,
+        name: str,
+        root: str,
+        lstat_data: os.stat_result,
+        stat_data: os.stat_result,
+        last_uri: str | None = None,
+        last_drive: str | None = None,
+    ) -> tuple:
+        """
+        Given stat information that has already been collected for a file, this
+        will return the same (dict, last_uri, last_drive) tuple as build_stat_dict.
+        """
+        if last_uri is None:
+            last_uri = os.path.join(root, name)
         if stat_data.st_ino != lstat_data.st_ino:
-            logging.info("File %s is a symlink, collecting symlink metadata", file_path)
+            logging.info("File %s is a symlink, collecting symlink metadata", os.path.join(root, name))
             self.good_symlink_count += 1
             stat_data = lstat_data
         stat_dict = {key: getattr(stat_data, key) for key in dir(stat_data) if key.startswith("st_")}
@@ -240,23 +258,40 @@ class IndalekoWindowsLocalStorageCollector(BaseLocalStorageCollector):
         last_uri = None
         counter = 0
         progress_frequency = 1000
-        for root, dirs, files in os.walk(self.path):
-            for name in dirs + files:
-                entry = self.build_stat_dict(name, root, last_uri, last_drive)
-                self.last_debug_entry = entry
+        for root, entries, error in self.walk():
+            if error is not None:
+                logging.warning("Unable to scan directory %s : %s", root, error)
+                self.access_error_count += 1
+            for walk_entry in entries:
                 counter += 1
-                if counter % progress_frequency == 0:
-                    ic(
-                        f"Processed {counter} entries (dir={self.dir_count}, files={self.file_count})."
-                        f"Last entry: {entry[0].get('Path')}\n",
+                if walk_entry.lstat is None:
+                    logging.warning(
+                        "Unable to stat %s : %s",
+                        os.path.join(root, walk_entry.name),
+                        walk_entry.error,
                     )
-                if entry is None:
                     self.not_found_count += 1
                     continue
-                if len(entry) == 0:
+                if walk_entry.stat is None:
+                    logging.warning("File %s is an invalid link", os.path.join(root, walk_entry.name))
                     self.error_count += 1
+                    self.bad_symlink_count += 1
                     continue
-                if name in dirs:
+                entry = self.build_windows_stat_dict(
+                    walk_entry.name,
+                    root,
+                    walk_entry.lstat,
+                    walk_entry.stat,
+                    last_uri,
+                    last_drive,
+                )
+                self.last_debug_entry = entry
+                if counter % progress_frequency == 0:
+                    ic(
+                        f"Processed {counter} entries (dir={self.dir_count}, files={self.file_count})."
+                        f"Last entry: {entry[0].get('Path')}\n",
+                    )
+                if stat.S_ISDIR(walk_entry.lstat.st_mode):
                     self.dir_count += 1
                 else:
                     self.file_count += 1
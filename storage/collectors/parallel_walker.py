@@ -0,0 +1,210 @@
+"""
+This module provides a parallel, scandir based directory walker for the
+storage collectors.
+
+The walker runs a small pool of threads.  Each thread owns a deque of
+directories still to be scanned: it pushes the subdirectories it discovers
+onto its own deque and pops from the same end (depth first, which keeps the
+working set small), while idle threads steal from the opposite end of another
+thread's deque.  All of the stat work happens on the worker threads, and the
+stat information from the directory scan is reused so that normally only one
+stat call is issued per entry; symbolic links get a second stat to determine
+whether their target exists.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import collections
+import os
+import queue
+import stat
+import threading
+
+from collections.abc import Iterator
+from typing import NamedTuple
+
+
+class IndalekoWalkEntry(NamedTuple):
+    """The stat information for a single directory entry."""
+
+    name: str
+    lstat: os.stat_result | None  # None if the entry could not be stat'd
+    stat: os.stat_result | None  # target of a symlink, None if it is broken
+    error: OSError | None
+
+
+class IndalekoWalkResult(NamedTuple):
+    """The entries for a single directory (or the error that prevented scanning it)."""
+
+    path: str
+    entries: list[IndalekoWalkEntry]
+    error: OSError | None
+
+
+class IndalekoParallelWalker:
+    """Walk a directory tree with a work-stealing pool of scandir threads."""
+
+    default_workers = int(
+        os.environ.get("INDALEKO_WALKER_THREADS", str(min(32, 4 * (os.cpu_count() or 1)))),
+    )
+    default_queue_depth = 1024
+
+    # On Windows the stat information returned by scandir does not include
+    # st_ino, st_dev or st_nlink, so a full stat is required.
+    need_full_stat = os.name == "nt"
+
+    def __init__(
+        self,
+        root: str,
+        workers: int | None = None,
+        queue_depth: int = default_queue_depth,
+    ) -> None:
+        """
+        Create the walker.
+
+        Inputs:
+            * root: the directory at which to start the walk
+            * workers: the number of scanning threads
+            * queue_depth: the number of scanned directories that may be
+              waiting for the consumer before the workers pause
+        """
+        if workers is None:
+            workers = IndalekoParallelWalker.default_workers
+        self.root = root
+        self.workers = max(1, workers)
+        self._deques = [collections.deque() for _ in range(self.workers)]
+        self._results = queue.Queue(maxsize=queue_depth)
+        self._condition = threading.Condition()
+        self._outstanding = 0
+        self._stopped = False
+
+    @staticmethod
+    def stat_entry(entry: os.DirEntry) -> IndalekoWalkEntry:
+        """Collect the stat information for a directory entry."""
+        try:
+            if IndalekoParallelWalker.need_full_stat:
+                lstat_data = os.lstat(entry.path)
+            else:
+                lstat_data = entry.stat(follow_symlinks=False)
+        except OSError as error:
+            return IndalekoWalkEntry(entry.name, None, None, error)
+        if not stat.S_ISLNK(lstat_data.st_mode):
+            return IndalekoWalkEntry(entry.name, lstat_data, lstat_data, None)
+        try:
+            return IndalekoWalkEntry(entry.name, lstat_data, os.stat(entry.path), None)
+        except OSError as error:
+            return IndalekoWalkEntry(entry.name, lstat_data, None, error)
+
+    def _push(self, index: int, path: str) -> None:
+        """Add a directory to the given worker's deque."""
+        with self._condition:
+            self._outstanding += 1
+            self._deques[index].append(path)
+            self._condition.notify()
+
+    def _next(self, index: int) -> str | None:
+        """Get the next directory for the given worker, stealing if needed."""
+        with self._condition:
+            while True:
+                if self._stopped:
+                    return None
+                if self._deques[index]:
+                    return self._deques[index].pop()
+                for offset in range(1, self.workers):
+                    victim = self._deques[(index + offset) % self.workers]
+                    if victim:
+                        return victim.popleft()
+                if self._outstanding == 0:
+                    return None
+                self._condition.wait()
+
+    def _put(self, item: IndalekoWalkResult | None) -> None:
+        """Hand a result to the consumer unless the walk has been abandoned."""
+        while not self._stopped:
+            try:
+                self._results.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _scan(self, index: int, path: str) -> IndalekoWalkResult:
+        """Scan one directory, queueing its subdirectories."""
+        entries = []
+        try:
+            with os.scandir(path) as iterator:
+                for entry in iterator:
+                    walk_entry = self.stat_entry(entry)
+                    entries.append(walk_entry)
+                    if walk_entry.lstat is not None and stat.S_ISDIR(walk_entry.lstat.st_mode):
+                        self._push(index, entry.path)
+        except OSError as error:
+            return IndalekoWalkResult(path, entries, error)
+        return IndalekoWalkResult(path, entries, None)
+
+    def _worker(self, index: int) -> None:
+        """The main loop for a walker thread."""
+        while True:
+            path = self._next(index)
+            if path is None:
+                return
+            try:
+                self._put(self._scan(index, path))
+            finally:
+                with self._condition:
+                    self._outstanding -= 1
+                    finished = self._outstanding == 0
+                    if finished:
+                        self._condition.notify_all()
+                if finished:
+                    self._put(None)
+
+    def walk(self) -> Iterator[IndalekoWalkResult]:
+        """
+        Walk the tree, yielding one result per directory scanned.
+
+        The order in which directories are returned is not defined.  As with
+        os.walk, the root directory itself is not returned as an entry, and
+        symbolic links to directories are not followed.
+        """
+        self._stopped = False
+        self._outstanding = 1
+        self._deques[0].append(self.root)
+        threads = [
+            threading.Thread(
+                target=self._worker,
+                args=(index,),
+                name=f"IndalekoWalker-{index}",
+                daemon=True,
+            )
+            for index in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                result = self._results.get()
+                if result is None:
+                    break
+                yield result
+        finally:
+            with self._condition:
+                self._stopped = True
+                self._condition.notify_all()
+            for thread in threads:
+                thread.join()
+            for worker_deque in self._deques:
+                worker_deque.clear()
@@ -0,0 +1,98 @@
+"""
+Test script for the parallel directory walker.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+import tempfile
+
+
+if os.environ.get("INDALEKO_ROOT") is None:
+    current_path = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.exists(os.path.join(current_path, "Indaleko.py")):
+        current_path = os.path.dirname(current_path)
+    os.environ["INDALEKO_ROOT"] = current_path
+    sys.path.append(current_path)
+
+from storage.collectors.parallel_walker import IndalekoParallelWalker
+
+
+def build_tree(root: str, depth: int = 3, fanout: int = 3) -> None:
+    """Build a small directory tree for testing."""
+    if depth == 0:
+        return
+    for index in range(fanout):
+        with open(os.path.join(root, f"file{index}.txt"), "w", encoding="utf-8") as fd:
+            fd.write("x" * index)
+        subdir = os.path.join(root, f"dir{index}")
+        os.mkdir(subdir)
+        build_tree(subdir, depth - 1, fanout)
+
+
+def test_parallel_walker_matches_os_walk() -> None:
+    """The walker should visit exactly the entries os.walk visits."""
+    with tempfile.TemporaryDirectory() as root:
+        build_tree(root)
+        expected = set()
+        for path, dirs, files in os.walk(root):
+            expected.update(os.path.join(path, name) for name in dirs + files)
+        for workers in (1, 4):
+            found = set()
+            for path, entries, error in IndalekoParallelWalker(root, workers=workers).walk():
+                assert error is None
+                for entry in entries:
+                    assert entry.lstat is not None
+                    assert entry.stat is entry.lstat  # no symlinks, so no second stat
+                    found.add(os.path.join(path, entry.name))
+            assert found == expected, f"Mismatch with {workers} workers"
+
+
+def test_parallel_walker_symlinks() -> None:
+    """Symlinks get a second stat, and broken symlinks are reported."""
+    if not hasattr(os, "symlink") or os.name == "nt":
+        return
+    with tempfile.TemporaryDirectory() as root:
+        build_tree(root, depth=1)
+        os.symlink(os.path.join(root, "file0.txt"), os.path.join(root, "good"))
+        os.symlink(os.path.join(root, "missing"), os.path.join(root, "bad"))
+        os.symlink(os.path.join(root, "dir0"), os.path.join(root, "dirlink"))
+        entries = {}
+        for _, dir_entries, _ in IndalekoParallelWalker(root, workers=2).walk():
+            entries.update({entry.name: entry for entry in dir_entries})
+        assert entries["good"].stat is not None
+        assert entries["good"].stat.st_ino != entries["good"].lstat.st_ino
+        assert entries["bad"].stat is None
+        assert entries["bad"].error is not None
+        # symlinked directories are reported but not followed
+        assert entries["dirlink"].stat is not None
+
+
+def test_parallel_walker_early_exit() -> None:
+    """Abandoning the walk must not leave worker threads blocked."""
+    with tempfile.TemporaryDirectory() as root:
+        build_tree(root, depth=4)
+        walk = IndalekoParallelWalker(root, workers=4, queue_depth=1).walk()
+        next(walk)
+        walk.close()
+
+
+if __name__ == "__main__":
+    test_parallel_walker_matches_os_walk()
+    test_parallel_walker_symlinks()
+    test_parallel_walker_early_exit()
@@ -19,11 +19,16 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import argparse
 import datetime
-import json
 import os
+import random
 import sys
 import uuid
 
+from typing import Any
+
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+
 
 # from icecream import ic
 
@@ -60,9 +65,30 @@ class IndalekoObject:
     ACCESS_TIMESTAMP = "581b5332-4d37-49c7-892a-854824f5d66f"
     CHANGE_TIMESTAMP = "3bdc4130-774f-4e99-914e-0bec9ee47aab"
 
+    # Fraction of trusted objects that are nonetheless fully validated.
+    validation_sample_rate = float(
+        os.environ.get("INDALEKO_OBJECT_VALIDATION_RATE", "0.0"),
+    )
+    model_fields = frozenset(IndalekoObjectDataModel.model_fields)
+    json_scalar_types = frozenset((str, int, float, bool))
+
     def __init__(self, **kwargs) -> None:
         """Initialize the object."""
         self.args = kwargs
+        self.check_arguments(kwargs)
+        self.add_tokenized_name(kwargs)
+        self.document = None
+        self.indaleko_object = IndalekoObjectDataModel.deserialize(kwargs)
+        if self.indaleko_object.Timestamps is not None:
+            for timestamp in self.indaleko_object.Timestamps:
+                if timestamp.Value.tzinfo is None:
+                    timestamp.Value = timestamp.Value.replace(
+                        tzinfo=datetime.UTC,
+                    )
+
+    @staticmethod
+    def check_arguments(kwargs: dict[str, Any]) -> None:
+        """Check the arguments required by every object."""
         assert "ObjectIdentifier" in kwargs, "ObjectIdentifier is missing."
         assert isinstance(
             kwargs["ObjectIdentifier"],
@@ -70,18 +96,118 @@ class IndalekoObject:
         ), "ObjectIdentifier is not a string."
         assert kwargs["ObjectIdentifier"] != "None", "ObjectIdentifier is None."
         assert "Record" in kwargs, f"Record is missing: {kwargs}"
+
+    @staticmethod
+    def add_tokenized_name(kwargs: dict[str, Any]) -> None:
+        """Add the tokenized forms of the label, unless the caller provided them."""
         if kwargs.get("Label"):
             tokenized = tokenize_filename(kwargs.get("Label"))
             for key, value in tokenized.items():
                 if key not in kwargs:
                     kwargs[key] = value
-        self.indaleko_object = IndalekoObjectDataModel.deserialize(kwargs)
-        if self.indaleko_object.Timestamps is not None:
-            for timestamp in self.indaleko_object.Timestamps:
-                if timestamp.Value.tzinfo is None:
-                    timestamp.Value = timestamp.Value.replace(
-                        tzinfo=datetime.UTC,
-                    )
+
+    @classmethod
+    def from_trusted(
+        cls,
+        validation_sample_rate: float | None = None,
+        **kwargs: dict[str, Any],
+    ) -> "IndalekoObject":
+        """
+        Build an object from data the caller has generated itself (e.g., a
+        storage recorder), skipping pydantic validation.
+
+        The database document is built directly from the arguments, and the
+        data model is created with model_construct so attribute access still
+        works.  A fraction (validation_sample_rate) of the objects are built
+        through the fully validated path instead, so that a recorder bug is
+        still caught without paying for validation on every object.
+        """
+        if validation_sample_rate is None:
+            validation_sample_rate = cls.validation_sample_rate
+        if validation_sample_rate > 0 and random.random() < validation_sample_rate:
+            return cls(**kwargs)
+        cls.check_arguments(kwargs)
+        cls.add_tokenized_name(kwargs)
+        obj = cls.__new__(cls)
+        obj.args = kwargs
+        obj.document = cls.build_document(kwargs)
+        obj._indaleko_object = None  # built on first use
+        return obj
+
+    @property
+    def indaleko_object(self) -> IndalekoObjectDataModel:
+        """The data model for this object."""
+        if self._indaleko_object is None:
+            self._indaleko_object = IndalekoObjectDataModel.model_construct(
+                **{key: value for key, value in self.args.items() if key in self.model_fields},
+            )
+        return self._indaleko_object
+
+    @indaleko_object.setter
+    def indaleko_object(self, value: IndalekoObjectDataModel) -> None:
+        self._indaleko_object = value
+
+    @staticmethod
+    def to_json_value(value: Any) -> Any:  # noqa: ANN401
+        """Convert a value to the form pydantic would emit in JSON mode."""
+        scalar_types = IndalekoObject.json_scalar_types
+        value_type = type(value)
+        if value_type in scalar_types:
+            return value
+        if value_type is dict:
+            return {
+                key: item if type(item) in scalar_types else IndalekoObject.to_json_value(item)
+                for key, item in value.items()
+                if item is not None
+            }
+        if value_type is list or value_type is tuple:
+            return [item if type(item) in scalar_types else IndalekoObject.to_json_value(item) for item in value]
+        if value_type is uuid.UUID:
+            return str(value)
+        if isinstance(value, datetime.datetime):
+            return IndalekoObject.to_json_datetime(value)
+        if isinstance(value, BaseModel):
+            return value.model_dump(mode="json", exclude_none=True, exclude_unset=True)
+        return to_jsonable_python(value)
+
+    @staticmethod
+    def to_json_datetime(value: datetime.datetime | str) -> str:
+        """Convert a timestamp to the ISO format pydantic emits (UTC as Z)."""
+        if isinstance(value, str):
+            value = datetime.datetime.fromisoformat(value)
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.UTC)
+        iso = value.isoformat()
+        if iso.endswith("+00:00"):
+            iso = iso[:-6] + "Z"
+        return iso
+
+    @staticmethod
+    def normalize_timestamp(timestamp: Any) -> Any:  # noqa: ANN401
+        """Normalize a timestamp entry the way IndalekoTimestampDataModel does."""
+        if type(timestamp) is not dict:
+            return IndalekoObject.to_json_value(timestamp)
+        doc = IndalekoObject.to_json_value({key: value for key, value in timestamp.items() if key != "Value"})
+        if timestamp.get("Value") is not None:
+            doc["Value"] = IndalekoObject.to_json_datetime(timestamp["Value"])
+        return doc
+
+    @staticmethod
+    def build_document(kwargs: dict[str, Any]) -> dict[str, Any]:
+        """Build the database document from the arguments for a trusted object."""
+        doc = {}
+        model_fields = IndalekoObject.model_fields
+        scalar_types = IndalekoObject.json_scalar_types
+        for key, value in kwargs.items():
+            if value is None or key not in model_fields:
+                continue
+            if type(value) in scalar_types:
+                doc[key] = value
+            elif key == "Timestamps":
+                doc[key] = [IndalekoObject.normalize_timestamp(timestamp) for timestamp in value]
+            else:
+                doc[key] = IndalekoObject.to_json_value(value)
+        return doc
 
     @staticmethod
     def deserialize(data: dict) -> "IndalekoObject":
@@ -90,9 +216,14 @@ class IndalekoObject:
 
     def serialize(self) -> dict:
         """Serialize the object to a dictionary."""
-        doc = json.loads(
-            self.indaleko_object.model_dump_json(exclude_none=True, exclude_unset=True),
-        )
+        if self.document is not None:
+            doc = dict(self.document)
+        else:
+            doc = self.indaleko_object.model_dump(
+                mode="json",
+                exclude_none=True,
+                exclude_unset=True,
+            )
         doc["_key"] = self.args["ObjectIdentifier"]
         return doc
 
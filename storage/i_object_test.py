@@ -0,0 +1,130 @@
+"""
+Test script for building objects from trusted recorder data.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import datetime
+import os
+import sys
+import uuid
+
+from typing import Any
+
+
+if os.environ.get("INDALEKO_ROOT") is None:
+    current_path = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.exists(os.path.join(current_path, "Indaleko.py")):
+        current_path = os.path.dirname(current_path)
+    os.environ["INDALEKO_ROOT"] = current_path
+    sys.path.append(current_path)
+
+from data_models import (
+    IndalekoObjectDataModel,
+    IndalekoRecordDataModel,
+    IndalekoSemanticAttributeDataModel,
+    IndalekoSourceIdentifierDataModel,
+)
+from storage.i_object import IndalekoObject
+
+
+source_id = IndalekoSourceIdentifierDataModel(Identifier=str(uuid.uuid4()), Version="1.0")
+machine_id = str(uuid.uuid4())
+object_ids = {"file": str(uuid.uuid4()), "directory": str(uuid.uuid4())}
+attribute_ids = (str(uuid.uuid4()), str(uuid.uuid4()))
+
+
+def object_arguments(kind: str) -> dict[str, Any]:
+    """Build the arguments a local recorder passes for a file or a directory."""
+    timestamp = datetime.datetime(2025, 3, 1, 12, 30, 15, 250000, tzinfo=datetime.UTC)
+    args = {
+        "URI": "/home/user/projects/indaleko" + ("/Read Me.final.md" if kind == "file" else ""),
+        "ObjectIdentifier": object_ids[kind],
+        "Timestamps": [
+            {
+                "Label": IndalekoObject.MODIFICATION_TIMESTAMP,
+                "Value": timestamp.isoformat(),
+                "Description": "Modified",
+            },
+            {
+                "Label": IndalekoObject.ACCESS_TIMESTAMP,
+                "Value": timestamp.replace(tzinfo=None).isoformat(),
+                "Description": "Accessed",
+            },
+        ],
+        "Size": 1410120 if kind == "file" else 4096,
+        "Machine": machine_id,
+        "SemanticAttributes": [
+            IndalekoSemanticAttributeDataModel(Identifier=attribute_ids[0], Value=33188),
+            IndalekoSemanticAttributeDataModel(Identifier=attribute_ids[1], Value="text/markdown"),
+        ],
+        "PosixFileAttributes": "S_IFREG" if kind == "file" else "S_IFDIR",
+        "LocalIdentifier": "1125899910119832" if kind == "file" else "1125899910119801",
+        "Label": "Read Me.final.md" if kind == "file" else "indaleko",
+        "LocalPath": "/home/user/projects/indaleko" if kind == "file" else "/home/user/projects",
+        "timestamp": timestamp,
+        "Record": IndalekoRecordDataModel(
+            SourceIdentifier=source_id,
+            Timestamp=timestamp,
+            Data="eyJzdF9zaXplIjogMTIzfQ==",
+        ),
+    }
+    if kind == "file":
+        args["WindowsFileAttributes"] = "FILE_ATTRIBUTE_ARCHIVE"
+    return args
+
+
+def test_trusted_matches_validated() -> None:
+    """from_trusted must serialize to the same document as the validated constructor."""
+    for kind in object_ids:
+        validated = IndalekoObject(**object_arguments(kind)).serialize()
+        trusted = IndalekoObject.from_trusted(validation_sample_rate=0.0, **object_arguments(kind)).serialize()
+        assert trusted == validated, kind
+        assert trusted["_key"] == object_ids[kind]
+        assert trusted["SpaceTokenizedName"]
+
+
+def test_trusted_sampled_validation() -> None:
+    """A sampled trusted object is built through the validated path."""
+    obj = IndalekoObject.from_trusted(validation_sample_rate=1.0, **object_arguments("file"))
+    assert obj.document is None
+    assert obj.serialize() == IndalekoObject(**object_arguments("file")).serialize()
+
+
+def test_trusted_data_model_is_lazy() -> None:
+    """The data model of a trusted object is built on first use, from the arguments."""
+    obj = IndalekoObject.from_trusted(validation_sample_rate=0.0, **object_arguments("directory"))
+    assert obj._indaleko_object is None
+    model = obj.indaleko_object
+    assert isinstance(model, IndalekoObjectDataModel)
+    assert obj.indaleko_object is model
+    assert obj["Label"] == "indaleko"
+    assert obj["Size"] == 4096
+    assert "LocalPath" in obj
+    # building the model does not change the document
+    assert obj.serialize() == IndalekoObject(**object_arguments("directory")).serialize()
+
+
+def main() -> None:
+    """Run the tests."""
+    test_trusted_matches_validated()
+    test_trusted_sampled_validation()
+    test_trusted_data_model_is_lazy()
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,7 @@ This module defines the data structure for entity resolution queue entries.
 from datetime import UTC, datetime
 from enum import Enum
 
-from pydantic import Field, validator
+from pydantic import Field, model_validator
 
 from data_models.base import IndalekoBaseModel
 
@@ -62,19 +62,17 @@ class ResolutionRequest(IndalekoBaseModel):
     last_error: str | None = Field(default=None, description="Last error message if failed")
     last_attempt_time: datetime | None = Field(default=None, description="When the last resolution attempt occurred")
 
-    @validator("path_depth", pre=True)
-    def calculate_path_depth(self, v, values):
+    @model_validator(mode="after")
+    def calculate_path_depth(self) -> "ResolutionRequest":
         """Calculate path depth from file_path if not provided."""
-        if v == 0 and "entity_info" in values:
-            entity_info = values["entity_info"]
-            if hasattr(entity_info, "file_path") and entity_info.file_path:
-                # Count path segments, normalizing for Windows vs Unix
-                normalized_path = entity_info.file_path.replace("\\", "/")
-                # Remove leading/trailing slashes before counting
-                cleaned_path = normalized_path.strip("/")
-                if cleaned_path:
-                    return len(cleaned_path.split("/"))
-        return v
+        if self.path_depth == 0 and self.entity_info.file_path:
+            # Count path segments, normalizing for Windows vs Unix
+            normalized_path = self.entity_info.file_path.replace("\\", "/")
+            # Remove leading/trailing slashes before counting
+            cleaned_path = normalized_path.strip("/")
+            if cleaned_path:
+                self.path_depth = len(cleaned_path.split("/"))
+        return self
 
     class Config:
         """Pydantic configuration."""
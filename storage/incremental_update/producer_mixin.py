@@ -6,6 +6,10 @@ to enqueue entity resolution requests when they encounter entities
 that don't exist in the database.
 """
 
+import os
+import threading
+import time
+
 from storage.incremental_update.models import EntityInfo, EntityType
 from storage.incremental_update.queue_service import EntityResolutionQueue
 from utils.i_logging import get_logger
@@ -37,13 +41,28 @@ class EntityResolutionProducer:
 
             # Continue with other processing
     ```
+
+    Recorders that see bursts of missing entities (e.g., a freshly unpacked
+    archive) should use buffer_entity_resolution instead: requests are held
+    and deduplicated in memory, then sent as a single enqueue_many once
+    resolution_batch_size requests are waiting or resolution_flush_interval
+    seconds have passed.  The interval is enforced by a timer, so a producer
+    that goes quiet does not hold a partial buffer.  Call
+    close_entity_resolutions when done.
     """
 
+    resolution_batch_size = int(os.environ.get("INDALEKO_RESOLUTION_BATCH_SIZE", "500"))
+    resolution_flush_interval = float(os.environ.get("INDALEKO_RESOLUTION_FLUSH_INTERVAL", "2.0"))
+
     def __init__(self, *args, **kwargs) -> None:
         """Initialize the mixin."""
         super().__init__(*args, **kwargs)
         self._resolution_queue = None
         self._machine_id = None
+        self._resolution_buffer = {}
+        self._resolution_buffer_start = None
+        self._resolution_lock = threading.RLock()
+        self._resolution_timer = None
 
     def _get_resolution_queue(self) -> EntityResolutionQueue:
         """
@@ -133,3 +152,110 @@ class EntityResolutionProducer:
         logger.debug(f"Enqueued entity resolution request {request_id} for {entity_type}:{volume_guid}:{frn}")
 
         return request_id
+
+    def buffer_entity_resolution(
+        self,
+        volume_guid: str,
+        frn: str,
+        file_path: str | None = None,
+        entity_type: EntityType | str = EntityType.UNKNOWN,
+        priority: int = 3,
+    ) -> list[str]:
+        """
+        Add an entity to the resolution buffer, flushing it if it is full or old.
+
+        Args:
+            volume_guid: Volume identifier (e.g., 'C:')
+            frn: File Reference Number or equivalent identifier
+            file_path: Optional file path
+            entity_type: Type of entity ('file', 'directory', 'unknown')
+            priority: Priority (1-5, where 1 is highest)
+
+        Returns:
+            The queue entry IDs if the buffer was flushed, otherwise an empty list
+        """
+        if isinstance(entity_type, str):
+            entity_type = EntityType(entity_type)
+        key = (volume_guid, frn)
+        request = {
+            "entity_info": {"volume_guid": volume_guid, "frn": frn, "file_path": file_path},
+            "entity_type": entity_type,
+            "priority": priority,
+        }
+        with self._resolution_lock:
+            self._merge_resolution_request(key, request)
+            if self._resolution_buffer_start is None:
+                self._resolution_buffer_start = time.monotonic()
+                self._start_resolution_timer()
+            if (
+                len(self._resolution_buffer) >= self.resolution_batch_size
+                or time.monotonic() - self._resolution_buffer_start >= self.resolution_flush_interval
+            ):
+                return self.flush_entity_resolutions()
+        return []
+
+    def _merge_resolution_request(self, key: tuple[str, str], request: dict) -> None:
+        """Add a request to the buffer, merging it with a buffered request for the same entity."""
+        existing = self._resolution_buffer.get(key)
+        if existing is not None:
+            # Merge here too, so a hot entity occupies a single buffer slot
+            request["priority"] = min(request["priority"], existing["priority"])
+            if request["entity_type"] == EntityType.UNKNOWN:
+                request["entity_type"] = existing["entity_type"]
+            if request["entity_info"]["file_path"] is None:
+                request["entity_info"] = existing["entity_info"]
+        self._resolution_buffer[key] = request
+
+    def _start_resolution_timer(self) -> None:
+        """Arrange for the buffer to be flushed after resolution_flush_interval seconds."""
+        self._resolution_timer = threading.Timer(self.resolution_flush_interval, self._flush_resolutions_on_timer)
+        self._resolution_timer.daemon = True
+        self._resolution_timer.start()
+
+    def _flush_resolutions_on_timer(self) -> None:
+        """Flush the buffer from the timer thread, keeping the requests if the queue is unavailable."""
+        with self._resolution_lock:
+            if self._resolution_timer is not threading.current_thread():
+                return  # the buffer was flushed (and maybe refilled) since this timer was started
+            self._resolution_timer = None
+            requests = self._resolution_buffer
+            try:
+                self.flush_entity_resolutions()
+            except Exception as e:
+                logger.exception(f"Error flushing {len(requests)} buffered entity resolution requests: {e!s}")
+                # Put them back, merged with anything buffered since, and try again later
+                buffered = self._resolution_buffer
+                self._resolution_buffer = requests
+                for key, request in buffered.items():
+                    self._merge_resolution_request(key, request)
+                self._resolution_buffer_start = time.monotonic()
+                self._start_resolution_timer()
+
+    def flush_entity_resolutions(self) -> list[str]:
+        """
+        Enqueue all buffered entity resolution requests in a single batch.
+
+        Returns:
+            The queue entry IDs of the buffered requests
+        """
+        with self._resolution_lock:
+            if self._resolution_timer is not None:
+                self._resolution_timer.cancel()
+                self._resolution_timer = None
+            if not self._resolution_buffer:
+                return []
+            requests = list(self._resolution_buffer.values())
+            self._resolution_buffer = {}
+            self._resolution_buffer_start = None
+            request_ids = self._get_resolution_queue().enqueue_many(self._get_machine_id(), requests)
+        logger.debug(f"Flushed {len(request_ids)} buffered entity resolution requests")
+        return request_ids
+
+    def close_entity_resolutions(self) -> list[str]:
+        """
+        Flush the resolution buffer and stop its timer.
+
+        Returns:
+            The queue entry IDs of the buffered requests
+        """
+        return self.flush_entity_resolutions()
@@ -6,9 +6,12 @@ entity resolution queue, including enqueueing, dequeueing,
 and updating the status of resolution requests.
 """
 
+from collections.abc import Iterable
 from datetime import UTC, datetime
 
-from data_models.db_config import IndalekoDBConfiguration
+from arango.exceptions import AQLQueryExecuteError, DocumentInsertError
+
+from db.db_config import IndalekoDBConfig
 from db.i_collections import IndalekoCollections
 from storage.incremental_update.models import (
     EntityInfo,
@@ -31,8 +34,11 @@ class EntityResolutionQueue:
     """
 
     COLLECTION_NAME = "EntityResolutionQueue"
+    DEDUP_INDEX_NAME = "EntityResolutionQueueEntity"
+    DEDUP_FIELDS = ["machine_id", "entity_info.volume_guid", "entity_info.frn"]
+    UNIQUE_CONSTRAINT_VIOLATED = 1210  # ArangoDB error code
 
-    def __init__(self, db_config: IndalekoDBConfiguration) -> None:
+    def __init__(self, db_config: IndalekoDBConfig) -> None:
         """
         Initialize the entity resolution queue.
 
@@ -65,6 +71,23 @@ class EntityResolutionQueue:
             collection.add_index(["status", "entity_type", "path_depth"])
             logger.info(f"Created index on status, entity_type and path_depth for {self.COLLECTION_NAME}")
 
+        # Unique index backing the upsert in enqueue_many: one request per entity
+        if not collection.has_index(self.DEDUP_FIELDS):
+            try:
+                collection.add_index(
+                    {
+                        "type": "persistent",
+                        "fields": self.DEDUP_FIELDS,
+                        "unique": True,
+                        "name": self.DEDUP_INDEX_NAME,
+                    },
+                )
+                logger.info(f"Created unique index on machine_id, volume_guid and frn for {self.COLLECTION_NAME}")
+            except Exception as e:
+                # Most likely a queue populated before the index existed that has
+                # duplicate entries; enqueue_many still works, just without the index.
+                logger.warning(f"Unable to create unique index for {self.COLLECTION_NAME}: {e}")
+
     def enqueue(
         self,
         machine_id: str,
@@ -108,11 +131,123 @@ class EntityResolutionQueue:
 
         # Insert into database
         collection = self._collections.get_collection(self.COLLECTION_NAME)
-        result = collection.insert(request.model_dump())
+        try:
+            result = collection.insert(request.model_dump())
+        except DocumentInsertError as e:
+            if e.error_code != self.UNIQUE_CONSTRAINT_VIOLATED:
+                raise
+            # A completed or failed request for this entity is in the queue (or
+            # another producer just added one); the upsert reopens or reuses it.
+            return self.enqueue_many(machine_id, [request])[0]
 
         logger.info(f"Enqueued entity resolution request {result['_key']} for {entity_info.frn}")
         return result["_key"]
 
+    def enqueue_many(
+        self,
+        machine_id: str,
+        requests: Iterable[EntityInfo | ResolutionRequest | dict],
+        entity_type: EntityType | str = EntityType.UNKNOWN,
+        priority: int = 3,
+    ) -> list[str]:
+        """
+        Add a batch of entity resolution requests to the queue in one request.
+
+        Duplicates within the batch are merged in memory (keeping the highest
+        priority and the most specific entity type), and the batch is then
+        upserted on (machine_id, volume_guid, frn) in a single AQL query.  An
+        entity with a pending or processing request keeps that request (its
+        priority may be raised); one whose request completed or failed has the
+        request reopened.  The upsert requires ArangoDB 3.12 or later.
+
+        Args:
+            machine_id: Identifier for the machine these entities belong to
+            requests: Entities to resolve, as EntityInfo (using the default
+                entity_type and priority), ResolutionRequest, or dicts with
+                the ResolutionRequest fields or the EntityInfo fields
+            entity_type: Default type of entity
+            priority: Default priority (1-5, where 1 is highest)
+
+        Returns:
+            The queue entry IDs, in the order of the input
+        """
+        if isinstance(entity_type, str):
+            entity_type = EntityType(entity_type)
+
+        merged: dict[tuple[str, str], ResolutionRequest] = {}
+        order = []
+        for item in requests:
+            request = self._to_request(machine_id, item, entity_type, priority)
+            key = (request.entity_info.volume_guid, request.entity_info.frn)
+            order.append(key)
+            existing = merged.get(key)
+            if existing is None:
+                merged[key] = request.model_copy()
+                continue
+            existing.priority = min(existing.priority, request.priority)
+            if existing.entity_type == EntityType.UNKNOWN:
+                existing.entity_type = request.entity_type
+            if existing.entity_info.file_path is None and request.entity_info.file_path is not None:
+                existing.entity_info = request.entity_info
+                existing.path_depth = request.path_depth
+        if not merged:
+            return []
+
+        db = self._collections.get_db()
+        bind_vars = {
+            "@collection": self.COLLECTION_NAME,
+            "requests": [request.model_dump(mode="json") for request in merged.values()],
+            "pending": ResolutionStatus.PENDING.value,
+            "processing": ResolutionStatus.PROCESSING.value,
+        }
+        query = """
+        FOR request IN @requests
+            UPSERT FILTER $CURRENT.machine_id == request.machine_id
+                AND $CURRENT.entity_info.volume_guid == request.entity_info.volume_guid
+                AND $CURRENT.entity_info.frn == request.entity_info.frn
+            INSERT request
+            UPDATE (OLD.status == @pending OR OLD.status == @processing)
+                ? { priority: MIN([OLD.priority, request.priority]) }
+                : MERGE(request, { attempts: 0, last_error: null, last_attempt_time: null })
+            IN @@collection
+            RETURN [NEW.entity_info.volume_guid, NEW.entity_info.frn, NEW._key]
+        """
+        try:
+            cursor = db.aql.execute(query, bind_vars=bind_vars)
+        except AQLQueryExecuteError as e:
+            if e.error_code != self.UNIQUE_CONSTRAINT_VIOLATED:
+                raise
+            # Lost an insert race with another producer; the retry finds its entries
+            cursor = db.aql.execute(query, bind_vars=bind_vars)
+        keys = {(volume_guid, frn): key for volume_guid, frn, key in cursor}
+
+        logger.info(f"Enqueued {len(merged)} entity resolution requests ({len(order)} submitted)")
+        return [keys[key] for key in order]
+
+    @staticmethod
+    def _to_request(
+        machine_id: str,
+        item: EntityInfo | ResolutionRequest | dict,
+        entity_type: EntityType,
+        priority: int,
+    ) -> ResolutionRequest:
+        """Build the resolution request for one item passed to enqueue_many."""
+        if isinstance(item, ResolutionRequest):
+            return item
+        if isinstance(item, dict):
+            if "entity_info" not in item:
+                item = {"entity_info": item}
+            item = {"machine_id": machine_id, "entity_type": entity_type, "priority": priority, **item}
+            if isinstance(item["entity_info"], dict):
+                item["entity_info"] = EntityInfo(**item["entity_info"])
+            return ResolutionRequest(**item)
+        return ResolutionRequest(
+            machine_id=machine_id,
+            entity_info=item,
+            entity_type=entity_type,
+            priority=priority,
+        )
+
     def _find_existing_request(self, machine_id: str, entity_info: EntityInfo) -> str | None:
         """
         Check if a resolution request already exists for this entity.
@@ -295,6 +430,47 @@ class EntityResolutionQueue:
             logger.exception(f"Failed to update status for request {request_id}: {e}")
             return False
 
+    def update_status_many(
+        self,
+        updates: list[tuple[str, ResolutionStatus | str, str | None]],
+    ) -> int:
+        """
+        Update the status of a batch of resolution requests in one request.
+
+        Args:
+            updates: (request_id, status, error_message) for each request;
+                error_message may be None
+
+        Returns:
+            The number of requests updated
+        """
+        if not updates:
+            return 0
+        documents = []
+        for request_id, status, error_message in updates:
+            if isinstance(status, str):
+                status = ResolutionStatus(status)
+            document = {"_key": request_id, "status": status.value}
+            if error_message is not None:
+                document["last_error"] = error_message
+            documents.append(document)
+
+        db = self._collections.get_db()
+        query = """
+        FOR document IN @documents
+            UPDATE document IN @@collection OPTIONS { ignoreErrors: true }
+            RETURN 1
+        """
+        try:
+            cursor = db.aql.execute(
+                query,
+                bind_vars={"@collection": self.COLLECTION_NAME, "documents": documents},
+            )
+            return len(list(cursor))
+        except Exception as e:
+            logger.exception(f"Failed to update status for {len(documents)} requests: {e}")
+            return 0
+
     def get_queue_stats(self, machine_id: str | None = None) -> dict:
         """
         Get statistics about the current queue state.
@@ -5,12 +5,21 @@ This module provides the service that processes the entity resolution queue,
 invoking appropriate collectors and recorders to resolve missing entities.
 """
 
+import concurrent.futures
 import socket
 import time
 
-from data_models.db_config import IndalekoDBConfiguration
+from collections import defaultdict
+
+from db.db_config import IndalekoDBConfig
 from storage.incremental_update.models import ResolutionStatus
 from storage.incremental_update.queue_service import EntityResolutionQueue
+from storage.incremental_update.resolvers import (
+    EntityNotFoundError,
+    EntityNotLocatedError,
+    EntityResolver,
+    default_resolvers,
+)
 from utils.i_logging import get_logger
 
 
@@ -26,15 +35,28 @@ class EntityResolutionService:
     2. Invokes appropriate collectors to gather entity information
     3. Uses existing recorders to normalize and store the data
     4. Updates request status and handles retries
+
+    Each batch is resolved one path depth at a time, shallowest first, so a
+    directory is always stored before anything inside it.  The entities at
+    the same depth are collected in parallel by a pool of worker threads and
+    recorded together, and the status updates for the whole batch are
+    committed in a single request.
+
+    Unless other resolvers are given, the resolvers for the platform the
+    service runs on are used (see default_resolvers).  A request that no
+    resolver can handle, or whose entity cannot be located yet, is left
+    pending for a later attempt rather than failed.
     """
 
     def __init__(
         self,
-        db_config: IndalekoDBConfiguration,
+        db_config: IndalekoDBConfig,
         machine_id: str | None = None,
         batch_size: int = 10,
         max_retries: int = 3,
         sleep_interval: float = 5.0,
+        workers: int = 4,
+        resolvers: list[EntityResolver] | None = None,
     ) -> None:
         """
         Initialize the entity resolution service.
@@ -45,18 +67,24 @@ class EntityResolutionService:
             batch_size: Number of requests to process in each batch
             max_retries: Maximum number of resolution attempts per entity
             sleep_interval: Seconds to sleep when queue is empty
+            workers: Number of entities collected concurrently
+            resolvers: Resolvers to try, in order, for each request (default: the platform resolvers)
         """
         self.db_config = db_config
         self.machine_id = machine_id or socket.gethostname()
         self.batch_size = batch_size
         self.max_retries = max_retries
         self.sleep_interval = sleep_interval
+        self.workers = workers
+        self.resolvers = list(resolvers) if resolvers is not None else default_resolvers()
 
         self.queue = EntityResolutionQueue(db_config)
 
-        # These will be initialized on first use
-        self._collectors = {}
-        self._recorders = {}
+        # Throughput statistics
+        self.resolved_count = 0
+        self.retry_count = 0
+        self.failed_count = 0
+        self.elapsed = 0.0
 
         logger.info(
             f"Initialized EntityResolutionService for machine {self.machine_id} with batch size {batch_size}",
@@ -110,9 +138,53 @@ class EntityResolutionService:
         except KeyboardInterrupt:
             logger.info("Received keyboard interrupt, stopping service")
 
-        logger.info(f"Entity resolution service finished, processed {total_processed} entities")
+        stats = self.get_stats()
+        logger.info(
+            f"Entity resolution service finished, processed {total_processed} entities "
+            f"({stats['entities_per_second']:.1f} entities/second)",
+        )
         return total_processed
 
+    def register_resolver(self, resolver: EntityResolver) -> None:
+        """
+        Add a resolver to the end of the resolver list.
+
+        Args:
+            resolver: The resolver to add
+        """
+        self.resolvers.append(resolver)
+
+    def get_stats(self) -> dict:
+        """
+        Get the resolution throughput statistics.
+
+        Returns:
+            Dictionary with resolved, retried and failed counts, the time spent
+            processing batches, and the resolution rate
+        """
+        return {
+            "resolved": self.resolved_count,
+            "retried": self.retry_count,
+            "failed": self.failed_count,
+            "elapsed": self.elapsed,
+            "entities_per_second": self.resolved_count / self.elapsed if self.elapsed > 0 else 0.0,
+        }
+
+    def _find_resolver(self, request: dict) -> EntityResolver | None:
+        """
+        Find the resolver for a request.
+
+        Args:
+            request: Resolution request document
+
+        Returns:
+            The first resolver that can resolve the request, or None
+        """
+        for resolver in self.resolvers:
+            if resolver.can_resolve(request):
+                return resolver
+        return None
+
     def _process_batch(self, batch: list[dict]) -> int:
         """
         Process a batch of resolution requests.
@@ -123,41 +195,85 @@ class EntityResolutionService:
         Returns:
             Number of successfully processed requests
         """
-        successful = 0
+        start = time.perf_counter()
+        updates = []
+        levels = defaultdict(list)
 
         for request in batch:
-            request_id = request["_key"]
+            # Skip if too many attempts
+            if request["attempts"] > self.max_retries:
+                logger.warning(
+                    f"Request {request['_key']} exceeded maximum retries ({self.max_retries}), marking as failed",
+                )
+                updates.append(
+                    (request["_key"], ResolutionStatus.FAILED, f"Exceeded maximum retries ({self.max_retries})"),
+                )
+                continue
+            levels[request.get("path_depth", 0)].append(request)
 
-            try:
-                # Skip if too many attempts
-                if request["attempts"] > self.max_retries:
-                    logger.warning(
-                        f"Request {request_id} exceeded maximum retries ({self.max_retries}), marking as failed",
-                    )
-                    self.queue.update_status(
-                        request_id,
-                        ResolutionStatus.FAILED,
-                        f"Exceeded maximum retries ({self.max_retries})",
-                    )
-                    continue
+        successful = 0
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as executor:
+            # Shallowest first: a directory is always stored before its contents
+            for depth in sorted(levels):
+                successful += self._resolve_level(levels[depth], executor, updates)
+
+        self.queue.update_status_many(updates)
+        self.resolved_count += successful
+        self.retry_count += sum(1 for _, status, _ in updates if status == ResolutionStatus.PENDING)
+        self.failed_count += sum(1 for _, status, _ in updates if status == ResolutionStatus.FAILED)
+        self.elapsed += time.perf_counter() - start
+        return successful
 
-                # Process this request
-                success = self._resolve_entity(request)
+    def _resolve_level(
+        self,
+        requests: list[dict],
+        executor: concurrent.futures.Executor,
+        updates: list[tuple[str, ResolutionStatus, str | None]],
+    ) -> int:
+        """
+        Resolve the requests for entities at one path depth.
 
-                if success:
-                    self.queue.update_status(request_id, ResolutionStatus.COMPLETED)
-                    successful += 1
-                else:
-                    self.queue.update_status(
-                        request_id,
-                        ResolutionStatus.PENDING,
-                        "Resolution attempt failed, will retry",
-                    )
+        Args:
+            requests: Resolution request documents, all at the same depth
+            executor: Worker pool used to collect the entities
+            updates: Status updates for the batch (appended to)
 
+        Returns:
+            Number of successfully resolved requests
+        """
+        futures = {}
+        for request in requests:
+            resolver = self._find_resolver(request)
+            if resolver is None:
+                updates.append((request["_key"], ResolutionStatus.PENDING, "No resolver for this entity"))
+                continue
+            futures[executor.submit(resolver.collect, request)] = (request, resolver)
+
+        collected = defaultdict(list)
+        for future in concurrent.futures.as_completed(futures):
+            request, resolver = futures[future]
+            try:
+                collected[resolver].append((request, future.result()))
+            except EntityNotFoundError as e:
+                updates.append((request["_key"], ResolutionStatus.FAILED, f"Entity not found: {e!s}"))
+            except EntityNotLocatedError as e:
+                updates.append((request["_key"], ResolutionStatus.PENDING, f"Entity not located: {e!s}"))
             except Exception as e:
-                logger.exception(f"Error processing request {request_id}: {e!s}")
-                self.queue.update_status(request_id, ResolutionStatus.PENDING, f"Processing error: {e!s}")
+                logger.exception(f"Error collecting request {request['_key']}: {e!s}")
+                updates.append((request["_key"], ResolutionStatus.PENDING, f"Processing error: {e!s}"))
 
+        successful = 0
+        for resolver, entities in collected.items():
+            try:
+                resolver.record([data for _, data in entities])
+            except Exception as e:
+                logger.exception(f"Error recording {len(entities)} entities with {resolver.name}: {e!s}")
+                updates.extend(
+                    (request["_key"], ResolutionStatus.PENDING, f"Processing error: {e!s}") for request, _ in entities
+                )
+                continue
+            updates.extend((request["_key"], ResolutionStatus.COMPLETED, None) for request, _ in entities)
+            successful += len(entities)
         return successful
 
     def _resolve_entity(self, request: dict) -> bool:
@@ -175,14 +291,16 @@ class EntityResolutionService:
 
         logger.info(f"Resolving {entity_type} entity: {entity_info['volume_guid']}:{entity_info['frn']}")
 
-        # This is where we would implement the actual resolution logic:
-        # 1. Determine which collector to use based on entity_type and volume_guid
-        # 2. Invoke collector to get entity data
-        # 3. Pass data to appropriate recorder
-
-        # For now, just return placeholder
-        logger.warning("Entity resolution not yet implemented")
-        return False
-
-    # TODO: Implement collector/recorder selection and invocation
-    # These would be implemented in a real implementation:
+        resolver = self._find_resolver(request)
+        if resolver is None:
+            logger.warning(f"No resolver for {entity_type} entity {entity_info['volume_guid']}:{entity_info['frn']}")
+            return False
+        try:
+            resolver.record([resolver.collect(request)])
+        except EntityNotFoundError:
+            logger.warning(f"Entity {entity_info['volume_guid']}:{entity_info['frn']} no longer exists")
+            return False
+        except EntityNotLocatedError:
+            logger.warning(f"Entity {entity_info['volume_guid']}:{entity_info['frn']} cannot be located")
+            return False
+        return True
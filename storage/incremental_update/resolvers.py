@@ -0,0 +1,675 @@
+"""
+Entity resolvers for the entity resolution service.
+
+A resolver connects queued resolution requests to the collector and
+recorder for one kind of storage.  Resolution happens in two steps so
+that the service can parallelize the first and batch the second:
+
+1. collect: gather the metadata for a single entity (collector side)
+2. record: normalize and store a batch of collected entities (recorder side)
+
+default_resolvers() returns the resolvers for the platform the service
+runs on.
+"""
+
+import ctypes
+import os
+import platform
+import stat
+import threading
+import uuid
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from data_models import IndalekoSourceIdentifierDataModel
+from db.bulk_loader import IndalekoBulkLoader
+from db.db_collections import IndalekoDBCollections
+from db.db_config import IndalekoDBConfig
+from storage.recorders.edges import IndalekoEdgeEngine
+from utils.i_logging import get_logger
+
+
+logger = get_logger(__name__)
+
+VOLUME_GUID_LENGTH = 36  # characters in a volume GUID without braces
+
+
+class EntityNotFoundError(Exception):
+    """The entity named by a resolution request no longer exists."""
+
+
+class EntityNotLocatedError(Exception):
+    """The entity named by a resolution request cannot be located now; it may be later."""
+
+
+def parse_frn(frn: str | int) -> int:
+    """
+    Convert a file reference number to an integer.
+
+    Args:
+        frn: File reference number, in decimal or as 0x prefixed hexadecimal
+
+    Returns:
+        The file reference number
+    """
+    if isinstance(frn, int):
+        return frn
+    frn = frn.strip()
+    if frn.lower().startswith("0x"):
+        return int(frn, 16)
+    return int(frn)
+
+
+def volume_matches(document: dict[str, Any], volume: str | None) -> bool:
+    """
+    Check whether a recorded object may be on a volume.
+
+    Objects carry a volume GUID when the recorder knows it; otherwise a drive
+    letter volume (e.g., 'C:') is compared with the object's path.
+
+    Args:
+        document: Object summary with volume and path
+        volume: Volume from a resolution request (a drive letter or a volume GUID)
+
+    Returns:
+        False only if the object is known to be on another volume
+    """
+    if not volume:
+        return True
+    guid = volume.removeprefix("Volume").strip("{}\\?").lower()
+    if document.get("volume") and len(guid) == VOLUME_GUID_LENGTH:
+        return str(document["volume"]).lower() == guid
+    if is_drive_letter(volume):
+        return (document.get("path") or "")[:2].upper() == volume.upper()
+    return True
+
+
+def is_drive_letter(volume: str) -> bool:
+    """Check whether a volume is given as a drive letter (e.g., 'C:')."""
+    return len(volume) == len("C:") and volume[1] == ":"
+
+
+class ObjectIdentityMap:
+    """
+    Find the objects already recorded for file system entities.
+
+    Resolving an entity must not create a second object for something the
+    storage recorders (or an earlier resolution) already stored, and the
+    object must be linked to the object of its directory.  The map finds
+    objects by FRN (the LocalIdentifier the recorders store) and by location
+    (LocalPath and Label), which are both indexed in the Objects collection.
+    Identities that are looked up or recorded are remembered, up to
+    capacity, so the directory resolved at one path depth is found without a
+    query when its contents are resolved.
+    """
+
+    default_capacity = 100_000
+
+    # What is returned for each object found
+    object_summary = (
+        "{id: doc._key, frn: doc.LocalIdentifier, volume: doc.Volume, path: doc.LocalPath, name: doc.Label}"
+    )
+    frn_query = f"""
+        FOR doc IN @@collection
+            FILTER doc.LocalIdentifier IN @frns
+            RETURN {object_summary}
+    """
+    location_query = f"""
+        FOR location IN @locations
+            FOR doc IN @@collection
+                FILTER doc.Label == location[1] AND doc.LocalPath == location[0]
+                LIMIT 1
+                RETURN {object_summary}
+    """
+
+    def __init__(
+        self,
+        db_config: IndalekoDBConfig | None = None,
+        query: Callable[[str, dict[str, Any]], Iterable[dict[str, Any]]] | None = None,
+        capacity: int = default_capacity,
+    ) -> None:
+        """
+        Initialize the map.
+
+        Args:
+            db_config: Database configuration (default: IndalekoDBConfig())
+            query: Callable running an AQL query with bind variables (default: the database)
+            capacity: Number of identities remembered
+        """
+        self._db_config = db_config
+        self._query = query
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._by_frn = OrderedDict()  # (volume, frn) -> (object id, path, name)
+        self._by_location = OrderedDict()  # (path, name) -> object id
+
+    def _execute(self, aql: str, bind_vars: dict[str, Any]) -> list[dict[str, Any]]:
+        """Run a query against the Objects collection."""
+        bind_vars = {"@collection": IndalekoDBCollections.Indaleko_Object_Collection, **bind_vars}
+        if self._query is not None:
+            return list(self._query(aql, bind_vars))
+        if self._db_config is None:
+            self._db_config = IndalekoDBConfig()
+        return list(self._db_config._arangodb.aql.execute(aql, bind_vars=bind_vars))
+
+    def _remember_frn(self, key: tuple[str, int], value: tuple[str, str, str]) -> None:
+        self._by_frn[key] = value
+        self._by_frn.move_to_end(key)
+        while len(self._by_frn) > self.capacity:
+            self._by_frn.popitem(last=False)
+
+    def _remember_location(self, key: tuple[str, str], object_id: str) -> None:
+        self._by_location[key] = object_id
+        self._by_location.move_to_end(key)
+        while len(self._by_location) > self.capacity:
+            self._by_location.popitem(last=False)
+
+    def remember(self, volume: str, frn: str | int | None, path: str, name: str, object_id: str) -> None:
+        """
+        Record the object stored for an entity.
+
+        Args:
+            volume: Volume of the entity
+            frn: File reference number of the entity, if known
+            path: Directory containing the entity
+            name: Name of the entity
+            object_id: Identifier of its object
+        """
+        with self._lock:
+            if frn is not None:
+                self._remember_frn((volume, parse_frn(frn)), (object_id, path, name))
+            self._remember_location((path, name), object_id)
+
+    def find(
+        self,
+        frns: Iterable[tuple[str, str | int]] = (),
+        locations: Iterable[tuple[str, str]] = (),
+    ) -> tuple[dict[tuple[str, int], tuple[str, str, str]], dict[tuple[str, str], str]]:
+        """
+        Find the objects recorded for a batch of entities.
+
+        Args:
+            frns: (volume, frn) of entities
+            locations: (directory, name) of entities
+
+        Returns:
+            ((volume, frn) -> (object id, directory, name), (directory, name) -> object id)
+            for the entities that have an object; an FRN that matches more than
+            one object on the volume is left out
+        """
+        by_frn, by_location = {}, {}
+        missing_frns, missing_locations = set(), set()
+        with self._lock:
+            for volume, frn in frns:
+                key = (volume, parse_frn(frn))
+                if key in self._by_frn:
+                    by_frn[key] = self._by_frn[key]
+                else:
+                    missing_frns.add(key)
+            for location in locations:
+                if location in self._by_location:
+                    by_location[location] = self._by_location[location]
+                elif location[1]:
+                    missing_locations.add(location)
+
+        if missing_frns:
+            volumes = {}
+            for volume, frn in missing_frns:
+                volumes.setdefault(str(frn), []).append(volume)
+            candidates = {}
+            for document in self._execute(self.frn_query, {"frns": sorted(volumes)}):
+                for volume in volumes.get(document["frn"], ()):
+                    if volume_matches(document, volume):
+                        candidates.setdefault((volume, parse_frn(document["frn"])), []).append(document)
+            for key, matches in candidates.items():
+                if len(matches) == 1:
+                    by_frn[key] = (matches[0]["id"], matches[0]["path"], matches[0]["name"])
+        if missing_locations:
+            bind_vars = {"locations": [list(location) for location in missing_locations]}
+            for document in self._execute(self.location_query, bind_vars):
+                by_location[(document["path"], document["name"])] = document["id"]
+
+        with self._lock:
+            for key, value in by_frn.items():
+                self._remember_frn(key, value)
+            for key, object_id in by_location.items():
+                self._remember_location(key, object_id)
+        return by_frn, by_location
+
+    def locate(self, volume: str, frn: str | int) -> str | None:
+        """
+        Find where the object recorded for an FRN was last seen.
+
+        Args:
+            volume: Volume of the entity
+            frn: File reference number of the entity
+
+        Returns:
+            The recorded path of the entity, or None if no single object has this FRN
+        """
+        by_frn, _ = self.find(frns=[(volume, frn)])
+        match = by_frn.get((volume, parse_frn(frn)))
+        if match is None:
+            return None
+        return os.path.join(match[1], match[2])
+
+
+def ntfs_path_from_frn(volume: str, frn: str | int) -> str | None:
+    """
+    Find the current path of an NTFS file or directory from its FRN (Windows only).
+
+    Args:
+        volume: A drive letter (e.g., 'C:') or a volume GUID
+        frn: File reference number
+
+    Returns:
+        The path, or None if the volume holds no such file
+
+    Raises:
+        OSError: If the volume cannot be opened or the file cannot be queried
+    """
+    from ctypes import wintypes  # pylint: disable=import-outside-toplevel
+
+    class FILE_ID_DESCRIPTOR(ctypes.Structure):  # noqa: N801
+        _fields_ = [
+            ("dwSize", wintypes.DWORD),
+            ("Type", ctypes.c_int),  # FileIdType
+            ("FileId", ctypes.c_longlong),
+            ("Padding", ctypes.c_byte * 8),  # the rest of the FILE_ID_128 union member
+        ]
+
+    file_share_all = 0x00000007  # read, write and delete
+    open_existing = 3
+    file_flag_backup_semantics = 0x02000000
+    volume_name_dos = 0
+    not_found_errors = (2, 3, 87)  # file not found, path not found, invalid parameter
+
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.CreateFileW.argtypes = [
+        wintypes.LPCWSTR,
+        wintypes.DWORD,
+        wintypes.DWORD,
+        wintypes.LPVOID,
+        wintypes.DWORD,
+        wintypes.DWORD,
+        wintypes.HANDLE,
+    ]
+    kernel32.CreateFileW.restype = wintypes.HANDLE
+    kernel32.OpenFileById.argtypes = [
+        wintypes.HANDLE,
+        ctypes.POINTER(FILE_ID_DESCRIPTOR),
+        wintypes.DWORD,
+        wintypes.DWORD,
+        wintypes.LPVOID,
+        wintypes.DWORD,
+    ]
+    kernel32.OpenFileById.restype = wintypes.HANDLE
+    kernel32.GetFinalPathNameByHandleW.argtypes = [wintypes.HANDLE, wintypes.LPWSTR, wintypes.DWORD, wintypes.DWORD]
+    kernel32.GetFinalPathNameByHandleW.restype = wintypes.DWORD
+    kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+    invalid_handle = wintypes.HANDLE(-1).value
+
+    # Any handle on the volume will do; the root directory needs no privileges
+    if is_drive_letter(volume):
+        root = volume + "\\"
+    else:
+        root = "\\\\?\\Volume{" + volume.removeprefix("Volume").strip("{}\\?") + "}\\"
+    volume_handle = kernel32.CreateFileW(root, 0, file_share_all, None, open_existing, file_flag_backup_semantics, None)
+    if volume_handle == invalid_handle:
+        raise ctypes.WinError(ctypes.get_last_error())
+    try:
+        file_id = parse_frn(frn)
+        if file_id >= 2**63:
+            file_id -= 2**64  # FileId is a signed LARGE_INTEGER
+        descriptor = FILE_ID_DESCRIPTOR(dwSize=ctypes.sizeof(FILE_ID_DESCRIPTOR), Type=0, FileId=file_id)
+        handle = kernel32.OpenFileById(
+            volume_handle,
+            ctypes.byref(descriptor),
+            0,
+            file_share_all,
+            None,
+            file_flag_backup_semantics,
+        )
+        if handle == invalid_handle:
+            error = ctypes.get_last_error()
+            if error in not_found_errors:
+                return None
+            raise ctypes.WinError(error)
+        try:
+            buffer = ctypes.create_unicode_buffer(32768)
+            length = kernel32.GetFinalPathNameByHandleW(handle, buffer, len(buffer), volume_name_dos)
+            if length == 0:
+                raise ctypes.WinError(ctypes.get_last_error())
+        finally:
+            kernel32.CloseHandle(handle)
+    finally:
+        kernel32.CloseHandle(volume_handle)
+    path = buffer.value
+    if path.startswith("\\\\?\\") and not path.startswith("\\\\?\\UNC\\"):
+        path = path[4:]
+    return path
+
+
+class EntityResolver(ABC):
+    """Base class for entity resolvers."""
+
+    name = "base"
+
+    @abstractmethod
+    def can_resolve(self, request: dict) -> bool:
+        """
+        Check whether this resolver handles a request.
+
+        Args:
+            request: Resolution request document
+
+        Returns:
+            True if this resolver can resolve the entity
+        """
+
+    @abstractmethod
+    def collect(self, request: dict) -> dict[str, Any]:
+        """
+        Gather the metadata for the entity named by a request.
+
+        Args:
+            request: Resolution request document
+
+        Returns:
+            The collected metadata, in the collector's format
+
+        Raises:
+            EntityNotFoundError: If the entity no longer exists
+            EntityNotLocatedError: If the entity cannot be located now
+        """
+
+    @abstractmethod
+    def record(self, entities: list[dict[str, Any]]) -> None:
+        """
+        Normalize and store a batch of collected entities.
+
+        Args:
+            entities: Collected metadata from collect()
+        """
+
+
+class LocalFileSystemResolver(EntityResolver):
+    """
+    Resolve entities on a locally mounted file system.
+
+    Collection builds the same stat dictionary the local storage collectors
+    produce.  A request without a path is located by its FRN: with the
+    frn_locator if there is one (OpenFileById on Windows), otherwise at the
+    path of the object already recorded for that FRN.
+
+    Recording reuses the identifier of the object already recorded for the
+    entity (by FRN, or else by location), so resolution never duplicates an
+    object.  The objects are normalized with a local storage recorder (e.g.,
+    IndalekoLinuxLocalStorageRecorder) and loaded into the Objects
+    collection, and a new or moved object is linked to the object of its
+    directory.  Sink callables can replace the database loads (e.g., for
+    testing).
+    """
+
+    name = "local"
+
+    # Source of the relationships built without a recorder
+    local_resolver_uuid = "1b5a2dc4-5f0e-4c59-9a47-6f3d2be3b0e1"
+
+    def __init__(
+        self,
+        recorder: Any = None,  # noqa: ANN401
+        sink: Callable[[list[dict[str, Any]]], None] | None = None,
+        collector_id: str | None = None,
+        identity_map: ObjectIdentityMap | None = None,
+        frn_locator: Callable[[str, str], str | None] | None = None,
+        relationship_sink: Callable[[list[dict[str, Any]]], None] | None = None,
+    ) -> None:
+        """
+        Initialize the resolver.
+
+        Args:
+            recorder: Storage recorder providing normalize_collector_data
+            sink: Callable that stores a batch of objects (default: bulk load)
+            collector_id: Collector identifier recorded in the collected data
+            identity_map: Map of the objects already recorded (default: the
+                database, or nothing recorded yet if a sink is used)
+            frn_locator: Callable returning the path for a volume and FRN, or
+                None if the entity no longer exists
+            relationship_sink: Callable that stores a batch of relationships
+                (default: bulk load, or not stored if a sink is used)
+        """
+        if recorder is None and sink is None:
+            raise ValueError("LocalFileSystemResolver requires a recorder or a sink")
+        self.recorder = recorder
+        self.sink = sink
+        self.collector_id = collector_id
+        if identity_map is None:
+            # With a sink nothing is in the database, so only the resolved entities are known
+            identity_map = ObjectIdentityMap() if sink is None else ObjectIdentityMap(query=lambda *_: [])
+        self.identity_map = identity_map
+        self.frn_locator = frn_locator
+        self.relationship_sink = relationship_sink
+        if recorder is not None:
+            self.edge_engine = recorder.get_edge_engine()
+        else:
+            self.edge_engine = IndalekoEdgeEngine(
+                IndalekoSourceIdentifierDataModel(Identifier=self.local_resolver_uuid, Version="1.0"),
+            )
+
+    def can_resolve(self, request: dict) -> bool:
+        """Requests with a path or an FRN can be resolved locally."""
+        entity_info = request["entity_info"]
+        return bool(entity_info.get("file_path") or entity_info.get("frn"))
+
+    def locate(self, volume: str, frn: str) -> str:
+        """
+        Find the path of an entity from its FRN.
+
+        Raises:
+            EntityNotFoundError: If the frn_locator reports that the entity no longer exists
+            EntityNotLocatedError: If no path is known for the entity
+        """
+        if self.frn_locator is not None:
+            path = self.frn_locator(volume, frn)
+            if path is None:
+                raise EntityNotFoundError(f"{volume}:{frn}")
+            return path
+        path = self.identity_map.locate(volume, frn)
+        if path is None:
+            raise EntityNotLocatedError(f"No path is known for {volume}:{frn}")
+        return path
+
+    def collect(self, request: dict) -> dict[str, Any]:
+        """Stat the entity and build a collector style record for it."""
+        entity_info = request["entity_info"]
+        file_path = entity_info.get("file_path")
+        located = not file_path
+        if located:
+            file_path = self.locate(entity_info["volume_guid"], entity_info["frn"])
+        try:
+            lstat_data = os.lstat(file_path)
+        except FileNotFoundError as e:
+            if located and self.frn_locator is None:
+                raise EntityNotLocatedError(f"{file_path} has moved") from e
+            raise EntityNotFoundError(file_path) from e
+        if located and self.frn_locator is None and lstat_data.st_ino != parse_frn(entity_info["frn"]):
+            raise EntityNotLocatedError(f"{file_path} is no longer FRN {entity_info['frn']}")
+        mode = lstat_data.st_mode
+        if not (stat.S_ISDIR(mode) or stat.S_ISREG(mode) or stat.S_ISLNK(mode)):
+            raise EntityNotFoundError(f"{file_path} is not a file, directory or symlink")
+        root, name = os.path.split(os.path.normpath(file_path))
+        # like the collectors, symlinks are recorded as the link itself
+        data = {key: getattr(lstat_data, key) for key in dir(lstat_data) if key.startswith("st_")}
+        data["Name"] = name
+        data["Path"] = root
+        data["URI"] = file_path
+        data["Volume"] = entity_info["volume_guid"]
+        if self.collector_id is not None:
+            data["Collector"] = self.collector_id
+        return data
+
+    def assign_identifiers(self, entities: list[dict[str, Any]]) -> list[bool]:
+        """
+        Give each entity the identifier of its existing object, or a new one.
+
+        Args:
+            entities: Collected metadata (ObjectIdentifier is set)
+
+        Returns:
+            For each entity, whether it needs to be linked to its directory
+            (its object is new, or was recorded at another location)
+        """
+        by_frn, by_location = self.identity_map.find(
+            frns=[(data["Volume"], data["st_ino"]) for data in entities if data.get("st_ino")],
+            locations=[(data["Path"], data["Name"]) for data in entities],
+        )
+        link = []
+        for data in entities:
+            location = (data["Path"], data["Name"])
+            match = by_frn.get((data["Volume"], data["st_ino"])) if data.get("st_ino") else None
+            if match is not None:
+                data["ObjectIdentifier"] = match[0]
+                link.append(match[1:] != location)
+            elif location in by_location:
+                data["ObjectIdentifier"] = by_location[location]
+                link.append(False)
+            else:
+                data["ObjectIdentifier"] = str(uuid.uuid4())
+                link.append(True)
+        return link
+
+    def build_relationships(self, entities: list[dict[str, Any]], volumes: list[str | None]) -> list[dict[str, Any]]:
+        """
+        Build the containment relationships between entities and their directories.
+
+        Args:
+            entities: Collected metadata of the entities to link
+            volumes: Volume identifier of each entity's object, if it has one
+
+        Returns:
+            The relationship documents
+        """
+        parents = {}
+        for data in entities:
+            parents[data["Path"]] = os.path.split(data["Path"])
+        _, parent_ids = self.identity_map.find(locations=parents.values())
+        edges = []
+        for data, volume in zip(entities, volumes, strict=True):
+            parent_id = parent_ids.get(parents[data["Path"]])
+            if parent_id is None:
+                logger.debug(f"No object for the directory of {data['URI']}, not linked")
+                continue
+            edges.extend(self.edge_engine.object_edges(data["ObjectIdentifier"], parent_id, volume=volume))
+        return edges
+
+    def store(
+        self,
+        collection_name: str,
+        documents: list[dict[str, Any]],
+        sink: Callable[[list[dict[str, Any]]], None] | None,
+        on_duplicate: str,
+    ) -> None:
+        """Store documents with a sink, or bulk load them into a collection."""
+        if sink is not None:
+            sink(documents)
+            return
+        summary = IndalekoBulkLoader(collection_name, on_duplicate=on_duplicate).load(documents)
+        if summary["errors"]:
+            raise RuntimeError(
+                f"{summary['errors']} of {len(documents)} documents failed to load into {collection_name}",
+            )
+
+    def record(self, entities: list[dict[str, Any]]) -> None:
+        """Normalize the entities with the recorder, store them and link them to their directories."""
+        if not entities:
+            return
+        link = self.assign_identifiers(entities)
+        if self.recorder is not None:
+            objects = [self.recorder.normalize_collector_data(data) for data in entities]
+            documents = [indaleko_object.serialize() for indaleko_object in objects]
+            volumes = [indaleko_object.args.get("Volume") for indaleko_object in objects]
+        else:
+            documents = entities
+            volumes = [None] * len(entities)
+        self.store(IndalekoDBCollections.Indaleko_Object_Collection, documents, self.sink, "replace")
+        for data in entities:
+            self.identity_map.remember(
+                data["Volume"],
+                data.get("st_ino"),
+                data["Path"],
+                data["Name"],
+                data["ObjectIdentifier"],
+            )
+
+        linked = [(data, volume) for data, volume, needed in zip(entities, volumes, link, strict=True) if needed]
+        edges = self.build_relationships([data for data, _ in linked], [volume for _, volume in linked])
+        if edges and (self.sink is None or self.relationship_sink is not None):
+            self.store(IndalekoDBCollections.Indaleko_Relationship_Collection, edges, self.relationship_sink, "error")
+        logger.debug(f"Recorded {len(documents)} resolved entities and {len(edges)} relationships")
+
+
+def platform_recorder(machine_config: Any = None) -> Any:  # noqa: ANN401
+    """
+    Create the local storage recorder for the platform the service runs on.
+
+    Args:
+        machine_config: Machine configuration (default: the most recent one)
+
+    Returns:
+        The recorder, or None if the platform has no local storage recorder
+    """
+    # pylint: disable=import-outside-toplevel
+    # Only the recorder for this platform is imported
+    system = platform.system()
+    if system == "Windows":
+        from platforms.windows.machine_config import IndalekoWindowsMachineConfig
+        from storage.recorders.local.windows.recorder import IndalekoWindowsLocalStorageRecorder
+
+        config_class, recorder_class = IndalekoWindowsMachineConfig, IndalekoWindowsLocalStorageRecorder
+    elif system == "Linux":
+        from platforms.linux.machine_config import IndalekoLinuxMachineConfig
+        from storage.recorders.local.linux.recorder import IndalekoLinuxLocalStorageRecorder
+
+        config_class, recorder_class = IndalekoLinuxMachineConfig, IndalekoLinuxLocalStorageRecorder
+    elif system == "Darwin":
+        from platforms.mac.machine_config import IndalekoMacOSMachineConfig
+        from storage.recorders.local.mac.recorder import IndalekoMacLocalStorageRecorder
+
+        config_class, recorder_class = IndalekoMacOSMachineConfig, IndalekoMacLocalStorageRecorder
+    else:
+        return None
+    if machine_config is None:
+        machine_config = config_class.load_config_from_file()
+    # Entities are handed to the recorder one batch at a time, not read from a file
+    return recorder_class(machine_config=machine_config, input_file=os.devnull)
+
+
+def default_resolvers(machine_config: Any = None) -> list[EntityResolver]:  # noqa: ANN401
+    """
+    Return the resolvers for the platform the service runs on.
+
+    On Windows a request with only an FRN is located with OpenFileById;
+    elsewhere it is located at the path of the object recorded for that FRN.
+    If the platform recorder cannot be created (e.g., there is no machine
+    configuration yet), there is no resolver and requests stay queued.
+
+    Args:
+        machine_config: Machine configuration (default: the most recent one)
+
+    Returns:
+        The resolvers, in the order they should be tried
+    """
+    try:
+        recorder = platform_recorder(machine_config)
+    except Exception as e:  # noqa: BLE001 - without a resolver, requests stay queued
+        logger.warning(f"No local file system resolver on {platform.system()}: {e!s}")
+        return []
+    if recorder is None:
+        logger.warning(f"No local storage recorder for {platform.system()}")
+        return []
+    frn_locator = ntfs_path_from_frn if platform.system() == "Windows" else None
+    return [LocalFileSystemResolver(recorder=recorder, frn_locator=frn_locator)]
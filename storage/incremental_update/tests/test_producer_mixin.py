@@ -0,0 +1,104 @@
+"""
+Tests for buffered entity resolution requests in the producer mixin.
+"""
+
+import time
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from storage.incremental_update.producer_mixin import EntityResolutionProducer
+
+
+class Producer(EntityResolutionProducer):
+    """A minimal producer with a mocked queue."""
+
+    resolution_batch_size = 100
+
+    def __init__(self, flush_interval: float) -> None:
+        """Initialize the producer."""
+        super().__init__()
+        self.resolution_flush_interval = flush_interval
+        self.machine_id = "test-machine"
+        self._resolution_queue = MagicMock()
+        self._resolution_queue.enqueue_many.side_effect = lambda machine_id, requests: [
+            request["entity_info"]["frn"] for request in requests
+        ]
+
+
+@pytest.fixture
+def producers():
+    """Collect the producers created by a test, and close them afterwards."""
+    created = []
+    yield created
+    for producer in created:
+        producer.close_entity_resolutions()
+
+
+def test_quiet_producer_is_flushed_by_timer(producers):
+    """A partial buffer is enqueued once the flush interval passes, without further requests."""
+    # Setup
+    producer = Producer(flush_interval=0.05)
+    producers.append(producer)
+
+    # Execute
+    assert producer.buffer_entity_resolution("C:", "1", file_path="/a") == []
+    assert producer.buffer_entity_resolution("C:", "1", entity_type="file") == []
+    deadline = time.monotonic() + 5.0
+    while not producer._resolution_queue.enqueue_many.called and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # Verify
+    producer._resolution_queue.enqueue_many.assert_called_once()
+    machine_id, requests = producer._resolution_queue.enqueue_many.call_args[0]
+    assert machine_id == "test-machine"
+    assert len(requests) == 1
+    assert requests[0]["entity_info"]["file_path"] == "/a"
+    assert requests[0]["entity_type"] == "file"
+    assert producer._resolution_buffer == {}
+
+
+def test_timer_keeps_requests_when_queue_fails(producers):
+    """Requests survive a failed timed flush and are enqueued by the next one."""
+    # Setup
+    producer = Producer(flush_interval=0.05)
+    producers.append(producer)
+    enqueue = producer._resolution_queue.enqueue_many.side_effect
+
+    def enqueue_after_outage(machine_id, requests):
+        if producer._resolution_queue.enqueue_many.call_count == 1:
+            raise RuntimeError("down")
+        return enqueue(machine_id, requests)
+
+    producer._resolution_queue.enqueue_many.side_effect = enqueue_after_outage
+
+    # Execute
+    producer.buffer_entity_resolution("C:", "1")
+    deadline = time.monotonic() + 5.0
+    while producer._resolution_queue.enqueue_many.call_count < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # Verify
+    assert producer._resolution_queue.enqueue_many.call_count == 2
+    assert producer._resolution_buffer == {}
+
+
+def test_close_flushes_and_stops_timer(producers):
+    """Closing enqueues what is buffered at once and cancels the pending timer."""
+    # Setup
+    producer = Producer(flush_interval=3600.0)
+    producers.append(producer)
+    producer.buffer_entity_resolution("C:", "1")
+    producer.buffer_entity_resolution("C:", "2")
+    timer = producer._resolution_timer
+
+    # Execute
+    result = producer.close_entity_resolutions()
+
+    # Verify
+    assert result == ["1", "2"]
+    timer.join(timeout=5.0)
+    assert not timer.is_alive()
+    assert producer._resolution_timer is None
+    assert producer.close_entity_resolutions() == []
@@ -57,6 +57,38 @@ def test_enqueue(queue_service, mock_collections):
     assert inserted_data["entity_info"]["frn"] == "123456"
     assert inserted_data["entity_type"] == "file"
     assert inserted_data["priority"] == 2
+    assert inserted_data["path_depth"] == 2
+
+
+def test_enqueue_many(queue_service, mock_collections):
+    """Test that a batch is deduplicated and enqueued with a single query."""
+    # Setup
+    mock_db = MagicMock()
+    mock_cursor = MagicMock()
+    mock_cursor.__iter__.return_value = [["C:", "1", "key1"], ["C:", "2", "key2"]]
+    mock_db.aql.execute.return_value = mock_cursor
+    mock_collections.get_db.return_value = mock_db
+
+    # Execute
+    result = queue_service.enqueue_many(
+        "test-machine",
+        [
+            EntityInfo(volume_guid="C:", frn="1"),
+            {"volume_guid": "C:", "frn": "2", "file_path": "/test/dir"},
+            {"entity_info": {"volume_guid": "C:", "frn": "1", "file_path": "/test/a.txt"}, "entity_type": "file", "priority": 1},
+        ],
+    )
+
+    # Verify
+    assert result == ["key1", "key2", "key1"]
+    mock_db.aql.execute.assert_called_once()
+    requests = mock_db.aql.execute.call_args[1]["bind_vars"]["requests"]
+    assert len(requests) == 2
+    merged = next(request for request in requests if request["entity_info"]["frn"] == "1")
+    assert merged["priority"] == 1
+    assert merged["entity_type"] == "file"
+    assert merged["entity_info"]["file_path"] == "/test/a.txt"
+    assert all(request["machine_id"] == "test-machine" for request in requests)
 
 
 def test_find_existing_request(queue_service, mock_collections):
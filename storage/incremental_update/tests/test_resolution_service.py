@@ -0,0 +1,209 @@
+"""
+Tests for the entity resolution service, using the local file system.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from storage.incremental_update.models import EntityInfo, EntityType, ResolutionRequest, ResolutionStatus
+from storage.incremental_update.resolution_service import EntityResolutionService
+from storage.incremental_update.resolvers import EntityResolver, LocalFileSystemResolver, ObjectIdentityMap
+
+
+@pytest.fixture
+def recorded():
+    """Collect the documents stored by the resolver."""
+    return []
+
+
+@pytest.fixture
+def relationships():
+    """Collect the relationships stored by the resolver."""
+    return []
+
+
+@pytest.fixture
+def service(recorded, relationships):
+    """Create a resolution service with a mocked queue and a local resolver."""
+    with patch("storage.incremental_update.resolution_service.EntityResolutionQueue", return_value=MagicMock()):
+        return EntityResolutionService(
+            MagicMock(),
+            machine_id="test-machine",
+            workers=4,
+            resolvers=[
+                LocalFileSystemResolver(
+                    sink=lambda documents: recorded.append(documents),
+                    relationship_sink=relationships.extend,
+                ),
+            ],
+        )
+
+
+def make_request(key, path, entity_type, attempts=1, frn=None):
+    """Build a queue document for a path (or, if path is None, only an FRN)."""
+    request = ResolutionRequest(
+        machine_id="test-machine",
+        entity_info=EntityInfo(volume_guid="vol", frn=frn or key, file_path=str(path) if path else None),
+        entity_type=entity_type,
+    ).model_dump(mode="json")
+    request["_key"] = key
+    request["attempts"] = attempts
+    return request
+
+
+def statuses(service):
+    """Return the statuses the service committed for its last batch."""
+    return {key: status for key, status, _ in service.queue.update_status_many.call_args[0][0]}
+
+
+def test_process_batch_depth_order(service, recorded, relationships, tmp_path):
+    """Directories are recorded before their contents, and linked to them."""
+    # Setup
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "a" / "b" / "f.txt").write_text("data", encoding="utf-8")
+    (tmp_path / "a" / "g.txt").write_text("data", encoding="utf-8")
+    batch = [
+        make_request("f", tmp_path / "a" / "b" / "f.txt", EntityType.FILE),
+        make_request("g", tmp_path / "a" / "g.txt", EntityType.FILE),
+        make_request("b", tmp_path / "a" / "b", EntityType.DIRECTORY),
+        make_request("a", tmp_path / "a", EntityType.DIRECTORY),
+        make_request("gone", tmp_path / "missing.txt", EntityType.FILE),
+        make_request("old", tmp_path / "a" / "g.txt", EntityType.FILE, attempts=10),
+    ]
+
+    # Execute
+    result = service._process_batch(batch)
+
+    # Verify
+    assert result == 4
+    levels = [sorted(document["Name"] for document in documents) for documents in recorded]
+    assert levels == [["a"], ["b", "g.txt"], ["f.txt"]]
+    ids = {document["Name"]: document["ObjectIdentifier"] for documents in recorded for document in documents}
+    contains = {(edge["Objects"][0], edge["Objects"][1]) for edge in relationships}
+    # the directory of "a" was never recorded, so "a" is not linked
+    assert contains == {
+        (ids["a"], ids["b"]),
+        (ids["b"], ids["a"]),
+        (ids["a"], ids["g.txt"]),
+        (ids["g.txt"], ids["a"]),
+        (ids["b"], ids["f.txt"]),
+        (ids["f.txt"], ids["b"]),
+    }
+    service.queue.update_status_many.assert_called_once()
+    assert statuses(service) == {
+        "a": ResolutionStatus.COMPLETED,
+        "b": ResolutionStatus.COMPLETED,
+        "f": ResolutionStatus.COMPLETED,
+        "g": ResolutionStatus.COMPLETED,
+        "gone": ResolutionStatus.FAILED,
+        "old": ResolutionStatus.FAILED,
+    }
+    stats = service.get_stats()
+    assert stats["resolved"] == 4
+    assert stats["failed"] == 2
+    assert stats["entities_per_second"] > 0
+
+
+def test_record_failure_is_retried(service, tmp_path):
+    """A failed recording leaves the requests pending for another attempt."""
+    # Setup
+    service.resolvers = [LocalFileSystemResolver(sink=MagicMock(side_effect=RuntimeError("down")))]
+    (tmp_path / "f.txt").write_text("data", encoding="utf-8")
+
+    # Execute
+    result = service._process_batch([make_request("f", tmp_path / "f.txt", EntityType.FILE)])
+
+    # Verify
+    assert result == 0
+    updates = service.queue.update_status_many.call_args[0][0]
+    assert updates[0][:2] == ("f", ResolutionStatus.PENDING)
+
+
+def test_unresolvable_requests_stay_pending(service, tmp_path):
+    """Requests without a resolver, or whose FRN cannot be located, are retried later."""
+    # Setup
+    (tmp_path / "f.txt").write_text("data", encoding="utf-8")
+    frn = str((tmp_path / "f.txt").stat().st_ino)
+
+    # Execute
+    result = service._process_batch([make_request("f", None, EntityType.FILE, frn=frn)])
+
+    # Verify
+    assert result == 0
+    assert statuses(service) == {"f": ResolutionStatus.PENDING}
+
+    # Without resolvers
+    service.resolvers = []
+    service._process_batch([make_request("g", tmp_path / "f.txt", EntityType.FILE)])
+    assert statuses(service) == {"g": ResolutionStatus.PENDING}
+
+
+def test_frn_resolves_to_existing_object(recorded, relationships, tmp_path):
+    """An FRN-only request is located through the object recorded for it, whose id is reused."""
+    # Setup
+    (tmp_path / "d").mkdir()
+    (tmp_path / "d" / "f.txt").write_text("data", encoding="utf-8")
+    (tmp_path / "d" / "moved.txt").write_text("data", encoding="utf-8")
+    frn = str((tmp_path / "d" / "f.txt").stat().st_ino)
+    moved_frn = str((tmp_path / "d" / "moved.txt").stat().st_ino)
+    objects = [
+        {"id": "dir-id", "frn": "1", "volume": None, "path": str(tmp_path), "name": "d"},
+        {"id": "file-id", "frn": frn, "volume": None, "path": str(tmp_path / "d"), "name": "f.txt"},
+        {"id": "moved-id", "frn": moved_frn, "volume": None, "path": str(tmp_path), "name": "moved.txt"},
+    ]
+
+    def query(_aql, bind_vars):
+        if "frns" in bind_vars:
+            return [document for document in objects if document["frn"] in bind_vars["frns"]]
+        locations = [tuple(location) for location in bind_vars["locations"]]
+        return [document for document in objects if (document["path"], document["name"]) in locations]
+
+    resolver = LocalFileSystemResolver(
+        sink=recorded.append,
+        identity_map=ObjectIdentityMap(query=query),
+        relationship_sink=relationships.extend,
+    )
+
+    # Execute
+    entities = [
+        resolver.collect(make_request("f", None, EntityType.FILE, frn=frn)),
+        resolver.collect(make_request("m", tmp_path / "d" / "moved.txt", EntityType.FILE)),
+    ]
+    resolver.record(entities)
+
+    # Verify
+    assert [(document["URI"], document["ObjectIdentifier"]) for document in recorded[0]] == [
+        (str(tmp_path / "d" / "f.txt"), "file-id"),
+        (str(tmp_path / "d" / "moved.txt"), "moved-id"),
+    ]
+    # Only the object recorded at another location is linked again
+    assert {(edge["Objects"][0], edge["Objects"][1]) for edge in relationships} == {
+        ("dir-id", "moved-id"),
+        ("moved-id", "dir-id"),
+    }
+
+
+def test_platform_resolvers_by_default():
+    """Without explicit resolvers, the service uses the resolvers for its platform."""
+    resolver = MagicMock()
+    with (
+        patch("storage.incremental_update.resolution_service.EntityResolutionQueue", return_value=MagicMock()),
+        patch("storage.incremental_update.resolution_service.default_resolvers", return_value=[resolver]),
+    ):
+        service = EntityResolutionService(MagicMock(), machine_id="test-machine")
+    assert service.resolvers == [resolver]
+
+
+def test_incomplete_resolver_is_rejected():
+    """A resolver that does not implement every step cannot be created."""
+
+    class CollectOnlyResolver(EntityResolver):
+        def can_resolve(self, _request):
+            return True
+
+        def collect(self, request):
+            return request
+
+    with pytest.raises(TypeError):
+        CollectOnlyResolver()
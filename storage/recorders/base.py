@@ -45,19 +45,23 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import argparse
 import datetime
+import itertools
 import json
 import logging
 import mimetypes
 import os
+import stat
 import sys
 import tempfile
 import uuid
 
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from typing import Any
 
 import jsonlines
 
+from arango.database import StandardDatabase
 from icecream import ic
 
 
@@ -76,14 +80,19 @@ from data_models import (
 )
 from data_models.storage_semantic_attributes import StorageSemanticAttributes
 from db import (
+    IndalekoBulkLoader,
     IndalekoCollection,
     IndalekoDBCollections,
     IndalekoDBConfig,
+    IndalekoDBConnectionPool,
     IndalekoServiceManager,
 )
 from storage.i_object import IndalekoObject
 from storage.i_relationship import IndalekoRelationship
 from storage.recorders.data_model import IndalekoStorageRecorderDataModel
+from storage.recorders.dirmap import IndalekoDirMap
+from storage.recorders.edges import IndalekoEdgeEngine
+from storage.recorders.manifest import IndalekoStorageManifest
 from utils.cli.base import IndalekoBaseCLI
 from utils.decorators import type_check
 from utils.misc.directory_management import (
@@ -120,6 +129,8 @@ class BaseStorageRecorder:
     )
     storage_recorder_service_version = "1.0"
 
+    default_streaming_batch_size = 10000
+
     counter_values = (
         "input_count",
         "output_count",
@@ -127,6 +138,10 @@ class BaseStorageRecorder:
         "file_count",
         "error_count",
         "edge_count",
+        "new_count",
+        "updated_count",
+        "unchanged_count",
+        "deleted_count",
     )
 
     recorder_data = IndalekoStorageRecorderDataModel(
@@ -208,7 +223,9 @@ class BaseStorageRecorder:
         self.dir_data_by_path = {}
         self.dir_data = []
         self.file_data = []
-        self.dirmap = {}
+        if isinstance(getattr(self, "dirmap", None), IndalekoDirMap):
+            self.dirmap.close()
+        self.dirmap = IndalekoDirMap(spill_dir=getattr(self, "data_dir", None))
         self.dir_edges = []
         self.collector_data = []
 
@@ -330,7 +347,7 @@ class BaseStorageRecorder:
             with jsonlines.open(file_name, mode="w") as writer:
                 for entry in data:
                     try:
-                        writer.write(entry.serialize())
+                        writer.write(entry if isinstance(entry, dict) else entry.serialize())
                         output_count += 1
                     except TypeError as err:
                         logging.exception("Error writing entry to JSONLines file: %s", err)
@@ -362,20 +379,14 @@ class BaseStorageRecorder:
             * database: the database configuration object (uses default config if not specified)
             * chunk_size: the number of records to upload at a time (defaults to 5000)
         """
-        raise NotImplementedError(
-            "upload_data_to_database implementation is not complete.",
-        )
-        if isinstance(collection, str):
-            collection = IndalekoCollection(collection, db_config=database)
-            assert isinstance(
-                collection,
-                IndalekoCollection,
-            ), "Collection is not an IndalekoCollection"
-        count = 0
-        while count < len(data):
-            chunk = data[count : count + chunk_size]
-            count += chunk_size
-            assert chunk
+        if isinstance(collection, IndalekoCollection):
+            collection = collection.collection_name
+        summary = IndalekoBulkLoader(
+            collection,
+            db_config=database,
+            chunk_size=chunk_size,
+        ).load(data)
+        return summary["errors"] == 0
 
     @staticmethod
     def build_load_string(**kwargs) -> str:
@@ -609,71 +620,55 @@ class BaseStorageRecorder:
             identifier = item.args["ObjectIdentifier"]
             self.dirmap[fqp] = identifier
 
-    def build_edges(self) -> None:
-        """Build the edges between files and directories."""
+    def get_edge_engine(self: "BaseStorageRecorder") -> IndalekoEdgeEngine:
+        """Build the edge engine for this recorder's relationships."""
         source_id = IndalekoSourceIdentifierDataModel(
             Identifier=str(self.recorder_data.ServiceUUID),
             Version=self.recorder_data.ServiceVersion,
         )
-        for item in self.dir_data + self.file_data:
-            assert "LocalPath" in item, f"Path not in item: {item.indaleko_object}"
-            parent = item["LocalPath"]
-            if parent not in self.dirmap:
-                # ic('Parent not in dirmap: ', parent)
-                continue
-            parent_id = self.dirmap[parent]
-            self.dir_edges.append(
-                BaseStorageRecorder.build_dir_contains_relationship(
-                    parent_id,
-                    item.args["ObjectIdentifier"],
-                    source_id,
-                ),
-            )
-            self.edge_count += 1
-            self.dir_edges.append(
-                BaseStorageRecorder.build_contained_by_dir_relationship(
-                    item.args["ObjectIdentifier"],
-                    parent_id,
-                    source_id,
-                ),
-            )
-            self.edge_count += 1
-            volume = item.args.get("Volume")
-            if volume:
-                self.dir_edges.append(
-                    BaseStorageRecorder.build_volume_contains_relationship(
-                        volume,
-                        item.args["ObjectIdentifier"],
-                        source_id,
-                    ),
-                )
-                self.edge_count += 1
-                self.dir_edges.append(
-                    BaseStorageRecorder.build_contained_by_volume_relationship(
-                        item.args["ObjectIdentifier"],
-                        volume,
-                        source_id,
-                    ),
-                )
-                self.edge_count += 1
-            machine_id = item.args.get("machine_id")
-            if machine_id:
-                self.dir_edges.append(
-                    BaseStorageRecorder.build_machine_contains_relationship(
-                        machine_id,
-                        item.args["ObjectIdentifier"],
-                        source_id,
-                    ),
-                )
-                self.edge_count += 1
-                self.dir_edges.append(
-                    BaseStorageRecorder.build_contained_by_machine_relationship(
-                        item.args["ObjectIdentifier"],
-                        machine_id,
-                        source_id,
-                    ),
-                )
-                self.edge_count += 1
+        return IndalekoEdgeEngine(
+            source_id,
+            collapse_symmetric=getattr(self.args, "collapse_edges", False),
+        )
+
+    def report_edge_stats(self: "BaseStorageRecorder", engine: IndalekoEdgeEngine) -> None:
+        """Record (and log) the edge generation statistics."""
+        self.edge_stats = engine.get_stats()
+        logging.info(
+            "Built %d edges (%.0f edges/second, %.0f bytes/edge)",
+            self.edge_stats["edges"],
+            self.edge_stats.get("edges_per_second", 0),
+            self.edge_stats.get("bytes_per_edge", 0),
+        )
+        if self.debug:
+            ic(self.edge_stats)
+
+    def build_item_edges(
+        self,
+        item: IndalekoObject,
+        engine: IndalekoEdgeEngine,
+    ) -> list[dict[str, Any]]:
+        """Build the edges between a single file or directory and its containers."""
+        assert "LocalPath" in item, f"Path not in item: {item.indaleko_object}"
+        parent_id = self.dirmap.get(item["LocalPath"])
+        if parent_id is None:
+            # ic('Parent not in dirmap: ', parent)
+            return []
+        return engine.object_edges(
+            item.args["ObjectIdentifier"],
+            parent_id,
+            volume=item.args.get("Volume"),
+            machine_id=item.args.get("machine_id"),
+        )
+
+    def build_edges(self) -> None:
+        """Build the edges between files and directories."""
+        engine = self.get_edge_engine()
+        for item in itertools.chain(self.dir_data, self.file_data):
+            edges = self.build_item_edges(item, engine)
+            self.dir_edges.extend(edges)
+            self.edge_count += len(edges)
+        self.report_edge_stats(engine)
 
     @staticmethod
     def arangoimport_object_data(recorder: "BaseStorageRecorder") -> None:
@@ -689,6 +684,48 @@ class BaseStorageRecorder:
             raise ValueError("relationship_data_load_string must be set")
         recorder.execute_command(recorder.relationship_data_load_string)
 
+    def get_bulk_loader(
+        self: "BaseStorageRecorder",
+        collection_name: str,
+        on_duplicate: str = "error",
+    ) -> IndalekoBulkLoader:
+        """Build a bulk loader for the given collection using the recorder's settings."""
+        return IndalekoBulkLoader(
+            collection_name,
+            chunk_size=getattr(self.args, "bulk_chunk_size", IndalekoBulkLoader.default_chunk_size),
+            workers=getattr(self.args, "bulk_workers", IndalekoBulkLoader.default_workers),
+            on_duplicate=on_duplicate,
+        )
+
+    def bulk_upload_data(
+        self: "BaseStorageRecorder",
+        data: Iterable[Any],
+        collection_name: str,
+    ) -> dict[str, Any]:
+        """
+        Stream the given data into the specified collection.
+
+        Inputs:
+            * data: an iterable of Indaleko objects/relationships (or documents)
+            * collection_name: the name of the collection to load
+
+        Returns:
+            The summary generated by the bulk loader.
+        """
+        summary = self.get_bulk_loader(collection_name).load(data)
+        self.error_count += summary["errors"]
+        if self.debug:
+            ic(summary)
+        return summary
+
+    @staticmethod
+    def iterate_file_data(file_name: str | None) -> Iterable[dict[str, Any]]:
+        """Stream the documents from a previously written JSONL output file."""
+        if not file_name or not os.path.exists(file_name):
+            raise ValueError(f"No in-memory data and no output file ({file_name}) to upload")
+        with jsonlines.open(file_name) as reader:
+            yield from reader
+
     @staticmethod
     def bulk_upload_object_data(recorder: "BaseStorageRecorder") -> None:
         """Bulk upload the object data to the database."""
@@ -696,7 +733,11 @@ class BaseStorageRecorder:
             recorder,
             BaseStorageRecorder,
         ), "recorder is not a BaseStorageRecorder"
-        raise NotImplementedError("bulk_upload_object_data must be implemented")
+        if recorder.dir_data or recorder.file_data:
+            data = itertools.chain(recorder.dir_data, recorder.file_data)
+        else:  # data already released, reload it from the output file
+            data = recorder.iterate_file_data(getattr(recorder, "output_object_file", None))
+        recorder.bulk_upload_data(data, IndalekoDBCollections.Indaleko_Object_Collection)
 
     @staticmethod
     def bulk_upload_relationship_data(recorder: "BaseStorageRecorder") -> None:
@@ -705,7 +746,11 @@ class BaseStorageRecorder:
             recorder,
             BaseStorageRecorder,
         ), "recorder is not a BaseStorageRecorder"
-        raise NotImplementedError("bulk_upload_relationship_data must be implemented")
+        if recorder.dir_edges:
+            data = recorder.dir_edges
+        else:  # data already released, reload it from the output file
+            data = recorder.iterate_file_data(getattr(recorder, "output_edge_file", None))
+        recorder.bulk_upload_data(data, IndalekoDBCollections.Indaleko_Relationship_Collection)
 
     class base_recorder_mixin(IndalekoBaseCLI.default_handler_mixin):
         """This is a mixin class for the base recorder."""
@@ -744,6 +789,44 @@ class BaseStorageRecorder:
                 help="Use bulk loader to load data (default=False)",
                 action="store_true",
             )
+            pre_parser.add_argument(
+                "--bulk_chunk_size",
+                type=int,
+                default=IndalekoBulkLoader.default_chunk_size,
+                help=f"Documents per bulk upload request (default={IndalekoBulkLoader.default_chunk_size})",
+            )
+            pre_parser.add_argument(
+                "--bulk_workers",
+                type=int,
+                default=IndalekoBulkLoader.default_workers,
+                help=f"Concurrent bulk upload requests (default={IndalekoBulkLoader.default_workers})",
+            )
+            pre_parser.add_argument(
+                "--streaming",
+                default=False,
+                help="Process the collector data in bounded batches rather than in memory (default=False)",
+                action="store_true",
+            )
+            pre_parser.add_argument(
+                "--batch_size",
+                type=int,
+                default=BaseStorageRecorder.default_streaming_batch_size,
+                help="Objects per batch in streaming mode "
+                f"(default={BaseStorageRecorder.default_streaming_batch_size})",
+            )
+            pre_parser.add_argument(
+                "--collapse_edges",
+                default=False,
+                help="Store each contains/contained-by pair as a single relationship (default=False)",
+                action="store_true",
+            )
+            pre_parser.add_argument(
+                "--manifest",
+                type=str,
+                default=None,
+                help="Manifest file used by the incremental output type "
+                "(default: derived from the machine and storage)",
+            )
             return pre_parser
 
     @staticmethod
@@ -961,20 +1044,12 @@ class BaseStorageRecorder:
                 )
         return semantic_attributes
 
-    def record(self) -> None:
-        """
-        This function processes and records the collector file and emits the data needed to
-        upload to the database.
-        """
-        self.normalize()
-        assert len(self.dir_data) + len(self.file_data) > 0, "No data to record"
-        self.build_dirmap()
-        self.build_edges()
+    def get_output_file_keys(self) -> dict[str, str]:
+        """This function returns the keys used to name the recorder's output files."""
         assert self.recorder_platform
         kwargs = {
             "platform": self.recorder_platform,
             "service": self.get_recorder_file_service_name(),
-            "collection": IndalekoDBCollections.Indaleko_Object_Collection,
             "timestamp": self.timestamp,
             "output_dir": self.data_dir,
         }
@@ -982,10 +1057,324 @@ class BaseStorageRecorder:
             kwargs["machine"] = str(uuid.UUID(self.machine_id).hex)
         if hasattr(self, "storage_description") and self.storage_description:
             kwargs["storage"] = self.storage_description
+        return kwargs
+
+    def generate_output_file_names(self) -> None:
+        """This function sets the names of the object and edge output files."""
+        kwargs = self.get_output_file_keys()
+        kwargs["collection"] = IndalekoDBCollections.Indaleko_Object_Collection
         self.output_object_file = self.generate_output_file_name(**kwargs)
         kwargs["collection"] = IndalekoDBCollections.Indaleko_Relationship_Collection
         self.output_edge_file = self.generate_output_file_name(**kwargs)
 
+    def record(self) -> None:
+        """
+        This function processes and records the collector file and emits the data needed to
+        upload to the database.
+        """
+        self.normalize()
+        assert len(self.dir_data) + len(self.file_data) > 0, "No data to record"
+        self.build_dirmap()
+        self.build_edges()
+        self.generate_output_file_names()
+
+    def is_collector_data_directory(self: "BaseStorageRecorder", data: dict[str, Any]) -> bool:
+        """Return True if the (not yet normalized) collector data describes a directory."""
+        if "st_mode" in data:
+            return stat.S_ISDIR(data["st_mode"])
+        if "st_file_attributes" in data:
+            return bool(data["st_file_attributes"] & stat.FILE_ATTRIBUTE_DIRECTORY)
+        return False
+
+    def iterate_collector_data(self: "BaseStorageRecorder") -> Iterator[dict[str, Any]]:
+        """This function streams the collector data from the input file."""
+        if self.input_file is None:
+            raise ValueError("input_file must be specified")
+        if self.input_file.endswith(".jsonl"):
+            with jsonlines.open(self.input_file) as reader:
+                yield from reader
+        elif self.input_file.endswith(".json"):
+            # plain JSON cannot be streamed, so this still loads the whole file
+            with open(self.input_file, encoding="utf-8-sig") as file:
+                yield from json.load(file)
+        else:
+            raise ValueError(f"Input file {self.input_file} is an unknown type")
+
+    def build_streaming_dirmap(
+        self: "BaseStorageRecorder",
+        manifest: IndalekoStorageManifest | None = None,
+    ) -> None:
+        """
+        First pass of the streaming recorder: assign the object identifier of
+        every directory so that edges can be built in a single second pass.
+        When a manifest is given, every entry is also classified against it,
+        so that known files and directories keep their identifiers.
+        Also sets collection_root to the shallowest directory in the data.
+        """
+        self.collection_root = None
+        for data in self.iterate_collector_data():
+            identifier = None
+            if manifest is not None:
+                identifier, _ = manifest.check(data)
+            if "Path" not in data or "Name" not in data:
+                continue
+            if self.collection_root is None or len(data["Path"]) < len(self.collection_root):
+                self.collection_root = data["Path"]
+            if not self.is_collector_data_directory(data):
+                continue
+            if identifier is None:
+                identifier = data.get("ObjectIdentifier") or str(uuid.uuid4())
+            self.dirmap[os.path.join(data["Path"], data["Name"])] = identifier
+
+    def stream_normalized_data(
+        self: "BaseStorageRecorder",
+        manifest: IndalekoStorageManifest | None = None,
+    ) -> Iterator[tuple[IndalekoObject, str | None]]:
+        """
+        Second pass of the streaming recorder: normalize the collector data one
+        entry at a time, using the directory identifiers from the first pass.
+        Yields each object along with its manifest state (None if there is no
+        manifest).
+        """
+        for data in self.iterate_collector_data():
+            self.input_count += 1
+            state = None
+            if "Path" in data and "Name" in data and self.is_collector_data_directory(data):
+                identifier = self.dirmap.get(os.path.join(data["Path"], data["Name"]))
+                if identifier is not None:
+                    data["ObjectIdentifier"] = identifier
+            if manifest is not None:
+                known = manifest.lookup(data)
+                if known is not None:
+                    data["ObjectIdentifier"], state = known
+                else:
+                    state = IndalekoStorageManifest.NEW
+            try:
+                obj = self.normalize_collector_data(data)
+            except OSError as e:
+                logging.exception("Error normalizing data: %s", e)
+                logging.exception("Data: %s", data)
+                self.error_count += 1
+                continue
+            if self.is_object_directory(obj):
+                if "LocalPath" not in obj:
+                    logging.warning(
+                        "Directory object does not have a path: %s",
+                        obj.serialize(),
+                    )
+                    continue  # skip
+                self.dir_count += 1
+            else:
+                self.file_count += 1
+            yield obj, state
+
+    @staticmethod
+    def open_streaming_output(dir_name: Path | str) -> tuple[Any, str]:
+        """Open a temporary JSONL file for streaming output."""
+        with tempfile.NamedTemporaryFile(dir=dir_name, delete=False) as tf:
+            temp_file_name = tf.name
+        return jsonlines.open(temp_file_name, mode="w"), temp_file_name
+
+    @staticmethod
+    def close_streaming_output(writer: Any, temp_file_name: str, preferred_file_name: str) -> str:
+        """Close a streaming output file and move it to its final name."""
+        writer.close()
+        try:
+            if os.path.exists(preferred_file_name):
+                os.remove(preferred_file_name)
+            os.rename(temp_file_name, preferred_file_name)
+        except OSError:
+            logging.exception(
+                "Unable to rename temp file %s to output file %s",
+                temp_file_name,
+                preferred_file_name,
+            )
+            preferred_file_name = temp_file_name
+        return preferred_file_name
+
+    def record_streaming(self: "BaseStorageRecorder", batch_size: int | None = None) -> None:
+        """
+        This function processes the collector file without ever holding the
+        whole volume in memory.  Objects and edges are produced in batches of
+        batch_size objects and are either uploaded directly (bulk output) or
+        appended to the output files (suitable for arangoimport).
+        """
+        if batch_size is None:
+            batch_size = getattr(self.args, "batch_size", self.default_streaming_batch_size)
+        self.generate_output_file_names()
+        self.build_streaming_dirmap()
+        engine = self.get_edge_engine()
+        bulk = getattr(self.args, "bulk", False) or self.output_type == "bulk"
+        if bulk:
+            object_loader = self.get_bulk_loader(IndalekoDBCollections.Indaleko_Object_Collection).start()
+            edge_loader = self.get_bulk_loader(IndalekoDBCollections.Indaleko_Relationship_Collection).start()
+
+            def emit(objects: list, edges: list) -> None:
+                object_loader.submit(objects)
+                edge_loader.submit(edges)
+
+        else:
+            object_writer, object_temp_file = self.open_streaming_output(self.data_dir)
+            edge_writer, edge_temp_file = self.open_streaming_output(self.data_dir)
+
+            def emit(objects: list, edges: list) -> None:
+                for obj in objects:
+                    object_writer.write(obj.serialize())
+                for edge in edges:
+                    edge_writer.write(edge)
+
+        objects = []
+        edges = []
+        try:
+            for obj, _ in self.stream_normalized_data():
+                objects.append(obj)
+                item_edges = self.build_item_edges(obj, engine)
+                edges.extend(item_edges)
+                self.edge_count += len(item_edges)
+                if len(objects) >= batch_size:
+                    emit(objects, edges)
+                    self.output_count += len(objects)
+                    objects = []
+                    edges = []
+            if objects or edges:
+                emit(objects, edges)
+                self.output_count += len(objects)
+        finally:
+            if bulk:
+                for loader in (object_loader, edge_loader):
+                    summary = loader.finish()
+                    self.error_count += summary["errors"]
+                    if self.debug:
+                        ic(summary)
+            else:
+                object_file = self.close_streaming_output(object_writer, object_temp_file, self.output_object_file)
+                edge_file = self.close_streaming_output(edge_writer, edge_temp_file, self.output_edge_file)
+                self.object_data_load_string = self.build_load_string(
+                    collection=IndalekoDBCollections.Indaleko_Object_Collection,
+                    file=object_file,
+                )
+                self.relationship_data_load_string = self.build_load_string(
+                    collection=IndalekoDBCollections.Indaleko_Relationship_Collection,
+                    file=edge_file,
+                )
+            self.dirmap.close()
+            self.report_edge_stats(engine)
+
+    def get_manifest_file_name(self: "BaseStorageRecorder") -> str:
+        """Return the name of the manifest used for incremental recording."""
+        if getattr(self.args, "manifest", None):
+            return self.args.manifest
+        kwargs = self.get_output_file_keys()
+        kwargs["timestamp"] = None  # the manifest persists across runs
+        kwargs["suffix"] = "sqlite"
+        return self.generate_output_file_name(**kwargs)
+
+    @staticmethod
+    def remove_objects(
+        db: StandardDatabase,
+        object_ids: list[str],
+        remove_objects: bool = True,
+    ) -> None:
+        """
+        Remove the relationships involving the given objects and, unless
+        remove_objects is False, the objects themselves.
+        """
+        object_collection = IndalekoDBCollections.Indaleko_Object_Collection
+        db.aql.execute(
+            "FOR edge IN @@edges FILTER edge._from IN @ids OR edge._to IN @ids REMOVE edge IN @@edges",
+            bind_vars={
+                "@edges": IndalekoDBCollections.Indaleko_Relationship_Collection,
+                "ids": [f"{object_collection}/{object_id}" for object_id in object_ids],
+            },
+        )
+        if remove_objects:
+            db.aql.execute(
+                "FOR key IN @keys REMOVE key IN @@objects OPTIONS { ignoreErrors: true }",
+                bind_vars={"@objects": object_collection, "keys": object_ids},
+            )
+
+    def record_incremental(self: "BaseStorageRecorder", batch_size: int | None = None) -> None:
+        """
+        This function records only what has changed since the previous run.
+
+        A persistent manifest keyed by (st_dev, st_ino) supplies stable object
+        identifiers.  New and changed objects are upserted, objects that moved
+        have their relationships rebuilt, and objects that are no longer
+        present are removed, along with their relationships.  Unchanged
+        objects cost a manifest lookup and nothing else.  The manifest is
+        only committed once the database has been updated.
+
+        The manifest must always be used with collector data covering the same
+        tree: anything in the manifest that is not in the collector data is
+        treated as deleted.  The manifest records the root of the tree, and
+        a run whose collector data has a different root is refused before
+        anything is removed.
+        """
+        if batch_size is None:
+            batch_size = getattr(self.args, "batch_size", self.default_streaming_batch_size)
+        manifest = IndalekoStorageManifest(self.get_manifest_file_name())
+        pool = IndalekoDBConnectionPool(size=1)
+        try:
+            self.build_streaming_dirmap(manifest)
+            manifest.check_root(self.collection_root)
+            # Stale relationships must be gone before the new ones are loaded.
+            with pool.connection() as db:
+                for moved in manifest.moved():
+                    self.remove_objects(db, moved, remove_objects=False)
+                for deleted in manifest.deleted():
+                    self.remove_objects(db, deleted)
+                    self.deleted_count += len(deleted)
+            engine = self.get_edge_engine()
+            object_loader = self.get_bulk_loader(
+                IndalekoDBCollections.Indaleko_Object_Collection,
+                on_duplicate="replace",
+            ).start()
+            edge_loader = self.get_bulk_loader(IndalekoDBCollections.Indaleko_Relationship_Collection).start()
+            objects = []
+            edges = []
+            try:
+                for obj, state in self.stream_normalized_data(manifest):
+                    if state == IndalekoStorageManifest.UNCHANGED:
+                        self.unchanged_count += 1
+                        continue
+                    if state == IndalekoStorageManifest.NEW:
+                        self.new_count += 1
+                    else:
+                        self.updated_count += 1
+                    objects.append(obj)
+                    if state != IndalekoStorageManifest.MODIFIED:
+                        item_edges = self.build_item_edges(obj, engine)
+                        edges.extend(item_edges)
+                        self.edge_count += len(item_edges)
+                    if len(objects) >= batch_size:
+                        object_loader.submit(objects)
+                        edge_loader.submit(edges)
+                        self.output_count += len(objects)
+                        objects = []
+                        edges = []
+                object_loader.submit(objects)
+                edge_loader.submit(edges)
+                self.output_count += len(objects)
+            finally:
+                for loader in (object_loader, edge_loader):
+                    summary = loader.finish()
+                    self.error_count += summary["errors"]
+                    if self.debug:
+                        ic(summary)
+            self.report_edge_stats(engine)
+            if self.error_count == 0:
+                manifest.commit()
+            else:
+                logging.warning(
+                    "Incremental recording had %d errors, manifest %s not updated",
+                    self.error_count,
+                    manifest.manifest_file,
+                )
+        finally:
+            manifest.close()
+            pool.close()
+            self.dirmap.close()
+
 
 def main() -> None:
     """Test code for IndalekoStorageRecorder.py."""
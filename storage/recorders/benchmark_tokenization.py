@@ -0,0 +1,166 @@
+"""
+Micro-benchmark for filename tokenization.
+
+The corpus mimics a real volume: a small set of names (index.js, README.md,
+__init__.py, ...) accounts for a large share of the entries, and the rest
+are mostly distinct.  A real tree can be used instead with --path.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+from collections.abc import Callable
+
+
+if os.environ.get("INDALEKO_ROOT") is None:
+    current_path = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.exists(os.path.join(current_path, "Indaleko.py")):
+        current_path = os.path.dirname(current_path)
+    os.environ["INDALEKO_ROOT"] = current_path
+    sys.path.append(current_path)
+
+# pylint: disable=wrong-import-position
+from storage.recorders.tokenization import (
+    _tokenize_base_name,
+    clear_tokenization_cache,
+    tokenization_cache_info,
+    tokenize_filename,
+    tokenize_filenames,
+)
+
+
+# pylint: enable=wrong-import-position
+
+COMMON_NAMES = [
+    "index.js",
+    "README.md",
+    "__init__.py",
+    "package.json",
+    "LICENSE",
+    "Makefile",
+    ".gitignore",
+    "setup.py",
+    "main.c",
+    "CMakeLists.txt",
+    "index.d.ts",
+    "style.css",
+    "desktop.ini",
+    "Thumbs.db",
+    ".DS_Store",
+]
+
+NAME_PATTERNS = [
+    "IMG_{n:05d}.JPG",
+    "report_{year}_Q{q}.docx",
+    "{word}{Word}Controller.java",
+    "{word}_{word2}_test.py",
+    "{Word}-{word2}-v{q}.{q}.tar.gz",
+    "Meeting Notes ({year}-{q:02d}-{n:02d}).txt",
+]
+
+WORDS = ["data", "model", "user", "query", "cache", "index", "record", "object", "storage", "activity"]
+
+
+def build_corpus(count: int, common_fraction: float, seed: int = 42) -> list[str]:
+    """Build a synthetic corpus of names with a realistic repetition rate."""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        if rng.random() < common_fraction:
+            corpus.append(rng.choice(COMMON_NAMES))
+            continue
+        word, word2 = rng.choice(WORDS), rng.choice(WORDS)
+        corpus.append(
+            rng.choice(NAME_PATTERNS).format(
+                n=rng.randrange(100000),
+                year=rng.randrange(2000, 2026),
+                q=rng.randrange(1, 5),
+                word=word,
+                word2=word2,
+                Word=word.capitalize(),
+            ),
+        )
+    return corpus
+
+
+def load_corpus(path: str, count: int) -> list[str]:
+    """Collect up to count names from a real directory tree."""
+    corpus = []
+    for _, dirs, files in os.walk(path):
+        corpus.extend(dirs)
+        corpus.extend(files)
+        if len(corpus) >= count:
+            break
+    return corpus[:count]
+
+
+def run_benchmark(label: str, corpus: list[str], func: Callable[[list[str]], object], repeat: int) -> float:
+    """Run func over the corpus, returning the best names per second."""
+    best = None
+    for _ in range(repeat):
+        clear_tokenization_cache()
+        start = time.perf_counter()
+        func(corpus)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    rate = len(corpus) / best
+    print(f"{label:<28} {len(corpus):>8} names {best:8.3f} s {rate:12.1f} names/s")
+    return rate
+
+
+def main() -> None:
+    """Run the tokenization benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark filename tokenization")
+    parser.add_argument("--count", type=int, default=200000, help="Number of names to tokenize")
+    parser.add_argument(
+        "--common-fraction",
+        type=float,
+        default=0.4,
+        help="Fraction of the synthetic corpus drawn from common names",
+    )
+    parser.add_argument("--path", type=str, default=None, help="Take the names from this directory tree")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per configuration (best is reported)")
+    args = parser.parse_args()
+    if args.path:
+        corpus = load_corpus(args.path, args.count)
+    else:
+        corpus = build_corpus(args.count, args.common_fraction)
+    print(f"{len(corpus)} names, {len(set(corpus))} distinct")
+    uncached = run_benchmark(
+        "uncached",
+        corpus,
+        lambda names: [_tokenize_base_name(os.path.basename(name)) for name in names],
+        args.repeat,
+    )
+    cached = run_benchmark(
+        "tokenize_filename (LRU)",
+        corpus,
+        lambda names: [tokenize_filename(name) for name in names],
+        args.repeat,
+    )
+    print(f"  {tokenization_cache_info()}")
+    batch = run_benchmark("tokenize_filenames (batch)", corpus, tokenize_filenames, args.repeat)
+    print(f"speedup: LRU {cached / uncached:.2f}x, batch {batch / uncached:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
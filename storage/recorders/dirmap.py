@@ -0,0 +1,168 @@
+"""
+This module provides a compact, spillable map from directory paths to object
+identifiers for the storage recorders.
+
+A Python dictionary of full path strings to UUID strings costs a few hundred
+bytes per directory.  This map stores a fixed size digest of the path and the
+raw UUID bytes instead, and once it grows beyond a configurable number of
+entries it moves its contents into an on-disk SQLite table so that the
+recorder's memory use stays bounded.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import tempfile
+import uuid
+
+
+class IndalekoDirMap:
+    """A map of directory path to object identifier that can spill to disk."""
+
+    default_max_memory_entries = int(
+        os.environ.get("INDALEKO_DIRMAP_MAX_MEMORY_ENTRIES", "1000000"),
+    )
+    digest_size = 16  # bytes; collisions are negligible at this size
+
+    def __init__(
+        self,
+        max_memory_entries: int = default_max_memory_entries,
+        spill_dir: str | None = None,
+    ) -> None:
+        """
+        Create the map.
+
+        Inputs:
+            * max_memory_entries: the number of entries held in memory before
+              the map spills to disk
+            * spill_dir: the directory for the spill file (default: system temp)
+        """
+        self.max_memory_entries = max_memory_entries
+        self.spill_dir = spill_dir
+        self._memory = {}
+        self._db = None
+        self._db_file = None
+        self._spilled_count = 0
+
+    @staticmethod
+    def path_key(path: str) -> bytes:
+        """Return the compact key for a path."""
+        return hashlib.blake2b(
+            path.encode("utf-8", "surrogateescape"),
+            digest_size=IndalekoDirMap.digest_size,
+        ).digest()
+
+    @staticmethod
+    def _encode_identifier(identifier: str | uuid.UUID) -> bytes:
+        if isinstance(identifier, uuid.UUID):
+            return identifier.bytes
+        return uuid.UUID(identifier).bytes
+
+    @staticmethod
+    def _decode_identifier(value: bytes) -> str:
+        return str(uuid.UUID(bytes=value))
+
+    def is_spilled(self) -> bool:
+        """Return True if the map has moved its contents to disk."""
+        return self._db is not None
+
+    def _spill(self) -> None:
+        """Move the in-memory entries into the on-disk table."""
+        fd, self._db_file = tempfile.mkstemp(
+            prefix="indaleko-dirmap-",
+            suffix=".sqlite",
+            dir=self.spill_dir,
+        )
+        os.close(fd)
+        self._db = sqlite3.connect(self._db_file, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=OFF")
+        self._db.execute("PRAGMA synchronous=OFF")
+        self._db.execute(
+            "CREATE TABLE dirmap (key BLOB PRIMARY KEY, value BLOB NOT NULL) WITHOUT ROWID",
+        )
+        self._flush()
+        logging.info("Directory map spilled to %s", self._db_file)
+
+    def _flush(self) -> None:
+        """Write the in-memory entries to the on-disk table."""
+        self._db.executemany(
+            "INSERT OR REPLACE INTO dirmap (key, value) VALUES (?, ?)",
+            self._memory.items(),
+        )
+        self._db.commit()
+        self._spilled_count += len(self._memory)
+        self._memory = {}
+
+    def __setitem__(self, path: str, identifier: str | uuid.UUID) -> None:
+        """Add (or replace) the identifier for a directory path."""
+        self._memory[self.path_key(path)] = self._encode_identifier(identifier)
+        if len(self._memory) >= self.max_memory_entries:
+            if self._db is None:
+                self._spill()
+            else:
+                self._flush()
+
+    def _lookup(self, key: bytes) -> bytes | None:
+        value = self._memory.get(key)
+        if value is None and self._db is not None:
+            row = self._db.execute("SELECT value FROM dirmap WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                value = row[0]
+        return value
+
+    def get(self, path: str, default: str | None = None) -> str | None:
+        """Return the identifier for a directory path, or the default."""
+        value = self._lookup(self.path_key(path))
+        if value is None:
+            return default
+        return self._decode_identifier(value)
+
+    def __getitem__(self, path: str) -> str:
+        """Return the identifier for a directory path."""
+        value = self.get(path)
+        if value is None:
+            raise KeyError(path)
+        return value
+
+    def __contains__(self, path: str) -> bool:
+        """Return True if the directory path is in the map."""
+        return self._lookup(self.path_key(path)) is not None
+
+    def __len__(self) -> int:
+        """Return the number of entries (spilled entries may include replacements)."""
+        return len(self._memory) + self._spilled_count
+
+    def close(self) -> None:
+        """Release the map, removing any spill file."""
+        self._memory = {}
+        self._spilled_count = 0
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+        if self._db_file is not None:
+            try:
+                os.remove(self._db_file)
+            except OSError as error:
+                logging.warning("Unable to remove directory map file %s: %s", self._db_file, error)
+            self._db_file = None
+
+    def __del__(self) -> None:
+        """Make sure the spill file is removed."""
+        self.close()
@@ -0,0 +1,54 @@
+"""
+Test script for the spillable directory map.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+import uuid
+
+
+if os.environ.get("INDALEKO_ROOT") is None:
+    current_path = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.exists(os.path.join(current_path, "Indaleko.py")):
+        current_path = os.path.dirname(current_path)
+    os.environ["INDALEKO_ROOT"] = current_path
+    sys.path.append(current_path)
+
+from storage.recorders.dirmap import IndalekoDirMap
+
+
+def test_dirmap_spills_to_disk() -> None:
+    """Entries must survive the move from memory to disk."""
+    dirmap = IndalekoDirMap(max_memory_entries=10)
+    expected = {f"/data/dir{index}": str(uuid.uuid4()) for index in range(35)}
+    for path, identifier in expected.items():
+        dirmap[path] = identifier
+    assert dirmap.is_spilled()
+    assert len(dirmap) == len(expected)
+    for path, identifier in expected.items():
+        assert path in dirmap
+        assert dirmap[path] == identifier
+    assert dirmap.get("/data/missing") is None
+    spill_file = dirmap._db_file  # pylint: disable=protected-access
+    dirmap.close()
+    assert not os.path.exists(spill_file)
+
+
+if __name__ == "__main__":
+    test_dirmap_spills_to_disk()
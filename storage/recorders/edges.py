@@ -0,0 +1,169 @@
+"""
+This module builds the containment relationships for the storage recorders.
+
+Each file or directory gets up to six relationship documents: contains and
+contained-by for its parent directory, its volume and its machine.  Building
+each of these as an IndalekoRelationship (several pydantic models and a JSON
+round trip per edge) dominates recording time for large volumes, and holding
+them costs far more memory than the documents themselves.  The engine here
+renders the documents directly from a per-run template, so an edge is a small
+dictionary that shares its record with every other edge from the run.
+
+The engine can also collapse each symmetric pair into a single document: the
+"contains" edge carries both relationship identifiers and the "contained by"
+edge is not emitted.  This halves the size of the relationship collection,
+but queries must then traverse the collapsed edges in both directions
+(ANY/INBOUND), so it is not the default.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+import os
+import sys
+import time
+import uuid
+
+from typing import Any
+
+
+if os.environ.get("INDALEKO_ROOT") is None:
+    current_path = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.exists(os.path.join(current_path, "Indaleko.py")):
+        current_path = os.path.dirname(current_path)
+    os.environ["INDALEKO_ROOT"] = current_path
+    sys.path.append(current_path)
+
+# pylint: disable=wrong-import-position
+from data_models import IndalekoRecordDataModel, IndalekoSourceIdentifierDataModel
+from db import IndalekoDBCollections
+from storage.i_relationship import IndalekoRelationship
+
+
+# pylint: enable=wrong-import-position
+
+
+class IndalekoEdgeEngine:
+    """Render the containment relationship documents for storage objects."""
+
+    # (contains, contained by) for each kind of container
+    directory_pair = (
+        str(IndalekoRelationship.DIRECTORY_CONTAINS_RELATIONSHIP_UUID_STR.value),
+        str(IndalekoRelationship.CONTAINED_BY_DIRECTORY_RELATIONSHIP_UUID_STR.value),
+    )
+    volume_pair = (
+        str(IndalekoRelationship.VOLUME_CONTAINS_RELATIONSHIP_UUID_STR.value),
+        str(IndalekoRelationship.CONTAINED_BY_VOLUME_RELATIONSHIP_UUID_STR.value),
+    )
+    machine_pair = (
+        str(IndalekoRelationship.MACHINE_CONTAINS_RELATIONSHIP_UUID_STR.value),
+        str(IndalekoRelationship.CONTAINED_BY_MACHINE_RELATIONSHIP_UUID_STR.value),
+    )
+    size_sample_interval = 1024  # objects between document size samples
+
+    def __init__(
+        self,
+        source_id: IndalekoSourceIdentifierDataModel,
+        collapse_symmetric: bool = False,
+        collection: str = IndalekoDBCollections.Indaleko_Object_Collection,
+    ) -> None:
+        """
+        Create the engine.
+
+        Inputs:
+            * source_id: the source identifier recorded in every relationship
+            * collapse_symmetric: emit one document per contains/contained-by pair
+            * collection: the collection holding the related objects
+        """
+        self.collapse_symmetric = collapse_symmetric
+        self.prefix = collection + "/"
+        # Every edge from this run shares the same record
+        self.record = json.loads(
+            IndalekoRecordDataModel(SourceIdentifier=source_id).model_dump_json(exclude_none=True),
+        )
+        self.relationships = {}
+        for pair in (self.directory_pair, self.volume_pair, self.machine_pair):
+            for identifier in pair:
+                self.relationships[identifier] = [{"Identifier": identifier}]
+            self.relationships[pair] = [{"Identifier": identifier} for identifier in pair]
+        self.object_count = 0
+        self.edge_count = 0
+        self.elapsed = 0.0
+        self.sampled_bytes = 0
+        self.sampled_edges = 0
+
+    def edge(self, id1: str, id2: str, relationship: str | tuple[str, str]) -> dict[str, Any]:
+        """Return the relationship document for id1 -> id2."""
+        return {
+            "Record": self.record,
+            "Objects": [id1, id2],
+            "Relationships": self.relationships[relationship],
+            "_key": str(uuid.uuid4()),
+            "_from": self.prefix + id1,
+            "_to": self.prefix + id2,
+        }
+
+    def add_pair(
+        self,
+        edges: list[dict[str, Any]],
+        container: str,
+        object_id: str,
+        pair: tuple[str, str],
+    ) -> None:
+        """Add the edges between a container and an object to the list."""
+        if self.collapse_symmetric:
+            edges.append(self.edge(container, object_id, pair))
+        else:
+            edges.append(self.edge(container, object_id, pair[0]))
+            edges.append(self.edge(object_id, container, pair[1]))
+
+    def object_edges(
+        self,
+        object_id: str | uuid.UUID,
+        parent_id: str | uuid.UUID,
+        volume: str | uuid.UUID | None = None,
+        machine_id: str | uuid.UUID | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return the edges between an object and its directory, volume and machine."""
+        start = time.perf_counter()
+        object_id = str(object_id)
+        edges = []
+        self.add_pair(edges, str(parent_id), object_id, self.directory_pair)
+        if volume:
+            self.add_pair(edges, str(volume), object_id, self.volume_pair)
+        if machine_id:
+            self.add_pair(edges, str(machine_id), object_id, self.machine_pair)
+        self.elapsed += time.perf_counter() - start
+        if self.object_count % self.size_sample_interval == 0:
+            self.sampled_bytes += sum(len(json.dumps(edge)) for edge in edges)
+            self.sampled_edges += len(edges)
+        self.object_count += 1
+        self.edge_count += len(edges)
+        return edges
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return the edge count, the generation rate and the average edge size."""
+        stats = {
+            "edges": self.edge_count,
+            "elapsed": self.elapsed,
+            "collapse_symmetric": self.collapse_symmetric,
+        }
+        if self.elapsed > 0:
+            stats["edges_per_second"] = self.edge_count / self.elapsed
+        if self.sampled_edges:
+            stats["bytes_per_edge"] = self.sampled_bytes / self.sampled_edges
+        return stats
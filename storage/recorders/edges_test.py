@@ -0,0 +1,83 @@
+"""
+Test script for the edge engine.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+import uuid
+
+
+if os.environ.get("INDALEKO_ROOT") is None:
+    current_path = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.exists(os.path.join(current_path, "Indaleko.py")):
+        current_path = os.path.dirname(current_path)
+    os.environ["INDALEKO_ROOT"] = current_path
+    sys.path.append(current_path)
+
+from data_models import IndalekoSemanticAttributeDataModel, IndalekoSourceIdentifierDataModel
+from storage.i_relationship import IndalekoRelationship
+from storage.recorders.edges import IndalekoEdgeEngine
+
+
+source_id = IndalekoSourceIdentifierDataModel(Identifier=str(uuid.uuid4()), Version="1.0")
+
+
+def test_edges_match_relationship_documents() -> None:
+    """Engine documents must have the same shape as IndalekoRelationship.serialize()."""
+    engine = IndalekoEdgeEngine(source_id)
+    parent, child = str(uuid.uuid4()), str(uuid.uuid4())
+    edges = engine.object_edges(child, parent, volume=str(uuid.uuid4()), machine_id=str(uuid.uuid4()))
+    assert len(edges) == 6
+    expected = IndalekoRelationship(
+        objects=(
+            {"collection": "Objects", "object": parent},
+            {"collection": "Objects", "object": child},
+        ),
+        relationships=[
+            IndalekoSemanticAttributeDataModel(
+                Identifier=IndalekoRelationship.DIRECTORY_CONTAINS_RELATIONSHIP_UUID_STR,
+            ),
+        ],
+        source_id=source_id,
+    ).serialize()
+    documents = []
+    for document in (expected, edges[0]):
+        document = dict(document, _key=None)
+        document["Record"] = {key: value for key, value in document["Record"].items() if key != "Timestamp"}
+        documents.append(document)
+    assert documents[0] == documents[1]
+    assert edges[1]["_from"] == expected["_to"]
+    assert edges[1]["Relationships"][0]["Identifier"] == IndalekoEdgeEngine.directory_pair[1]
+    stats = engine.get_stats()
+    assert stats["edges"] == 6
+    assert stats["bytes_per_edge"] > 0
+
+
+def test_edges_collapse_symmetric_pairs() -> None:
+    """A collapsed pair is one edge carrying both relationships."""
+    engine = IndalekoEdgeEngine(source_id, collapse_symmetric=True)
+    edges = engine.object_edges(uuid.uuid4(), uuid.uuid4(), volume=uuid.uuid4())
+    assert len(edges) == 2
+    assert [item["Identifier"] for item in edges[0]["Relationships"]] == list(IndalekoEdgeEngine.directory_pair)
+    assert len({edge["_key"] for edge in edges}) == 2
+
+
+if __name__ == "__main__":
+    test_edges_match_relationship_documents()
+    test_edges_collapse_symmetric_pairs()
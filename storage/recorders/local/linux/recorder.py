@@ -215,7 +215,7 @@ class IndalekoLinuxLocalStorageRecorder(BaseLocalStorageRecorder):
             Timestamp=kwargs["timestamp"],
             Data=encode_binary_data(bytes(json.dumps(data).encode("utf-8"))),
         )
-        return IndalekoObject(**kwargs)
+        return IndalekoObject.from_trusted(**kwargs)
 
     @staticmethod
     def generate_log_file_name(**kwargs) -> str:
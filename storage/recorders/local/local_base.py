@@ -46,7 +46,6 @@ if os.environ.get("INDALEKO_ROOT") is None:
 
 # pylint: disable=wrong-import-position
 from data_models import IndalekoSourceIdentifierDataModel
-from db import IndalekoDBCollections
 from perf.perf_collector import IndalekoPerformanceDataCollector
 from perf.perf_recorder import IndalekoPerformanceDataRecorder
 from platforms.machine_config import IndalekoMachineConfig
@@ -139,6 +138,12 @@ class BaseLocalStorageRecorder(BaseStorageRecorder):
         def record(recorder: BaseLocalStorageRecorder, **kwargs) -> None:
             recorder.record()
 
+        def record_streaming(recorder: BaseLocalStorageRecorder, **kwargs) -> None:
+            recorder.record_streaming(batch_size=args.batch_size)
+
+        def record_incremental(recorder: BaseLocalStorageRecorder, **kwargs) -> None:
+            recorder.record_incremental(batch_size=args.batch_size)
+
         def extract_counters(**kwargs):
             recorder = kwargs.get("recorder")
             if recorder:
@@ -182,21 +187,55 @@ class BaseLocalStorageRecorder(BaseStorageRecorder):
                     if debug:
                         ic("Performance data written to the database")
 
-        # Step 1: normalize the data and gather the performance.
-        if args.debug:
-            ic("Normalizing data")
-        capture_performance(record)
-        # Step 2: record the time to save the object data.
-        if args.debug:
-            ic("Writing object data to file")
-        capture_performance(
-            recorder.write_object_data_to_file,
-            output_file_name=output_file,
-        )
-        # Step 3: record the time to save the edge data.
-        if args.debug:
-            ic("Writing edge data to file")
-        capture_performance(recorder.write_edge_data_to_file, recorder.output_edge_file)
+        bulk_upload = (args.bulk or getattr(args, "output_type", "file") == "bulk") and not args.arangoimport
+        if args.arangoimport and args.bulk:
+            ic(
+                "Warning: both arangoimport and bulk upload specified.  Using arangoimport ONLY.",
+            )
+        if getattr(args, "output_type", "file") == "incremental":
+            # Steps 1-3: upload only what changed since the last run, as
+            # recorded in the manifest.
+            if args.debug:
+                ic("Recording changes using manifest", recorder.get_manifest_file_name())
+            capture_performance(record_incremental)
+            if args.arangoimport:
+                ic("Warning: arangoimport is not used for incremental recording.")
+                args.arangoimport = False
+        elif getattr(args, "streaming", False):
+            # Steps 1-3: normalize, build edges, and upload (or write) the data
+            # in bounded batches rather than holding the whole volume in memory.
+            if args.debug:
+                ic("Streaming data in batches of", args.batch_size)
+            if args.arangoimport:
+                recorder.output_type = "file"
+                args.bulk = False
+            capture_performance(record_streaming)
+        else:
+            # Step 1: normalize the data and gather the performance.
+            if args.debug:
+                ic("Normalizing data")
+            capture_performance(record)
+            if bulk_upload:
+                # Step 2: stream the data straight into the database; there is no
+                # need for the intermediate files when we are loading in-process.
+                if args.debug:
+                    ic("Using bulk uploader to load object data")
+                capture_performance(recorder.bulk_upload_object_data)
+                if args.debug:
+                    ic("Using bulk uploader to load relationship data")
+                capture_performance(recorder.bulk_upload_relationship_data)
+            else:
+                # Step 2: record the time to save the object data.
+                if args.debug:
+                    ic("Writing object data to file")
+                capture_performance(
+                    recorder.write_object_data_to_file,
+                    output_file_name=output_file,
+                )
+                # Step 3: record the time to save the edge data.
+                if args.debug:
+                    ic("Writing edge data to file")
+                capture_performance(recorder.write_edge_data_to_file, recorder.output_edge_file)
 
         # Free that memory before running arangoimport!
         proc = psutil.Process(os.getpid())
@@ -211,10 +250,6 @@ class BaseLocalStorageRecorder(BaseStorageRecorder):
             ic(f"Memory usage after deleting recorder: {memory_after.rss}")
             ic(memory_after)
 
-        if args.arangoimport and args.bulk:
-            ic(
-                "Warning: both arangoimport and bulk upload specified.  Using arangoimport ONLY.",
-            )
         if args.arangoimport:
             # Step 4: upload the data to the database using the arangoimport utility
             if args.debug:
@@ -223,14 +258,6 @@ class BaseLocalStorageRecorder(BaseStorageRecorder):
             if args.debug:
                 ic("Using arangoimport to load relationship data")
             capture_performance(recorder.arangoimport_relationship_data)
-        elif args.bulk:
-            # Step 5: upload the data to the database using the bulk uploader
-            if args.debug:
-                ic("Using bulk uploader to load object data")
-            capture_performance(recorder.bulk_upload_object_data)
-            if args.debug:
-                ic("Using bulk uploader to load relationship data")
-            capture_performance(recorder.bulk_upload_relationship_data)
 
     @staticmethod
     def local_recorder_runner(
@@ -258,26 +285,15 @@ class BaseLocalStorageRecorder(BaseStorageRecorder):
         )
         runner.run()
 
-    def record(self) -> None:
-        """
-        This function processes and records the collector file and emits the data needed to
-        upload to the database.
-        """
-        self.normalize()
-        assert len(self.dir_data) + len(self.file_data) > 0, "No data to record"
-        self.build_dirmap()
-        self.build_edges()
+    def get_output_file_keys(self) -> dict[str, str]:
+        """This function returns the keys used to name the recorder's output files."""
         kwargs = {
             "machine": self.machine_id,
             "platform": getattr(self, "platform", self.get_recorder_platform_name()),
             "service": self.recorder_data.ServiceFileName,
-            "collection": IndalekoDBCollections.Indaleko_Object_Collection,
             "timestamp": self.timestamp,
             "output_dir": self.data_dir,
         }
         if self.storage_description:
             kwargs["storage"] = self.storage_description
-
-        self.output_object_file = self.generate_output_file_name(**kwargs)
-        kwargs["collection"] = IndalekoDBCollections.Indaleko_Relationship_Collection
-        self.output_edge_file = self.generate_output_file_name(**kwargs)
+        return kwargs
@@ -275,7 +275,7 @@ class IndalekoMacLocalStorageRecorder(BaseLocalStorageRecorder):
             Data=encode_binary_data(bytes(json.dumps(data).encode("utf-8"))),
         )
 
-        return IndalekoObject(**kwargs)
+        return IndalekoObject.from_trusted(**kwargs)
 
     def arangoimport(self) -> None:
 
@@ -216,7 +216,7 @@ class IndalekoWindowsLocalStorageRecorder(BaseLocalStorageRecorder):
             Timestamp=kwargs["timestamp"],
             Data=encode_binary_data(bytes(json.dumps(data).encode("utf-8"))),
         )
-        return IndalekoObject(**kwargs)
+        return IndalekoObject.from_trusted(**kwargs)
 
 
 def main() -> None:
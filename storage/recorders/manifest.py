@@ -0,0 +1,221 @@
+"""
+This module provides the persistent manifest used by the storage recorders
+for incremental re-indexing.
+
+The manifest records, for every object the recorder has uploaded, the
+identity of the underlying file (st_dev, st_ino), the ObjectIdentifier used
+in the database, and the attributes used to detect a change (URI, mtime,
+ctime and size).  On the next run this lets the recorder keep the same
+ObjectIdentifier for the same file, upload only what has changed, and find
+the objects that have been deleted.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import logging
+import os
+import sqlite3
+import uuid
+
+from collections.abc import Iterator
+from typing import Any
+
+
+class IndalekoStorageManifest:
+    """A persistent (st_dev, st_ino) keyed manifest of recorded objects."""
+
+    NEW = "new"  # not in the manifest
+    MOVED = "moved"  # same file, different URI (so its edges must be rebuilt)
+    MODIFIED = "modified"  # same file and URI, different mtime, ctime or size
+    UNCHANGED = "unchanged"
+
+    def __init__(self, manifest_file: str) -> None:
+        """
+        Open (or create) the manifest.
+
+        All changes made during a run are part of one transaction, so the
+        manifest only moves forward when commit() is called after the
+        database has been updated.
+        """
+        self.manifest_file = manifest_file
+        self._db = sqlite3.connect(manifest_file)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS manifest ("
+            "dev TEXT NOT NULL, "
+            "ino TEXT NOT NULL, "
+            "object_id TEXT NOT NULL, "
+            "uri TEXT NOT NULL, "
+            "mtime_ns INTEGER, "
+            "ctime_ns INTEGER, "
+            "size INTEGER, "
+            "generation INTEGER NOT NULL, "
+            "state TEXT NOT NULL, "
+            "PRIMARY KEY (dev, ino)) WITHOUT ROWID",
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT)",
+        )
+        row = self._db.execute("SELECT value FROM metadata WHERE key = 'generation'").fetchone()
+        self.previous_generation = int(row[0]) if row is not None else 0
+        self.generation = self.previous_generation + 1
+        self._db.commit()
+
+    @staticmethod
+    def file_key(data: dict[str, Any]) -> tuple[str, str] | None:
+        """Return the manifest key for the collector data, if it has one."""
+        if "st_dev" not in data or "st_ino" not in data or not data["st_ino"]:
+            return None
+        # st_dev and st_ino can exceed the range of an SQLite integer.
+        return str(data["st_dev"]), str(data["st_ino"])
+
+    def is_empty(self) -> bool:
+        """Return True if no run has been committed to the manifest."""
+        return self.previous_generation == 0
+
+    def check_root(self, root: str | None) -> None:
+        """
+        Record the root of the tree covered by this run.  A manifest only
+        covers one tree: anything in it that is not seen in this run is
+        treated as deleted, so running it against a different root would
+        delete the whole previous tree.  Raises ValueError if a previous run
+        covered a different root, or if the root of a non-empty manifest
+        cannot be checked because this run saw no entries.
+        """
+        row = self._db.execute("SELECT value FROM metadata WHERE key = 'root'").fetchone()
+        previous = row[0] if row is not None else None
+        if root is None:
+            if not self.is_empty():
+                raise ValueError(f"No entries to check against the root of manifest {self.manifest_file}")
+            return
+        root = os.path.normpath(root)
+        if previous is not None and previous != root:
+            raise ValueError(
+                f"Manifest {self.manifest_file} covers {previous}, not {root}; use a different manifest",
+            )
+        self._db.execute(
+            "INSERT OR REPLACE INTO metadata (key, value) VALUES ('root', ?)",
+            (root,),
+        )
+
+    def check(self, data: dict[str, Any]) -> tuple[str, str]:
+        """
+        Classify the collector data against the manifest and record it (and
+        its state) as seen in this run.  Returns the ObjectIdentifier to use (the one from
+        the manifest for a known file) and one of NEW, MOVED, MODIFIED or
+        UNCHANGED.
+        """
+        identifier = data.get("ObjectIdentifier") or str(uuid.uuid4())
+        key = self.file_key(data)
+        if key is None:
+            return identifier, self.NEW
+        uri = data.get("URI", "")
+        attributes = (data.get("st_mtime_ns"), data.get("st_ctime_ns"), data.get("st_size"))
+        row = self._db.execute(
+            "SELECT object_id, uri, mtime_ns, ctime_ns, size, generation FROM manifest WHERE dev = ? AND ino = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            state = self.NEW
+        else:
+            identifier = row[0]
+            if row[5] == self.generation:
+                # already seen in this run: another hard link to the same file
+                return identifier, self.UNCHANGED
+            if row[1] != uri:
+                state = self.MOVED
+            elif tuple(row[2:5]) != attributes:
+                state = self.MODIFIED
+            else:
+                state = self.UNCHANGED
+        self._db.execute(
+            "INSERT OR REPLACE INTO manifest "
+            "(dev, ino, object_id, uri, mtime_ns, ctime_ns, size, generation, state) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (*key, identifier, uri, *attributes, self.generation, state),
+        )
+        return identifier, state
+
+    def lookup(self, data: dict[str, Any]) -> tuple[str, str] | None:
+        """Return the ObjectIdentifier and state recorded by check() in this run."""
+        key = self.file_key(data)
+        if key is None:
+            return None
+        row = self._db.execute(
+            "SELECT object_id, state FROM manifest WHERE dev = ? AND ino = ? AND generation = ?",
+            (*key, self.generation),
+        ).fetchone()
+        return (row[0], row[1]) if row is not None else None
+
+    def _select_identifiers(self, query: str, parameters: tuple, batch_size: int) -> Iterator[list[str]]:
+        cursor = self._db.execute(query, parameters)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield [row[0] for row in rows]
+
+    def moved(self, batch_size: int = 1000) -> Iterator[list[str]]:
+        """Yield, in batches, the ObjectIdentifiers of files that moved in this run."""
+        return self._select_identifiers(
+            "SELECT object_id FROM manifest WHERE generation = ? AND state = ?",
+            (self.generation, self.MOVED),
+            batch_size,
+        )
+
+    def deleted(self, batch_size: int = 1000) -> Iterator[list[str]]:
+        """
+        Yield, in batches, the ObjectIdentifiers of files in the manifest that
+        were not seen in this run.  This is only meaningful once the whole
+        tree covered by the manifest has been checked.
+        """
+        return self._select_identifiers(
+            "SELECT object_id FROM manifest WHERE generation < ?",
+            (self.generation,),
+            batch_size,
+        )
+
+    def commit(self) -> None:
+        """Drop the deleted files and make this run's changes permanent."""
+        removed = self._db.execute(
+            "DELETE FROM manifest WHERE generation < ?",
+            (self.generation,),
+        ).rowcount
+        self._db.execute(
+            "INSERT OR REPLACE INTO metadata (key, value) VALUES ('generation', ?)",
+            (str(self.generation),),
+        )
+        self._db.commit()
+        logging.info(
+            "Manifest %s committed generation %d (%d entries removed)",
+            self.manifest_file,
+            self.generation,
+            removed,
+        )
+        self.previous_generation = self.generation
+        self.generation += 1
+
+    def rollback(self) -> None:
+        """Discard this run's changes."""
+        self._db.rollback()
+
+    def close(self) -> None:
+        """Close the manifest, discarding any uncommitted changes."""
+        if self._db is not None:
+            self._db.rollback()
+            self._db.close()
+            self._db = None
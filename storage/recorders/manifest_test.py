@@ -0,0 +1,115 @@
+"""
+Test script for the incremental recording manifest.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+import tempfile
+import uuid
+
+
+if os.environ.get("INDALEKO_ROOT") is None:
+    current_path = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.exists(os.path.join(current_path, "Indaleko.py")):
+        current_path = os.path.dirname(current_path)
+    os.environ["INDALEKO_ROOT"] = current_path
+    sys.path.append(current_path)
+
+from storage.recorders.manifest import IndalekoStorageManifest
+
+
+def make_entry(ino: int, uri: str, mtime: int = 1, size: int = 10) -> dict:
+    """Build the parts of a collector entry the manifest uses."""
+    return {
+        "st_dev": 2756347094955649599 * 4,  # larger than an SQLite integer
+        "st_ino": ino,
+        "st_mtime_ns": mtime,
+        "st_ctime_ns": mtime,
+        "st_size": size,
+        "URI": uri,
+        "ObjectIdentifier": str(uuid.uuid4()),
+    }
+
+
+def test_manifest_across_runs() -> None:
+    """Identifiers are stable, and changes and deletions are detected."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manifest_file = os.path.join(tmpdir, "manifest.sqlite")
+        manifest = IndalekoStorageManifest(manifest_file)
+        assert manifest.is_empty()
+        first = {}
+        for ino, uri in ((1, "/a"), (2, "/a/b"), (3, "/a/c"), (4, "/a/d")):
+            entry = make_entry(ino, uri)
+            identifier, state = manifest.check(entry)
+            assert state == IndalekoStorageManifest.NEW
+            assert identifier == entry["ObjectIdentifier"]
+            first[ino] = identifier
+        manifest.commit()
+        manifest.close()
+
+        manifest = IndalekoStorageManifest(manifest_file)
+        assert not manifest.is_empty()
+        results = {
+            1: manifest.check(make_entry(1, "/a")),
+            2: manifest.check(make_entry(2, "/a/b", mtime=2)),
+            3: manifest.check(make_entry(3, "/a/renamed")),
+            5: manifest.check(make_entry(5, "/a/new")),
+        }
+        assert results[1] == (first[1], IndalekoStorageManifest.UNCHANGED)
+        assert results[2] == (first[2], IndalekoStorageManifest.MODIFIED)
+        assert results[3] == (first[3], IndalekoStorageManifest.MOVED)
+        assert results[5][1] == IndalekoStorageManifest.NEW
+        assert manifest.lookup(make_entry(3, "/a/renamed")) == results[3]
+        assert [identifier for batch in manifest.moved() for identifier in batch] == [first[3]]
+        assert [identifier for batch in manifest.deleted() for identifier in batch] == [first[4]]
+        manifest.commit()
+        manifest.close()
+
+        manifest = IndalekoStorageManifest(manifest_file)
+        assert manifest.check(make_entry(4, "/a/d"))[1] == IndalekoStorageManifest.NEW
+        assert manifest.check(make_entry(3, "/a/renamed")) == (first[3], IndalekoStorageManifest.UNCHANGED)
+        manifest.close()
+
+
+def test_manifest_root() -> None:
+    """A manifest refuses to be used for a different tree."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manifest_file = os.path.join(tmpdir, "manifest.sqlite")
+        manifest = IndalekoStorageManifest(manifest_file)
+        manifest.check_root(None)  # nothing recorded yet, so nothing to delete
+        manifest.check_root("/a/")
+        manifest.check(make_entry(1, "/a/b"))
+        manifest.commit()
+        manifest.close()
+
+        manifest = IndalekoStorageManifest(manifest_file)
+        manifest.check_root("/a")
+        for root in ("/b", None):
+            try:
+                manifest.check_root(root)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f"manifest for /a accepted root {root}")
+        manifest.close()
+
+
+if __name__ == "__main__":
+    test_manifest_across_runs()
+    test_manifest_root()
@@ -21,38 +21,36 @@ You should have received a copy of the GNU Affero General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import functools
 import os
 import re
 
+from collections.abc import Iterable
 
-def tokenize_filename(filename: str) -> dict[str, str | list[str]]:
-    """
-    Generate different tokenizations of a filename to improve search capabilities.
 
-    Args:
-        filename: The filename or directory name to tokenize
+# Patterns are compiled once; tokenization runs for every object recorded.
+# This finds transitions from lowercase to uppercase
+_CAMEL_LOWER_UPPER = re.compile(r"([a-z])([A-Z])")
+# Also handle consecutive uppercase letters followed by lowercase
+_CAMEL_UPPER_UPPER_LOWER = re.compile(r"([A-Z])([A-Z][a-z])")
+# Split by spaces, dashes, dots, etc.
+_SPACE_SPLIT = re.compile(r"[ \-_\.\(\)\[\]\{\}]")
+
+# Names repeat heavily across a volume (index.js, README.md, __init__.py) so
+# the results are memoized in a bounded LRU cache.
+TOKENIZATION_CACHE_SIZE = int(os.environ.get("INDALEKO_TOKENIZATION_CACHE_SIZE", "65536"))
 
-    Returns:
-        A dictionary containing different tokenization results:
-        - CamelCaseTokenizedName: Splits CamelCase names (e.g., "IndalekoObject" -> "Indaleko Object")
-        - SnakeCaseTokenizedName: Splits snake_case names (e.g., "indaleko_object" -> "indaleko object")
-        - NgramTokenizedName: List of n-grams (3-5 character sequences)
-        - SpaceTokenizedName: Simple space-split tokenization
-        - SearchTokenizedName: Combined tokenization for search purposes
-    """
-    # Strip path but keep extension for display
-    base_name = os.path.basename(filename)
 
+def _tokenize_base_name(base_name: str) -> dict[str, str | list[str]]:
+    """Tokenize a name that has already had its path stripped."""
     # For n-grams, we use just the name part without extension
-    name_part, extension = os.path.splitext(base_name)
+    name_part, _ = os.path.splitext(base_name)
 
     result = {}
 
     # CamelCase tokenization - preserve extension
-    # This regex finds transitions from lowercase to uppercase
-    camel_split = re.sub(r"([a-z])([A-Z])", r"\1 \2", base_name)
-    # Also handle consecutive uppercase letters followed by lowercase
-    camel_split = re.sub(r"([A-Z])([A-Z][a-z])", r"\1 \2", camel_split)
+    camel_split = _CAMEL_LOWER_UPPER.sub(r"\1 \2", base_name)
+    camel_split = _CAMEL_UPPER_UPPER_LOWER.sub(r"\1 \2", camel_split)
     result["CamelCaseTokenizedName"] = camel_split
 
     # Snake case tokenization - preserve extension
@@ -60,47 +58,84 @@ def tokenize_filename(filename: str) -> dict[str, str | list[str]]:
     result["SnakeCaseTokenizedName"] = snake_split
 
     # N-gram tokenization (using 3, 4, and 5-grams) - just on name part
-    ngrams = []
-    # Only generate n-grams if name is long enough
-    if len(name_part) >= 3:
-        # 3-grams
-        for i in range(len(name_part) - 2):
-            ngrams.append(name_part[i : i + 3])
-
-        # 4-grams
-        if len(name_part) >= 4:
-            for i in range(len(name_part) - 3):
-                ngrams.append(name_part[i : i + 4])
-
-        # 5-grams
-        if len(name_part) >= 5:
-            for i in range(len(name_part) - 4):
-                ngrams.append(name_part[i : i + 5])
-
-    result["NgramTokenizedName"] = ngrams
-
-    # Space tokenization (split by spaces, dashes, dots, etc.) - on full name
-    space_split = re.split(r"[ \-_\.\(\)\[\]\{\}]", base_name)
-    # Remove empty strings from the list
-    space_split = [token for token in space_split if token]
+    length = len(name_part)
+    result["NgramTokenizedName"] = [
+        name_part[i : i + size] for size in (3, 4, 5) for i in range(length - size + 1)
+    ]
+
+    # Space tokenization - on full name, removing empty strings
+    space_split = [token for token in _SPACE_SPLIT.split(base_name) if token]
     result["SpaceTokenizedName"] = space_split
 
     # Create a combined tokenized value that incorporates CamelCase and snake_case tokenization
     # This will be indexed using the standard text_en analyzer
-    combined_tokens = []
-    combined_tokens.append(base_name)  # Original name
-    combined_tokens.append(camel_split)  # CamelCase tokenized version
-    combined_tokens.append(snake_split)  # snake_case tokenized version
+    result["SearchTokenizedName"] = " ".join([base_name, camel_split, snake_split, *space_split])
+
+    return result
+
 
-    # Add individual tokens from space tokenization
-    combined_tokens.extend(space_split)
+@functools.lru_cache(maxsize=TOKENIZATION_CACHE_SIZE)
+def _tokenize_base_name_cached(base_name: str) -> dict[str, str | list[str]]:
+    """Memoized form of _tokenize_base_name; callers must not modify the result."""
+    return _tokenize_base_name(base_name)
 
-    # Join everything into a single string with spaces for standard analyzer processing
-    result["SearchTokenizedName"] = " ".join(combined_tokens)
 
+def _copy_tokens(tokens: dict[str, str | list[str]]) -> dict[str, str | list[str]]:
+    """Copy a cached result so that callers may modify it."""
+    result = dict(tokens)
+    result["NgramTokenizedName"] = list(tokens["NgramTokenizedName"])
+    result["SpaceTokenizedName"] = list(tokens["SpaceTokenizedName"])
     return result
 
 
+def tokenize_filename(filename: str) -> dict[str, str | list[str]]:
+    """
+    Generate different tokenizations of a filename to improve search capabilities.
+
+    Args:
+        filename: The filename or directory name to tokenize
+
+    Returns:
+        A dictionary containing different tokenization results:
+        - CamelCaseTokenizedName: Splits CamelCase names (e.g., "IndalekoObject" -> "Indaleko Object")
+        - SnakeCaseTokenizedName: Splits snake_case names (e.g., "indaleko_object" -> "indaleko object")
+        - NgramTokenizedName: List of n-grams (3-5 character sequences)
+        - SpaceTokenizedName: Simple space-split tokenization
+        - SearchTokenizedName: Combined tokenization for search purposes
+    """
+    # Strip path but keep extension for display
+    return _copy_tokens(_tokenize_base_name_cached(os.path.basename(filename)))
+
+
+def tokenize_filenames(filenames: Iterable[str]) -> list[dict[str, str | list[str]]]:
+    """
+    Tokenize a batch of filenames.
+
+    Each distinct name in the batch is tokenized only once, so this is the
+    preferred interface when a recorder has many names in hand.  The results
+    are in the same order as the input.
+    """
+    unique = {}
+    results = []
+    for filename in filenames:
+        base_name = os.path.basename(filename)
+        tokens = unique.get(base_name)
+        if tokens is None:
+            tokens = unique[base_name] = _tokenize_base_name_cached(base_name)
+        results.append(_copy_tokens(tokens))
+    return results
+
+
+def tokenization_cache_info() -> functools._CacheInfo:
+    """Return the hit/miss statistics for the tokenization cache."""
+    return _tokenize_base_name_cached.cache_info()
+
+
+def clear_tokenization_cache() -> None:
+    """Empty the tokenization cache."""
+    _tokenize_base_name_cached.cache_clear()
+
+
 def main() -> None:
     """Test the tokenization functions."""
     test_names = [
@@ -29,7 +29,7 @@ if os.environ.get("INDALEKO_ROOT") is None:
     os.environ["INDALEKO_ROOT"] = current_path
     sys.path.append(current_path)
 
-from storage.recorders.tokenization import tokenize_filename
+from storage.recorders.tokenization import tokenize_filename, tokenize_filenames
 
 
 def test_tokenize_filename() -> None:
@@ -96,6 +96,27 @@ def test_tokenize_filename() -> None:
             assert len(result["NgramTokenizedName"]) > 0, "Expected n-grams for name length >= 3"
 
 
+def test_tokenize_filename_cached_copies() -> None:
+    """Cached results must not be shared with (and modified by) callers."""
+    first = tokenize_filename("index.js")
+    first["NgramTokenizedName"].append("modified")
+    first["SpaceTokenizedName"].clear()
+    second = tokenize_filename("index.js")
+    assert "modified" not in second["NgramTokenizedName"]
+    assert second["SpaceTokenizedName"] == ["index", "js"]
+
+
+def test_tokenize_filenames_batch() -> None:
+    """The batch interface must match the single name interface, in order."""
+    names = ["README.md", "IndalekoObject.py", "README.md", "/tmp/data_set-v2.tar.gz", "ab"]
+    results = tokenize_filenames(names)
+    assert len(results) == len(names)
+    for name, result in zip(names, results, strict=True):
+        assert result == tokenize_filename(name)
+    assert results[0] is not results[2]
+
 
 if __name__ == "__main__":
     test_tokenize_filename()
+    test_tokenize_filename_cached_copies()
+    test_tokenize_filenames_batch()
@@ -3,6 +3,8 @@ import time
 
 from datetime import UTC, datetime
 
+import pytest
+
 from activity.collectors.storage.fs_incremental import FsIncrementalCollector
 from activity.recorders.storage.fs_incremental_recorder import FsIncrementalRecorder
 
@@ -61,3 +63,91 @@ def test_incremental_indexer(tmp_path):
     paths = [a["file_path"] for a in acts3]
     assert any(p.endswith("a.txt") for p in paths)
     assert len(acts3) == 1
+
+
+def test_incremental_rescan_deletions(tmp_path):
+    base = tmp_path / "data"
+    (base / "sub").mkdir(parents=True)
+    (base / "a.txt").write_text("a", encoding="utf-8")
+    (base / "sub" / "b.txt").write_text("b", encoding="utf-8")
+    (base / "sub" / "c.txt").write_text("c", encoding="utf-8")
+    state_file = tmp_path / "state.json"
+
+    def collect(**kwargs):
+        return FsIncrementalCollector(
+            volumes=[str(base)],
+            state_file=str(state_file),
+            patterns=["*.txt"],
+            **kwargs,
+        ).collect_activities()
+
+    first = collect()
+    assert sorted(a["event"] for a in first) == ["created"] * 3
+    # directories written just now are re-listed, not trusted
+    assert collect() == []
+
+    # age the directories so their mtimes can be cached
+    old = time.time() - 60
+    for path in (base, base / "sub"):
+        os.utime(path, (old, old))
+    assert collect() == []
+    assert collect(prune_unchanged_dirs=True) == []
+
+    (base / "sub" / "b.txt").unlink()
+    (base / "d.txt").write_text("d", encoding="utf-8")
+    acts = {os.path.basename(a["file_path"]): a for a in collect()}
+    assert acts["b.txt"]["event"] == "deleted"
+    assert acts["b.txt"]["size_bytes"] is None
+    assert acts["d.txt"]["event"] == "created"
+    assert len(acts) == 2
+
+    # removing a directory reports the files it held
+    (base / "sub" / "c.txt").unlink()
+    (base / "sub").rmdir()
+    acts = collect()
+    assert [(os.path.basename(a["file_path"]), a["event"]) for a in acts] == [("c.txt", "deleted")]
+
+
+def test_inotify_watcher(tmp_path):
+    from activity.collectors.storage.fs_inotify import FsInotifyWatcher
+
+    if not FsInotifyWatcher.is_supported():
+        pytest.skip("inotify not supported")
+    base = tmp_path / "data"
+    base.mkdir()
+    (base / "keep.txt").write_text("keep", encoding="utf-8")
+    (base / "old.txt").write_text("old", encoding="utf-8")
+    watcher = FsInotifyWatcher(volumes=[str(base)], patterns=["*.txt"])
+    try:
+        watcher.start()
+        # created then modified: one created event
+        new_file = base / "new.txt"
+        new_file.write_text("one", encoding="utf-8")
+        new_file.write_text("two", encoding="utf-8")
+        # created then deleted: nothing
+        temp_file = base / "temp.txt"
+        temp_file.write_text("temp", encoding="utf-8")
+        temp_file.unlink()
+        # rename within the tree
+        (base / "old.txt").rename(base / "renamed.txt")
+        (base / "keep.txt").write_text("changed", encoding="utf-8")
+        # a new directory with a file in it
+        subdir = base / "sub"
+        subdir.mkdir()
+        (subdir / "inner.txt").write_text("inner", encoding="utf-8")
+        (base / "ignored.log").write_text("not matched", encoding="utf-8")
+        time.sleep(0.05)
+        assert watcher.read_events()
+        time.sleep(0.05)
+        assert watcher.read_events()
+        events = {act["file_path"]: act for act in watcher.flush()}
+    finally:
+        watcher.close()
+    assert events[str(new_file)]["event"] == "created"
+    assert events[str(new_file)]["size_bytes"] == 3
+    assert str(temp_file) not in events
+    assert events[str(base / "renamed.txt")]["event"] == "renamed"
+    assert events[str(base / "renamed.txt")]["old_path"] == str(base / "old.txt")
+    assert events[str(base / "keep.txt")]["event"] == "modified"
+    assert events[str(subdir / "inner.txt")]["event"] == "created"
+    assert len(events) == 4
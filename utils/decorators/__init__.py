@@ -34,7 +34,7 @@ if os.environ.get("INDALEKO_ROOT") is None:
     sys.path.append(current_path)
 
 # pylint: disable=wrong-import-position
-from indaleko.utils.decorators.type_check import type_check
+from utils.decorators.type_check import type_check
 
 
 # pylint: enable=wrong-import-position
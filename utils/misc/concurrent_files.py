@@ -0,0 +1,87 @@
+"""
+This module runs a function over many files concurrently.
+
+The files are submitted to an executor as they are read from the input,
+but only a bounded number are in flight at once, so the input may be a
+lazy iterator over a very large tree.  Results are yielded in the order
+the files finish, and a file that fails is reported rather than stopping
+the others.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import logging
+
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+from typing import Any
+
+
+DEFAULT_PENDING_PER_WORKER = 2  # files in flight per worker
+
+
+def map_files(
+    function: Callable[..., Any],
+    file_paths: Iterable[str],
+    *args: Any,  # noqa: ANN401
+    workers: int,
+    pending_per_worker: int = DEFAULT_PENDING_PER_WORKER,
+    executor: Executor | None = None,
+    action: str = "processing",
+) -> Iterator[tuple[str, Any]]:
+    """
+    Call function(file_path, *args) for many files concurrently.
+
+    Args:
+        function: Function to call for each file
+        file_paths: Paths of the files
+        args: Further arguments passed to function after the file path
+        workers: Size of the thread pool (and the basis of the in-flight limit)
+        pending_per_worker: Files in flight per worker
+        executor: Executor to run on (default: a thread pool of workers threads)
+        action: What function does, for the warning logged when a file fails
+
+    Yields:
+        (file_path, result) in the order the files finish; result is None if
+        function raised for that file
+    """
+    owns_executor = executor is None
+    if owns_executor:
+        executor = ThreadPoolExecutor(max_workers=workers)
+    max_pending = max(1, workers * pending_per_worker)
+    pending: dict[Future, str] = {}
+    try:
+        for file_path in file_paths:
+            if len(pending) >= max_pending:
+                yield from _collect(pending, wait(pending, return_when=FIRST_COMPLETED).done, action)
+            pending[executor.submit(function, file_path, *args)] = file_path
+        while pending:
+            yield from _collect(pending, wait(pending, return_when=FIRST_COMPLETED).done, action)
+    finally:
+        if owns_executor:
+            executor.shutdown(cancel_futures=True)
+
+
+def _collect(pending: dict[Future, str], done: set[Future], action: str) -> Iterator[tuple[str, Any]]:
+    """Yield the results of the finished futures and forget them."""
+    for future in done:
+        file_path = pending.pop(future)
+        try:
+            yield file_path, future.result()
+        except Exception as e:  # noqa: BLE001 - one bad file must not stop the others
+            logging.warning(f"Error {action} {file_path}: {e}")
+            yield file_path, None
@@ -0,0 +1,84 @@
+"""
+Tests for the concurrent_files module.
+
+Project Indaleko
+Copyright (C) 2024-2025 Tony Mason
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+import threading
+import unittest
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+if os.environ.get("INDALEKO_ROOT") is None:
+    current_path = os.path.dirname(os.path.abspath(__file__))
+    while not os.path.exists(os.path.join(current_path, "Indaleko.py")):
+        current_path = os.path.dirname(current_path)
+    os.environ["INDALEKO_ROOT"] = current_path
+    sys.path.append(current_path)
+
+from utils.misc.concurrent_files import map_files
+
+
+class TestMapFiles(unittest.TestCase):
+    """Test cases for map_files."""
+
+    def test_results_and_failures(self) -> None:
+        """Test that every file yields its result, or None if the function raised."""
+
+        def measure(file_path: str, scale: int) -> int:
+            if file_path == "bad":
+                raise OSError("unreadable")
+            return len(file_path) * scale
+
+        with self.assertLogs(level="WARNING") as logs:
+            results = dict(map_files(measure, ["a", "bb", "bad", "dddd"], 10, workers=2, action="measuring"))
+        assert results == {"a": 10, "bb": 20, "bad": None, "dddd": 40}
+        assert "Error measuring bad: unreadable" in logs.output[0]
+
+    def test_input_is_consumed_lazily(self) -> None:
+        """Test that no more than workers * pending_per_worker files are in flight."""
+        lock = threading.Lock()
+        state = {"submitted": 0, "finished": 0, "most": 0}
+
+        def file_paths():
+            for index in range(50):
+                with lock:
+                    state["submitted"] += 1
+                    state["most"] = max(state["most"], state["submitted"] - state["finished"])
+                yield str(index)
+
+        def finish(file_path: str) -> str:
+            with lock:
+                state["finished"] += 1
+            return file_path
+
+        results = list(map_files(finish, file_paths(), workers=2, pending_per_worker=3))
+        assert sorted(file_path for file_path, _ in results) == sorted(str(index) for index in range(50))
+        assert state["most"] <= 2 * 3 + 1
+
+    def test_supplied_executor_is_not_shut_down(self) -> None:
+        """Test that an executor supplied by the caller is left running."""
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert dict(map_files(str.upper, ["x"], workers=1, executor=executor)) == {"x": "X"}
+            assert executor.submit(str.lower, "Y").result() == "y"
+
+
+if __name__ == "__main__":
+    unittest.main()
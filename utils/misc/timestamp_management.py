@@ -42,7 +42,7 @@ def validate_iso_timestamp(source: str) -> bool:
     return utils.data_validation.validate_iso_timestamp(source)
 
 
-def generate_iso_timestamp(ts: datetime | None = None) -> str:
+def generate_iso_timestamp(ts: datetime.datetime | None = None) -> str:
     """Given a timestamp, convert it to an ISO timestamp."""
     if ts is None:
         ts = datetime.datetime.now(datetime.UTC)